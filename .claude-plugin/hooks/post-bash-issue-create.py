@@ -29,7 +29,7 @@ if str(_plugin_dir) not in sys.path:
     sys.path.insert(0, str(_plugin_dir))
 
 from lib.logger import logger
-from lib.session_utils import session_dir, write_issue_index
+from lib.session_utils import session_dir, write_issue_index, update_session_state
 from lib.workflow import ULTRA_PLANNER
 
 
@@ -111,11 +111,8 @@ def main():
         sys.exit(0)
 
     # Update session state with captured issue number
-    state['issue_no'] = issue_no
-
-    with open(session_file, 'w') as f:
-        logger(session_id, f"Updating session state with issue_no={issue_no}")
-        json.dump(state, f)
+    logger(session_id, f"Updating session state with issue_no={issue_no}")
+    update_session_state(session_id, {'issue_no': issue_no}, sess_dir)
 
     # Create issue index file for reverse lookup
     write_issue_index(session_id, issue_no, workflow, sess_dir=sess_dir)
@@ -10,7 +10,7 @@ if str(_plugin_dir) not in sys.path:
     sys.path.insert(0, str(_plugin_dir))
 
 from lib.logger import logger
-from lib.session_utils import session_dir, is_handsoff_enabled
+from lib.session_utils import session_dir, is_handsoff_enabled, update_session_state
 from lib.workflow import get_continuation_prompt, ISSUE_TO_IMPL
 
 
@@ -101,9 +101,8 @@ def main():
         )
 
         if prompt:
-            with open(fname, 'w') as f:
-                logger(session_id, f"Updating state for continuation: {state}")
-                json.dump(state, f)
+            logger(session_id, f"Updating state for continuation: {state}")
+            update_session_state(session_id, {'continuation_count': state['continuation_count']}, sess_dir)
             # NOTE: `dumps` is REQUIRED ow Claude Code will just ignore your output!
             print(json.dumps({
                 'decision': 'block',
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-import os
 import sys
 import json
 from pathlib import Path
@@ -11,7 +10,7 @@ if str(_plugin_dir) not in sys.path:
     sys.path.insert(0, str(_plugin_dir))
 
 from lib.logger import logger
-from lib.session_utils import session_dir, is_handsoff_enabled, write_issue_index
+from lib.session_utils import session_dir, is_handsoff_enabled, write_issue_index, write_session_state
 from lib.workflow import (
     detect_workflow,
     extract_issue_no,
@@ -64,13 +63,16 @@ def main():
 
         state['continuation_count'] = 0
 
+        # Let the server tail the transcript for progress milestones
+        transcript_path = hook_input.get("transcript_path")
+        if transcript_path:
+            state['transcript_path'] = transcript_path
+
         # Create session directory using AGENTIZE_HOME fallback
         sess_dir = session_dir(makedirs=True)
 
-        session_file = os.path.join(sess_dir, f'{session_id}.json')
-        with open(session_file, 'w') as f:
-            logger(session_id, f"Writing state: {state}")
-            json.dump(state, f)
+        logger(session_id, f"Writing state: {state}")
+        write_session_state(session_id, state, sess_dir)
 
         # Create issue index file if issue_no is present
         if issue_no is not None:
@@ -3,10 +3,22 @@
 Provides shared session directory path resolution, handsoff mode checks,
 AGENTIZE_HOME resolution, and issue index file management used across
 multiple hook and library files.
+
+Session state and issue index writes go through a directory-wide advisory
+lock and an atomic rename, so readers (the server's session index) never see
+a torn JSON file and concurrent read-modify-write updates do not lose fields.
 """
 
 import json
 import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX platforms: writes stay atomic but unlocked
+    fcntl = None
+
+SESSION_LOCK_FILE = '.lock'
 
 
 def get_agentize_home() -> str:
@@ -70,13 +82,98 @@ def write_issue_index(
     os.makedirs(by_issue_dir, exist_ok=True)
 
     issue_index_file = os.path.join(by_issue_dir, f'{issue_no}.json')
-    with open(issue_index_file, 'w') as f:
-        index_data = {'session_id': session_id, 'workflow': workflow}
-        json.dump(index_data, f)
+    with session_lock(sess_dir):
+        _atomic_write_json(issue_index_file, {'session_id': session_id, 'workflow': workflow})
 
     return issue_index_file
 
 
+@contextmanager
+def session_lock(sess_dir: str):
+    """Hold the session directory's exclusive advisory lock.
+
+    Args:
+        sess_dir: Session directory path (created if missing).
+    """
+    os.makedirs(sess_dir, exist_ok=True)
+    with open(os.path.join(sess_dir, SESSION_LOCK_FILE), 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _atomic_write_json(path: str, data) -> None:
+    """Write JSON to a sibling temp file, then rename it over path."""
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f'.{name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_session_state(session_id: str, state: dict, sess_dir=None) -> str:
+    """Atomically replace a session state file under the session lock.
+
+    Args:
+        session_id: The session ID.
+        state: Full session state to write.
+        sess_dir: Optional session directory path. If None, uses session_dir(makedirs=True).
+
+    Returns:
+        The path to the session state file.
+    """
+    if sess_dir is None:
+        sess_dir = session_dir(makedirs=True)
+
+    session_file = os.path.join(sess_dir, f'{session_id}.json')
+    with session_lock(sess_dir):
+        _atomic_write_json(session_file, state)
+    return session_file
+
+
+def update_session_state(session_id: str, updates: dict, sess_dir=None):
+    """Merge fields into an existing session state file (locked read-modify-write).
+
+    Fields written concurrently by other writers (e.g., ``state: done`` or
+    ``pr_number``) are preserved because the file is re-read under the lock.
+
+    Args:
+        session_id: The session ID.
+        updates: Fields to set on the stored state.
+        sess_dir: Optional session directory path. If None, uses session_dir().
+
+    Returns:
+        The updated state dict, or None if the session file is missing or unreadable.
+    """
+    if sess_dir is None:
+        sess_dir = session_dir()
+
+    session_file = os.path.join(sess_dir, f'{session_id}.json')
+    if not os.path.exists(session_file):
+        return None
+
+    with session_lock(sess_dir):
+        try:
+            with open(session_file) as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        state.update(updates)
+        _atomic_write_json(session_file, state)
+    return state
+
+
 def session_dir(makedirs: bool = False) -> str:
     """Get session directory path using AGENTIZE_HOME fallback.
 
@@ -15,6 +15,8 @@ Supported workflows:
 Self-contained design:
 - Uses `get_agentize_home()` from `session_utils.py` for AGENTIZE_HOME resolution
 - Provides `_run_acw()` helper that invokes `acw` by sourcing `src/cli/acw.sh`
+- Runs `acw` under the shared provider limits (`acw.limits`) through a
+  `python -m` subprocess when the agentize package is installed
 - No imports from `agentize.shell` or dependency on `setup.sh`
 - Maintains plugin standalone capability for handsoff supervisor workflows
 """
@@ -22,6 +24,7 @@ Self-contained design:
 import re
 import os
 import subprocess
+import sys
 import json
 import tempfile
 from typing import Optional
@@ -185,9 +188,17 @@ def _run_acw(provider: str, model: str, input_file: str, output_file: str,
     # Set up environment with AGENTIZE_HOME
     env = os.environ.copy()
     env['AGENTIZE_HOME'] = agentize_home
+    cmd = ['bash', '-c', bash_cmd]
+
+    # Take a provider slot shared with the agentize workflows (acw.limits);
+    # a subprocess keeps this module free of agentize imports
+    python_dir = os.path.join(agentize_home, 'python')
+    if os.path.isfile(os.path.join(python_dir, 'agentize', 'workflow', 'api', 'limiter.py')):
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [python_dir, env.get('PYTHONPATH')]))
+        cmd = [sys.executable, '-m', 'agentize.workflow.api.limiter', 'run', provider, model, '--'] + cmd
 
     return subprocess.run(
-        ['bash', '-c', bash_cmd],
+        cmd,
         env=env,
         capture_output=True,
         text=True,
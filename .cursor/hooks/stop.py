@@ -19,7 +19,7 @@ if str(hooks_dir) not in sys.path:
     sys.path.insert(0, str(hooks_dir))
 
 from lib.logger import logger
-from lib.session_utils import session_dir
+from lib.session_utils import session_dir, update_session_state
 from lib.workflow import get_continuation_prompt
 
 
@@ -103,9 +103,8 @@ def main():
         )
 
         if prompt:
-            with open(fname, 'w') as f:
-                logger(session_id, f"Updating state for continuation: {state}")
-                json.dump(state, f)
+            logger(session_id, f"Updating state for continuation: {state}")
+            update_session_state(session_id, {'continuation_count': state['continuation_count']}, sess_dir)
             # NOTE: `dumps` is REQUIRED or Cursor will just ignore your output!
             print(json.dumps({
                 'decision': 'block',
@@ -0,0 +1,2 @@
+#!/usr/bin/env bash
+echo "Content from editor" > "$1"
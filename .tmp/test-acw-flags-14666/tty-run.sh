@@ -0,0 +1,3 @@
+#!/usr/bin/env bash
+source "/root/package/src/cli/acw.sh"
+acw --chat --editor --stdout claude test-model
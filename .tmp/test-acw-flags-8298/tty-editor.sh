@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+cat > "$1" << 'EOF'
+TTY prompt content
+EOF
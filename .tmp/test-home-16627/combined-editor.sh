@@ -0,0 +1,2 @@
+#!/usr/bin/env bash
+echo "Editor refinement focus" > "$1"
@@ -0,0 +1,259 @@
+"""
+Local advisory work claims keyed by issue.
+
+A claim is an exclusive, non-blocking `flock` on
+`<git-common-dir>/agentize-claims/issue-<N>.lock`, shared by every worktree
+of a clone. The server's spawns, `wt spawn`, `wt rebase` and `lol impl` all
+claim the issue before an agent starts, so a second agent for the same issue
+is rejected at once instead of after wasted agent minutes.
+
+`flock` locks belong to the open file description, so a claim taken before
+spawning a worker and inherited by it stays held until the worker (and every
+process that inherited the descriptor) exits, even after the spawner closes
+its own copy.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+
+CLAIMS_DIRNAME = "agentize-claims"
+
+# Exit status of `python -m agentize.claims acquire` when another process holds the claim
+EXIT_HELD = 3
+
+
+class ClaimHeldError(RuntimeError):
+    """Raised when another process holds the claim."""
+
+    def __init__(self, key: str, holder: Optional[dict]):
+        self.key = key
+        self.holder = holder
+        super().__init__(f"{key} is claimed by {format_holder(holder)}")
+
+
+def issue_claim_key(issue_no: int) -> str:
+    """Claim key for an issue (rebases and reviews claim the PR's issue)."""
+    return f"issue-{issue_no}"
+
+
+def resolve_claims_dir(cwd: Optional[str] = None) -> Path:
+    """Return the claims directory for the clone containing cwd.
+
+    Uses `AGENTIZE_CLAIMS_DIR` when set, else `<git-common-dir>/agentize-claims`,
+    falling back to `$AGENTIZE_HOME/.tmp/claims` outside a git repository.
+    """
+    override = os.getenv("AGENTIZE_CLAIMS_DIR")
+    if override:
+        return Path(override)
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--path-format=absolute", "--git-common-dir"],
+            capture_output=True,
+            text=True,
+            cwd=cwd,
+        )
+    except OSError:
+        result = None
+    if result is not None and result.returncode == 0 and result.stdout.strip():
+        return Path(result.stdout.strip()) / CLAIMS_DIRNAME
+    return Path(os.getenv("AGENTIZE_HOME", ".")) / ".tmp" / "claims"
+
+
+def format_holder(holder: Optional[dict]) -> str:
+    """Describe a claim holder, e.g. 'PID 4242 (lol impl 42) since 14:03:10'."""
+    if not holder or holder.get("pid") is None:
+        return "another process"
+    text = f"PID {holder['pid']}"
+    if holder.get("command"):
+        text += f" ({holder['command']})"
+    if holder.get("since"):
+        text += f" since {time.strftime('%H:%M:%S', time.localtime(holder['since']))}"
+    return text
+
+
+class WorkClaim:
+    """An exclusive advisory claim on a work key.
+
+    Use as a context manager (raises ClaimHeldError when taken), or call
+    acquire()/release(). hand_off() closes this process's descriptor while a
+    child that inherited it keeps the claim.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        command: str = "",
+        claims_dir: Optional[Path] = None,
+        fd: Optional[int] = None,
+    ):
+        self.key = key
+        self.command = command
+        self._claims_dir = Path(claims_dir) if claims_dir is not None else None
+        self._fd = fd
+
+    @property
+    def claims_dir(self) -> Path:
+        if self._claims_dir is None:
+            self._claims_dir = resolve_claims_dir()
+        return self._claims_dir
+
+    @property
+    def path(self) -> Path:
+        return self.claims_dir / f"{self.key}.lock"
+
+    def fileno(self) -> Optional[int]:
+        """Descriptor holding the claim (pass it to children that keep the claim)."""
+        return self._fd
+
+    def acquire(self, command: Optional[str] = None) -> bool:
+        """Take the claim without blocking. False if another process holds it.
+
+        `command` (default: the one given at construction) is recorded with
+        this process's PID as the holder.
+        """
+        if self._fd is None:
+            self.claims_dir.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._fd)
+            self._fd = None
+            return False
+        command = self.command if command is None else command
+        self._write_holder({"pid": os.getpid(), "command": command, "since": time.time()})
+        return True
+
+    def record_holder(self, pid: int) -> None:
+        """Record the process now doing the work (e.g., the spawned worker's PID)."""
+        holder = self.holder() or {"since": time.time()}
+        holder["pid"] = pid
+        self._write_holder(holder)
+
+    def _write_holder(self, holder: dict) -> None:
+        if self._fd is None:
+            return
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, json.dumps(holder).encode(), 0)
+
+    def holder(self) -> Optional[dict]:
+        """Holder recorded in the lock file (meaningful only while the claim is held)."""
+        if self._fd is None:
+            return read_claim_holder(self.key, self.claims_dir)
+        try:
+            return _parse_holder(os.pread(self._fd, 4096, 0).decode(errors="replace"))
+        except OSError:
+            return None
+
+    def release(self) -> None:
+        """Drop the claim for every process sharing the descriptor."""
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def hand_off(self) -> None:
+        """Close this process's descriptor; children that inherited it keep the claim."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "WorkClaim":
+        if not self.acquire():
+            raise ClaimHeldError(self.key, self.holder())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def read_claim_holder(key: str, claims_dir: Optional[Path] = None) -> Optional[dict]:
+    """Read the holder recorded for a claim (None when absent or unreadable)."""
+    path = (Path(claims_dir) if claims_dir is not None else resolve_claims_dir()) / f"{key}.lock"
+    try:
+        return _parse_holder(path.read_text())
+    except OSError:
+        return None
+
+
+def _parse_holder(text: str) -> Optional[dict]:
+    try:
+        data = json.loads(text or "null")
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def claimed_by(key: str, claims_dir: Optional[Path] = None) -> Optional[dict]:
+    """Return the holder if another process holds the claim, else None.
+
+    A probe only: the claim is released again right away, so callers that go
+    on to spawn must still take the claim for real.
+    """
+    claim = WorkClaim(key, claims_dir=claims_dir)
+    try:
+        if claim.acquire():
+            claim.release()
+            return None
+    except OSError:
+        return None
+    return claim.holder() or {}
+
+
+def main(argv=None):
+    """
+    CLI entrypoint used by the `wt` shell functions.
+
+    `acquire --fd N` locks a descriptor the calling shell opened on the lock
+    file, so the claim lives as long as the shell and the processes it
+    spawns keep that descriptor open. `note --fd N --pid P` records the
+    spawned worker as the holder.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    import argparse
+    import sys
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(prog="claims", description="Local advisory work claims")
+    sub = parser.add_subparsers(dest="action", required=True)
+    acquire = sub.add_parser("acquire", help="Claim a key on an inherited descriptor")
+    acquire.add_argument("key")
+    acquire.add_argument("--fd", type=int, required=True)
+    acquire.add_argument("--command", default="")
+    note = sub.add_parser("note", help="Record the holder PID of a claimed descriptor")
+    note.add_argument("key")
+    note.add_argument("--fd", type=int, required=True)
+    note.add_argument("--pid", type=int, required=True)
+
+    args = parser.parse_args(argv)
+
+    claim = WorkClaim(args.key, command=getattr(args, "command", ""), fd=args.fd)
+    if args.action == "note":
+        claim.record_holder(args.pid)
+        return
+
+    try:
+        fcntl.flock(args.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print(f"Error: {args.key} is claimed by {format_holder(claim.holder())}", file=sys.stderr)
+        sys.exit(EXIT_HELD)
+    claim._write_holder({"pid": os.getppid(), "command": claim.command, "since": time.time()})
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ import sys
 from agentize.shell import get_agentize_home, run_shell_function
 from agentize.workflow import ImplError, SimpError, run_impl_workflow, run_simp_workflow
 from agentize.usage import count_usage, format_output
+from agentize.tmp_gc import format_report, run_gc
+from agentize.trace import find_trace_files, format_summary, load_trace, select_runs, summarize
 
 
 def run_shell_command(cmd: str, agentize_home: str) -> int:
@@ -117,6 +119,21 @@ def handle_usage(args: argparse.Namespace) -> int:
     return 0
 
 
+def handle_gc(args: argparse.Namespace) -> int:
+    """Handle gc command."""
+    dry_run = getattr(args, "dry_run", False)
+    report = run_gc(dry_run=dry_run)
+    print(format_report(report, dry_run=dry_run))
+    return 0
+
+
+def handle_trace(args: argparse.Namespace) -> int:
+    """Handle trace command."""
+    records = select_runs(load_trace(find_trace_files()), run=args.run, last=args.last)
+    print(format_summary(summarize(records)))
+    return 0
+
+
 def main() -> int:
     """Main entry point."""
     try:
@@ -181,6 +198,25 @@ def main() -> int:
         "--cost", action="store_true", help="Show estimated USD cost column"
     )
 
+    # gc command
+    gc_parser = subparsers.add_parser(
+        "gc", help="Remove expired .tmp artifacts"
+    )
+    gc_parser.add_argument(
+        "--dry-run", action="store_true", help="Report what would be removed without deleting"
+    )
+
+    # trace command
+    trace_parser = subparsers.add_parser(
+        "trace", help="Summarize workflow stage time, tokens and cost"
+    )
+    trace_parser.add_argument(
+        "--run", metavar="PREFIX", help="Only include runs with this session prefix"
+    )
+    trace_parser.add_argument(
+        "--last", type=int, metavar="N", help="Only include the N most recent runs"
+    )
+
     # plan command
     plan_parser = subparsers.add_parser(
         "plan", help="Run multi-agent debate pipeline"
@@ -259,6 +295,10 @@ def main() -> int:
         return handle_serve(args, agentize_home)
     elif args.command == "usage":
         return handle_usage(args)
+    elif args.command == "gc":
+        return handle_gc(args)
+    elif args.command == "trace":
+        return handle_trace(args)
     elif args.command == "plan":
         return handle_plan(args, agentize_home)
     elif args.command == "claude-clean":
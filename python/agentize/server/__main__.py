@@ -6,9 +6,11 @@ Polls GitHub Projects v2 for issues with "Plan Accepted" status and
 """
 
 import os
-import signal
 import sys
 import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
 
 # Re-export all public functions from submodules for backward compatibility
 # (tests import from agentize.server.__main__)
@@ -20,6 +22,8 @@ from agentize.server.notify import (
     _extract_repo_slug,
     _format_worker_assignment_message,
     _format_worker_completion_message,
+    _format_worker_progress_message,
+    _format_eta,
     TELEGRAM_API_TIMEOUT_SEC,
 )
 from agentize.server.session import (
@@ -29,6 +33,8 @@ from agentize.server.session import (
     _get_session_state_for_issue,
     _remove_issue_index,
     set_pr_number_for_issue,
+    SessionIndex,
+    get_session_index,
 )
 from agentize.server.github import (
     load_config,
@@ -41,6 +47,7 @@ from agentize.server.github import (
     filter_ready_refinements,
     discover_candidate_prs,
     filter_conflicting_prs,
+    query_pr,
     resolve_issue_from_pr,
     discover_candidate_feat_requests,
     query_feat_request_items,
@@ -53,10 +60,15 @@ from agentize.server.github import (
 from agentize.server.workers import (
     worktree_exists,
     spawn_worktree,
+    resume_worktree,
+    mark_preempted,
+    is_preempted,
+    clear_preempted,
     spawn_refinement,
     spawn_feat_request,
     spawn_review_resolution,
     rebase_worktree,
+    reset_issue_status,
     init_worker_status_files,
     read_worker_status,
     write_worker_status,
@@ -69,7 +81,70 @@ from agentize.server.workers import (
     _cleanup_review_resolution,
     DEFAULT_WORKERS_DIR,
 )
+from agentize.server.spawn_logs import (
+    new_spawn_log,
+    record_spawn_log,
+    finish_spawn_logs_for_pid,
+    find_spawn_logs,
+    enforce_log_retention,
+    tail_log,
+    follow_log,
+)
+from agentize.server.leases import (
+    Lease,
+    LeaseError,
+    LeaseStore,
+    SQLiteLeaseStore,
+    HTTPLeaseStore,
+    LeaseKeeper,
+    create_lease_keeper,
+    make_lease_server,
+)
+from agentize.server.lifecycle import (
+    ServerLifecycle,
+    MODE_RUNNING,
+    MODE_DRAINING,
+    MODE_STOPPING,
+    MODE_RESTARTING,
+    write_server_registry,
+    read_server_registry,
+    claim_server_registry,
+    clear_server_registry,
+    registry_slots,
+    busy_workers,
+    exec_restart,
+)
+from agentize.server.progress import (
+    ProgressEvent,
+    WorkerProgress,
+    ProgressTracker,
+    extract_log_milestones,
+    extract_transcript_milestones,
+    read_worker_progress,
+)
+from agentize.server.health import (
+    HealthPolicy,
+    WorkerHealth,
+    WorkerHealthMonitor,
+    DEFAULT_TASK_BUDGETS,
+    REQUEUE_STATUS,
+)
+from agentize.server.history import (
+    TaskHistory,
+    TaskRecord,
+    transcript_usage,
+    DEFAULT_HISTORY_PATH,
+)
+from agentize.server.recheck import (
+    MergeableRecheckQueue,
+    DEFAULT_RECHECK_DELAYS,
+)
 from agentize.server.runtime_config import load_runtime_config, resolve_precedence
+from agentize.tmp_gc import run_gc
+
+# Spawn log retention defaults (overridable via server.logs in .agentize.local.yaml)
+DEFAULT_LOG_MAX_SIZE_MB = 512
+DEFAULT_LOG_MAX_AGE_DAYS = 14
 
 
 def _resolve_tg_credentials() -> tuple[str, str]:
@@ -93,71 +168,626 @@ def _resolve_tg_credentials() -> tuple[str, str]:
     return cfg_token, cfg_chat_id
 
 
+def _resolve_log_retention() -> tuple[Optional[int], Optional[float], bool]:
+    """Resolve spawn log retention settings from YAML only.
+
+    Reads server.logs.max_size_mb, server.logs.max_age_days and
+    server.logs.compress. A value of 0 disables the corresponding limit.
+
+    Returns:
+        Tuple of (max_total_bytes, max_age_sec, compress)
+    """
+    config, _ = load_runtime_config()
+    server = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
+    logs = server.get("logs", {}) if isinstance(server.get("logs"), dict) else {}
+
+    max_size_mb = resolve_precedence(None, None, logs.get("max_size_mb"), DEFAULT_LOG_MAX_SIZE_MB)
+    max_age_days = resolve_precedence(None, None, logs.get("max_age_days"), DEFAULT_LOG_MAX_AGE_DAYS)
+    compress = bool(resolve_precedence(None, None, logs.get("compress"), True))
+
+    max_total_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+    max_age_sec = float(max_age_days) * 86400 if max_age_days else None
+    return max_total_bytes, max_age_sec, compress
+
+
+def _resolve_gc_interval() -> int:
+    """Resolve the .tmp garbage collection interval (gc.interval) from YAML only.
+
+    Returns:
+        Interval in seconds (default: 60m). 0 disables periodic collection.
+    """
+    config, _ = load_runtime_config()
+    gc_config = config.get("gc", {}) if isinstance(config.get("gc"), dict) else {}
+    interval = resolve_precedence(None, None, gc_config.get("interval"), "60m")
+    try:
+        return parse_period(str(interval))
+    except ValueError as e:
+        _log(f"Ignoring gc.interval: {e}", level="WARNING")
+        return parse_period("60m")
+
+
+def _run_periodic_gc() -> None:
+    """Run one .tmp garbage collection pass and log the bytes reclaimed."""
+    try:
+        report = run_gc()
+    except (OSError, ValueError) as e:
+        _log(f"Garbage collection failed: {e}", level="WARNING")
+        return
+    files = sum(stats["files"] for stats in report.values())
+    reclaimed = sum(stats["bytes"] for stats in report.values())
+    if files:
+        _log(f"Garbage collection reclaimed {reclaimed} bytes in {files} files")
+
+
+def _resolve_progress_settings() -> tuple[int, int]:
+    """Resolve worker progress streaming (server.progress) from YAML only.
+
+    Returns:
+        Tuple of (interval_seconds, throttle_seconds). Interval 0 disables streaming.
+        Defaults: 15s interval, 5m throttle.
+    """
+    config, _ = load_runtime_config()
+    server = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
+    progress = server.get("progress", {}) if isinstance(server.get("progress"), dict) else {}
+    interval = resolve_precedence(None, None, progress.get("interval"), "15s")
+    throttle = resolve_precedence(None, None, progress.get("throttle"), "5m")
+    try:
+        return parse_period(str(interval)), parse_period(str(throttle))
+    except ValueError as e:
+        _log(f"Ignoring server.progress: {e}", level="WARNING")
+        return parse_period("15s"), parse_period("5m")
+
+
+def _resolve_health_policy() -> Optional[HealthPolicy]:
+    """Resolve stuck-worker detection (server.health) from YAML only.
+
+    Returns:
+        HealthPolicy, or None when server.health.enabled is false.
+        Defaults: 30m inactivity window and DEFAULT_TASK_BUDGETS.
+    """
+    config, _ = load_runtime_config()
+    server = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
+    health = server.get("health", {}) if isinstance(server.get("health"), dict) else {}
+    if health.get("enabled") is False:
+        return None
+
+    policy = HealthPolicy()
+    try:
+        inactivity = health.get("inactivity")
+        if inactivity is not None:
+            policy.inactivity_sec = parse_period(str(inactivity))
+        budgets = health.get("budgets", {}) if isinstance(health.get("budgets"), dict) else {}
+        for task, budget in budgets.items():
+            policy.budgets[str(task)] = parse_period(str(budget))
+    except ValueError as e:
+        _log(f"Ignoring server.health: {e}", level="WARNING")
+        return HealthPolicy()
+    return policy
+
+
+def _resolve_task_history() -> Optional[TaskHistory]:
+    """Resolve the task duration history (server.history) from YAML only.
+
+    Returns:
+        TaskHistory at server.history.path (default: .tmp/workers/history.sqlite),
+        or None when server.history.enabled is false
+    """
+    config, _ = load_runtime_config()
+    server = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
+    history = server.get("history", {}) if isinstance(server.get("history"), dict) else {}
+    if history.get("enabled") is False:
+        return None
+    path = resolve_precedence(None, None, history.get("path"), DEFAULT_HISTORY_PATH)
+    return TaskHistory(str(path))
+
+
+def _issue_labels(items: list[dict]) -> dict[int, list[str]]:
+    """Map issue number to label names for project items."""
+    labels = {}
+    for item in items:
+        content = item.get('content')
+        if content and 'number' in content:
+            nodes = (content.get('labels') or {}).get('nodes') or []
+            labels[content['number']] = [node['name'] for node in nodes if node.get('name')]
+    return labels
+
+
+def _shortest_first(history: Optional[TaskHistory], task: str, items: list, labels_of: Callable) -> list:
+    """Order candidates shortest-expected-job-first (unchanged without history)."""
+    if history is None or len(items) < 2:
+        return list(items)
+    return history.order_shortest_first(task, items, labels_of)
+
+
+def _record_task_start(
+    history: Optional[TaskHistory],
+    task: str,
+    issue_no: int,
+    pid: Optional[int],
+    *,
+    pr_no: Optional[int] = None,
+    labels: list[str] = ()
+) -> Optional[float]:
+    """Record a spawned task in the history; returns its expected duration in seconds."""
+    if history is None:
+        return None
+    history.record_start(task, issue_no=issue_no, pr_no=pr_no, pid=pid, labels=labels)
+    return history.estimate(task, labels=labels)
+
+
+def _eta_suffix(eta: Optional[float]) -> str:
+    """' (ETA ~45m)' for notification messages, or '' without an estimate."""
+    return f" (ETA {_format_eta(eta)})" if eta is not None else ""
+
+
+def _claim_issue_lease(leases: Optional[LeaseKeeper], issue_no: int) -> bool:
+    """Claim the cross-host lease for an issue before spawning (always True without leasing)."""
+    if leases is None:
+        return True
+    if leases.claim(leases.issue_key(issue_no)):
+        return True
+    print(f"Issue #{issue_no}: leased by another server, skipping")
+    return False
+
+
+def _settle_issue_lease(
+    leases: Optional[LeaseKeeper],
+    issue_no: int,
+    success: bool,
+    pid: Optional[int]
+) -> None:
+    """Bind a claimed lease to the spawned worker, or release it if the spawn failed."""
+    if leases is None:
+        return
+    key = leases.issue_key(issue_no)
+    if success:
+        leases.bind(key, pid)
+    else:
+        leases.release(key)
+
+
+def _resolve_lease_keeper(period: int, repo_slug: Optional[str]) -> Optional[LeaseKeeper]:
+    """Resolve the multi-host lease store from server.leases in YAML.
+
+    Issue keys are prefixed with repo_slug so servers for different
+    repositories can share one store.
+
+    Returns:
+        LeaseKeeper, or None when server.leases.backend is not configured
+    """
+    config, _ = load_runtime_config()
+    server = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
+    leases_config = server.get("leases", {}) if isinstance(server.get("leases"), dict) else {}
+    return create_lease_keeper(leases_config, period, namespace=repo_slug)
+
+
+def _resolve_server_settings() -> tuple[int, int]:
+    """Resolve server.period and server.num_workers from YAML only.
+
+    Returns:
+        Tuple of (period_seconds, num_workers)
+
+    Raises:
+        ValueError: If server.period is not a valid period
+    """
+    config, _ = load_runtime_config()
+    server_config = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
+
+    # Apply precedence: YAML > default (no CLI)
+    period = resolve_precedence(None, None, server_config.get("period"), "5m")
+    num_workers = resolve_precedence(None, None, server_config.get("num_workers"), 5)
+    return parse_period(period), int(num_workers)
+
+
+def _resolve_recheck_delays() -> tuple[int, ...]:
+    """Resolve server.recheck_delays (mergeable == UNKNOWN re-check schedule) from YAML only.
+
+    Returns:
+        Delays in seconds (default: 10s, 30s, 90s). An empty list disables re-checks.
+    """
+    config, _ = load_runtime_config()
+    server_config = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
+    delays = resolve_precedence(None, None, server_config.get("recheck_delays"), None)
+    if delays is None:
+        return DEFAULT_RECHECK_DELAYS
+    if not isinstance(delays, list):
+        _log("Ignoring server.recheck_delays: expected a list of periods", level="WARNING")
+        return DEFAULT_RECHECK_DELAYS
+    try:
+        return tuple(parse_period(str(delay)) for delay in delays)
+    except ValueError as e:
+        _log(f"Ignoring server.recheck_delays: {e}", level="WARNING")
+        return DEFAULT_RECHECK_DELAYS
+
+
+@dataclass
+class ServerDeps:
+    """What run_server() reads and starts outside its own loop.
+
+    The defaults are the real config resolvers, clock, lifecycle and
+    spawners. simulate.py passes fakes here instead of patching this module.
+    """
+
+    load_config: Callable[[], tuple[str, int, Optional[str]]] = load_config
+    resolve_server_settings: Callable[[], tuple[int, int]] = _resolve_server_settings
+    resolve_tg_credentials: Callable[[], tuple[str, str]] = _resolve_tg_credentials
+    resolve_session_dir: Callable[[], Path] = _resolve_session_dir
+    resolve_log_retention: Callable[[], tuple[Optional[int], Optional[float], bool]] = _resolve_log_retention
+    resolve_gc_interval: Callable[[], int] = _resolve_gc_interval
+    resolve_progress_settings: Callable[[], tuple[int, int]] = _resolve_progress_settings
+    resolve_health_policy: Callable[[], Optional[HealthPolicy]] = _resolve_health_policy
+    resolve_task_history: Callable[[], Optional[TaskHistory]] = _resolve_task_history
+    resolve_lease_keeper: Callable[[int, Optional[str]], Optional[LeaseKeeper]] = _resolve_lease_keeper
+    resolve_recheck_delays: Callable[[], tuple[int, ...]] = _resolve_recheck_delays
+    enforce_log_retention: Callable[..., None] = enforce_log_retention
+    run_gc: Callable[[], None] = _run_periodic_gc
+    monotonic: Callable[[], float] = time.monotonic
+    lifecycle: Callable[[], ServerLifecycle] = ServerLifecycle
+    is_alive: Callable[[int, str], bool] = check_worker_liveness
+    worktree_exists: Callable[[int], bool] = worktree_exists
+    spawn_worktree: Callable[[int], tuple[bool, Optional[int]]] = spawn_worktree
+    resume_worktree: Callable[[int], tuple[bool, Optional[int]]] = resume_worktree
+    spawn_refinement: Callable[[int], tuple[bool, Optional[int]]] = spawn_refinement
+    spawn_feat_request: Callable[[int], tuple[bool, Optional[int]]] = spawn_feat_request
+    rebase_worktree: Callable[[int, int], tuple[bool, Optional[int]]] = rebase_worktree
+    spawn_review_resolution: Callable[[int, int], tuple[bool, Optional[int]]] = spawn_review_resolution
+
+
+def _begin_spawn(lifecycle: ServerLifecycle, leases: Optional[LeaseKeeper], issue_no: int) -> bool:
+    """Gate a spawn: no new work while draining/stopping, then claim the issue lease."""
+    if not lifecycle.accepting_work:
+        return False
+    return _claim_issue_lease(leases, issue_no)
+
+
+def _spawn_impl(deps: ServerDeps, issue_no: int, resume: bool) -> tuple[bool, Optional[int]]:
+    """Spawn an impl run, resuming in the existing worktree when it was preempted."""
+    success, pid = deps.resume_worktree(issue_no) if resume else deps.spawn_worktree(issue_no)
+    if success:
+        clear_preempted(issue_no)
+    return success, pid
+
+
+def _adopt_workers(leases: Optional[LeaseKeeper], num_workers: int) -> None:
+    """Take over busy workers recorded in the registry (after restart or crash).
+
+    Re-binds their issue leases so the heartbeat keeps renewing them.
+    """
+    busy = busy_workers(registry_slots(num_workers))
+    if not busy:
+        return
+    print(f"Adopted {len(busy)} busy worker(s) from the registry")
+    if leases is None:
+        return
+    for _, status in busy:
+        issue_no, pid = status.get('issue'), status.get('pid')
+        if issue_no is None or pid is None:
+            continue
+        key = leases.issue_key(issue_no)
+        if leases.claim(key):
+            leases.bind(key, pid)
+
+
+def _release_idle_leases(leases: Optional[LeaseKeeper], num_workers: int) -> None:
+    """Release leases of PID-less spawns once cleanup has freed their worker slot."""
+    if leases is None:
+        return
+    busy = busy_workers(registry_slots(num_workers))
+    leases.release_unbound({leases.issue_key(status['issue']) for _, status in busy if status.get('issue') is not None})
+
+
+def _assign_rebases(
+    deps: ServerDeps,
+    pr_numbers: list[int],
+    prs: list[dict],
+    num_workers: int,
+    lifecycle: ServerLifecycle,
+    leases: Optional[LeaseKeeper],
+    token: str,
+    chat_id: str,
+    repo_slug: Optional[str],
+    history: Optional[TaskHistory] = None
+) -> None:
+    """Spawn rebase workers for conflicting PRs (from a full poll or a re-check)."""
+    for pr_no in pr_numbers:
+        # Resolve issue number for worker tracking
+        pr_metadata = next((p for p in prs if p.get('number') == pr_no), None)
+        if not pr_metadata:
+            continue
+
+        issue_no = resolve_issue_from_pr(pr_metadata)
+        if not issue_no:
+            _log(f"PR #{pr_no}: could not resolve issue number, skipping", level="WARNING")
+            continue
+
+        # Check if worktree already exists
+        if not deps.worktree_exists(issue_no):
+            _log(f"PR #{pr_no} (issue #{issue_no}): worktree does not exist, skipping rebase", level="WARNING")
+            continue
+
+        # Worker assignment and rebase (follows existing pattern)
+        if num_workers > 0:
+            worker_id = get_free_worker(num_workers)
+            if worker_id is None:
+                print(f"All {num_workers} workers busy, waiting for next poll")
+                return
+
+            if not _begin_spawn(lifecycle, leases, issue_no):
+                continue
+
+            write_worker_status(worker_id, 'BUSY', issue_no, None)
+            success, pid = deps.rebase_worktree(pr_no, issue_no)
+            _settle_issue_lease(leases, issue_no, success, pid)
+            if success:
+                write_worker_status(worker_id, 'BUSY', issue_no, pid)
+                print(f"PR #{pr_no} (issue #{issue_no}) rebase assigned to worker {worker_id}")
+                eta = _record_task_start(history, 'rebase', issue_no, pid, pr_no=pr_no)
+
+                if token and chat_id:
+                    pr_url = f"https://github.com/{repo_slug}/pull/{pr_no}" if repo_slug else None
+                    msg = f"🔄 PR rebase started: <a href=\"{pr_url}\">#{pr_no}</a> (issue #{issue_no})" if pr_url else f"🔄 PR rebase started: #{pr_no} (issue #{issue_no})"
+                    send_telegram_message(token, chat_id, msg + _eta_suffix(eta))
+            else:
+                write_worker_status(worker_id, 'FREE', None, None)
+                _log(f"Failed to rebase PR #{pr_no}", level="ERROR")
+        else:
+            # Unlimited workers mode
+            if not _begin_spawn(lifecycle, leases, issue_no):
+                continue
+            success, pid = deps.rebase_worktree(pr_no, issue_no)
+            _settle_issue_lease(leases, issue_no, success, pid)
+            if not success:
+                _log(f"Failed to rebase PR #{pr_no}", level="ERROR")
+
+
+def _recheck_unknown_prs(
+    recheck: MergeableRecheckQueue,
+    org: str,
+    project_id: int,
+    assign: Callable[[list[int], list[dict]], None],
+    clock: Callable[[], float] = time.monotonic
+) -> None:
+    """Re-query PRs due in the re-check queue and rebase those now CONFLICTING."""
+    due = recheck.due(clock())
+    if not due:
+        return
+    try:
+        owner, repo = get_repo_owner_name()
+        pr_project_id = lookup_project_graphql_id(org, project_id)
+    except RuntimeError as e:
+        _log(f"Failed to re-check PR mergeability: {e}", level="ERROR")
+        for pr_no in due:
+            recheck.record(pr_no, None, clock())
+        return
+
+    resolved = []
+    for pr_no in due:
+        pr = query_pr(owner, repo, pr_no)
+        mergeable = pr.get('mergeable') if pr and pr.get('state', 'OPEN') == 'OPEN' else None
+        recheck.record(pr_no, mergeable, clock())
+        if mergeable in ('CONFLICTING', 'MERGEABLE'):
+            resolved.append(pr)
+        if mergeable == 'UNKNOWN' and pr_no not in recheck:
+            print(f"PR #{pr_no}: mergeable still UNKNOWN, leaving it to the next poll")
+
+    conflicting = filter_conflicting_prs(resolved, owner, repo, pr_project_id)
+    if conflicting:
+        print(f"Re-check resolved conflicting PRs: {conflicting}")
+        assign(conflicting, resolved)
+
+
+def _wait_for_next_poll(
+    lifecycle: ServerLifecycle,
+    period: int,
+    recheck: MergeableRecheckQueue,
+    on_due: Callable[[], None],
+    clock: Callable[[], float] = time.monotonic
+) -> None:
+    """Wait out the poll period, waking early for due PR re-checks.
+
+    Returns as soon as a lifecycle signal changes the mode or requests a reload.
+    """
+    deadline = clock() + period
+    while True:
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return
+        until_due = recheck.seconds_until_due(clock())
+        lifecycle.wait(remaining if until_due is None else min(remaining, until_due))
+        if not lifecycle.accepting_work or lifecycle.reload_requested:
+            return
+        try:
+            on_due()
+        except Exception as e:
+            _log(f"Error during PR re-check: {e}", level="ERROR")
+
+
 def run_server(
     period: int,
-    num_workers: int = 5
+    num_workers: int = 5,
+    deps: Optional[ServerDeps] = None
 ) -> None:
     """Main polling loop.
 
     Args:
         period: Polling interval in seconds
         num_workers: Maximum concurrent workers (0 = unlimited)
+        deps: Config resolvers, clock, lifecycle and spawners (default: the real ones)
 
     Telegram credentials are loaded from .agentize.local.yaml only.
+    Lifecycle signals: SIGUSR1 drains, SIGHUP reloads settings, SIGUSR2
+    restarts in place (see lifecycle.py).
     """
-    org, project_id, remote_url = load_config()
-    print(f"Starting server: org={org}, project={project_id}, period={period}s, workers={num_workers}")
+    if deps is None:
+        deps = ServerDeps()
+    org, project_id, remote_url = deps.load_config()
+
+    # Take ownership of the worker registry; a live owner means a second server
+    handed_off = read_server_registry().get('pid') == os.getpid()
+    owner_pid = claim_server_registry()
+    if owner_pid is not None:
+        print(f"Error: server PID {owner_pid} already owns .tmp/workers "
+              f"(send SIGUSR2 to restart it or SIGUSR1 to drain it)", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Starting server: org={org}, project={project_id}, period={period}s, workers={num_workers}, pid={os.getpid()}")
 
     # Extract repo slug for issue links (computed once)
     repo_slug = _extract_repo_slug(remote_url) if remote_url else None
 
     # Resolve Telegram credentials (YAML only)
-    token, chat_id = _resolve_tg_credentials()
+    token, chat_id = deps.resolve_tg_credentials()
 
     # Resolve session directory for completion notifications
-    session_dir = _resolve_session_dir()
+    session_dir = deps.resolve_session_dir()
+
+    # Resolve spawn log retention (YAML only)
+    log_max_bytes, log_max_age, compress_logs = deps.resolve_log_retention()
+
+    # Resolve .tmp garbage collection interval (first pass runs on the first cycle)
+    gc_interval = deps.resolve_gc_interval()
+    next_gc_at = deps.monotonic()
 
-    # Initialize worker status files (if num_workers > 0)
+    # Resolve multi-host lease store (server.leases); heartbeat runs in a daemon thread
+    leases = deps.resolve_lease_keeper(period, repo_slug)
+    if leases is not None:
+        leases.start()
+        print(f"Leasing enabled: owner={leases.owner}, ttl={leases.ttl}s")
+
+    # Task durations, exit status and cost feed SJF ordering and ETAs (server.history)
+    history = deps.resolve_task_history()
+
+    # Initialize worker status files (if num_workers > 0); busy entries are kept
     if num_workers > 0:
         init_worker_status_files(num_workers)
+        _adopt_workers(leases, num_workers)
         cleanup_dead_workers(
-            num_workers,
+            registry_slots(num_workers),
             tg_token=token,
             tg_chat_id=chat_id,
             repo_slug=repo_slug,
-            session_dir=session_dir
+            session_dir=session_dir,
+            compress_logs=compress_logs,
+            history=history,
+            is_alive=deps.is_alive
+        )
+
+    # Stream worker progress milestones from logs and transcripts (daemon thread)
+    def publish_progress(event: ProgressEvent) -> None:
+        print(f"Worker {event.worker_id} (issue #{event.issue_no}) {event.kind}: {event.detail}")
+        if token and chat_id:
+            issue_url = f"https://github.com/{repo_slug}/issues/{event.issue_no}" if repo_slug and event.issue_no else None
+            msg = _format_worker_progress_message(event.issue_no, event.worker_id, event.kind, event.detail, issue_url)
+            send_telegram_message(token, chat_id, msg)
+
+    progress_interval, progress_throttle = deps.resolve_progress_settings()
+    progress = None
+    if progress_interval > 0 and num_workers > 0:
+        progress = ProgressTracker(
+            publish_progress, throttle_sec=progress_throttle, session_dir=session_dir, history=history
         )
+        progress.start(progress_interval)
+
+    # Flag idle workers and preempt workers over their task budget
+    def notify_health(message: str) -> None:
+        if token and chat_id:
+            send_telegram_message(token, chat_id, f"⏱️ {message}")
 
-    # Send startup notification if Telegram is configured
+    health_policy = deps.resolve_health_policy()
+    health = WorkerHealthMonitor(health_policy, notify_health) if health_policy is not None else None
+
+    # Send startup notification if Telegram is configured (not on restart hand-off)
     if token and chat_id:
-        notify_server_start(token, chat_id, org, project_id, period)
+        if not handed_off:
+            notify_server_start(token, chat_id, org, project_id, period)
     else:
         print("Telegram notification skipped (no credentials configured)")
 
-    # Setup signal handler for graceful shutdown
-    running = [True]
+    # Short-delay re-checks of PRs whose mergeable state is still UNKNOWN
+    recheck = MergeableRecheckQueue(deps.resolve_recheck_delays())
 
-    def signal_handler(signum, frame):
-        print("\nShutting down...")
-        running[0] = False
+    def recheck_due_prs() -> None:
+        _recheck_unknown_prs(
+            recheck, org, project_id,
+            lambda pr_numbers, prs: _assign_rebases(
+                deps, pr_numbers, prs, num_workers, lifecycle, leases, token, chat_id, repo_slug, history
+            ),
+            deps.monotonic
+        )
 
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Signals switch lifecycle modes: stop, drain, reload, restart
+    lifecycle = deps.lifecycle()
+    lifecycle.install_signal_handlers()
 
-    while running[0]:
+    while not lifecycle.should_exit:
         try:
-            # Clean up dead workers before polling
-            if num_workers > 0:
+            # Reload settings and credentials in place (SIGHUP)
+            if lifecycle.take_reload():
+                try:
+                    period, num_workers = deps.resolve_server_settings()
+                except ValueError as e:
+                    _log(f"Reload failed, keeping current settings: {e}", level="ERROR")
+                else:
+                    token, chat_id = deps.resolve_tg_credentials()
+                    log_max_bytes, log_max_age, compress_logs = deps.resolve_log_retention()
+                    gc_interval = deps.resolve_gc_interval()
+                    recheck.delays = deps.resolve_recheck_delays()
+                    history = deps.resolve_task_history()
+                    if progress is not None:
+                        progress.throttle_sec = deps.resolve_progress_settings()[1]
+                        progress.history = history
+                    health_policy = deps.resolve_health_policy()
+                    if health_policy is None:
+                        health = None
+                    elif health is None:
+                        health = WorkerHealthMonitor(health_policy, notify_health)
+                    else:
+                        health.policy = health_policy
+                    if num_workers > 0:
+                        init_worker_status_files(num_workers)
+                    print(f"Reloaded settings: period={period}s, workers={num_workers}")
+
+            # Preempt stuck workers, then clean up dead workers before polling
+            # (including slots above a reduced num_workers)
+            slots = registry_slots(num_workers)
+            if health is not None and slots > 0:
+                health.check(slots)
+            if slots > 0:
                 cleanup_dead_workers(
-                    num_workers,
+                    slots,
                     tg_token=token,
                     tg_chat_id=chat_id,
                     repo_slug=repo_slug,
-                    session_dir=session_dir
+                    session_dir=session_dir,
+                    compress_logs=compress_logs,
+                    history=history,
+                    is_alive=deps.is_alive
                 )
+            _release_idle_leases(leases, num_workers)
+
+            # Draining: no discovery or assignment; exit once every worker is idle
+            if lifecycle.mode == MODE_DRAINING:
+                busy = busy_workers(registry_slots(num_workers))
+                if not busy:
+                    print("Drain complete: no busy workers, exiting")
+                    break
+                print(f"Draining: waiting for {len(busy)} busy worker(s)")
+                lifecycle.wait(period)
+                continue
+
+            # Rotate spawn logs (never touches logs of live workers)
+            deps.enforce_log_retention(max_total_bytes=log_max_bytes, max_age_sec=log_max_age)
+
+            # Collect expired .tmp artifacts (never touches live sessions/workers)
+            if gc_interval and deps.monotonic() >= next_gc_at:
+                deps.run_gc()
+                next_gc_at = deps.monotonic() + gc_interval
 
             items = query_project_items(org, project_id)
-            ready_issues = filter_ready_issues(items)
+            issue_labels = _issue_labels(items)
+            ready_issues = _shortest_first(
+                history, 'issue', filter_ready_issues(items), lambda n: issue_labels.get(n, [])
+            )
 
             # Build issue titles map (without changing filter_ready_issues return type)
             issue_titles: dict[int, str] = {}
@@ -167,7 +797,9 @@ def run_server(
                     issue_titles[content['number']] = content.get('title', '')
 
             for issue_no in ready_issues:
-                if worktree_exists(issue_no):
+                # A preempted impl run is resumed in its worktree; any other existing worktree is skipped
+                resume = deps.worktree_exists(issue_no)
+                if resume and not is_preempted(issue_no):
                     print(f"Issue #{issue_no}: worktree already exists, skipping")
                     continue
 
@@ -179,29 +811,39 @@ def run_server(
                         break
 
                     # Mark worker as busy before spawning
+                    if not _begin_spawn(lifecycle, leases, issue_no):
+                        continue
+
                     write_worker_status(worker_id, 'BUSY', issue_no, None)
-                    success, pid = spawn_worktree(issue_no)
+                    success, pid = _spawn_impl(deps, issue_no, resume)
+                    _settle_issue_lease(leases, issue_no, success, pid)
                     if success:
                         write_worker_status(worker_id, 'BUSY', issue_no, pid)
                         print(f"issue #{issue_no} is assigned to worker {worker_id}")
+                        eta = _record_task_start(history, 'issue', issue_no, pid, labels=issue_labels.get(issue_no, []))
 
                         # Send Telegram notification if configured
                         if token and chat_id:
                             issue_title = issue_titles.get(issue_no, '')
                             issue_url = f"https://github.com/{repo_slug}/issues/{issue_no}" if repo_slug else None
-                            msg = _format_worker_assignment_message(issue_no, issue_title, worker_id, issue_url)
+                            msg = _format_worker_assignment_message(issue_no, issue_title, worker_id, issue_url, eta)
                             send_telegram_message(token, chat_id, msg)
                     else:
                         write_worker_status(worker_id, 'FREE', None, None)
                         _log(f"Failed to spawn worktree for issue #{issue_no}", level="ERROR")
                 else:
                     # Unlimited workers mode
-                    success, _ = spawn_worktree(issue_no)
+                    if not _begin_spawn(lifecycle, leases, issue_no):
+                        continue
+                    success, pid = _spawn_impl(deps, issue_no, resume)
+                    _settle_issue_lease(leases, issue_no, success, pid)
                     if not success:
                         _log(f"Failed to spawn worktree for issue #{issue_no}", level="ERROR")
 
             # Process refinement candidates
-            ready_refinements = filter_ready_refinements(items)
+            ready_refinements = _shortest_first(
+                history, 'refine', filter_ready_refinements(items), lambda n: issue_labels.get(n, [])
+            )
             for issue_no in ready_refinements:
                 # Check worker availability (if bounded)
                 if num_workers > 0:
@@ -211,30 +853,42 @@ def run_server(
                         break
 
                     # Mark worker as busy before spawning
+                    if not _begin_spawn(lifecycle, leases, issue_no):
+                        continue
+
                     write_worker_status(worker_id, 'BUSY', issue_no, None)
-                    success, pid = spawn_refinement(issue_no)
+                    success, pid = deps.spawn_refinement(issue_no)
+                    _settle_issue_lease(leases, issue_no, success, pid)
                     if success:
                         write_worker_status(worker_id, 'BUSY', issue_no, pid)
                         print(f"issue #{issue_no} refinement assigned to worker {worker_id}")
+                        eta = _record_task_start(history, 'refine', issue_no, pid, labels=issue_labels.get(issue_no, []))
 
                         # Send Telegram notification if configured
                         if token and chat_id:
                             issue_title = issue_titles.get(issue_no, '')
                             issue_url = f"https://github.com/{repo_slug}/issues/{issue_no}" if repo_slug else None
                             msg = f"🔄 Refinement started: <a href=\"{issue_url}\">#{issue_no}</a> {issue_title}" if issue_url else f"🔄 Refinement started: #{issue_no} {issue_title}"
-                            send_telegram_message(token, chat_id, msg)
+                            send_telegram_message(token, chat_id, msg + _eta_suffix(eta))
                     else:
                         write_worker_status(worker_id, 'FREE', None, None)
                         _log(f"Failed to spawn refinement for issue #{issue_no}", level="ERROR")
                 else:
                     # Unlimited workers mode
-                    success, _ = spawn_refinement(issue_no)
+                    if not _begin_spawn(lifecycle, leases, issue_no):
+                        continue
+                    success, pid = deps.spawn_refinement(issue_no)
+                    _settle_issue_lease(leases, issue_no, success, pid)
                     if not success:
                         _log(f"Failed to spawn refinement for issue #{issue_no}", level="ERROR")
 
             # Process feat-request candidates
             feat_request_items = query_feat_request_items(org, project_id)
-            ready_feat_requests = filter_ready_feat_requests(feat_request_items)
+            feat_request_labels = _issue_labels(feat_request_items)
+            ready_feat_requests = _shortest_first(
+                history, 'feat-request', filter_ready_feat_requests(feat_request_items),
+                lambda n: feat_request_labels.get(n, [])
+            )
             for issue_no in ready_feat_requests:
                 # Check worker availability (if bounded)
                 if num_workers > 0:
@@ -244,23 +898,33 @@ def run_server(
                         break
 
                     # Mark worker as busy before spawning
+                    if not _begin_spawn(lifecycle, leases, issue_no):
+                        continue
+
                     write_worker_status(worker_id, 'BUSY', issue_no, None)
-                    success, pid = spawn_feat_request(issue_no)
+                    success, pid = deps.spawn_feat_request(issue_no)
+                    _settle_issue_lease(leases, issue_no, success, pid)
                     if success:
                         write_worker_status(worker_id, 'BUSY', issue_no, pid)
                         print(f"issue #{issue_no} dev-req planning assigned to worker {worker_id}")
+                        eta = _record_task_start(
+                            history, 'feat-request', issue_no, pid, labels=feat_request_labels.get(issue_no, [])
+                        )
 
                         # Send Telegram notification if configured
                         if token and chat_id:
                             issue_url = f"https://github.com/{repo_slug}/issues/{issue_no}" if repo_slug else None
                             msg = f"📝 Dev-req planning started: <a href=\"{issue_url}\">#{issue_no}</a>" if issue_url else f"📝 Dev-req planning started: #{issue_no}"
-                            send_telegram_message(token, chat_id, msg)
+                            send_telegram_message(token, chat_id, msg + _eta_suffix(eta))
                     else:
                         write_worker_status(worker_id, 'FREE', None, None)
                         _log(f"Failed to spawn dev-req planning for issue #{issue_no}", level="ERROR")
                 else:
                     # Unlimited workers mode
-                    success, _ = spawn_feat_request(issue_no)
+                    if not _begin_spawn(lifecycle, leases, issue_no):
+                        continue
+                    success, pid = deps.spawn_feat_request(issue_no)
+                    _settle_issue_lease(leases, issue_no, success, pid)
                     if not success:
                         _log(f"Failed to spawn dev-req planning for issue #{issue_no}", level="ERROR")
 
@@ -271,47 +935,11 @@ def run_server(
                 candidate_prs = discover_candidate_prs(owner, repo)
                 conflicting_pr_numbers = filter_conflicting_prs(candidate_prs, owner, repo, pr_project_id)
 
-                for pr_no in conflicting_pr_numbers:
-                    # Resolve issue number for worker tracking
-                    pr_metadata = next((p for p in candidate_prs if p.get('number') == pr_no), None)
-                    if not pr_metadata:
-                        continue
-
-                    issue_no = resolve_issue_from_pr(pr_metadata)
-                    if not issue_no:
-                        _log(f"PR #{pr_no}: could not resolve issue number, skipping", level="WARNING")
-                        continue
-
-                    # Check if worktree already exists
-                    if not worktree_exists(issue_no):
-                        _log(f"PR #{pr_no} (issue #{issue_no}): worktree does not exist, skipping rebase", level="WARNING")
-                        continue
-
-                    # Worker assignment and rebase (follows existing pattern)
-                    if num_workers > 0:
-                        worker_id = get_free_worker(num_workers)
-                        if worker_id is None:
-                            print(f"All {num_workers} workers busy, waiting for next poll")
-                            break
-
-                        write_worker_status(worker_id, 'BUSY', issue_no, None)
-                        success, pid = rebase_worktree(pr_no, issue_no)
-                        if success:
-                            write_worker_status(worker_id, 'BUSY', issue_no, pid)
-                            print(f"PR #{pr_no} (issue #{issue_no}) rebase assigned to worker {worker_id}")
-
-                            if token and chat_id:
-                                pr_url = f"https://github.com/{repo_slug}/pull/{pr_no}" if repo_slug else None
-                                msg = f"🔄 PR rebase started: <a href=\"{pr_url}\">#{pr_no}</a> (issue #{issue_no})" if pr_url else f"🔄 PR rebase started: #{pr_no} (issue #{issue_no})"
-                                send_telegram_message(token, chat_id, msg)
-                        else:
-                            write_worker_status(worker_id, 'FREE', None, None)
-                            _log(f"Failed to rebase PR #{pr_no}", level="ERROR")
-                    else:
-                        # Unlimited workers mode
-                        success, _ = rebase_worktree(pr_no, issue_no)
-                        if not success:
-                            _log(f"Failed to rebase PR #{pr_no}", level="ERROR")
+                recheck.sync(candidate_prs, deps.monotonic())
+                _assign_rebases(
+                    deps, conflicting_pr_numbers, candidate_prs, num_workers, lifecycle, leases,
+                    token, chat_id, repo_slug, history
+                )
             except RuntimeError as e:
                 _log(f"Failed to process conflicting PRs: {e}", level="ERROR")
 
@@ -320,11 +948,14 @@ def run_server(
                 owner, repo = get_repo_owner_name()
                 review_project_id = lookup_project_graphql_id(org, project_id)
                 review_prs = discover_candidate_prs(owner, repo)
-                ready_review_prs = filter_ready_review_prs(review_prs, owner, repo, review_project_id)
+                ready_review_prs = _shortest_first(
+                    history, 'review-resolution', filter_ready_review_prs(review_prs, owner, repo, review_project_id),
+                    lambda pr: issue_labels.get(pr[1], [])
+                )
 
                 for pr_no, issue_no in ready_review_prs:
                     # Check if worktree exists
-                    if not worktree_exists(issue_no):
+                    if not deps.worktree_exists(issue_no):
                         _log(f"PR #{pr_no} (issue #{issue_no}): worktree does not exist, skipping review resolution", level="WARNING")
                         continue
 
@@ -335,34 +966,56 @@ def run_server(
                             print(f"All {num_workers} workers busy, waiting for next poll")
                             break
 
+                        if not _begin_spawn(lifecycle, leases, issue_no):
+                            continue
+
                         write_worker_status(worker_id, 'BUSY', issue_no, None)
-                        success, pid = spawn_review_resolution(pr_no, issue_no)
+                        success, pid = deps.spawn_review_resolution(pr_no, issue_no)
+                        _settle_issue_lease(leases, issue_no, success, pid)
                         if success:
                             write_worker_status(worker_id, 'BUSY', issue_no, pid)
                             print(f"PR #{pr_no} (issue #{issue_no}) review resolution assigned to worker {worker_id}")
+                            eta = _record_task_start(
+                                history, 'review-resolution', issue_no, pid,
+                                pr_no=pr_no, labels=issue_labels.get(issue_no, [])
+                            )
 
                             if token and chat_id:
                                 pr_url = f"https://github.com/{repo_slug}/pull/{pr_no}" if repo_slug else None
                                 msg = f"📝 Review resolution started: <a href=\"{pr_url}\">#{pr_no}</a> (issue #{issue_no})" if pr_url else f"📝 Review resolution started: #{pr_no} (issue #{issue_no})"
-                                send_telegram_message(token, chat_id, msg)
+                                send_telegram_message(token, chat_id, msg + _eta_suffix(eta))
                         else:
                             write_worker_status(worker_id, 'FREE', None, None)
                             _log(f"Failed to spawn review resolution for PR #{pr_no}", level="ERROR")
                     else:
                         # Unlimited workers mode
-                        success, _ = spawn_review_resolution(pr_no, issue_no)
+                        if not _begin_spawn(lifecycle, leases, issue_no):
+                            continue
+                        success, pid = deps.spawn_review_resolution(pr_no, issue_no)
+                        _settle_issue_lease(leases, issue_no, success, pid)
                         if not success:
                             _log(f"Failed to spawn review resolution for PR #{pr_no}", level="ERROR")
             except RuntimeError as e:
                 _log(f"Failed to process review resolution: {e}", level="ERROR")
 
-            if running[0]:
-                time.sleep(period)
+            if not lifecycle.should_exit:
+                _wait_for_next_poll(lifecycle, period, recheck, recheck_due_prs, deps.monotonic)
 
         except Exception as e:
             _log(f"Error during poll: {e}", level="ERROR")
-            if running[0]:
-                time.sleep(period)
+            if not lifecycle.should_exit:
+                lifecycle.wait(period)
+
+    # Held leases are left to expire: detached workers keep running after shutdown
+    if leases is not None:
+        leases.stop()
+    if progress is not None:
+        progress.stop()
+
+    # Restart: the new process image keeps this PID, the registry and the workers
+    if lifecycle.mode == MODE_RESTARTING:
+        exec_restart()
+    clear_server_registry()
 
 
 def main() -> None:
@@ -383,15 +1036,8 @@ def main() -> None:
         sys.exit(1)
 
     # Load YAML config for server parameters
-    config, _ = load_runtime_config()
-    server_config = config.get("server", {}) if isinstance(config.get("server"), dict) else {}
-
-    # Apply precedence: YAML > default (no CLI)
-    period = resolve_precedence(None, None, server_config.get("period"), "5m")
-    num_workers = resolve_precedence(None, None, server_config.get("num_workers"), 5)
-
     try:
-        period_seconds = parse_period(period)
+        period_seconds, num_workers = _resolve_server_settings()
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -463,6 +463,32 @@ def discover_candidate_prs(owner: str, repo: str) -> list[dict]:
     return prs
 
 
+def query_pr(owner: str, repo: str, pr_no: int) -> Optional[dict]:
+    """Re-query one PR's metadata (same fields as discover_candidate_prs).
+
+    Returns:
+        PR metadata dict, or None if the query fails
+    """
+    result = subprocess.run(
+        ['gh', 'pr', 'view', str(pr_no),
+         '-R', f'{owner}/{repo}',
+         '--json', 'number,headRefName,mergeable,body,closingIssuesReferences,state'],
+        capture_output=True, text=True
+    )
+
+    if result.returncode != 0:
+        _log(f"Failed to view PR #{pr_no}: {result.stderr}", level="WARNING")
+        return None
+
+    try:
+        pr = json.loads(result.stdout)
+    except json.JSONDecodeError as e:
+        _log(f"Failed to parse PR #{pr_no} response: {e}", level="WARNING")
+        return None
+
+    return pr if isinstance(pr, dict) else None
+
+
 def filter_conflicting_prs(prs: list[dict], owner: str, repo: str, project_id: str) -> list[int]:
     """Filter PRs to those with merge conflicts and not already being rebased.
 
@@ -471,7 +497,7 @@ def filter_conflicting_prs(prs: list[dict], owner: str, repo: str, project_id: s
     - Resolved issue does not have Status == "Rebasing"
 
     Skips PRs with:
-    - mergeable == "UNKNOWN" (retry on next poll)
+    - mergeable == "UNKNOWN" (re-checked shortly via MergeableRecheckQueue)
     - Status == "Rebasing" (already being processed)
     - Cannot resolve issue number (still queued - best effort)
     """
@@ -487,7 +513,7 @@ def filter_conflicting_prs(prs: list[dict], owner: str, repo: str, project_id: s
 
         if mergeable == 'UNKNOWN':
             if debug:
-                print(f"  - PR #{pr_no}: {{ mergeable: {mergeable} }}, decision: SKIP, reason: retry next poll", file=sys.stderr)
+                print(f"  - PR #{pr_no}: {{ mergeable: {mergeable} }}, decision: SKIP, reason: recheck queued", file=sys.stderr)
             skip_unknown += 1
             continue
 
@@ -0,0 +1,206 @@
+"""Stuck-worker detection and preemption.
+
+`kill(pid, 0)` only tells whether a worker exists, so a hung `claude --print`
+keeps its slot BUSY forever. The monitor judges health from output activity
+instead: spawn log growth, transcript growth and `continuation_count` bumps
+(tracked by `progress.py`), with the log file mtime as a fallback. A worker
+idle past the inactivity window is flagged; a worker past the wall-clock
+budget of its task type is terminated and its issue Status is reset so the
+task is picked up again. A preempted impl task is marked so the server
+resumes it in its existing worktree.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from agentize.server.log import _log
+from agentize.server.progress import read_worker_progress
+from agentize.server.spawn_logs import find_spawn_logs
+from agentize.server.workers import DEFAULT_WORKERS_DIR, mark_preempted, read_worker_status, reset_issue_status
+
+DEFAULT_INACTIVITY_SEC = 30 * 60
+
+# Hard wall-clock budget per task type (spawn log task names); 0 disables
+DEFAULT_TASK_BUDGETS = {
+    'issue': 240 * 60,
+    'refine': 60 * 60,
+    'feat-request': 60 * 60,
+    'review-resolution': 60 * 60,
+    'rebase': 30 * 60,
+}
+
+# Status that puts each task type back in the queue
+REQUEUE_STATUS = {
+    'issue': 'Plan Accepted',
+    'refine': 'Proposed',
+    'feat-request': 'Proposed',
+    'review-resolution': 'Proposed',
+    'rebase': 'Proposed',
+}
+
+# Seconds between SIGTERM and SIGKILL for a preempted worker
+KILL_GRACE_SEC = 30
+
+
+@dataclass
+class HealthPolicy:
+    """Inactivity window and per-task wall-clock budgets, in seconds."""
+
+    inactivity_sec: int = DEFAULT_INACTIVITY_SEC
+    budgets: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_TASK_BUDGETS))
+
+
+@dataclass
+class WorkerHealth:
+    """Health verdict for one busy worker slot."""
+
+    worker_id: int
+    issue_no: Optional[int]
+    pid: int
+    task: Optional[str]
+    started_at: float
+    last_activity: float
+    stalled: bool
+    over_budget: bool
+
+
+def _signal_worker(pid: int, sig: int) -> None:
+    """Signal the worker's process group when it leads one, else the PID."""
+    try:
+        if os.getpgid(pid) == pid:
+            os.killpg(pid, sig)
+        else:
+            os.kill(pid, sig)
+    except OSError:
+        pass  # Already gone
+
+
+class WorkerHealthMonitor:
+    """Flag idle workers and preempt workers that exceed their budget.
+
+    ``check()`` runs once per poll cycle, before dead workers are cleaned up.
+    A preempted worker gets SIGTERM, then SIGKILL after ``KILL_GRACE_SEC``;
+    ``cleanup_dead_workers()`` frees its slot once the process is gone.
+    """
+
+    def __init__(
+        self,
+        policy: HealthPolicy,
+        notify: Optional[Callable[[str], None]] = None,
+        *,
+        workers_dir: str = DEFAULT_WORKERS_DIR,
+        logs_dir: Optional[Path] = None,
+    ):
+        self.policy = policy
+        self.notify = notify
+        self.workers_dir = workers_dir
+        self.logs_dir = logs_dir
+        self._flagged: set[int] = set()
+        self._terminated: dict[int, float] = {}
+
+    def assess(self, worker_id: int, now: Optional[float] = None) -> Optional[WorkerHealth]:
+        """Health of a BUSY slot with a PID (None otherwise)."""
+        now = time.time() if now is None else now
+        status = read_worker_status(worker_id, self.workers_dir)
+        pid = status.get('pid')
+        if status.get('state') != 'BUSY' or pid is None:
+            return None
+
+        logs = find_spawn_logs(pid=pid, logs_dir=self.logs_dir)
+        task = logs[0].get('task') if logs else None
+        status_file = Path(self.workers_dir) / f'worker-{worker_id}.status'
+        started_at = logs[0].get('start') if logs and logs[0].get('start') else _mtime(status_file, now)
+
+        last_activity = started_at
+        if logs:
+            last_activity = max(last_activity, _mtime(Path(logs[0]['path']), started_at))
+        progress = read_worker_progress(self.workers_dir).get(worker_id)
+        if progress and progress.get('pid') == pid:
+            last_activity = max(last_activity, progress.get('last_activity') or 0)
+
+        budget = self.policy.budgets.get(task or '', 0)
+        inactivity = self.policy.inactivity_sec
+        return WorkerHealth(
+            worker_id=worker_id,
+            issue_no=status.get('issue'),
+            pid=pid,
+            task=task,
+            started_at=started_at,
+            last_activity=last_activity,
+            stalled=bool(inactivity) and now - last_activity > inactivity,
+            over_budget=bool(budget) and now - started_at > budget,
+        )
+
+    def check(self, slots: int, now: Optional[float] = None) -> list[WorkerHealth]:
+        """Assess every slot, flag stalled workers, preempt over-budget ones.
+
+        Returns:
+            Health of the workers that were flagged or preempted in this call
+        """
+        now = time.time() if now is None else now
+        acted = []
+        busy_pids = set()
+        for worker_id in range(slots):
+            health = self.assess(worker_id, now)
+            if health is None:
+                continue
+            busy_pids.add(health.pid)
+
+            if health.pid in self._terminated:
+                if now - self._terminated[health.pid] >= KILL_GRACE_SEC:
+                    _log(f"Worker {worker_id} PID {health.pid} ignored SIGTERM, sending SIGKILL", level="WARNING")
+                    _signal_worker(health.pid, signal.SIGKILL)
+                continue
+
+            if health.over_budget:
+                self._preempt(health, now)
+                acted.append(health)
+            elif health.stalled and health.pid not in self._flagged:
+                self._flagged.add(health.pid)
+                idle_min = int((now - health.last_activity) // 60)
+                self._report(f"Worker {worker_id} (issue #{health.issue_no}, {health.task or 'unknown task'}) "
+                             f"has produced no output for {idle_min}m")
+                acted.append(health)
+            elif not health.stalled:
+                self._flagged.discard(health.pid)
+
+        # Forget workers that are gone
+        self._flagged &= busy_pids
+        for pid in [pid for pid in self._terminated if pid not in busy_pids]:
+            del self._terminated[pid]
+        return acted
+
+    def _preempt(self, health: WorkerHealth, now: float) -> None:
+        budget_min = self.policy.budgets.get(health.task or '', 0) // 60
+        self._report(f"Worker {health.worker_id} (issue #{health.issue_no}, {health.task}) exceeded its "
+                     f"{budget_min}m budget, terminating PID {health.pid}")
+        _signal_worker(health.pid, signal.SIGTERM)
+        self._terminated[health.pid] = now
+        requeue = REQUEUE_STATUS.get(health.task or '')
+        if health.issue_no is not None and requeue:
+            if health.task == 'issue':
+                # The worktree survives; without the mark the server would skip the issue for good
+                mark_preempted(health.issue_no, self.workers_dir)
+            reset_issue_status(health.issue_no, requeue)
+            _log(f"Issue #{health.issue_no}: status reset to {requeue} after preemption")
+
+    def _report(self, message: str) -> None:
+        _log(message, level="WARNING")
+        if self.notify is not None:
+            try:
+                self.notify(message)
+            except Exception as e:
+                _log(f"Failed to send health notification: {e}", level="WARNING")
+
+
+def _mtime(path: Path, default: float) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return default
@@ -0,0 +1,283 @@
+"""Task duration history and expected-duration estimates.
+
+Every worker task (implementation, refinement, dev-req planning, review
+resolution, rebase) is recorded in a local SQLite store when it is spawned
+and closed out when its worker is reaped: start/end times, exit status, the
+model seen in its transcript and its token cost. The estimator turns that
+history into an expected duration per task type, model and label, which the
+server uses to order candidates shortest-expected-first and to show ETAs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Optional, TypeVar
+
+from agentize.server.log import _log
+from agentize.server.workers import DEFAULT_WORKERS_DIR
+from agentize.usage import usage_cost
+
+DEFAULT_HISTORY_PATH = os.path.join(DEFAULT_WORKERS_DIR, 'history.sqlite')
+
+# Fewest finished tasks an estimate is based on, and how many recent ones count
+MIN_SAMPLES = 3
+SAMPLE_WINDOW = 50
+
+# Workflow labels are shared by every task of a type, so they say nothing
+# about the expected duration of one task over another
+_WORKFLOW_LABEL_PREFIX = 'agentize:'
+
+T = TypeVar('T')
+
+
+@dataclass
+class TaskRecord:
+    """One spawned worker task."""
+
+    id: int
+    task: str
+    issue_no: Optional[int]
+    pr_no: Optional[int]
+    pid: Optional[int]
+    labels: tuple[str, ...]
+    model: Optional[str]
+    started_at: float
+    ended_at: Optional[float] = None
+    exit_code: Optional[int] = None
+    cost_usd: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.ended_at is None else self.ended_at - self.started_at
+
+    @property
+    def succeeded(self) -> bool:
+        """Finished without a failure exit (unknown exit codes count as success)."""
+        return self.ended_at is not None and self.exit_code in (0, None)
+
+
+def transcript_usage(transcript_path: str, since: float = 0) -> tuple[Optional[str], Optional[float]]:
+    """Model and USD cost of the assistant messages in a transcript after since.
+
+    Returns:
+        Tuple of (model, cost_usd); the model is the last one seen. Both are
+        None when the transcript is missing or has no priced usage after since.
+    """
+    model, cost = None, None
+    try:
+        f = open(transcript_path, errors='replace')
+    except OSError:
+        return None, None
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(entry, dict) or entry.get('type') != 'assistant':
+                continue
+            if since and _entry_time(entry) < since:
+                continue
+            message = entry.get('message') if isinstance(entry.get('message'), dict) else {}
+            model_id = message.get('model') or ''
+            entry_cost = usage_cost(message.get('usage') or {}, model_id)
+            if entry_cost is not None:
+                model = model_id
+                cost = (cost or 0.0) + entry_cost
+    return model, cost
+
+
+def _entry_time(entry: dict) -> float:
+    """Epoch seconds of a transcript entry's ISO timestamp (inf if absent, so it counts)."""
+    stamp = entry.get('timestamp')
+    if not isinstance(stamp, str):
+        return float('inf')
+    try:
+        return datetime.fromisoformat(stamp.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return float('inf')
+
+
+def _encode_labels(labels: Iterable[str]) -> str:
+    return ','.join(sorted(set(labels)))
+
+
+def _decode_labels(value: Optional[str]) -> tuple[str, ...]:
+    return tuple(label for label in (value or '').split(',') if label)
+
+
+class TaskHistory:
+    """Local store of task start/end times, exit status and cost.
+
+    Storage failures are logged and swallowed: the history only informs
+    ordering and ETAs, so it never stops the server from spawning work.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS tasks ('
+                    'id INTEGER PRIMARY KEY AUTOINCREMENT, task TEXT NOT NULL, '
+                    "issue INTEGER, pr INTEGER, pid INTEGER, labels TEXT NOT NULL DEFAULT '', "
+                    'model TEXT, started_at REAL NOT NULL, ended_at REAL, exit_code INTEGER, cost_usd REAL)'
+                )
+                conn.execute('CREATE INDEX IF NOT EXISTS tasks_by_task ON tasks (task, ended_at)')
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            _log(f"Cannot initialize task history {path}: {e}", level="WARNING")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        try:
+            conn = self._connect()
+            try:
+                return conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            _log(f"Task history query failed ({self.path}): {e}", level="WARNING")
+            return []
+
+    def record_start(
+        self,
+        task: str,
+        *,
+        issue_no: Optional[int] = None,
+        pr_no: Optional[int] = None,
+        pid: Optional[int] = None,
+        labels: Iterable[str] = (),
+        model: Optional[str] = None,
+        started_at: Optional[float] = None,
+    ) -> None:
+        """Record a spawned task. A still-open task on the same PID is superseded."""
+        started_at = time.time() if started_at is None else started_at
+        if pid is not None:
+            self._execute('DELETE FROM tasks WHERE pid = ? AND ended_at IS NULL', (pid,))
+        self._execute(
+            'INSERT INTO tasks (task, issue, pr, pid, labels, model, started_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (task, issue_no, pr_no, pid, _encode_labels(labels), model, started_at),
+        )
+
+    def record_end(
+        self,
+        pid: int,
+        exit_code: Optional[int],
+        *,
+        ended_at: Optional[float] = None,
+        transcript_path: Optional[str] = None,
+    ) -> Optional[TaskRecord]:
+        """Close out the open task of a reaped worker.
+
+        Model and cost are read from the transcript (entries after the task
+        started) when one is given; otherwise they stay as recorded.
+
+        Returns:
+            The finished record, or None if no open task matches pid
+        """
+        record = self.open_task(pid)
+        if record is None:
+            return None
+        record.ended_at = time.time() if ended_at is None else ended_at
+        record.exit_code = exit_code
+        if transcript_path:
+            model, cost = transcript_usage(transcript_path, since=record.started_at)
+            record.model = model or record.model
+            record.cost_usd = cost
+        self._execute(
+            'UPDATE tasks SET ended_at = ?, exit_code = ?, model = ?, cost_usd = ? WHERE id = ?',
+            (record.ended_at, record.exit_code, record.model, record.cost_usd, record.id),
+        )
+        return record
+
+    def open_task(self, pid: int) -> Optional[TaskRecord]:
+        """The unfinished task recorded for pid, if any."""
+        rows = self._execute(
+            f'SELECT {_COLUMNS} FROM tasks WHERE pid = ? AND ended_at IS NULL ORDER BY id DESC LIMIT 1', (pid,)
+        )
+        return _to_record(rows[0]) if rows else None
+
+    def records(self, task: Optional[str] = None, limit: Optional[int] = None) -> list[TaskRecord]:
+        """Recorded tasks, newest first."""
+        sql = f'SELECT {_COLUMNS} FROM tasks'
+        params: tuple = ()
+        if task is not None:
+            sql += ' WHERE task = ?'
+            params = (task,)
+        sql += ' ORDER BY started_at DESC'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        return [_to_record(row) for row in self._execute(sql, params)]
+
+    def estimate(
+        self,
+        task: str,
+        *,
+        model: Optional[str] = None,
+        labels: Iterable[str] = (),
+    ) -> Optional[float]:
+        """Expected duration in seconds: the median of recent successful runs.
+
+        Falls back from tasks sharing a label with the candidate, to all tasks
+        on the model, to all tasks of the type, using the first group with at
+        least MIN_SAMPLES runs. None when even the task type lacks samples.
+        """
+        rows = self._execute(
+            f'SELECT {_COLUMNS} FROM tasks WHERE task = ? AND ended_at IS NOT NULL ORDER BY ended_at DESC',
+            (task,),
+        )
+        finished = [r for r in map(_to_record, rows) if r.succeeded]
+        on_model = [r for r in finished if r.model == model] if model else finished
+        wanted = {label for label in labels if not label.startswith(_WORKFLOW_LABEL_PREFIX)}
+        labelled = [r for r in on_model if wanted.intersection(r.labels)]
+
+        for group in (labelled, on_model, finished):
+            if len(group) >= MIN_SAMPLES:
+                return statistics.median(r.duration for r in group[:SAMPLE_WINDOW])
+        return None
+
+    def expected_end(self, pid: int) -> Optional[float]:
+        """Estimated finish time (epoch seconds) of the task running on pid."""
+        record = self.open_task(pid)
+        if record is None:
+            return None
+        estimate = self.estimate(record.task, model=record.model, labels=record.labels)
+        return None if estimate is None else record.started_at + estimate
+
+    def order_shortest_first(
+        self,
+        task: str,
+        items: list[T],
+        labels_of: Callable[[T], Iterable[str]],
+    ) -> list[T]:
+        """Sort candidates by expected duration, shortest first.
+
+        The sort is stable and candidates without an estimate keep their
+        place after the estimated ones, so with no history the order is
+        unchanged.
+        """
+        estimates = [self.estimate(task, labels=labels_of(item)) for item in items]
+        ranked = sorted(range(len(items)), key=lambda i: (estimates[i] is None, estimates[i] or 0, i))
+        return [items[i] for i in ranked]
+
+
+_COLUMNS = 'id, task, issue, pr, pid, labels, model, started_at, ended_at, exit_code, cost_usd'
+
+
+def _to_record(row: tuple) -> TaskRecord:
+    id_, task, issue, pr, pid, labels, model, started_at, ended_at, exit_code, cost = row
+    return TaskRecord(id_, task, issue, pr, pid, _decode_labels(labels), model,
+                      started_at, ended_at, exit_code, cost)
@@ -0,0 +1,432 @@
+"""Lease-based task claims shared across server hosts.
+
+A lease is an exclusive, TTL-bounded claim on a task key (e.g.,
+'owner/repo#issue:42').
+Servers acquire a lease before spawning a worker and renew it on a heartbeat
+while the worker is alive, so several hosts can poll the same project without
+double-spawning. Two stores are provided: a SQLite file on a shared mount and
+a small HTTP lease service (itself backed by SQLite).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from agentize.server.log import _log
+
+
+LEASE_SERVICE_TIMEOUT_SEC = 10
+
+
+class LeaseError(RuntimeError):
+    """Raised when the lease store cannot be reached."""
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A held claim on a task key."""
+
+    key: str
+    owner: str
+    expires_at: float
+
+
+class LeaseStore(ABC):
+    """Interface for lease backends.
+
+    Implementations must make acquire() atomic across processes and hosts.
+    Transport or storage failures raise LeaseError.
+    """
+
+    @abstractmethod
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        """Claim key for owner unless another owner holds an unexpired lease."""
+
+    @abstractmethod
+    def renew(self, key: str, owner: str, ttl: float) -> bool:
+        """Extend owner's lease on key. False if the lease was lost."""
+
+    @abstractmethod
+    def release(self, key: str, owner: str) -> None:
+        """Drop owner's lease on key (no-op if not held)."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Lease]:
+        """Return the current unexpired lease on key, if any."""
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """Lease store in a SQLite file, suitable for a shared network mount.
+
+    Uses the default rollback journal (WAL does not work over network file
+    systems) and BEGIN IMMEDIATE so concurrent acquires serialize on the
+    database write lock.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        conn = self._connect()
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS leases ('
+                'key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+        except sqlite3.Error as e:
+            raise LeaseError(f"Cannot initialize lease database {path}: {e}") from e
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        except sqlite3.Error as e:
+            raise LeaseError(f"Cannot open lease database {self.path}: {e}") from e
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT owner, expires_at FROM leases WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                conn.execute('ROLLBACK')
+                return False
+            conn.execute(
+                'INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)',
+                (key, owner, now + ttl),
+            )
+            conn.execute('COMMIT')
+            return True
+        except sqlite3.Error as e:
+            raise LeaseError(f"Lease acquire failed for {key}: {e}") from e
+        finally:
+            conn.close()
+
+    def renew(self, key: str, owner: str, ttl: float) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                'UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?',
+                (time.time() + ttl, key, owner),
+            )
+            return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            raise LeaseError(f"Lease renew failed for {key}: {e}") from e
+        finally:
+            conn.close()
+
+    def release(self, key: str, owner: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, owner))
+        except sqlite3.Error as e:
+            raise LeaseError(f"Lease release failed for {key}: {e}") from e
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Lease]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT owner, expires_at FROM leases WHERE key = ? AND expires_at > ?',
+                (key, time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise LeaseError(f"Lease lookup failed for {key}: {e}") from e
+        finally:
+            conn.close()
+        return Lease(key, row[0], row[1]) if row else None
+
+
+class HTTPLeaseStore(LeaseStore):
+    """Client for the lease service (make_lease_server() / python -m agentize.server.leases)."""
+
+    def __init__(self, url: str, timeout: float = LEASE_SERVICE_TIMEOUT_SEC):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _call(self, op: str, payload: dict) -> dict:
+        req = urllib.request.Request(
+            f"{self.url}/{op}",
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read().decode('utf-8'))
+        except (urllib.error.URLError, OSError, json.JSONDecodeError) as e:
+            raise LeaseError(f"Lease service {op} failed: {e}") from e
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        return bool(self._call('acquire', {'key': key, 'owner': owner, 'ttl': ttl}).get('ok'))
+
+    def renew(self, key: str, owner: str, ttl: float) -> bool:
+        return bool(self._call('renew', {'key': key, 'owner': owner, 'ttl': ttl}).get('ok'))
+
+    def release(self, key: str, owner: str) -> None:
+        self._call('release', {'key': key, 'owner': owner})
+
+    def get(self, key: str) -> Optional[Lease]:
+        lease = self._call('get', {'key': key}).get('lease')
+        return Lease(**lease) if lease else None
+
+
+def make_lease_server(store: LeaseStore, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """Build an HTTP server exposing store as POST /acquire, /renew, /release, /get."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            op = self.path.strip('/')
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if op == 'acquire':
+                    result = {'ok': store.acquire(body['key'], body['owner'], float(body['ttl']))}
+                elif op == 'renew':
+                    result = {'ok': store.renew(body['key'], body['owner'], float(body['ttl']))}
+                elif op == 'release':
+                    store.release(body['key'], body['owner'])
+                    result = {'ok': True}
+                elif op == 'get':
+                    lease = store.get(body['key'])
+                    result = {'lease': lease.__dict__ if lease else None}
+                else:
+                    self.send_error(404, f"Unknown operation: {op}")
+                    return
+                status = 200
+            except (KeyError, ValueError, json.JSONDecodeError) as e:
+                result, status = {'error': f"Bad request: {e}"}, 400
+            except LeaseError as e:
+                result, status = {'error': str(e)}, 503
+            data = json.dumps(result).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+class LeaseKeeper:
+    """Claims, heartbeats and releases this server's leases.
+
+    Each claimed key is bound to a worker PID after spawning. The heartbeat
+    renews keys whose worker is alive (or not yet bound) and releases keys
+    whose worker has exited. Leases are intentionally not released on shutdown:
+    workers outlive the server, and a restarted server with the same owner
+    re-acquires its own leases.
+
+    Issue keys are prefixed with the repo slug (namespace), so servers for
+    different repositories can share one lease store.
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        ttl: float,
+        owner: Optional[str] = None,
+        namespace: Optional[str] = None,
+    ):
+        self.store = store
+        self.ttl = ttl
+        self.owner = owner or socket.gethostname()
+        self.namespace = namespace
+        self._held: dict[str, Optional[int]] = {}
+        # Keys whose spawn reported no PID; renewed until release_unbound() drops them
+        self._unbound: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def issue_key(self, issue_no: int) -> str:
+        """Lease key for an issue: '<owner>/<repo>#issue:<N>' ('issue:<N>' without a repo slug)."""
+        key = f"issue:{issue_no}"
+        return f"{self.namespace}#{key}" if self.namespace else key
+
+    def claim(self, key: str) -> bool:
+        """Acquire key. Returns False if another owner holds it or the store is unreachable."""
+        try:
+            acquired = self.store.acquire(key, self.owner, self.ttl)
+        except LeaseError as e:
+            _log(f"Cannot claim {key}: {e}", level="WARNING")
+            return False
+        if acquired:
+            with self._lock:
+                self._held[key] = None
+        return acquired
+
+    def bind(self, key: str, pid: Optional[int]) -> None:
+        """Associate a claimed key with the worker PID that keeps it alive.
+
+        Without a PID the worker may still be running, so the key keeps being
+        renewed until release_unbound() finds its worker slot free.
+        """
+        with self._lock:
+            if key not in self._held:
+                return
+            self._held[key] = pid
+            if pid is None:
+                self._unbound.add(key)
+            else:
+                self._unbound.discard(key)
+        if pid is None:
+            _log(f"Lease {key}: spawn reported no PID, renewing until its worker slot is free", level="WARNING")
+
+    def release_unbound(self, busy_keys: set[str]) -> None:
+        """Release keys bound without a PID whose worker is no longer busy."""
+        with self._lock:
+            idle = sorted(self._unbound - busy_keys)
+        for key in idle:
+            _log(f"Lease {key}: worker without a PID is no longer busy, releasing")
+            self.release(key)
+
+    def release(self, key: str) -> None:
+        """Release key (best-effort)."""
+        with self._lock:
+            self._held.pop(key, None)
+            self._unbound.discard(key)
+        try:
+            self.store.release(key, self.owner)
+        except LeaseError as e:
+            _log(f"Cannot release {key}: {e}", level="WARNING")
+
+    def held(self) -> list[str]:
+        """Keys currently claimed by this keeper."""
+        with self._lock:
+            return sorted(self._held)
+
+    def heartbeat(self) -> None:
+        """Renew live leases and release those whose worker exited."""
+        with self._lock:
+            held = dict(self._held)
+        for key, pid in held.items():
+            if pid is not None and not _pid_alive(pid):
+                self.release(key)
+                continue
+            try:
+                renewed = self.store.renew(key, self.owner, self.ttl)
+            except LeaseError as e:
+                # Keep the key; the next heartbeat retries before the TTL lapses
+                _log(f"Cannot renew {key}: {e}", level="WARNING")
+                continue
+            if not renewed:
+                _log(f"Lease {key} was lost to another owner", level="WARNING")
+                with self._lock:
+                    self._held.pop(key, None)
+                    self._unbound.discard(key)
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Run heartbeat() in a daemon thread every interval (default: ttl / 3)."""
+        interval = interval if interval is not None else self.ttl / 3
+
+        def _loop():
+            while not self._stop.wait(interval):
+                self.heartbeat()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=_loop, name='lease-heartbeat', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the heartbeat thread (held leases expire after their TTL)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def create_lease_keeper(
+    leases_config: dict,
+    period: int,
+    namespace: Optional[str] = None,
+) -> Optional[LeaseKeeper]:
+    """Build a LeaseKeeper from the server.leases config section.
+
+    Args:
+        leases_config: Parsed `server.leases` mapping (empty disables leasing)
+        period: Server polling period in seconds (default TTL is 3x period, min 300s)
+        namespace: Repo slug (owner/repo) prefixed to issue keys
+
+    Returns:
+        LeaseKeeper, or None when no backend is configured
+
+    Raises:
+        ValueError: If the backend is unknown or its location is missing
+    """
+    backend = leases_config.get('backend')
+    if not backend:
+        return None
+
+    from agentize.server.notify import parse_period
+
+    ttl_value = leases_config.get('ttl')
+    ttl = parse_period(str(ttl_value)) if ttl_value else max(3 * period, 300)
+
+    if backend == 'sqlite':
+        path = leases_config.get('path')
+        if not path:
+            raise ValueError("server.leases.path is required for the sqlite backend")
+        store: LeaseStore = SQLiteLeaseStore(os.path.expanduser(str(path)))
+    elif backend == 'service':
+        url = leases_config.get('url')
+        if not url:
+            raise ValueError("server.leases.url is required for the service backend")
+        store = HTTPLeaseStore(str(url))
+    else:
+        raise ValueError(f"Unknown server.leases.backend '{backend}'. Use sqlite or service.")
+
+    return LeaseKeeper(store, ttl, owner=leases_config.get('owner'), namespace=namespace)
+
+
+def main(argv=None):
+    """Run the lease service: python -m agentize.server.leases --db PATH [--host H] [--port N]."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m agentize.server.leases",
+        description="Serve task leases for multi-host agentize servers"
+    )
+    parser.add_argument("--db", required=True, help="SQLite database backing the leases")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Bind port (default: 8765)")
+    args = parser.parse_args(argv)
+
+    server = make_lease_server(SQLiteLeaseStore(args.db), args.host, args.port)
+    _log(f"Lease service listening on {args.host}:{args.port} (db: {args.db})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""Server lifecycle modes (drain, reload, restart) and the server registry entry.
+
+Signals drive the mode of a running server:
+
+- SIGINT/SIGTERM: stop after the current cycle
+- SIGUSR1: drain (stop assigning work, exit once no worker is busy)
+- SIGHUP: reload `.agentize.local.yaml` settings and credentials in place
+- SIGUSR2: restart (re-exec the server with the same PID, adopting workers)
+
+The worker status files under `.tmp/workers` are the persisted worker
+registry; `server.json` next to them records which server process owns them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from agentize.server.log import _log
+from agentize.server.workers import DEFAULT_WORKERS_DIR, read_worker_status
+
+MODE_RUNNING = 'running'
+MODE_DRAINING = 'draining'
+MODE_STOPPING = 'stopping'
+MODE_RESTARTING = 'restarting'
+
+SERVER_REGISTRY_FILE = 'server.json'
+
+
+class ServerLifecycle:
+    """Lifecycle mode of the polling loop, updated from signal handlers.
+
+    ``wait()`` replaces the inter-cycle sleep and returns early when a
+    signal arrives, so drain/reload/restart take effect without waiting out
+    the poll period.
+    """
+
+    def __init__(self):
+        self.mode = MODE_RUNNING
+        self.reload_requested = False
+        self._wake = threading.Event()
+
+    def install_signal_handlers(self) -> None:
+        """Route lifecycle signals to this instance (main thread only)."""
+        signal.signal(signal.SIGINT, lambda signum, frame: self.request(MODE_STOPPING))
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.request(MODE_STOPPING))
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.request(MODE_DRAINING))
+        signal.signal(signal.SIGUSR2, lambda signum, frame: self.request(MODE_RESTARTING))
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.request_reload())
+
+    def request(self, mode: str) -> None:
+        """Switch mode. Stop and restart are final; drain only applies while running."""
+        if self.mode in (MODE_STOPPING, MODE_RESTARTING):
+            return
+        if mode == MODE_DRAINING and self.mode != MODE_RUNNING:
+            return
+        messages = {
+            MODE_STOPPING: "\nShutting down...",
+            MODE_DRAINING: "\nDraining: no new assignments, exiting once workers are idle",
+            MODE_RESTARTING: "\nRestarting: handing workers over to a new server process",
+        }
+        print(messages.get(mode, f"\nMode: {mode}"))
+        self.mode = mode
+        self._wake.set()
+
+    def request_reload(self) -> None:
+        self.reload_requested = True
+        self._wake.set()
+
+    def take_reload(self) -> bool:
+        """Return True once per reload request."""
+        requested, self.reload_requested = self.reload_requested, False
+        return requested
+
+    @property
+    def accepting_work(self) -> bool:
+        return self.mode == MODE_RUNNING
+
+    @property
+    def should_exit(self) -> bool:
+        return self.mode in (MODE_STOPPING, MODE_RESTARTING)
+
+    def wait(self, seconds: float) -> None:
+        """Sleep until the next cycle or until a lifecycle signal arrives."""
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+
+def _registry_path(workers_dir: str) -> Path:
+    return Path(workers_dir) / SERVER_REGISTRY_FILE
+
+
+def read_server_registry(workers_dir: str = DEFAULT_WORKERS_DIR) -> dict:
+    """Return the owning server entry ({pid, host, mode, started_at}) or {}."""
+    try:
+        with open(_registry_path(workers_dir)) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_server_registry(mode: str, workers_dir: str = DEFAULT_WORKERS_DIR) -> None:
+    """Record this process as the owner of the worker registry (atomic)."""
+    path = _registry_path(workers_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    previous = read_server_registry(workers_dir)
+    started_at = previous.get('started_at') if previous.get('pid') == os.getpid() else None
+    entry = {
+        'pid': os.getpid(),
+        'host': socket.gethostname(),
+        'mode': mode,
+        'started_at': started_at or int(time.time()),
+    }
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(entry, f)
+    tmp_path.rename(path)
+
+
+def clear_server_registry(workers_dir: str = DEFAULT_WORKERS_DIR) -> None:
+    """Remove the owner entry if this process still owns it."""
+    if read_server_registry(workers_dir).get('pid') == os.getpid():
+        try:
+            _registry_path(workers_dir).unlink()
+        except OSError:
+            pass
+
+
+def claim_server_registry(workers_dir: str = DEFAULT_WORKERS_DIR) -> Optional[int]:
+    """Take ownership of the worker registry.
+
+    Returns the PID of another live server on this host that already owns it
+    (the caller must not start), or None once ownership is recorded. An entry
+    left by this same PID is a restart hand-off and is adopted.
+    """
+    entry = read_server_registry(workers_dir)
+    pid = entry.get('pid')
+    if isinstance(pid, int) and pid != os.getpid() and entry.get('host') == socket.gethostname():
+        try:
+            os.kill(pid, 0)
+            return pid
+        except ProcessLookupError:
+            pass  # Stale entry from a crashed server
+        except PermissionError:
+            return pid
+    write_server_registry(MODE_RUNNING, workers_dir)
+    return None
+
+
+def registry_slots(num_workers: int, workers_dir: str = DEFAULT_WORKERS_DIR) -> int:
+    """Number of worker slots to track: at least num_workers, plus any higher
+    slots still on disk (e.g., after a reload shrank server.num_workers)."""
+    slots = num_workers
+    for path in Path(workers_dir).glob('worker-*.status'):
+        try:
+            slots = max(slots, int(path.stem.split('-', 1)[1]) + 1)
+        except ValueError:
+            continue
+    return slots
+
+
+def busy_workers(slots: int, workers_dir: str = DEFAULT_WORKERS_DIR) -> list[tuple[int, dict]]:
+    """(worker_id, status) for every BUSY slot."""
+    busy = []
+    for i in range(slots):
+        status = read_worker_status(i, workers_dir)
+        if status.get('state') == 'BUSY':
+            busy.append((i, status))
+    return busy
+
+
+def exec_restart() -> None:
+    """Replace this process with a fresh server (same PID, so spawned
+    workers stay its children and the registry entry stays valid)."""
+    write_server_registry(MODE_RESTARTING)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    _log("Re-executing server process")
+    os.execv(sys.executable, [sys.executable, '-m', 'agentize.server'])
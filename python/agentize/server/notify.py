@@ -112,7 +112,8 @@ def _format_worker_assignment_message(
     issue_no: int,
     issue_title: str,
     worker_id: int,
-    issue_url: Optional[str]
+    issue_url: Optional[str],
+    eta_sec: Optional[float] = None
 ) -> str:
     """Build HTML-formatted Telegram message for worker assignment.
 
@@ -121,6 +122,7 @@ def _format_worker_assignment_message(
         issue_title: Issue title (will be HTML-escaped)
         worker_id: Worker slot ID
         issue_url: Full GitHub issue URL or None
+        eta_sec: Expected duration from the task history, or None
 
     Returns:
         HTML-formatted message for Telegram
@@ -132,11 +134,22 @@ def _format_worker_assignment_message(
     else:
         issue_ref = f'#{issue_no}'
 
-    return (
+    msg = (
         f"🔧 <b>Worker Assignment</b>\n\n"
         f"Issue: {issue_ref} {escaped_title}\n"
         f"Worker: {worker_id}"
     )
+    if eta_sec is not None:
+        msg += f"\nETA: {_format_eta(eta_sec)}"
+    return msg
+
+
+def _format_eta(seconds: float) -> str:
+    """Render an expected duration as a rough ETA (e.g., '~45m', '~2h05m')."""
+    minutes = max(1, round(seconds / 60))
+    if minutes < 60:
+        return f"~{minutes}m"
+    return f"~{minutes // 60}h{minutes % 60:02d}m"
 
 
 def _format_worker_completion_message(
@@ -173,3 +186,38 @@ def _format_worker_completion_message(
     lines.append(f"Worker: {worker_id}")
 
     return '\n'.join(lines)
+
+
+def _format_worker_progress_message(
+    issue_no: Optional[int],
+    worker_id: int,
+    kind: str,
+    detail: str,
+    issue_url: Optional[str]
+) -> str:
+    """Build HTML-formatted Telegram message for a worker progress milestone.
+
+    Args:
+        issue_no: GitHub issue number (None if the worker has no issue)
+        worker_id: Worker slot ID
+        kind: Milestone kind (iteration, commit, pr, error)
+        detail: Milestone detail (will be HTML-escaped)
+        issue_url: Full GitHub issue URL or None
+
+    Returns:
+        HTML-formatted message for Telegram
+    """
+    icons = {'iteration': '🔁', 'commit': '📌', 'pr': '🔀', 'error': '⚠️'}
+    if issue_no is None:
+        issue_ref = 'unknown'
+    elif issue_url:
+        issue_ref = f'<a href="{issue_url}">#{issue_no}</a>'
+    else:
+        issue_ref = f'#{issue_no}'
+
+    return (
+        f"{icons.get(kind, '⏳')} <b>Worker Progress</b>\n\n"
+        f"Issue: {issue_ref}\n"
+        f"Worker: {worker_id}\n"
+        f"{kind.capitalize()}: {escape_html(detail)}"
+    )
@@ -0,0 +1,333 @@
+"""Live progress of busy workers, streamed from spawn logs and session transcripts.
+
+A background tracker tails each busy worker's spawn log (`.tmp/logs`) and the
+Claude transcript recorded in its hooked session, using offset polling. It
+extracts milestones (iteration, commit, PR opened, error), publishes them as
+throttled progress events, and keeps `.tmp/workers/progress.json` up to date
+with each worker's latest milestone and last output activity.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from agentize.server.log import _log
+from agentize.server.session import SessionIndex, _resolve_session_dir
+from agentize.server.spawn_logs import find_spawn_logs
+from agentize.server.workers import DEFAULT_WORKERS_DIR, read_worker_status
+
+PROGRESS_FILE = 'progress.json'
+
+MILESTONE_ITERATION = 'iteration'
+MILESTONE_COMMIT = 'commit'
+MILESTONE_PR = 'pr'
+MILESTONE_ERROR = 'error'
+
+# When several milestones arrive inside one throttle window, the most
+# important pending one is sent (newest wins among equals)
+_PRIORITY = {MILESTONE_ITERATION: 0, MILESTONE_COMMIT: 1, MILESTONE_ERROR: 2, MILESTONE_PR: 3}
+
+_COMMIT_RE = re.compile(r'^\[[\w./-]+(?: \(root-commit\))? ([0-9a-f]{7,40})\] (.+)$')
+_PR_RE = re.compile(r'https://github\.com/[^/\s]+/[^/\s]+/pull/(\d+)')
+_ERROR_RE = re.compile(r'^(?:Error|ERROR|fatal|Traceback \(most recent call last\))\b')
+
+
+@dataclass
+class ProgressEvent:
+    """A milestone observed in a worker's output."""
+
+    worker_id: int
+    issue_no: Optional[int]
+    kind: str
+    detail: str
+    at: float
+
+
+@dataclass
+class WorkerProgress:
+    """Progress of one busy worker slot, persisted to progress.json."""
+
+    worker_id: int
+    issue_no: Optional[int]
+    pid: Optional[int]
+    started_at: float
+    last_activity: float
+    log_file: Optional[str] = None
+    log_bytes: int = 0
+    transcript_file: Optional[str] = None
+    transcript_bytes: int = 0
+    continuation_count: int = 0
+    milestone: Optional[str] = None
+    detail: Optional[str] = None
+    milestone_at: Optional[float] = None
+    expected_end: Optional[float] = None
+
+
+def extract_log_milestones(line: str) -> list[tuple[str, str]]:
+    """Milestones in one line of plain command output: (kind, detail)."""
+    found = []
+    line = line.rstrip()
+    commit = _COMMIT_RE.match(line)
+    if commit:
+        found.append((MILESTONE_COMMIT, f"{commit.group(1)[:7]} {commit.group(2)}"))
+    pr = _PR_RE.search(line)
+    if pr:
+        found.append((MILESTONE_PR, f"#{pr.group(1)}"))
+    if _ERROR_RE.match(line):
+        found.append((MILESTONE_ERROR, line[:200]))
+    return found
+
+
+def extract_transcript_milestones(line: str) -> list[tuple[str, str]]:
+    """Milestones in one JSONL transcript entry.
+
+    Tool results are scanned like plain output (git commit summaries, PR
+    URLs); API error entries are reported as errors.
+    """
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(entry, dict):
+        return []
+    message = entry.get('message') if isinstance(entry.get('message'), dict) else {}
+    if entry.get('isApiErrorMessage'):
+        return [(MILESTONE_ERROR, _content_text(message.get('content'))[:200] or 'API error')]
+
+    found = []
+    content = message.get('content')
+    if isinstance(content, list):
+        for item in content:
+            if isinstance(item, dict) and item.get('type') == 'tool_result':
+                for text_line in _content_text(item.get('content')).splitlines():
+                    found.extend(m for m in extract_log_milestones(text_line) if m[0] != MILESTONE_ERROR)
+    return found
+
+
+def _content_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return '\n'.join(
+            item.get('text', '') for item in content
+            if isinstance(item, dict) and isinstance(item.get('text'), str)
+        )
+    return ''
+
+
+class _Tail:
+    """Incremental line reader over a growing file (offset polling)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.offset = 0
+        self._pending = ''
+
+    def read_lines(self) -> list[str]:
+        """Complete lines appended since the last call; restarts if the file shrank."""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset, self._pending = 0, ''
+        if size == self.offset:
+            return []
+        with open(self.path, errors='replace') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+            self.offset = f.tell()
+        *lines, self._pending = (self._pending + chunk).split('\n')
+        return lines
+
+
+@dataclass
+class _Tracked:
+    progress: WorkerProgress
+    log: Optional[_Tail] = None
+    transcript: Optional[_Tail] = None
+    pending: Optional[ProgressEvent] = None
+    last_sent: float = 0.0
+
+
+class ProgressTracker:
+    """Tail busy workers' output and publish throttled progress events.
+
+    ``poll()`` does one pass; ``start()`` runs it in a daemon thread. Events
+    for one worker are sent at most once per ``throttle_sec``; the first
+    milestone of a worker is sent right away. With a ``history`` (TaskHistory),
+    each worker's ``expected_end`` is estimated when it is first seen.
+    """
+
+    def __init__(
+        self,
+        publish: Optional[Callable[[ProgressEvent], None]] = None,
+        *,
+        throttle_sec: float = 300,
+        workers_dir: str = DEFAULT_WORKERS_DIR,
+        logs_dir: Optional[Path] = None,
+        session_dir: Optional[Path] = None,
+        history=None,
+    ):
+        self.publish = publish
+        self.history = history
+        self.throttle_sec = throttle_sec
+        self.workers_dir = workers_dir
+        self.logs_dir = logs_dir
+        self.sessions = SessionIndex(session_dir or _resolve_session_dir())
+        self._tracked: dict[int, _Tracked] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self, now: Optional[float] = None) -> list[ProgressEvent]:
+        """Read new output of every busy worker. Returns the events published."""
+        now = time.time() if now is None else now
+        self.sessions.refresh()
+        busy = {}
+        for path in Path(self.workers_dir).glob('worker-*.status'):
+            try:
+                worker_id = int(path.stem.split('-', 1)[1])
+            except ValueError:
+                continue
+            status = read_worker_status(worker_id, self.workers_dir)
+            if status.get('state') == 'BUSY' and status.get('pid') is not None:
+                busy[worker_id] = status
+
+        for worker_id in list(self._tracked):
+            tracked = self._tracked[worker_id]
+            status = busy.get(worker_id)
+            if status is None or status['pid'] != tracked.progress.pid:
+                del self._tracked[worker_id]
+
+        published = []
+        for worker_id, status in sorted(busy.items()):
+            tracked = self._tracked.get(worker_id)
+            if tracked is None:
+                progress = WorkerProgress(worker_id, status.get('issue'), status['pid'], now, now)
+                if self.history is not None:
+                    progress.expected_end = self.history.expected_end(status['pid'])
+                tracked = self._tracked[worker_id] = _Tracked(progress)
+            self._read_worker(tracked, now)
+            event = self._take_due_event(tracked, now)
+            if event is not None:
+                published.append(event)
+                if self.publish is not None:
+                    try:
+                        self.publish(event)
+                    except Exception as e:
+                        _log(f"Failed to publish progress for worker {worker_id}: {e}", level="WARNING")
+
+        self._write_progress_file()
+        return published
+
+    def _read_worker(self, tracked: _Tracked, now: float) -> None:
+        progress = tracked.progress
+        if tracked.log is None:
+            logs = [e for e in find_spawn_logs(pid=progress.pid, logs_dir=self.logs_dir)
+                    if not e.get('compressed')]
+            if logs:
+                tracked.log = _Tail(logs[0]['path'])
+                progress.log_file = str(logs[0]['path'])
+
+        state = self.sessions.for_issue(progress.issue_no) if progress.issue_no is not None else None
+        if state and tracked.transcript is None and state.get('state') == 'done':
+            state = None  # A finished earlier session; the worker's hook has not indexed its own yet
+        if state:
+            transcript_path = state.get('transcript_path')
+            if transcript_path and (tracked.transcript is None or str(tracked.transcript.path) != transcript_path):
+                tracked.transcript = _Tail(transcript_path)
+                progress.transcript_file = transcript_path
+            count = state.get('continuation_count', 0)
+            if isinstance(count, int) and count > progress.continuation_count:
+                progress.continuation_count = count
+                progress.last_activity = now
+                self._record(tracked, MILESTONE_ITERATION, f"iteration {count}", now)
+
+        if tracked.log is not None:
+            lines = tracked.log.read_lines()
+            if tracked.log.offset != progress.log_bytes:
+                progress.log_bytes = tracked.log.offset
+                progress.last_activity = now
+            for line in lines:
+                for kind, detail in extract_log_milestones(line):
+                    self._record(tracked, kind, detail, now)
+
+        if tracked.transcript is not None:
+            lines = tracked.transcript.read_lines()
+            if tracked.transcript.offset != progress.transcript_bytes:
+                progress.transcript_bytes = tracked.transcript.offset
+                progress.last_activity = now
+            for line in lines:
+                for kind, detail in extract_transcript_milestones(line):
+                    self._record(tracked, kind, detail, now)
+
+    def _record(self, tracked: _Tracked, kind: str, detail: str, now: float) -> None:
+        progress = tracked.progress
+        progress.milestone, progress.detail, progress.milestone_at = kind, detail, now
+        event = ProgressEvent(progress.worker_id, progress.issue_no, kind, detail, now)
+        if tracked.pending is None or _PRIORITY[kind] >= _PRIORITY[tracked.pending.kind]:
+            tracked.pending = event
+
+    def _take_due_event(self, tracked: _Tracked, now: float) -> Optional[ProgressEvent]:
+        if tracked.pending is None:
+            return None
+        if tracked.last_sent and now - tracked.last_sent < self.throttle_sec:
+            return None
+        event, tracked.pending = tracked.pending, None
+        tracked.last_sent = now
+        return event
+
+    def snapshot(self) -> dict[int, WorkerProgress]:
+        """Current progress per busy worker slot."""
+        return {worker_id: tracked.progress for worker_id, tracked in self._tracked.items()}
+
+    def _write_progress_file(self) -> None:
+        path = Path(self.workers_dir) / PROGRESS_FILE
+        data = {str(worker_id): asdict(progress) for worker_id, progress in sorted(self.snapshot().items())}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            tmp_path.rename(path)
+        except OSError as e:
+            _log(f"Failed to write {path}: {e}", level="WARNING")
+
+    def start(self, interval: float) -> None:
+        """Run poll() in a daemon thread every interval seconds."""
+
+        def _loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.poll()
+                except Exception as e:
+                    _log(f"Progress poll failed: {e}", level="WARNING")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=_loop, name='worker-progress', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def read_worker_progress(workers_dir: str = DEFAULT_WORKERS_DIR) -> dict[int, dict]:
+    """Read progress.json: worker_id -> WorkerProgress fields ({} if absent)."""
+    try:
+        with open(Path(workers_dir) / PROGRESS_FILE) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {int(k): v for k, v in data.items() if k.isdigit() and isinstance(v, dict)}
@@ -0,0 +1,87 @@
+"""Short-delay re-check queue for PRs whose mergeability GitHub has not computed yet.
+
+GitHub computes `mergeable` lazily, so `gh pr list` often reports `UNKNOWN`
+right after a push to the base branch. Instead of waiting for the next full
+poll, the server re-queries just those PRs on a short backoff schedule
+(10s, 30s, 90s by default) between polls.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_RECHECK_DELAYS = (10, 30, 90)
+
+
+@dataclass
+class _Pending:
+    """A PR waiting for its mergeable state to resolve."""
+
+    pr_no: int
+    attempt: int
+    due_at: float
+
+
+class MergeableRecheckQueue:
+    """Schedule re-queries of PRs reported as mergeable == UNKNOWN.
+
+    Times are caller-supplied monotonic seconds, so the queue itself never
+    sleeps or reads the clock.
+    """
+
+    def __init__(self, delays: tuple[int, ...] = DEFAULT_RECHECK_DELAYS):
+        self.delays = tuple(delays)
+        self._pending: dict[int, _Pending] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, pr_no: int) -> bool:
+        return pr_no in self._pending
+
+    def sync(self, prs: list[dict], now: float) -> None:
+        """Track UNKNOWN PRs from a full poll and drop PRs that resolved or closed.
+
+        A PR already in the queue keeps its place in the backoff schedule.
+        """
+        unknown = {pr.get('number') for pr in prs if pr.get('mergeable') == 'UNKNOWN'}
+        for pr_no in list(self._pending):
+            if pr_no not in unknown:
+                del self._pending[pr_no]
+        if not self.delays:
+            self._pending.clear()
+            return
+        for pr_no in unknown:
+            if pr_no is not None and pr_no not in self._pending:
+                self._pending[pr_no] = _Pending(pr_no, 0, now + self.delays[0])
+
+    def seconds_until_due(self, now: float) -> Optional[float]:
+        """Seconds until the earliest re-check (0 if overdue), or None if empty."""
+        if not self._pending:
+            return None
+        return max(0.0, min(p.due_at for p in self._pending.values()) - now)
+
+    def due(self, now: float) -> list[int]:
+        """PR numbers whose re-check time has come, earliest first."""
+        ready = [p for p in self._pending.values() if p.due_at <= now]
+        return [p.pr_no for p in sorted(ready, key=lambda p: p.due_at)]
+
+    def record(self, pr_no: int, mergeable: Optional[str], now: float) -> None:
+        """Record a re-check result.
+
+        A resolved state (or a failed query, passed as None) leaves the queue;
+        the next full poll picks the PR up again. A PR still UNKNOWN moves to
+        the next delay, and leaves the queue once the schedule is exhausted.
+        """
+        pending = self._pending.get(pr_no)
+        if pending is None:
+            return
+        if mergeable != 'UNKNOWN':
+            del self._pending[pr_no]
+            return
+        pending.attempt += 1
+        if pending.attempt >= len(self.delays):
+            del self._pending[pr_no]
+            return
+        pending.due_at = now + self.delays[pending.attempt]
@@ -35,6 +35,8 @@ VALID_TOP_LEVEL_KEYS = {
     "project", "git", "agentize", "worktree", "pre_commit",  # Metadata keys (shared with .agentize.yaml)
     "permissions",  # User-configurable permission rules
     "planner",  # Planner backend configuration
+    "gc",  # .tmp artifact garbage collection (agentize.tmp_gc)
+    "acw",  # Provider concurrency and rate limits (workflow.api.limiter)
 }
 
 # Valid workflow names
@@ -1,12 +1,51 @@
-"""Session state file lookups for the server module."""
+"""Session state file lookups for the server module.
+
+``SessionIndex`` keeps hooked-session state in memory, refreshed from an
+inotify watch where available (mtime scan otherwise), so per-issue lookups do
+not re-read JSON files that hooks may be rewriting.
+"""
 
 from __future__ import annotations
 
+import ctypes
+import ctypes.util
 import json
 import os
+import struct
+import sys
+import time
 from pathlib import Path
 from typing import Optional
 
+# Add .claude-plugin to path for shared helper import
+_repo_root = Path(__file__).resolve().parents[3]
+_plugin_dir = _repo_root / ".claude-plugin"
+if str(_plugin_dir) not in sys.path:
+    sys.path.insert(0, str(_plugin_dir))
+
+from lib.session_utils import update_session_state
+
+from agentize.server.log import _log
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Files modified this recently are reloaded on every scan: a same-size rewrite
+# within one filesystem timestamp tick would otherwise look unchanged
+_RACY_WINDOW_SEC = 2.0
+
 
 def _resolve_session_dir(base_dir: Optional[str] = None) -> Path:
     """Returns hooked-sessions directory using AGENTIZE_HOME fallback.
@@ -64,8 +103,229 @@ def _load_session_state(session_id: str, session_dir: Path) -> Optional[dict]:
         return None
 
 
+class _Inotify:
+    """Minimal non-blocking inotify wrapper (Linux, via libc)."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+    def add_watch(self, path: Path) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed: {path}')
+        return wd
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Drain pending events as (wd, mask, name) tuples."""
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+                offset += length
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SessionIndex:
+    """In-memory index of ``{session_id}.json`` and ``by-issue/{n}.json`` files.
+
+    Call ``refresh()`` before querying. With inotify only files named in
+    change events are re-read; otherwise files are re-read when their
+    (mtime, size, inode) stamp changes. A file that fails to parse keeps its
+    last good state and is retried on the next refresh.
+    """
+
+    def __init__(self, session_dir: Path, use_inotify: bool = True):
+        self.session_dir = Path(session_dir)
+        self._sessions: dict[str, dict] = {}
+        self._issues: dict[int, str] = {}
+        self._stamps: dict[Path, tuple[int, int, int]] = {}
+        self._retry: set[Path] = set()
+        self._watches: dict[int, Path] = {}
+        self._watcher: Optional[_Inotify] = None
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self._watcher = _Inotify()
+            except (OSError, AttributeError) as e:
+                _log(f"inotify unavailable for session index, using mtime scan: {e}", level="WARNING")
+
+    @property
+    def mode(self) -> str:
+        """``inotify`` or ``scan``."""
+        return 'inotify' if self._watcher is not None else 'scan'
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the session directory."""
+        if self._watcher is None:
+            self._scan_dir(self.session_dir)
+            self._scan_dir(self.session_dir / 'by-issue')
+            return
+
+        for directory in self._add_missing_watches():
+            self._scan_dir(directory)
+
+        changed: set[Path] = set(self._retry)
+        self._retry.clear()
+        for wd, mask, name in self._watcher.read_events():
+            if mask & _IN_Q_OVERFLOW:
+                self._scan_dir(self.session_dir)
+                self._scan_dir(self.session_dir / 'by-issue')
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & (_IN_IGNORED | _IN_DELETE_SELF):
+                # Directory removed: forget its entries; re-watched once it reappears
+                del self._watches[wd]
+                for path in [p for p in self._stamps if p.parent == directory]:
+                    self._drop(path)
+                continue
+            if mask & _IN_ISDIR:
+                continue
+            changed.add(directory / name)
+
+        for directory in self._add_missing_watches():
+            self._scan_dir(directory)
+        for path in changed:
+            if path.exists():
+                self._load(path)
+            else:
+                self._drop(path)
+
+    def _add_missing_watches(self) -> list[Path]:
+        """Watch the session and by-issue directories once they exist."""
+        added = []
+        watched = set(self._watches.values())
+        for directory in (self.session_dir, self.session_dir / 'by-issue'):
+            if directory in watched or not directory.is_dir():
+                continue
+            try:
+                self._watches[self._watcher.add_watch(directory)] = directory
+                added.append(directory)
+            except OSError as e:
+                _log(f"inotify watch failed, using mtime scan: {e}", level="WARNING")
+                self._watcher.close()
+                self._watcher = None
+                return [self.session_dir, self.session_dir / 'by-issue']
+        return added
+
+    def _scan_dir(self, directory: Path) -> None:
+        present = set()
+        now = time.time()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.name.endswith('.json') or entry.name.startswith('.') or not entry.is_file():
+                continue
+            path = Path(entry.path)
+            present.add(path)
+            st = entry.stat()
+            stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+            if stamp != self._stamps.get(path) or now - st.st_mtime < _RACY_WINDOW_SEC or path in self._retry:
+                self._retry.discard(path)
+                self._load(path, stamp)
+        for path in [p for p in self._stamps if p.parent == directory and p not in present]:
+            self._drop(path)
+
+    def _load(self, path: Path, stamp: Optional[tuple[int, int, int]] = None) -> None:
+        if path.name.startswith('.') or path.suffix != '.json':
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if stamp is None:
+                st = path.stat()
+                stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except (OSError, json.JSONDecodeError):
+            self._retry.add(path)
+            return
+        if not isinstance(data, dict):
+            return
+
+        self._stamps[path] = stamp
+        if path.parent == self.session_dir:
+            self._sessions[path.stem] = data
+        elif path.stem.isdigit() and data.get('session_id'):
+            self._issues[int(path.stem)] = data['session_id']
+
+    def _drop(self, path: Path) -> None:
+        self._stamps.pop(path, None)
+        self._retry.discard(path)
+        if path.parent == self.session_dir:
+            self._sessions.pop(path.stem, None)
+        elif path.stem.isdigit():
+            self._issues.pop(int(path.stem), None)
+
+    def forget_issue(self, issue_no: int) -> None:
+        """Drop an issue mapping immediately (its index file was removed)."""
+        self._drop(self.session_dir / 'by-issue' / f'{issue_no}.json')
+
+    def get(self, session_id: str) -> Optional[dict]:
+        """Session state by session ID."""
+        state = self._sessions.get(session_id)
+        return dict(state) if state is not None else None
+
+    def session_for_issue(self, issue_no: int) -> Optional[str]:
+        """Session ID recorded in the issue's by-issue index."""
+        return self._issues.get(int(issue_no))
+
+    def for_issue(self, issue_no: int) -> Optional[dict]:
+        """Session state of the session indexed for an issue."""
+        session_id = self.session_for_issue(issue_no)
+        return self.get(session_id) if session_id is not None else None
+
+    def query(
+        self,
+        *,
+        issue_no: Optional[int] = None,
+        workflow: Optional[str] = None,
+        state: Optional[str] = None,
+    ) -> list[tuple[str, dict]]:
+        """Sessions matching every given filter, as (session_id, state) pairs."""
+        matches = []
+        for session_id, data in sorted(self._sessions.items()):
+            if issue_no is not None and str(data.get('issue_no')) != str(issue_no):
+                continue
+            if workflow is not None and data.get('workflow') != workflow:
+                continue
+            if state is not None and data.get('state') != state:
+                continue
+            matches.append((session_id, dict(data)))
+        return matches
+
+
+_session_indexes: dict[Path, SessionIndex] = {}
+
+
+def get_session_index(session_dir: Path) -> SessionIndex:
+    """Process-wide SessionIndex for a session directory (refreshed by the caller)."""
+    key = Path(session_dir).absolute()
+    index = _session_indexes.get(key)
+    if index is None:
+        index = _session_indexes[key] = SessionIndex(key)
+    return index
+
+
 def _get_session_state_for_issue(issue_no: int, session_dir: Path) -> Optional[dict]:
-    """Combined lookup: issue index -> session state.
+    """Combined lookup: issue index -> session state, served from the SessionIndex.
+
+    A pure in-memory query: the caller refreshes the index (once per cleanup
+    cycle in cleanup_dead_workers), so repeated lookups never rescan the
+    session directory.
 
     Args:
         issue_no: GitHub issue number
@@ -74,10 +334,7 @@ def _get_session_state_for_issue(issue_no: int, session_dir: Path) -> Optional[d
     Returns:
         Session state dict or None if not found
     """
-    session_id = _load_issue_index(issue_no, session_dir)
-    if session_id is None:
-        return None
-    return _load_session_state(session_id, session_dir)
+    return get_session_index(session_dir).for_issue(issue_no)
 
 
 def _remove_issue_index(issue_no: int, session_dir: Path) -> None:
@@ -93,6 +350,10 @@ def _remove_issue_index(issue_no: int, session_dir: Path) -> None:
     except OSError:
         pass  # Best effort cleanup
 
+    index = _session_indexes.get(Path(session_dir).absolute())
+    if index is not None:
+        index.forget_issue(issue_no)
+
 
 def set_pr_number_for_issue(issue_no: int, pr_number: int, session_dir: Optional[Path] = None) -> bool:
     """Best-effort persistence of PR number into session state.
@@ -113,24 +374,5 @@ def set_pr_number_for_issue(issue_no: int, pr_number: int, session_dir: Optional
     if session_id is None:
         return False
 
-    # Load existing session state
-    session_file = session_dir / f'{session_id}.json'
-    if not session_file.exists():
-        return False
-
-    try:
-        with open(session_file) as f:
-            state = json.load(f)
-
-        # Add pr_number to state
-        state['pr_number'] = pr_number
-
-        # Write back atomically
-        tmp_file = session_dir / f'{session_id}.json.tmp'
-        with open(tmp_file, 'w') as f:
-            json.dump(state, f)
-        tmp_file.rename(session_file)
-
-        return True
-    except (json.JSONDecodeError, OSError):
-        return False
+    # Locked read-modify-write shared with the hooks (see lib.session_utils)
+    return update_session_state(session_id, {'pr_number': pr_number}, str(session_dir)) is not None
@@ -0,0 +1,564 @@
+"""Server throughput simulation against a synthetic GitHub backend.
+
+Runs the real ``run_server`` polling loop on a virtual clock.
+
+- GitHub is replaced by ``FakeGitHub``, an in-process board that answers the
+  ``gh``/``scripts/gh-graphql.sh`` invocations made by ``github.py``. It extends
+  the ``AGENTIZE_GH_API=fixture`` idea to generated, stateful data.
+- Spawns are replaced by fake workers whose durations are sampled.
+- Everything else runs for real: discovery, filtering, worker status files and
+  ``cleanup_dead_workers``. Scheduler and discovery changes are measured as
+  they would ship.
+
+Usage:
+    python -m agentize.server.simulate --sizes 10,100,1000,5000 --workers 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+from unittest import mock
+
+import agentize.server.__main__ as server_main
+from agentize.server import github, workers
+from agentize.server.lifecycle import ServerLifecycle
+from agentize.server.notify import parse_period
+
+
+DEFAULT_SIZES = (10, 100, 1000, 5000)
+
+# Median worker durations in seconds, per task type (sampled log-normally)
+DEFAULT_DURATIONS = {
+    'issue': 1800.0,
+    'refine': 600.0,
+    'feat-request': 900.0,
+    'rebase': 300.0,
+    'review': 600.0,
+}
+
+SIM_OWNER = 'sim-org'
+SIM_REPO = 'sim-repo'
+SIM_PROJECT_ID = 'PVT_sim'
+
+# Fake PIDs start above the kernel's pid_max so they never match a real process
+_FAKE_PID_BASE = 1 << 23
+
+
+class _SimulationDone(BaseException):
+    """Raised from the patched wait to leave ``run_server`` (bypasses its ``except Exception``)."""
+
+
+def _flag_value(argv: list[str], name: str) -> Optional[str]:
+    """Return the value following flag ``name`` in argv, if present."""
+    try:
+        return argv[argv.index(name) + 1]
+    except (ValueError, IndexError):
+        return None
+
+
+def _field_value(argv: list[str], key: str) -> Optional[str]:
+    """Return the value of a ``-f``/``-F key=value`` GraphQL variable."""
+    prefix = f'{key}='
+    for arg in argv:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return None
+
+
+class FakeGitHub:
+    """In-process GitHub board answering the commands issued by ``github.py``.
+
+    Issues map number -> {status, labels, title}; PRs map number ->
+    {issue, mergeable, threads, settles_to}. Like GitHub, an UNKNOWN PR's
+    mergeability is computed lazily: the first query that reports UNKNOWN
+    settles it to ``settles_to`` for later queries. Every invocation is counted
+    per kind so the harness can report GitHub calls per poll cycle.
+    """
+
+    def __init__(self, api_latency_ms: float = 0.0, seed: int = 0):
+        self.issues: dict[int, dict] = {}
+        self.prs: dict[int, dict] = {}
+        self.calls: dict[str, int] = {}
+        self.api_latency = api_latency_ms / 1000.0
+        self.latency_spent = 0.0
+        self._rng = random.Random(seed)
+
+    def reset_counters(self) -> None:
+        self.calls = {}
+        self.latency_spent = 0.0
+
+    def run(self, argv: list[str], **kwargs) -> subprocess.CompletedProcess:
+        """Drop-in for ``subprocess.run`` as called from ``github.py``."""
+        kind, rc, stdout = self._dispatch(list(argv))
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+        if self.api_latency and kind != 'git':
+            self.latency_spent += self._rng.expovariate(1.0 / self.api_latency)
+        return subprocess.CompletedProcess(argv, rc, stdout, '')
+
+    def _dispatch(self, argv: list[str]) -> tuple[str, int, str]:
+        if argv[:3] == ['git', 'remote', 'get-url']:
+            return 'git', 0, f'https://github.com/{SIM_OWNER}/{SIM_REPO}.git\n'
+        if argv[:3] == ['gh', 'issue', 'list']:
+            label = _flag_value(argv, '--label')
+            numbers = [str(n) for n, issue in sorted(self.issues.items()) if label in issue['labels']]
+            return 'issue_list', 0, '\n'.join(numbers) + '\n'
+        if argv[:3] == ['gh', 'issue', 'view']:
+            issue = self.issues.get(int(argv[3]))
+            if issue is None:
+                return 'issue_view', 1, ''
+            return 'issue_view', 0, '\n'.join(sorted(issue['labels'])) + '\n'
+        if argv[:3] == ['gh', 'pr', 'list']:
+            return 'pr_list', 0, json.dumps(self._pr_list(_flag_value(argv, '--label')))
+        if argv[:3] == ['gh', 'pr', 'view']:
+            pr_no = int(argv[3])
+            if pr_no not in self.prs:
+                return 'pr_view', 1, ''
+            return 'pr_view', 0, json.dumps(self._pr_json(pr_no))
+        if argv[:3] == ['gh', 'api', 'graphql']:
+            if _field_value(argv, 'projectNumber') is not None:
+                data = {'repositoryOwner': {'projectV2': {'id': SIM_PROJECT_ID}}}
+                return 'project_lookup', 0, json.dumps({'data': data})
+            return 'issue_status', 0, json.dumps({'data': self._issue_status(int(_field_value(argv, 'number')))})
+        if argv[:2] == ['scripts/gh-graphql.sh', 'review-threads']:
+            return 'review_threads', 0, json.dumps({'data': self._review_threads(int(argv[4]))})
+        return 'unknown', 1, ''
+
+    def _pr_list(self, label: Optional[str]) -> list[dict]:
+        if label != 'agentize:pr':
+            return []
+        return [self._pr_json(pr_no) for pr_no in sorted(self.prs)]
+
+    def _pr_json(self, pr_no: int) -> dict:
+        pr = self.prs[pr_no]
+        data = {
+            'number': pr_no,
+            'headRefName': f"issue-{pr['issue']}-sim",
+            'mergeable': pr['mergeable'],
+            'body': f"Resolves #{pr['issue']}",
+            'closingIssuesReferences': [{'number': pr['issue']}],
+            'state': 'OPEN',
+        }
+        if pr['mergeable'] == 'UNKNOWN' and 'settles_to' in pr:
+            pr['mergeable'] = pr.pop('settles_to')
+        return data
+
+    def _issue_status(self, issue_no: int) -> dict:
+        issue = self.issues.get(issue_no)
+        if issue is None:
+            return {'repository': {'issue': None}}
+        values = [{'field': {'name': 'Status'}, 'name': issue['status']}] if issue['status'] else []
+        item = {'project': {'id': SIM_PROJECT_ID}, 'fieldValues': {'nodes': values}}
+        return {'repository': {'issue': {'projectItems': {'nodes': [item]}}}}
+
+    def _review_threads(self, pr_no: int) -> dict:
+        threads = [
+            {'id': f'T{pr_no}-{i}', 'isResolved': False, 'isOutdated': False}
+            for i in range(self.prs.get(pr_no, {}).get('threads', 0))
+        ]
+        page = {'nodes': threads, 'pageInfo': {'hasNextPage': False}}
+        return {'repository': {'pullRequest': {'reviewThreads': page}}}
+
+
+def generate_board(fake: FakeGitHub, n: int, seed: int = 0) -> None:
+    """Populate ``fake`` with ``n`` issues and ``n // 5`` PRs in mixed states.
+
+    Roughly: 30% Plan Accepted, 10% awaiting refinement, 10% dev-req, and the
+    rest in states the server must skip (Proposed, In Progress, Done). Each PR
+    links a Done issue with a worktree; 20% conflict, 10% report UNKNOWN
+    mergeability (half of which settle to CONFLICTING), and 20% carry
+    unresolved review threads.
+    """
+    rng = random.Random(seed)
+    fake.issues.clear()
+    fake.prs.clear()
+    for issue_no in range(1, n + 1):
+        roll = rng.random()
+        if roll < 0.3:
+            status, labels = 'Plan Accepted', {'agentize:plan'}
+        elif roll < 0.4:
+            status, labels = 'Proposed', {'agentize:plan', 'agentize:refine'}
+        elif roll < 0.5:
+            status, labels = 'Proposed', {'agentize:dev-req'}
+        elif roll < 0.7:
+            status, labels = 'Proposed', {'agentize:plan'}
+        elif roll < 0.8:
+            status, labels = 'In Progress', {'agentize:plan'}
+        else:
+            status, labels = 'Done', {'agentize:plan'}
+        fake.issues[issue_no] = {'status': status, 'labels': labels, 'title': f'Simulated issue {issue_no}'}
+
+    for i in range(n // 5):
+        pr_no = n + 1 + i
+        issue_no = n + 1 + n // 5 + i
+        roll = rng.random()
+        mergeable = 'CONFLICTING' if roll < 0.2 else 'UNKNOWN' if roll < 0.3 else 'MERGEABLE'
+        threads = rng.randint(1, 3) if rng.random() < 0.2 else 0
+        fake.issues[issue_no] = {
+            'status': 'Proposed' if threads else 'Done',
+            'labels': {'agentize:plan'},
+            'title': f'Simulated issue {issue_no}',
+            'worktree': True,
+        }
+        fake.prs[pr_no] = {'issue': issue_no, 'mergeable': mergeable, 'threads': threads}
+        if mergeable == 'UNKNOWN':
+            fake.prs[pr_no]['settles_to'] = 'CONFLICTING' if rng.random() < 0.5 else 'MERGEABLE'
+
+
+@dataclass
+class _Job:
+    task: str
+    issue_no: int
+    pr_no: Optional[int]
+    start: float
+    finish: float
+
+
+@dataclass
+class SimulationResult:
+    """Metrics for one simulated board size."""
+
+    n: int
+    num_workers: int
+    period: int
+    cycles: int = 0
+    poll_latency: list[float] = field(default_factory=list)
+    gh_calls: list[int] = field(default_factory=list)
+    gh_calls_by_kind: dict[str, int] = field(default_factory=dict)
+    time_to_assignment: list[float] = field(default_factory=list)
+    assigned: dict[str, int] = field(default_factory=dict)
+    completed: int = 0
+    busy_seconds: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        capacity = self.num_workers * self.elapsed
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    def summary(self) -> dict:
+        return {
+            'n': self.n,
+            'cycles': self.cycles,
+            'poll_latency_ms': _percentiles([t * 1000 for t in self.poll_latency]),
+            'gh_calls_per_cycle': _percentiles(self.gh_calls),
+            'gh_calls_by_kind': {
+                kind: round(count / self.cycles, 1) for kind, count in sorted(self.gh_calls_by_kind.items())
+            } if self.cycles else {},
+            'time_to_assignment_s': _percentiles(self.time_to_assignment),
+            'assigned': dict(sorted(self.assigned.items())),
+            'completed': self.completed,
+            'worker_utilization': round(self.utilization, 3),
+        }
+
+
+def _percentiles(values: list[float]) -> dict:
+    """Return p50/p95/max (nearest-rank) of values, rounded for display."""
+    if not values:
+        return {'p50': 0, 'p95': 0, 'max': 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+    return {'p50': round(rank(0.5), 1), 'p95': round(rank(0.95), 1), 'max': round(ordered[-1], 1)}
+
+
+class _Simulator:
+    """Virtual clock, fake workers and board transitions for one run."""
+
+    def __init__(self, fake: FakeGitHub, result: SimulationResult, cycles: int,
+                 durations: dict[str, float], sigma: float, seed: int):
+        self.fake = fake
+        self.result = result
+        self.max_cycles = cycles
+        self.durations = durations
+        self.sigma = sigma
+        self.rng = random.Random(seed)
+        self.now = 0.0
+        self.jobs: dict[int, _Job] = {}
+        self.next_pid = _FAKE_PID_BASE
+        self.cycle_started = time.perf_counter()
+        self.spawned_this_cycle = 0
+        self.wait_started: Optional[float] = None
+
+    # -- virtual clock ---------------------------------------------------
+
+    def sleep(self, seconds: float) -> None:
+        """End a poll cycle: record metrics, advance the clock, maybe stop.
+
+        A wait that ends before the poll period is up is a PR re-check
+        wake-up inside the current cycle: only the clock advances.
+        """
+        if self.wait_started is None:
+            self.wait_started = self.now
+        if self.now + seconds < self.wait_started + self.result.period:
+            self._advance(seconds)
+            return
+        self.wait_started = None
+
+        self.result.poll_latency.append(time.perf_counter() - self.cycle_started + self.fake.latency_spent)
+        self.result.gh_calls.append(sum(n for kind, n in self.fake.calls.items() if kind != 'git'))
+        for kind, n in self.fake.calls.items():
+            self.result.gh_calls_by_kind[kind] = self.result.gh_calls_by_kind.get(kind, 0) + n
+        self.result.cycles += 1
+
+        idle = not self.jobs and self.spawned_this_cycle == 0
+        if self.result.cycles >= self.max_cycles or idle:
+            raise _SimulationDone()
+
+        self._advance(seconds)
+        self.fake.reset_counters()
+        self.spawned_this_cycle = 0
+        self.cycle_started = time.perf_counter()
+
+    def _advance(self, seconds: float) -> None:
+        self.now += seconds
+        if self.result.num_workers == 0:
+            # Unlimited mode keeps no worker status files; finish jobs by the clock
+            for pid in [pid for pid, job in self.jobs.items() if job.finish <= self.now]:
+                self._complete(pid)
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def lifecycle_class(self) -> type:
+        """ServerLifecycle whose inter-cycle wait is the virtual clock (no signal handlers)."""
+        sim = self
+
+        class _SimLifecycle(ServerLifecycle):
+            def install_signal_handlers(self) -> None:
+                pass
+
+            def wait(self, seconds: float) -> None:
+                sim.sleep(seconds)
+
+        return _SimLifecycle
+
+    # -- fake workers ----------------------------------------------------
+
+    def is_alive(self, worker_id: int, workers_dir: str = workers.DEFAULT_WORKERS_DIR) -> bool:
+        status = workers.read_worker_status(worker_id, workers_dir)
+        job = self.jobs.get(status.get('pid'))
+        if status.get('state') != 'BUSY' or job is None:
+            return True
+        if self.now < job.finish:
+            return True
+        self._complete(status['pid'])
+        return False
+
+    def _spawn(self, task: str, issue_no: int, pr_no: Optional[int] = None) -> tuple[bool, Optional[int]]:
+        median = self.durations.get(task, 600.0)
+        duration = self.rng.lognormvariate(math.log(median), self.sigma)
+        pid = self.next_pid
+        self.next_pid += 1
+        self.jobs[pid] = _Job(task, issue_no, pr_no, self.now, self.now + duration)
+        self.spawned_this_cycle += 1
+        self.result.assigned[task] = self.result.assigned.get(task, 0) + 1
+        # Every candidate is ready from t=0, so time-to-assignment is the spawn time
+        self.result.time_to_assignment.append(self.now)
+        self._start_transition(task, issue_no, pr_no)
+        return True, pid
+
+    def _start_transition(self, task: str, issue_no: int, pr_no: Optional[int]) -> None:
+        """Apply the board change a real worker makes when it starts."""
+        issue = self.fake.issues[issue_no]
+        if task == 'issue':
+            issue['status'] = 'In Progress'
+            issue['worktree'] = True
+        elif task == 'refine':
+            issue['status'] = 'Refining'
+        elif task in ('feat-request', 'review'):
+            issue['status'] = 'In Progress'
+        elif task == 'rebase':
+            issue['prev_status'] = issue['status']
+            issue['status'] = 'Rebasing'
+
+    def _complete(self, pid: int) -> None:
+        """Apply the board change a real worker makes when it finishes."""
+        job = self.jobs.pop(pid)
+        self.result.completed += 1
+        self.result.busy_seconds += job.finish - job.start
+        issue = self.fake.issues[job.issue_no]
+        if job.task == 'issue':
+            issue['status'] = 'Done'
+        elif job.task == 'refine':
+            issue['labels'].discard('agentize:refine')
+            issue['status'] = 'Proposed'
+        elif job.task == 'feat-request':
+            issue['labels'] = (issue['labels'] - {'agentize:dev-req'}) | {'agentize:plan'}
+            issue['status'] = 'Proposed'
+        elif job.task == 'rebase':
+            self.fake.prs[job.pr_no]['mergeable'] = 'MERGEABLE'
+            issue['status'] = issue.pop('prev_status', 'Done')
+        elif job.task == 'review':
+            self.fake.prs[job.pr_no]['threads'] = 0
+            issue['status'] = 'Done'
+
+    def finish(self) -> None:
+        """Credit busy time of jobs still running when the simulation stops."""
+        self.result.elapsed = self.now
+        for job in self.jobs.values():
+            self.result.busy_seconds += max(0.0, min(job.finish, self.now) - job.start)
+
+    def worktree_exists(self, issue_no: int) -> bool:
+        return bool(self.fake.issues.get(issue_no, {}).get('worktree'))
+
+    def deps(self) -> server_main.ServerDeps:
+        """Server dependencies backed by the virtual clock and fake workers.
+
+        Config resolvers return fixed settings, so no YAML, Telegram, leases,
+        history, health checks or progress threads are involved.
+        """
+        return server_main.ServerDeps(
+            load_config=lambda: (SIM_OWNER, 1, f'https://github.com/{SIM_OWNER}/{SIM_REPO}'),
+            resolve_server_settings=lambda: (self.result.period, self.result.num_workers),
+            resolve_tg_credentials=lambda: ('', ''),
+            # Relative: run_server runs inside the scratch directory
+            resolve_session_dir=lambda: Path('.tmp', 'hooked-sessions'),
+            resolve_log_retention=lambda: (None, None, False),
+            resolve_gc_interval=lambda: 0,
+            resolve_progress_settings=lambda: (0, 0),
+            resolve_health_policy=lambda: None,
+            resolve_task_history=lambda: None,
+            resolve_lease_keeper=lambda period, repo_slug: None,
+            resolve_recheck_delays=lambda: server_main.DEFAULT_RECHECK_DELAYS,
+            enforce_log_retention=lambda **kwargs: None,
+            run_gc=lambda: None,
+            monotonic=self.monotonic,
+            lifecycle=self.lifecycle_class(),
+            is_alive=self.is_alive,
+            worktree_exists=self.worktree_exists,
+            spawn_worktree=lambda issue_no: self._spawn('issue', issue_no),
+            resume_worktree=lambda issue_no: self._spawn('issue', issue_no),
+            spawn_refinement=lambda issue_no: self._spawn('refine', issue_no),
+            spawn_feat_request=lambda issue_no: self._spawn('feat-request', issue_no),
+            rebase_worktree=lambda pr_no, issue_no: self._spawn('rebase', issue_no, pr_no),
+            spawn_review_resolution=lambda pr_no, issue_no: self._spawn('review', issue_no, pr_no),
+        )
+
+    def patches(self) -> list:
+        """Point ``github.py`` at the fake board (GitHub is faked at the ``gh`` call boundary)."""
+        return [
+            mock.patch.object(github, 'subprocess', SimpleNamespace(run=self.fake.run)),
+            mock.patch.dict(github._project_id_cache, clear=True),
+        ]
+
+
+def run_simulation(
+    n: int,
+    num_workers: int = 5,
+    period: int = 300,
+    cycles: int = 50,
+    *,
+    durations: Optional[dict[str, float]] = None,
+    sigma: float = 0.5,
+    api_latency_ms: float = 0.0,
+    seed: int = 0,
+    verbose: bool = False,
+) -> SimulationResult:
+    """Run ``run_server`` against a generated board of size ``n``.
+
+    Stops after ``cycles`` poll cycles, or earlier once a cycle neither spawns
+    nor has running workers. Runs in a temporary directory so worker status
+    files never touch the real ``.tmp``.
+
+    Args:
+        n: Number of generated issues (PRs are n // 5 more)
+        num_workers: Worker slots (0 = unlimited)
+        period: Virtual poll interval in seconds
+        cycles: Maximum number of poll cycles
+        durations: Median worker duration per task type (seconds)
+        sigma: Log-normal shape of sampled durations
+        api_latency_ms: Mean simulated latency per GitHub call, added to poll latency
+        seed: Seed for board generation and duration sampling
+        verbose: Keep the server's stdout/stderr instead of discarding it
+    """
+    fake = FakeGitHub(api_latency_ms=api_latency_ms, seed=seed)
+    generate_board(fake, n, seed=seed)
+    result = SimulationResult(n=n, num_workers=num_workers, period=period)
+    sim = _Simulator(fake, result, cycles, {**DEFAULT_DURATIONS, **(durations or {})}, sigma, seed)
+
+    cwd = os.getcwd()
+    sink = io.StringIO()
+    with tempfile.TemporaryDirectory(prefix='agentize-sim-') as workdir, contextlib.ExitStack() as stack:
+        for patch in sim.patches():
+            stack.enter_context(patch)
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(sink))
+            stack.enter_context(contextlib.redirect_stderr(sink))
+        os.chdir(workdir)
+        try:
+            sim.cycle_started = time.perf_counter()
+            server_main.run_server(period, num_workers, sim.deps())
+        except _SimulationDone:
+            pass
+        finally:
+            os.chdir(cwd)
+    sim.finish()
+    return result
+
+
+def format_table(results: list[SimulationResult]) -> str:
+    """Render results as a fixed-width table."""
+    header = f"{'N':>6}  {'cycles':>6}  {'poll p50/p95 ms':>16}  {'gh calls/cycle':>15}  {'TTA p50/p95 s':>15}  {'util':>5}"
+    lines = [header, '-' * len(header)]
+    for r in results:
+        s = r.summary()
+        poll = f"{s['poll_latency_ms']['p50']}/{s['poll_latency_ms']['p95']}"
+        calls = f"{s['gh_calls_per_cycle']['p50']}/{s['gh_calls_per_cycle']['max']}"
+        tta = f"{s['time_to_assignment_s']['p50']:.0f}/{s['time_to_assignment_s']['p95']:.0f}"
+        lines.append(f"{r.n:>6}  {r.cycles:>6}  {poll:>16}  {calls:>15}  {tta:>15}  {s['worker_utilization']:>5.2f}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m agentize.server.simulate',
+        description='Benchmark the server polling loop against a synthetic GitHub board',
+    )
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help='Comma-separated board sizes (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=5, help='Worker slots, 0 = unlimited (default: 5)')
+    parser.add_argument('--period', default='5m', help='Virtual poll period, Nm or Ns (default: 5m)')
+    parser.add_argument('--cycles', type=int, default=50, help='Maximum poll cycles per size (default: 50)')
+    parser.add_argument('--api-latency-ms', type=float, default=0.0,
+                        help='Mean simulated latency per GitHub call (default: 0)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Print JSON summaries instead of a table')
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(s) for s in re.split(r'[,\s]+', args.sizes.strip()) if s]
+        period = parse_period(args.period)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    results = [
+        run_simulation(n, args.workers, period, args.cycles, api_latency_ms=args.api_latency_ms, seed=args.seed)
+        for n in sizes
+    ]
+    if args.json:
+        print(json.dumps([r.summary() for r in results], indent=2))
+    else:
+        print(format_table(results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
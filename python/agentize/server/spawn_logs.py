@@ -0,0 +1,348 @@
+"""Spawn log index, compression, retention and tailing for the server module."""
+
+from __future__ import annotations
+
+import fcntl
+import gzip
+import json
+import os
+import shutil
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from agentize.server.log import _log
+
+
+INDEX_FILE = 'index.json'
+INDEX_LOCK_FILE = f'.{INDEX_FILE}.lock'
+
+
+def _resolve_logs_dir(base_dir: Optional[str] = None) -> Path:
+    """Returns the spawn log directory using AGENTIZE_HOME fallback.
+
+    Args:
+        base_dir: Optional base directory override. If None, uses AGENTIZE_HOME or '.'
+
+    Returns:
+        Path to .tmp/logs directory
+    """
+    base = base_dir or os.getenv('AGENTIZE_HOME', '.')
+    return Path(base) / '.tmp' / 'logs'
+
+
+def _load_index(logs_dir: Path) -> dict[str, dict]:
+    """Load the log index, returning an empty index on missing or malformed files."""
+    index_file = logs_dir / INDEX_FILE
+    if not index_file.exists():
+        return {}
+    try:
+        with open(index_file) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_index(logs_dir: Path, index: dict[str, dict]) -> None:
+    """Write the log index atomically (per-process temp file + rename)."""
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = logs_dir / f'.{INDEX_FILE}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_file, logs_dir / INDEX_FILE)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def _index_lock(logs_dir: Path) -> Iterator[None]:
+    """Hold the index's exclusive advisory lock around a read-modify-write.
+
+    The server, `lol gc` and other servers sharing AGENTIZE_HOME all update
+    the index; without the lock one writer's entries can be lost.
+    """
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    with open(logs_dir / INDEX_LOCK_FILE, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def new_spawn_log(task: str, key: int | str, logs_dir: Optional[Path] = None) -> Path:
+    """Create the log directory and return a fresh timestamped log path.
+
+    Args:
+        task: Task type used as filename prefix (e.g., 'refine', 'feat-request')
+        key: Issue or PR number used in the filename
+        logs_dir: Log directory (uses AGENTIZE_HOME/.tmp/logs if None)
+
+    Returns:
+        Path to the (not yet created) log file
+    """
+    logs_dir = logs_dir or _resolve_logs_dir()
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    return logs_dir / f'{task}-{key}-{int(time.time())}.log'
+
+
+def record_spawn_log(
+    log_file: str | Path,
+    *,
+    task: Optional[str] = None,
+    issue_no: Optional[int] = None,
+    pr_no: Optional[int] = None,
+    pid: Optional[int] = None,
+    logs_dir: Optional[Path] = None,
+) -> None:
+    """Insert or update the index entry for a spawn log.
+
+    Only non-None fields overwrite existing values, so callers can record the
+    log before spawning and add the PID afterwards.
+    """
+    log_file = Path(log_file)
+    logs_dir = logs_dir or log_file.parent
+    with _index_lock(logs_dir):
+        index = _load_index(logs_dir)
+        entry = index.get(log_file.name, {
+            'task': None,
+            'issue': None,
+            'pr': None,
+            'pid': None,
+            'start': time.time(),
+            'end': None,
+            'exit_code': None,
+            'compressed': False,
+        })
+        for key, value in (('task', task), ('issue', issue_no), ('pr', pr_no), ('pid', pid)):
+            if value is not None:
+                entry[key] = value
+        index[log_file.name] = entry
+        _save_index(logs_dir, index)
+
+
+def _compress_log(path: Path) -> Optional[Path]:
+    """Gzip a finished log in place. Returns the compressed path or None on failure."""
+    gz_path = path.with_name(path.name + '.gz')
+    try:
+        with open(path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        path.unlink()
+        return gz_path
+    except OSError as e:
+        _log(f"Failed to compress log {path}: {e}", level="WARNING")
+        gz_path.unlink(missing_ok=True)
+        return None
+
+
+def finish_spawn_logs_for_pid(
+    pid: int,
+    exit_code: Optional[int] = None,
+    *,
+    compress: bool = True,
+    logs_dir: Optional[Path] = None,
+) -> list[Path]:
+    """Mark every open log owned by pid as finished and optionally compress it.
+
+    Args:
+        pid: Worker process ID recorded via record_spawn_log()
+        exit_code: Exit status if known (None when the process was not our child)
+        compress: Gzip finished logs to save disk space
+        logs_dir: Log directory (uses AGENTIZE_HOME/.tmp/logs if None)
+
+    Returns:
+        Paths of the finished logs (compressed paths when compression succeeded)
+    """
+    logs_dir = logs_dir or _resolve_logs_dir()
+    if not logs_dir.is_dir():
+        return []
+    finished = []
+    with _index_lock(logs_dir):
+        index = _load_index(logs_dir)
+        for name, entry in index.items():
+            if entry.get('pid') != pid or entry.get('end') is not None:
+                continue
+            entry['end'] = time.time()
+            entry['exit_code'] = exit_code
+            path = logs_dir / name
+            if compress and path.exists():
+                gz_path = _compress_log(path)
+                if gz_path is not None:
+                    entry['compressed'] = True
+                    path = gz_path
+            finished.append(path)
+        if finished:
+            _save_index(logs_dir, index)
+    return finished
+
+
+def find_spawn_logs(
+    *,
+    task: Optional[str] = None,
+    issue_no: Optional[int] = None,
+    pr_no: Optional[int] = None,
+    pid: Optional[int] = None,
+    logs_dir: Optional[Path] = None,
+) -> list[dict]:
+    """Look up indexed logs by task, issue, PR or worker PID, newest first.
+
+    Returns:
+        List of index entries with an added 'path' key pointing at the
+        current file (the .gz path once compressed)
+    """
+    logs_dir = logs_dir or _resolve_logs_dir()
+    matches = []
+    for name, entry in _load_index(logs_dir).items():
+        if task is not None and entry.get('task') != task:
+            continue
+        if issue_no is not None and entry.get('issue') != issue_no:
+            continue
+        if pr_no is not None and entry.get('pr') != pr_no:
+            continue
+        if pid is not None and entry.get('pid') != pid:
+            continue
+        path = logs_dir / (name + '.gz' if entry.get('compressed') else name)
+        matches.append({**entry, 'path': path})
+    matches.sort(key=lambda e: e.get('start') or 0, reverse=True)
+    return matches
+
+
+def enforce_log_retention(
+    *,
+    max_total_bytes: Optional[int] = None,
+    max_age_sec: Optional[float] = None,
+    logs_dir: Optional[Path] = None,
+    now: Optional[float] = None,
+) -> int:
+    """Delete finished logs older than max_age_sec, then oldest-first until under max_total_bytes.
+
+    Logs whose index entry is still open with a live PID are never deleted.
+    Unindexed logs (e.g., written before the index existed) are treated as
+    finished once their mtime is older than max_age_sec.
+
+    Returns:
+        Number of bytes reclaimed
+    """
+    logs_dir = logs_dir or _resolve_logs_dir()
+    if not logs_dir.is_dir():
+        return 0
+    now = now if now is not None else time.time()
+    with _index_lock(logs_dir):
+        reclaimed = _apply_log_retention(logs_dir, max_total_bytes, max_age_sec, now)
+    if reclaimed:
+        _log(f"Log retention reclaimed {reclaimed} bytes in {logs_dir}")
+    return reclaimed
+
+
+def _apply_log_retention(
+    logs_dir: Path,
+    max_total_bytes: Optional[int],
+    max_age_sec: Optional[float],
+    now: float,
+) -> int:
+    """Body of enforce_log_retention(), run under the index lock."""
+    index = _load_index(logs_dir)
+
+    candidates = []  # (mtime, size, path, index_name)
+    total = 0
+    with os.scandir(logs_dir) as entries:
+        for dirent in entries:
+            if not dirent.is_file() or dirent.name.startswith((INDEX_FILE, '.')):
+                continue
+            try:
+                stat = dirent.stat()
+            except OSError:
+                continue
+            total += stat.st_size
+            index_name = dirent.name[:-3] if dirent.name.endswith('.gz') else dirent.name
+            entry = index.get(index_name)
+            if entry and entry.get('end') is None and _pid_alive(entry.get('pid')):
+                continue
+            candidates.append((stat.st_mtime, stat.st_size, Path(dirent.path), index_name))
+
+    candidates.sort()
+    reclaimed = 0
+    for mtime, size, path, index_name in candidates:
+        expired = max_age_sec is not None and now - mtime > max_age_sec
+        over_budget = max_total_bytes is not None and total - reclaimed > max_total_bytes
+        if not expired and not over_budget:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        reclaimed += size
+        index.pop(index_name, None)
+
+    if reclaimed:
+        _save_index(logs_dir, index)
+    return reclaimed
+
+
+def _open_log_text(path: Path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', errors='replace')
+    return open(path, errors='replace')
+
+
+def tail_log(log_file: str | Path, lines: int = 20) -> list[str]:
+    """Return the last N lines of a log (plain or gzip-compressed)."""
+    path = Path(log_file)
+    if not path.exists() and path.with_name(path.name + '.gz').exists():
+        path = path.with_name(path.name + '.gz')
+    if not path.exists():
+        return []
+    with _open_log_text(path) as f:
+        tail = deque(f, maxlen=lines)
+    return [line.rstrip('\n') for line in tail]
+
+
+def follow_log(
+    log_file: str | Path,
+    *,
+    poll_interval: float = 1.0,
+    stop: Optional[Callable[[], bool]] = None,
+    from_start: bool = False,
+) -> Iterator[str]:
+    """Yield lines appended to a live log using offset polling.
+
+    Stops when stop() returns True or when the log is finished (removed or
+    replaced by its compressed .gz). A trailing partial line is held back
+    until its newline arrives.
+    """
+    path = Path(log_file)
+    offset = 0 if from_start or not path.exists() else path.stat().st_size
+    pending = ''
+    while True:
+        if path.exists():
+            with open(path, errors='replace') as f:
+                f.seek(offset)
+                chunk = f.read()
+                offset = f.tell()
+            if chunk:
+                pending += chunk
+                *complete, pending = pending.split('\n')
+                for line in complete:
+                    yield line
+        elif path.with_name(path.name + '.gz').exists() or offset:
+            if pending:
+                yield pending
+            return
+        if stop is not None and stop():
+            return
+        time.sleep(poll_interval)
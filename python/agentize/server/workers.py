@@ -5,17 +5,26 @@ from __future__ import annotations
 import os
 import re
 import subprocess
-import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
+from agentize.claims import WorkClaim, claimed_by, format_holder, issue_claim_key
 from agentize.shell import run_shell_function
 from agentize.server.log import _log
+from agentize.server.spawn_logs import finish_spawn_logs_for_pid, new_spawn_log, record_spawn_log
 
 
 # Worker status file management
 DEFAULT_WORKERS_DIR = '.tmp/workers'
 
+# Popen handles for claude sessions spawned directly by this process, keyed by PID.
+# Holding the handle keeps the exit status available until cleanup_dead_workers() reaps it.
+_spawned_procs: dict[int, subprocess.Popen] = {}
+
+# Exit codes of children reaped by check_worker_liveness() without a Popen handle
+# (e.g., children inherited across a restart exec), kept for _reap_exit_code()
+_reaped_exit_codes: dict[int, int] = {}
+
 
 def _parse_pid_from_output(stdout: str) -> Optional[int]:
     """Parse PID from wt command output.
@@ -30,6 +39,98 @@ def _parse_pid_from_output(stdout: str) -> Optional[int]:
     return None
 
 
+def _parse_log_path_from_output(stdout: str) -> Optional[str]:
+    """Parse the log file path from wt headless output ('Log: <path>')."""
+    for line in stdout.splitlines():
+        if line.startswith('Log:'):
+            return line[len('Log:'):].strip() or None
+    return None
+
+
+def _record_wt_spawn_log(
+    stdout: str,
+    pid: Optional[int],
+    task: str,
+    issue_no: Optional[int] = None,
+    pr_no: Optional[int] = None
+) -> None:
+    """Index the log written by a headless wt spawn/rebase so it joins rotation."""
+    log_path = _parse_log_path_from_output(stdout)
+    if log_path is None or pid is None:
+        return
+    try:
+        record_spawn_log(log_path, task=task, issue_no=issue_no, pr_no=pr_no, pid=pid)
+    except OSError as e:
+        _log(f"Failed to index log {log_path}: {e}", level="WARNING")
+
+
+def _claim_issue_work(issue_no: int, task: str) -> tuple[bool, Optional[WorkClaim]]:
+    """Take the local work claim on an issue before spawning an agent for it.
+
+    Returns:
+        Tuple of (may_spawn, claim). may_spawn is False (logged) when another
+        process such as a manual `lol impl` run holds the claim. claim is None
+        when the claims directory is unusable; the spawn then goes ahead unclaimed.
+    """
+    claim = WorkClaim(issue_claim_key(issue_no), command=f"server {task}")
+    try:
+        if claim.acquire():
+            return True, claim
+    except OSError as e:
+        _log(f"Cannot take work claim for issue #{issue_no}: {e}", level="WARNING")
+        return True, None
+    _log(f"Issue #{issue_no}: claimed by {format_holder(claim.holder())}, skipping {task}", level="WARNING")
+    return False, None
+
+
+def _spawn_claude_with_log(
+    claude_args: list[str],
+    worktree_path: str,
+    task: str,
+    *,
+    issue_no: Optional[int] = None,
+    pr_no: Optional[int] = None,
+    claim: Optional[WorkClaim] = None
+) -> tuple[subprocess.Popen, Path]:
+    """Spawn claude headlessly with stdout/stderr redirected to an indexed log file.
+
+    A held work claim is inherited by the child, which keeps it until it exits;
+    this process's copy is closed once the child is running.
+
+    Returns:
+        Tuple of (process, log_file)
+    """
+    log_file = new_spawn_log(task, pr_no if pr_no is not None else issue_no)
+    claim_fds = (claim.fileno(),) if claim is not None and claim.fileno() is not None else ()
+
+    # Note: Popen duplicates the file descriptor, so the child process inherits it
+    # and continues writing even after the 'with' block exits
+    try:
+        with open(log_file, 'w') as f:
+            proc = subprocess.Popen(
+                claude_args,
+                cwd=worktree_path,
+                stdin=subprocess.DEVNULL,
+                stdout=f,
+                stderr=subprocess.STDOUT,
+                pass_fds=claim_fds
+            )
+    except OSError:
+        if claim is not None:
+            claim.release()
+        raise
+    if claim is not None:
+        claim.record_holder(proc.pid)
+        claim.hand_off()
+
+    _spawned_procs[proc.pid] = proc
+    try:
+        record_spawn_log(log_file, task=task, issue_no=issue_no, pr_no=pr_no, pid=proc.pid)
+    except OSError as e:
+        _log(f"Failed to index log {log_file}: {e}", level="WARNING")
+    return proc, log_file
+
+
 def worktree_exists(issue_no: int) -> bool:
     """Check if a worktree exists for the given issue number."""
     result = run_shell_function(f'wt pathto {issue_no}', capture_output=True)
@@ -54,7 +155,66 @@ def spawn_worktree(issue_no: int, model: Optional[str] = None) -> tuple[bool, Op
     if result.returncode != 0:
         return False, None
 
-    return True, _parse_pid_from_output(result.stdout)
+    pid = _parse_pid_from_output(result.stdout)
+    _record_wt_spawn_log(result.stdout, pid, 'issue', issue_no=issue_no)
+    return True, pid
+
+
+def resume_worktree(issue_no: int, model: Optional[str] = None) -> tuple[bool, Optional[int]]:
+    """Re-run /issue-to-impl in the existing worktree of a preempted issue.
+
+    `wt spawn` refuses an existing worktree, so the agent is spawned directly
+    in it, keeping the branch and the commits made before preemption.
+
+    Args:
+        issue_no: GitHub issue number
+        model: Claude model to use (opus, sonnet, haiku); uses default if not specified
+
+    Returns:
+        Tuple of (success, pid). pid is None if spawn failed.
+    """
+    result = run_shell_function(f'wt pathto {issue_no}', capture_output=True)
+    if result.returncode != 0:
+        _log(f"Failed to get worktree path to resume issue #{issue_no}", level="ERROR")
+        return False, None
+    worktree_path = result.stdout.strip()
+
+    may_spawn, claim = _claim_issue_work(issue_no, 'issue')
+    if not may_spawn:
+        return False, None
+
+    run_shell_function(f'wt_claim_issue_status {issue_no} "{worktree_path}"', capture_output=True)
+
+    claude_args = ['claude']
+    if model:
+        claude_args.extend(['--model', model])
+    claude_args.extend(['--print', f'/issue-to-impl {issue_no}'])
+
+    proc, log_file = _spawn_claude_with_log(claude_args, worktree_path, 'issue', issue_no=issue_no, claim=claim)
+
+    _log(f"Resumed issue #{issue_no} in {worktree_path}, PID: {proc.pid}, log: {log_file}")
+    return True, proc.pid
+
+
+def _preempted_marker(issue_no: int, workers_dir: str) -> Path:
+    return Path(workers_dir) / f'preempted-{issue_no}'
+
+
+def mark_preempted(issue_no: int, workers_dir: str = DEFAULT_WORKERS_DIR) -> None:
+    """Record that an issue's impl run was preempted, so its worktree is resumed."""
+    marker = _preempted_marker(issue_no, workers_dir)
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+
+
+def is_preempted(issue_no: int, workers_dir: str = DEFAULT_WORKERS_DIR) -> bool:
+    """Check whether an issue's impl run was preempted and not yet resumed."""
+    return _preempted_marker(issue_no, workers_dir).exists()
+
+
+def clear_preempted(issue_no: int, workers_dir: str = DEFAULT_WORKERS_DIR) -> None:
+    """Forget a preemption once the issue's impl run has been spawned again."""
+    _preempted_marker(issue_no, workers_dir).unlink(missing_ok=True)
 
 
 def rebase_worktree(
@@ -74,6 +234,13 @@ def rebase_worktree(
     """
     _log(f"Rebasing worktree for PR #{pr_no}...")
 
+    # wt rebase takes the work claim itself; probe first so the status is left alone
+    if issue_no is not None:
+        holder = claimed_by(issue_claim_key(issue_no))
+        if holder is not None:
+            _log(f"Issue #{issue_no}: claimed by {format_holder(holder)}, skipping rebase", level="WARNING")
+            return False, None
+
     # Set status to "Rebasing" if issue_no is provided (best-effort claim)
     if issue_no is not None:
         path_result = run_shell_function(f'wt pathto {issue_no}', capture_output=True)
@@ -91,7 +258,9 @@ def rebase_worktree(
     if result.returncode != 0:
         return False, None
 
-    return True, _parse_pid_from_output(result.stdout)
+    pid = _parse_pid_from_output(result.stdout)
+    _record_wt_spawn_log(result.stdout, pid, 'rebase', issue_no=issue_no, pr_no=pr_no)
+    return True, pid
 
 
 def _check_issue_has_label(issue_no: int, label: str) -> bool:
@@ -184,10 +353,9 @@ def spawn_refinement(issue_no: int, model: Optional[str] = None) -> tuple[bool,
         return False, None
     worktree_path = result.stdout.strip()
 
-    # Create log directory and file
-    log_dir = Path(os.getenv('AGENTIZE_HOME', '.')) / '.tmp' / 'logs'
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / f'refine-{issue_no}-{int(time.time())}.log'
+    may_spawn, claim = _claim_issue_work(issue_no, 'refine')
+    if not may_spawn:
+        return False, None
 
     # Build claude command with optional model
     claude_args = ['claude']
@@ -196,16 +364,7 @@ def spawn_refinement(issue_no: int, model: Optional[str] = None) -> tuple[bool,
     claude_args.extend(['--print', f'/ultra-planner --refine {issue_no}'])
 
     # Spawn Claude with /ultra-planner --refine
-    # Note: Popen duplicates the file descriptor, so the child process inherits it
-    # and continues writing even after the 'with' block exits
-    with open(log_file, 'w') as f:
-        proc = subprocess.Popen(
-            claude_args,
-            cwd=worktree_path,
-            stdin=subprocess.DEVNULL,
-            stdout=f,
-            stderr=subprocess.STDOUT
-        )
+    proc, log_file = _spawn_claude_with_log(claude_args, worktree_path, 'refine', issue_no=issue_no, claim=claim)
 
     _log(f"Spawned refinement for issue #{issue_no}, PID: {proc.pid}, log: {log_file}")
     return True, proc.pid
@@ -233,17 +392,16 @@ def spawn_feat_request(issue_no: int, model: Optional[str] = None) -> tuple[bool
         return False, None
     worktree_path = result.stdout.strip()
 
+    may_spawn, claim = _claim_issue_work(issue_no, 'feat-request')
+    if not may_spawn:
+        return False, None
+
     # Set status to "In Progress" (concurrency control)
     run_shell_function(
         f'wt_claim_issue_status {issue_no} "{worktree_path}" "In Progress"',
         capture_output=True
     )
 
-    # Create log directory and file
-    log_dir = Path(os.getenv('AGENTIZE_HOME', '.')) / '.tmp' / 'logs'
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / f'feat-request-{issue_no}-{int(time.time())}.log'
-
     # Build claude command with optional model
     claude_args = ['claude']
     if model:
@@ -251,14 +409,9 @@ def spawn_feat_request(issue_no: int, model: Optional[str] = None) -> tuple[bool
     claude_args.extend(['--print', f'/ultra-planner --from-issue {issue_no}'])
 
     # Spawn Claude with /ultra-planner --from-issue
-    with open(log_file, 'w') as f:
-        proc = subprocess.Popen(
-            claude_args,
-            cwd=worktree_path,
-            stdin=subprocess.DEVNULL,
-            stdout=f,
-            stderr=subprocess.STDOUT
-        )
+    proc, log_file = _spawn_claude_with_log(
+        claude_args, worktree_path, 'feat-request', issue_no=issue_no, claim=claim
+    )
 
     _log(f"Spawned feat-request planning for issue #{issue_no}, PID: {proc.pid}, log: {log_file}")
     return True, proc.pid
@@ -288,17 +441,16 @@ def spawn_review_resolution(
         return False, None
     worktree_path = result.stdout.strip()
 
+    may_spawn, claim = _claim_issue_work(issue_no, 'review-resolution')
+    if not may_spawn:
+        return False, None
+
     # Set status to "In Progress" (concurrency control)
     run_shell_function(
         f'wt_claim_issue_status {issue_no} "{worktree_path}" "In Progress"',
         capture_output=True
     )
 
-    # Create log directory and file
-    log_dir = Path(os.getenv('AGENTIZE_HOME', '.')) / '.tmp' / 'logs'
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / f'review-resolution-{pr_no}-{int(time.time())}.log'
-
     # Build claude command with optional model
     # Note: /resolve-review auto-detects PR from current branch, no pr_no needed
     claude_args = ['claude']
@@ -307,14 +459,9 @@ def spawn_review_resolution(
     claude_args.extend(['--print', '/resolve-review'])
 
     # Spawn Claude with /resolve-review
-    with open(log_file, 'w') as f:
-        proc = subprocess.Popen(
-            claude_args,
-            cwd=worktree_path,
-            stdin=subprocess.DEVNULL,
-            stdout=f,
-            stderr=subprocess.STDOUT
-        )
+    proc, log_file = _spawn_claude_with_log(
+        claude_args, worktree_path, 'review-resolution', issue_no=issue_no, pr_no=pr_no, claim=claim
+    )
 
     _log(f"Spawned review resolution for PR #{pr_no} (issue #{issue_no}), PID: {proc.pid}, log: {log_file}")
     return True, proc.pid
@@ -340,6 +487,22 @@ def _cleanup_review_resolution(issue_no: int) -> None:
     _log(f"Review resolution cleanup for issue #{issue_no}: reset status to Proposed")
 
 
+def reset_issue_status(issue_no: int, status: str) -> None:
+    """Set an issue's project Status (best-effort), e.g. to re-queue a preempted task.
+
+    Args:
+        issue_no: GitHub issue number
+        status: Target Status name (e.g., "Proposed", "Plan Accepted")
+    """
+    result = run_shell_function('wt pathto main', capture_output=True)
+    if result.returncode == 0:
+        worktree_path = result.stdout.strip()
+        run_shell_function(
+            f'wt_claim_issue_status {issue_no} "{worktree_path}" "{status}"',
+            capture_output=True
+        )
+
+
 def init_worker_status_files(num_workers: int, workers_dir: str = DEFAULT_WORKERS_DIR) -> None:
     """Initialize worker status files with state=FREE.
 
@@ -456,6 +619,20 @@ def check_worker_liveness(worker_id: int, workers_dir: str = DEFAULT_WORKERS_DIR
     if pid is None:
         return True  # No PID to check
 
+    # Directly spawned children must be polled: a zombie still answers signal 0
+    proc = _spawned_procs.get(pid)
+    if proc is not None:
+        return proc.poll() is None
+
+    # Children without a handle (inherited across a restart exec) must be reaped too
+    try:
+        reaped_pid, wait_status = os.waitpid(pid, os.WNOHANG)
+        if reaped_pid == pid:
+            _reaped_exit_codes[pid] = os.waitstatus_to_exitcode(wait_status)
+            return False
+    except ChildProcessError:
+        pass  # Not our child (e.g., detached by wt headless)
+
     # Check if process is still running
     try:
         os.kill(pid, 0)  # Signal 0 just checks if process exists
@@ -464,6 +641,26 @@ def check_worker_liveness(worker_id: int, workers_dir: str = DEFAULT_WORKERS_DIR
         return False
 
 
+def _reap_exit_code(pid: int) -> Optional[int]:
+    """Reap a finished child process and return its exit code.
+
+    Returns None when pid is not our child (e.g., detached by wt headless)
+    or has already been reaped.
+    """
+    proc = _spawned_procs.pop(pid, None)
+    if proc is not None:
+        return proc.poll()
+    if pid in _reaped_exit_codes:
+        return _reaped_exit_codes.pop(pid)
+    try:
+        reaped_pid, status = os.waitpid(pid, os.WNOHANG)
+    except ChildProcessError:
+        return None
+    if reaped_pid == 0:
+        return None
+    return os.waitstatus_to_exitcode(status)
+
+
 def cleanup_dead_workers(
     num_workers: int,
     workers_dir: str = DEFAULT_WORKERS_DIR,
@@ -471,7 +668,10 @@ def cleanup_dead_workers(
     tg_token: Optional[str] = None,
     tg_chat_id: Optional[str] = None,
     repo_slug: Optional[str] = None,
-    session_dir: Optional[Path] = None
+    session_dir: Optional[Path] = None,
+    compress_logs: bool = True,
+    history=None,
+    is_alive: Callable[[int, str], bool] = check_worker_liveness
 ) -> None:
     """Mark workers with dead PIDs as FREE and send completion notifications.
 
@@ -482,47 +682,66 @@ def cleanup_dead_workers(
         tg_chat_id: Telegram chat ID (optional)
         repo_slug: GitHub repo slug for issue URLs (optional)
         session_dir: Path to hooked-sessions directory (optional)
+        compress_logs: Gzip the finished worker's spawn logs (default: True)
+        history: TaskHistory to close the worker's task in (optional)
+        is_alive: Liveness check per worker slot (default: check_worker_liveness)
     """
     # Import here to avoid circular imports
     from agentize.server.notify import send_telegram_message, _format_worker_completion_message
-    from agentize.server.session import _get_session_state_for_issue, _remove_issue_index
+    from agentize.server.session import _get_session_state_for_issue, _remove_issue_index, get_session_index
 
-    for i in range(num_workers):
-        if not check_worker_liveness(i, workers_dir):
-            status = read_worker_status(i, workers_dir)
-            issue_no = status.get('issue')
-            _log(f"Worker {i} PID {status.get('pid')} is dead, marking as FREE")
-
-            # Check for completion notification conditions
-            if tg_token and tg_chat_id and issue_no and session_dir:
-                session_state = _get_session_state_for_issue(issue_no, session_dir)
-                if session_state and session_state.get('state') == 'done':
-                    # Check if this was a refinement (has agentize:refine label)
-                    is_refinement = _check_issue_has_label(issue_no, 'agentize:refine')
-                    if is_refinement:
-                        _cleanup_refinement(issue_no)
-
-                    # Check if this was a dev-req (has agentize:dev-req label)
-                    is_feat_request = _check_issue_has_label(issue_no, 'agentize:dev-req')
-                    if is_feat_request:
-                        _cleanup_feat_request(issue_no)
-
-                    # Always try review resolution cleanup (idempotent, no label to detect)
-                    # This resets "In Progress" to "Proposed" if applicable
-                    _cleanup_review_resolution(issue_no)
-
-                    issue_url = f"https://github.com/{repo_slug}/issues/{issue_no}" if repo_slug else None
-
-                    # Build PR URL if pr_number is available in session state
-                    pr_url = None
-                    pr_number = session_state.get('pr_number')
-                    if pr_number and repo_slug:
-                        pr_url = f"https://github.com/{repo_slug}/pull/{pr_number}"
-
-                    msg = _format_worker_completion_message(issue_no, i, issue_url, pr_url=pr_url)
-                    if send_telegram_message(tg_token, tg_chat_id, msg):
-                        _log(f"Sent completion notification for issue #{issue_no}")
-                        # Remove issue index to prevent duplicate notifications
-                        _remove_issue_index(issue_no, session_dir)
+    dead = [i for i in range(num_workers) if not is_alive(i, workers_dir)]
+    # One refresh per cycle; the per-worker lookups below are in-memory
+    if dead and session_dir:
+        get_session_index(session_dir).refresh()
 
-            write_worker_status(i, 'FREE', None, None, workers_dir)
+    for i in dead:
+        status = read_worker_status(i, workers_dir)
+        issue_no = status.get('issue')
+        _log(f"Worker {i} PID {status.get('pid')} is dead, marking as FREE")
+
+        # Close out the worker's spawn log (records exit code, compresses)
+        if status.get('pid') is not None:
+            pid = status['pid']
+            exit_code = _reap_exit_code(pid)
+            finish_spawn_logs_for_pid(pid, exit_code, compress=compress_logs)
+
+            # Record duration, exit status and cost (from the session transcript)
+            if history is not None:
+                session_state = _get_session_state_for_issue(issue_no, session_dir) if issue_no and session_dir else None
+                transcript_path = session_state.get('transcript_path') if session_state else None
+                history.record_end(pid, exit_code, transcript_path=transcript_path)
+
+        # Check for completion notification conditions
+        if tg_token and tg_chat_id and issue_no and session_dir:
+            session_state = _get_session_state_for_issue(issue_no, session_dir)
+            if session_state and session_state.get('state') == 'done':
+                # Check if this was a refinement (has agentize:refine label)
+                is_refinement = _check_issue_has_label(issue_no, 'agentize:refine')
+                if is_refinement:
+                    _cleanup_refinement(issue_no)
+
+                # Check if this was a dev-req (has agentize:dev-req label)
+                is_feat_request = _check_issue_has_label(issue_no, 'agentize:dev-req')
+                if is_feat_request:
+                    _cleanup_feat_request(issue_no)
+
+                # Always try review resolution cleanup (idempotent, no label to detect)
+                # This resets "In Progress" to "Proposed" if applicable
+                _cleanup_review_resolution(issue_no)
+
+                issue_url = f"https://github.com/{repo_slug}/issues/{issue_no}" if repo_slug else None
+
+                # Build PR URL if pr_number is available in session state
+                pr_url = None
+                pr_number = session_state.get('pr_number')
+                if pr_number and repo_slug:
+                    pr_url = f"https://github.com/{repo_slug}/pull/{pr_number}"
+
+                msg = _format_worker_completion_message(issue_no, i, issue_url, pr_url=pr_url)
+                if send_telegram_message(tg_token, tg_chat_id, msg):
+                    _log(f"Sent completion notification for issue #{issue_no}")
+                    # Remove issue index to prevent duplicate notifications
+                    _remove_issue_index(issue_no, session_dir)
+
+        write_worker_status(i, 'FREE', None, None, workers_dir)
@@ -0,0 +1,358 @@
+"""
+Garbage collection for .tmp artifacts.
+
+Applies per-class age, LRU-count and size policies to the session state,
+debug, chat and workflow artifacts that accumulate under `.tmp`, while never
+touching files that belong to a live worker or session.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import re
+import subprocess
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+@dataclass(frozen=True)
+class ArtifactPolicy:
+    """Retention policy for one class of .tmp artifacts.
+
+    Patterns are globs relative to a `.tmp` directory; files whose name
+    matches an `exclude` glob belong to another class. Limits left as None
+    are not enforced.
+    """
+
+    name: str
+    patterns: tuple[str, ...]
+    max_age_days: Optional[float] = None
+    max_count: Optional[int] = None
+    max_size_mb: Optional[float] = None
+    exclude: tuple[str, ...] = ()
+
+
+# Session run records (agentize.workflow.api telemetry and checkpoint) under any prefix
+_RUN_RECORD_PATTERNS = ("*-trace.jsonl", "*-manifest.json")
+
+
+DEFAULT_POLICIES: tuple[ArtifactPolicy, ...] = (
+    ArtifactPolicy("sessions", ("hooked-sessions/*.json",), max_age_days=14),
+    ArtifactPolicy("debug-stop", ("debug-stop/*.log",), max_age_days=7, max_size_mb=64),
+    ArtifactPolicy("acw-sessions", ("acw-sessions/*.md",), max_age_days=30, max_count=100),
+    ArtifactPolicy(
+        "planner",
+        (
+            "issue-*-*.txt",
+            "issue-*-*.md",
+            "[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]-[0-9][0-9][0-9][0-9][0-9][0-9]-*",
+        ),
+        max_age_days=7,
+        exclude=_RUN_RECORD_PATTERNS,
+    ),
+    ArtifactPolicy(
+        "impl",
+        ("impl-input-*.txt", "impl-output.txt", "commit-report-iter-*.txt"),
+        max_age_days=7,
+    ),
+    ArtifactPolicy("traces", _RUN_RECORD_PATTERNS, max_age_days=30),
+)
+
+# Files used within this window are always kept (covers writers without a worker slot)
+DEFAULT_GRACE_SEC = 3600
+
+_WORKTREE_ISSUE_RE = re.compile(r"^issue-(\d+)")
+
+
+def resolve_tmp_dirs(base_dir: Optional[str] = None) -> list[Path]:
+    """Return `$AGENTIZE_HOME/.tmp` plus the `.tmp` of every wt worktree."""
+    base = Path(base_dir or os.getenv("AGENTIZE_HOME", "."))
+    tmp_dirs = [base / ".tmp"]
+
+    result = subprocess.run(
+        ["git", "-C", str(base), "rev-parse", "--path-format=absolute",
+         "--show-toplevel", "--git-common-dir"],
+        capture_output=True,
+        text=True,
+    )
+    lines = result.stdout.splitlines()
+    # Only follow worktrees when base is itself a checkout root, not a nested directory
+    if result.returncode == 0 and len(lines) == 2 and Path(lines[0]).resolve() == base.resolve():
+        trees_dir = Path(lines[1]) / "trees"
+        if trees_dir.is_dir():
+            tmp_dirs.extend(sorted(p / ".tmp" for p in trees_dir.iterdir() if (p / ".tmp").is_dir()))
+
+    return [d for d in tmp_dirs if d.is_dir()]
+
+
+def _busy_issues(tmp_dir: Path) -> set[int]:
+    """Issues held by BUSY workers with a live PID (from `<tmp_dir>/workers`)."""
+    from agentize.server.workers import read_worker_status
+
+    workers_dir = tmp_dir / "workers"
+    issues: set[int] = set()
+    if not workers_dir.is_dir():
+        return issues
+    for status_file in workers_dir.glob("worker-*.status"):
+        try:
+            worker_id = int(status_file.stem.split("-", 1)[1].split(".")[0])
+        except (IndexError, ValueError):
+            continue
+        status = read_worker_status(worker_id, str(workers_dir))
+        if status.get("state") != "BUSY" or status.get("issue") is None:
+            continue
+        pid = status.get("pid")
+        if pid is not None:
+            try:
+                os.kill(pid, 0)
+            except OSError:
+                continue
+        issues.add(status["issue"])
+    return issues
+
+
+def _live_sessions(tmp_dir: Path, busy_issues: set[int]) -> set[str]:
+    """Session IDs referenced by the by-issue index of a busy issue."""
+    sessions: set[str] = set()
+    by_issue = tmp_dir / "hooked-sessions" / "by-issue"
+    for issue_no in busy_issues:
+        try:
+            with open(by_issue / f"{issue_no}.json") as f:
+                session_id = json.load(f).get("session_id")
+        except (OSError, json.JSONDecodeError, AttributeError):
+            continue
+        if session_id:
+            sessions.add(session_id)
+    return sessions
+
+
+def _worktree_issue(tmp_dir: Path) -> Optional[int]:
+    """Issue number of a `trees/issue-N*/.tmp` directory, else None."""
+    match = _WORKTREE_ISSUE_RE.match(tmp_dir.parent.name)
+    return int(match.group(1)) if match else None
+
+
+def _is_protected(
+    policy: ArtifactPolicy,
+    path: Path,
+    tmp_dir: Path,
+    busy_issues: set[int],
+    live_sessions: set[str],
+) -> bool:
+    if _worktree_issue(tmp_dir) in busy_issues:
+        return True
+    if policy.name == "sessions":
+        return path.stem in live_sessions
+    if policy.name == "debug-stop":
+        return path.name.split("-cont-", 1)[0] in live_sessions
+    return False
+
+
+def load_gc_policies(config: Optional[dict] = None) -> list[ArtifactPolicy]:
+    """Apply `gc.<class>` overrides from .agentize.local.yaml to DEFAULT_POLICIES.
+
+    Args:
+        config: Parsed runtime config (loaded via load_runtime_config() if None)
+
+    Returns:
+        Policy list in DEFAULT_POLICIES order
+    """
+    if config is None:
+        from agentize.server.runtime_config import load_runtime_config
+
+        config, _ = load_runtime_config()
+    gc_config = config.get("gc", {}) if isinstance(config.get("gc"), dict) else {}
+
+    policies = []
+    for policy in DEFAULT_POLICIES:
+        overrides = gc_config.get(policy.name)
+        if isinstance(overrides, dict):
+            fields = {
+                key: overrides[key]
+                for key in ("max_age_days", "max_count", "max_size_mb")
+                if key in overrides
+            }
+            # 0 disables a limit, mirroring server.logs
+            policy = replace(policy, **{k: (v or None) for k, v in fields.items()})
+        policies.append(policy)
+    return policies
+
+
+def run_gc(
+    tmp_dirs: Optional[Iterable[Path]] = None,
+    policies: Optional[Iterable[ArtifactPolicy]] = None,
+    *,
+    dry_run: bool = False,
+    grace_sec: float = DEFAULT_GRACE_SEC,
+    now: Optional[float] = None,
+) -> dict[str, dict[str, int]]:
+    """Collect expired .tmp artifacts.
+
+    Per class, files are ranked most-recently-used first (by max of atime and
+    mtime); a file is removed when it exceeds max_age_days, ranks beyond
+    max_count, or falls past the cumulative max_size_mb budget. Files used
+    within grace_sec, session state of busy workers, and artifacts in the
+    worktree of a busy issue are always kept. Issue indexes pointing at a
+    removed session are removed with it.
+
+    Args:
+        tmp_dirs: `.tmp` directories to scan (defaults to resolve_tmp_dirs())
+        policies: Policies to apply (defaults to load_gc_policies())
+        dry_run: Report what would be removed without deleting
+        grace_sec: Minimum idle time before any file is eligible
+        now: Override current time (for testing)
+
+    Returns:
+        Dict mapping class name to {"files": N, "bytes": N} reclaimed
+    """
+    tmp_dirs = list(tmp_dirs) if tmp_dirs is not None else resolve_tmp_dirs()
+    policies = list(policies) if policies is not None else load_gc_policies()
+    now = now if now is not None else time.time()
+
+    # A worker's status file lives in the main .tmp, its worktree in trees/
+    all_busy: set[int] = set()
+    for tmp_dir in tmp_dirs:
+        all_busy |= _busy_issues(tmp_dir)
+    live_sessions = {tmp_dir: _live_sessions(tmp_dir, all_busy) for tmp_dir in tmp_dirs}
+
+    report: dict[str, dict[str, int]] = {}
+    removed_sessions: set[Path] = set()
+    for policy in policies:
+        entries = []  # (last_use, size, path, protected)
+        for tmp_dir in tmp_dirs:
+            sessions = live_sessions[tmp_dir]
+            seen: set[Path] = set()
+            for pattern in policy.patterns:
+                for path in tmp_dir.glob(pattern):
+                    if path in seen or not path.is_file():
+                        continue
+                    if any(fnmatch.fnmatch(path.name, exclude) for exclude in policy.exclude):
+                        continue
+                    seen.add(path)
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    last_use = max(stat.st_mtime, stat.st_atime)
+                    protected = now - last_use < grace_sec or _is_protected(
+                        policy, path, tmp_dir, all_busy, sessions
+                    )
+                    entries.append((last_use, stat.st_size, path, protected))
+
+        entries.sort(key=lambda e: e[0], reverse=True)
+        stats = {"files": 0, "bytes": 0}
+        kept_count = 0
+        kept_bytes = 0
+        for last_use, size, path, protected in entries:
+            expired = (
+                policy.max_age_days is not None
+                and now - last_use > policy.max_age_days * 86400
+            )
+            over_count = policy.max_count is not None and kept_count >= policy.max_count
+            over_size = (
+                policy.max_size_mb is not None
+                and kept_bytes + size > policy.max_size_mb * 1024 * 1024
+            )
+            if protected or not (expired or over_count or over_size):
+                kept_count += 1
+                kept_bytes += size
+                continue
+            if not dry_run:
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+            stats["files"] += 1
+            stats["bytes"] += size
+            if policy.name == "sessions":
+                removed_sessions.add(path)
+        report[policy.name] = stats
+
+    # Drop by-issue indexes whose session is gone (never for busy issues)
+    if "sessions" in report:
+        for tmp_dir in tmp_dirs:
+            sess_dir = tmp_dir / "hooked-sessions"
+            for index_file in (sess_dir / "by-issue").glob("*.json"):
+                if index_file.stem.isdigit() and int(index_file.stem) in all_busy:
+                    continue
+                try:
+                    with open(index_file) as f:
+                        session_id = json.load(f).get("session_id")
+                    size = index_file.stat().st_size
+                except (OSError, json.JSONDecodeError, AttributeError):
+                    continue
+                session_file = sess_dir / f"{session_id}.json"
+                if session_file.exists() and session_file not in removed_sessions:
+                    continue
+                if not dry_run:
+                    try:
+                        index_file.unlink()
+                    except OSError:
+                        continue
+                report["sessions"]["files"] += 1
+                report["sessions"]["bytes"] += size
+
+    return report
+
+
+def _format_bytes(n: int) -> str:
+    if n < 1024:
+        return f"{n}B"
+    value = float(n)
+    for unit in ("K", "M"):
+        value /= 1024
+        if value < 1024:
+            return f"{value:.1f}{unit}"
+    return f"{value / 1024:.1f}G"
+
+
+def format_report(report: dict[str, dict[str, int]], dry_run: bool = False) -> str:
+    """Format a run_gc() report as one line per class plus a total."""
+    verb = "would remove" if dry_run else "removed"
+    lines = []
+    total_files = 0
+    total_bytes = 0
+    for name, stats in report.items():
+        lines.append(f"{name:<14} {verb} {stats['files']} files ({_format_bytes(stats['bytes'])})")
+        total_files += stats["files"]
+        total_bytes += stats["bytes"]
+    reclaim = "Reclaimable" if dry_run else "Reclaimed"
+    lines.append(f"{reclaim}: {_format_bytes(total_bytes)} in {total_files} files")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    CLI entrypoint for .tmp garbage collection.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    import argparse
+    import sys
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        prog="gc",
+        description="Remove expired .tmp artifacts"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be removed without deleting"
+    )
+
+    args = parser.parse_args(argv)
+
+    report = run_gc(dry_run=args.dry_run)
+    print(format_report(report, dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
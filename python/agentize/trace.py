@@ -0,0 +1,153 @@
+"""
+Workflow stage trace summaries.
+
+Reads the `<prefix>-trace.jsonl` files that workflow Sessions append to under
+`.tmp` and reports where time and money went, per stage and per run.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Optional
+
+from agentize.tmp_gc import resolve_tmp_dirs
+from agentize.usage import format_cost, format_number
+
+
+def load_trace(paths: Iterable[Path]) -> list[dict]:
+    """Read trace records from JSONL files, skipping unreadable files and malformed lines."""
+    records = []
+    for path in paths:
+        try:
+            lines = path.read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "stage" in record:
+                records.append(record)
+    return records
+
+
+def find_trace_files(base_dir: Optional[str] = None) -> list[Path]:
+    """Trace files in `$AGENTIZE_HOME/.tmp` and the `.tmp` of every wt worktree."""
+    return [path for tmp_dir in resolve_tmp_dirs(base_dir) for path in sorted(tmp_dir.glob("*-trace.jsonl"))]
+
+
+def _run_key(record: dict) -> tuple[str, str]:
+    return str(record.get("run", "")), str(record.get("session", ""))
+
+
+def select_runs(records: list[dict], run: Optional[str] = None, last: Optional[int] = None) -> list[dict]:
+    """Keep records of the `run` prefix and/or the `last` N runs (by session start)."""
+    if run is not None:
+        records = [record for record in records if record.get("run") == run]
+    if last is not None:
+        keys = sorted({_run_key(record) for record in records}, key=lambda key: key[1])
+        recent = set(keys[-last:]) if last > 0 else set()
+        records = [record for record in records if _run_key(record) in recent]
+    return records
+
+
+def _empty_stats() -> dict:
+    return {"count": 0, "failed": 0, "reused": 0, "wall": 0.0, "wait": 0.0, "tokens": 0, "cost": 0.0}
+
+
+def _add(stats: dict, record: dict) -> None:
+    stats["count"] += 1
+    if record.get("status") != "ok":
+        stats["failed"] += 1
+    if record.get("cached") or record.get("resumed"):
+        stats["reused"] += 1
+    stats["wall"] += record.get("wall_seconds") or 0.0
+    stats["wait"] += record.get("wait_seconds") or 0.0
+    stats["tokens"] += record.get("tokens") or 0
+    stats["cost"] += record.get("cost_usd") or 0.0
+
+
+def summarize(records: list[dict]) -> dict[str, dict[str, dict]]:
+    """Aggregate records by stage and by run (`<prefix> @ <session start>`)."""
+    stages: dict[str, dict] = {}
+    runs: dict[str, dict] = {}
+    for record in records:
+        _add(stages.setdefault(str(record["stage"]), _empty_stats()), record)
+        run, session = _run_key(record)
+        _add(runs.setdefault(f"{run} @ {session}", _empty_stats()), record)
+    return {"stages": stages, "runs": runs}
+
+
+def _format_table(title: str, rows: dict[str, dict]) -> list[str]:
+    lines = [
+        f"{title:<34} {'n':>4} {'fail':>4} {'reuse':>5} {'wall':>9} {'mean':>8} {'wait':>8} {'tokens':>8} {'cost':>8}"
+    ]
+    for name, stats in sorted(rows.items(), key=lambda item: item[1]["wall"], reverse=True):
+        mean = stats["wall"] / stats["count"] if stats["count"] else 0.0
+        lines.append(
+            f"{name:<34} {stats['count']:>4} {stats['failed']:>4} {stats['reused']:>5} "
+            f"{stats['wall']:>8.1f}s {mean:>7.1f}s {stats['wait']:>7.1f}s "
+            f"{format_number(stats['tokens']):>8} {format_cost(stats['cost']):>8}"
+        )
+    return lines
+
+
+def format_summary(summary: dict[str, dict[str, dict]]) -> str:
+    """Format summarize() output as a per-stage table, a per-run table and a total."""
+    if not summary["runs"]:
+        return "No stage traces found"
+    lines = _format_table("Stage", summary["stages"])
+    lines.append("")
+    lines.extend(_format_table("Run", summary["runs"]))
+    total = _empty_stats()
+    for stats in summary["runs"].values():
+        for key in total:
+            total[key] += stats[key]
+    lines.append("")
+    lines.append(
+        f"Total: {total['count']} stages in {len(summary['runs'])} runs, "
+        f"{total['wall']:.1f}s wall, {total['wait']:.1f}s waiting, "
+        f"{format_number(total['tokens'])} tokens, {format_cost(total['cost'])}"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    CLI entrypoint for stage trace summaries.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    import argparse
+    import sys
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        prog="trace",
+        description="Summarize workflow stage time, tokens and cost"
+    )
+    parser.add_argument(
+        "--run",
+        metavar="PREFIX",
+        help="Only include runs with this session prefix (e.g. issue-42)"
+    )
+    parser.add_argument(
+        "--last",
+        type=int,
+        metavar="N",
+        help="Only include the N most recent runs"
+    )
+
+    args = parser.parse_args(argv)
+
+    records = select_runs(load_trace(find_trace_files()), run=args.run, last=args.last)
+    print(format_summary(summarize(records)))
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,25 @@ def match_model_pricing(model_id: str) -> Optional[dict]:
     return None
 
 
+def usage_cost(usage: dict, model_id: str) -> Optional[float]:
+    """USD cost of one assistant message's usage block (None for unknown models)."""
+    rates = match_model_pricing(model_id)
+    if not rates:
+        return None
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    cache_read = usage.get("cache_read_input_tokens", 0)
+    cache_write = usage.get("cache_creation_input_tokens", 0)
+    # Non-cache input = total input - cache_read - cache_write
+    non_cache_input = max(0, input_tokens - cache_read - cache_write)
+    return (
+        non_cache_input * rates["input"] / 1_000_000
+        + output_tokens * rates["output"] / 1_000_000
+        + cache_read * rates["cache_read"] / 1_000_000
+        + cache_write * rates["cache_write"] / 1_000_000
+    )
+
+
 def format_cost(cost: float) -> str:
     """Format USD cost with dollar sign and appropriate precision."""
     return f"${cost:.2f}"
@@ -155,19 +174,8 @@ def count_usage(mode: str, home_dir: str = None, include_cache: bool = False, in
                                 # Compute cost if requested
                                 if include_cost:
                                     model_id = message.get("model", "")
-                                    rates = match_model_pricing(model_id)
-                                    if rates:
-                                        # Compute cost per million tokens
-                                        cache_read = usage.get("cache_read_input_tokens", 0)
-                                        cache_write = usage.get("cache_creation_input_tokens", 0)
-                                        # Non-cache input = total input - cache_read - cache_write
-                                        non_cache_input = max(0, input_tokens - cache_read - cache_write)
-                                        cost = (
-                                            non_cache_input * rates["input"] / 1_000_000
-                                            + output_tokens * rates["output"] / 1_000_000
-                                            + cache_read * rates["cache_read"] / 1_000_000
-                                            + cache_write * rates["cache_write"] / 1_000_000
-                                        )
+                                    cost = usage_cost(usage, model_id)
+                                    if cost is not None:
                                         buckets[bucket_key]["cost_usd"] += cost
                                     elif model_id:
                                         buckets[bucket_key]["unknown_models"].add(model_id)
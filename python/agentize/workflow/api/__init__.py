@@ -2,15 +2,44 @@
 
 from __future__ import annotations
 
-from agentize.workflow.api.acw import ACW, list_acw_providers, run_acw
-from agentize.workflow.api.session import PipelineError, Session, StageCall, StageResult
+from agentize.workflow.api.acw import ACW, list_acw_providers, run_acw, run_acw_async
+from agentize.workflow.api.cache import StageCache
+from agentize.workflow.api.checkpoint import StageManifest
+from agentize.workflow.api.context import ContextAssembler, ContextPolicy
+from agentize.workflow.api.hedge import HedgePolicy, LatencyHistory
+from agentize.workflow.api.retry import RetryPolicy, StageFailure, classify_failure
+from agentize.workflow.api.session import (
+    GraphError,
+    ParallelError,
+    PipelineError,
+    Session,
+    StageCall,
+    StageNode,
+    StageResult,
+)
+from agentize.workflow.api.telemetry import StageTelemetry, TraceWriter
 
 __all__ = [
     "ACW",
     "list_acw_providers",
     "run_acw",
+    "run_acw_async",
     "Session",
     "StageCall",
+    "StageNode",
     "StageResult",
     "PipelineError",
+    "GraphError",
+    "ParallelError",
+    "StageCache",
+    "StageManifest",
+    "RetryPolicy",
+    "StageFailure",
+    "classify_failure",
+    "HedgePolicy",
+    "LatencyHistory",
+    "ContextAssembler",
+    "ContextPolicy",
+    "StageTelemetry",
+    "TraceWriter",
 ]
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
+import signal
 import subprocess
 import sys
 import threading
 import time
 from pathlib import Path
-from typing import Callable
+from typing import Awaitable, Callable
 
 from agentize.shell import get_agentize_home
+from agentize.workflow.api.limiter import ProviderLimiter, provider_limiter
 
 _ACW_PROVIDERS_CACHE: list[str] | None = None
 _ACW_PROVIDERS_LOCK = threading.Lock()
@@ -29,14 +34,19 @@ def _resolve_acw_script(agentize_home: str, env: dict[str, str] | None = None) -
     return acw_script
 
 
-def _resolve_overrides_cmd(env: dict[str, str] | None = None) -> str:
+def _resolve_overrides_path(env: dict[str, str] | None = None) -> Path | None:
     env_vars = env or os.environ
     overrides_path = env_vars.get("AGENTIZE_SHELL_OVERRIDES")
     if overrides_path:
         override_path = Path(overrides_path).expanduser()
         if override_path.exists():
-            return f' && source "{override_path}"'
-    return ""
+            return override_path
+    return None
+
+
+def _resolve_overrides_cmd(env: dict[str, str] | None = None) -> str:
+    override_path = _resolve_overrides_path(env)
+    return f' && source "{override_path}"' if override_path is not None else ""
 
 
 def _merge_env(env: dict[str, str] | None) -> dict[str, str]:
@@ -48,20 +58,17 @@ def _merge_env(env: dict[str, str] | None) -> dict[str, str]:
     return merged
 
 
-def run_acw(
+def _build_acw_command(
     provider: str,
     model: str,
     input_file: str | Path,
     output_file: str | Path,
     *,
-    tools: str | None = None,
-    permission_mode: str | None = None,
-    extra_flags: list[str] | None = None,
-    timeout: int = 3600,
-    cwd: str | Path | None = None,
-    env: dict[str, str] | None = None,
-) -> subprocess.CompletedProcess:
-    """Run acw shell function for a single stage."""
+    tools: str | None,
+    permission_mode: str | None,
+    extra_flags: list[str] | None,
+    env: dict[str, str] | None,
+) -> tuple[list[str], dict[str, str]]:
     merged_env = _merge_env(env)
     agentize_home = merged_env["AGENTIZE_HOME"]
     acw_script = _resolve_acw_script(agentize_home, merged_env)
@@ -84,9 +91,35 @@ def run_acw(
     cmd_args = " ".join(f'"{arg}"' for arg in cmd_parts)
     overrides_cmd = _resolve_overrides_cmd(merged_env)
     bash_cmd = f'source "{acw_script}"{overrides_cmd} && acw {cmd_args}'
+    return ["bash", "-c", bash_cmd], merged_env
+
 
+def run_acw(
+    provider: str,
+    model: str,
+    input_file: str | Path,
+    output_file: str | Path,
+    *,
+    tools: str | None = None,
+    permission_mode: str | None = None,
+    extra_flags: list[str] | None = None,
+    timeout: int = 3600,
+    cwd: str | Path | None = None,
+    env: dict[str, str] | None = None,
+) -> subprocess.CompletedProcess:
+    """Run acw shell function for a single stage."""
+    cmd, merged_env = _build_acw_command(
+        provider,
+        model,
+        input_file,
+        output_file,
+        tools=tools,
+        permission_mode=permission_mode,
+        extra_flags=extra_flags,
+        env=env,
+    )
     return subprocess.run(
-        ["bash", "-c", bash_cmd],
+        cmd,
         env=merged_env,
         capture_output=True,
         text=True,
@@ -95,8 +128,125 @@ def run_acw(
     )
 
 
+async def run_acw_async(
+    provider: str,
+    model: str,
+    input_file: str | Path,
+    output_file: str | Path,
+    *,
+    tools: str | None = None,
+    permission_mode: str | None = None,
+    extra_flags: list[str] | None = None,
+    timeout: int = 3600,
+    cwd: str | Path | None = None,
+    env: dict[str, str] | None = None,
+) -> subprocess.CompletedProcess:
+    """Run acw shell function for a single stage without blocking the event loop.
+
+    The stage runs in its own process group. On timeout or task cancellation
+    the whole group (bash, acw and the provider CLI) is terminated.
+    """
+    cmd, merged_env = _build_acw_command(
+        provider,
+        model,
+        input_file,
+        output_file,
+        tools=tools,
+        permission_mode=permission_mode,
+        extra_flags=extra_flags,
+        env=env,
+    )
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        env=merged_env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=str(cwd) if cwd else None,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _terminate_process_group(proc)
+        raise subprocess.TimeoutExpired(cmd, timeout) from None
+    except asyncio.CancelledError:
+        await _terminate_process_group(proc)
+        raise
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
+async def _terminate_process_group(proc: asyncio.subprocess.Process, grace: float = 5.0) -> None:
+    """SIGTERM the stage's process group, then SIGKILL it after grace seconds."""
+    if proc.returncode is not None:
+        return
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(proc.wait()), grace)
+            return
+        except asyncio.TimeoutError:
+            continue
+
+
+def _providers_fingerprint(acw_script: str, overrides_path: Path | None) -> str:
+    """Hash of the path, mtime and size of acw.sh, its acw/*.sh modules and the shell overrides."""
+    script = Path(acw_script)
+    files = [script, *sorted(script.parent.glob("acw/*.sh"))]
+    if overrides_path is not None:
+        files.append(overrides_path)
+    entries = []
+    for path in files:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append([str(path), stat.st_mtime_ns, stat.st_size])
+    return hashlib.sha256(json.dumps(entries).encode()).hexdigest()
+
+
+def _providers_cache_path(agentize_home: str) -> Path:
+    return Path(agentize_home) / ".tmp" / "acw-providers.json"
+
+
+def _load_cached_providers(cache_path: Path, fingerprint: str) -> list[str] | None:
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return None
+    providers = data.get("providers")
+    if not isinstance(providers, list) or not providers or not all(isinstance(p, str) for p in providers):
+        return None
+    return providers
+
+
+def _store_cached_providers(cache_path: Path, fingerprint: str, providers: list[str]) -> None:
+    """Best effort: a read-only AGENTIZE_HOME only costs the next process a subprocess."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp{os.getpid()}")
+        tmp_path.write_text(json.dumps({"fingerprint": fingerprint, "providers": providers}) + "\n")
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+
 def list_acw_providers() -> list[str]:
-    """List supported providers from `acw --complete providers`."""
+    """List supported providers from `acw --complete providers`.
+
+    Cached in memory and in `$AGENTIZE_HOME/.tmp/acw-providers.json`, keyed by
+    the acw scripts' fingerprint, so only the first process after an acw
+    change pays for the bash subprocess.
+    """
     global _ACW_PROVIDERS_CACHE
 
     if _ACW_PROVIDERS_CACHE is not None:
@@ -109,23 +259,30 @@ def list_acw_providers() -> list[str]:
         merged_env = _merge_env(None)
         agentize_home = merged_env["AGENTIZE_HOME"]
         acw_script = _resolve_acw_script(agentize_home, merged_env)
-        overrides_cmd = _resolve_overrides_cmd(merged_env)
-        bash_cmd = f'source "{acw_script}"{overrides_cmd} && acw --complete providers'
-
-        result = subprocess.run(
-            ["bash", "-c", bash_cmd],
-            env=merged_env,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            detail = result.stderr.strip() or result.stdout.strip()
-            hint = detail if detail else f"exit code {result.returncode}"
-            raise RuntimeError(f"acw --complete providers failed ({hint})")
-
-        providers = [line.strip() for line in result.stdout.splitlines() if line.strip()]
-        if not providers:
-            raise RuntimeError("acw --complete providers returned no providers")
+        overrides_path = _resolve_overrides_path(merged_env)
+        fingerprint = _providers_fingerprint(acw_script, overrides_path)
+        cache_path = _providers_cache_path(agentize_home)
+
+        providers = _load_cached_providers(cache_path, fingerprint)
+        if providers is None:
+            overrides_cmd = _resolve_overrides_cmd(merged_env)
+            bash_cmd = f'source "{acw_script}"{overrides_cmd} && acw --complete providers'
+
+            result = subprocess.run(
+                ["bash", "-c", bash_cmd],
+                env=merged_env,
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                detail = result.stderr.strip() or result.stdout.strip()
+                hint = detail if detail else f"exit code {result.returncode}"
+                raise RuntimeError(f"acw --complete providers failed ({hint})")
+
+            providers = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+            if not providers:
+                raise RuntimeError("acw --complete providers returned no providers")
+            _store_cached_providers(cache_path, fingerprint, providers)
 
         _ACW_PROVIDERS_CACHE = providers
         return list(providers)
@@ -146,14 +303,9 @@ class ACW:
         extra_flags: list[str] | None = None,
         log_writer: Callable[[str], None] | None = None,
         runner: Callable[..., subprocess.CompletedProcess] | None = None,
+        async_runner: Callable[..., Awaitable[subprocess.CompletedProcess]] | None = None,
+        limit: bool | None = None,
     ) -> None:
-        # Skip provider validation when using custom runner (for tests)
-        if runner is None:
-            providers = list_acw_providers()
-            if provider not in providers:
-                available = ", ".join(providers)
-                raise ValueError(f"Unsupported provider '{provider}'. Available: {available}")
-
         self.name = name
         self.provider = provider
         self.model = model
@@ -163,6 +315,22 @@ class ACW:
         self.extra_flags = extra_flags
         self._log_writer = log_writer
         self._runner = runner if runner is not None else run_acw
+        self._async_runner = async_runner
+        # acw.limits apply to real acw calls; custom runners are stand-ins (tests)
+        self._limit = limit if limit is not None else (self._runner is run_acw and async_runner is None)
+        self.wait_seconds = 0.0
+        # Skip provider validation when using custom runner (for tests)
+        self._validated = runner is not None or async_runner is not None
+
+    def _validate_provider(self) -> None:
+        """Check the provider on first run, keeping the provider lookup off construction."""
+        if self._validated:
+            return
+        providers = list_acw_providers()
+        if self.provider not in providers:
+            available = ", ".join(providers)
+            raise ValueError(f"Unsupported provider '{self.provider}'. Available: {available}")
+        self._validated = True
 
     def _log(self, message: str) -> None:
         if self._log_writer:
@@ -170,25 +338,81 @@ class ACW:
             return
         print(message, file=sys.stderr)
 
+    def _limiter(self) -> ProviderLimiter | None:
+        return provider_limiter(self.provider, self.model) if self._limit else None
+
+    def _log_wait(self, backend: str) -> None:
+        if self.wait_seconds >= 1:
+            self._log(f"agent {self.name} ({backend}) waited {int(self.wait_seconds)}s for a provider slot")
+
+    def _runner_kwargs(self) -> dict:
+        return {
+            "tools": self.tools,
+            "permission_mode": self.permission_mode,
+            "extra_flags": self.extra_flags,
+            "timeout": self.timeout,
+        }
+
     def run(
         self,
         input_file: str | Path,
         output_file: str | Path,
     ) -> subprocess.CompletedProcess:
+        self._validate_provider()
+        backend = f"{self.provider}:{self.model}"
+        limiter = self._limiter()
+        if limiter is not None:
+            self.wait_seconds = limiter.acquire()
+            self._log_wait(backend)
+
         start_time = time.time()
+        self._log(f"agent {self.name} ({backend}) is running...")
+        try:
+            process = self._runner(
+                self.provider,
+                self.model,
+                input_file,
+                output_file,
+                **self._runner_kwargs(),
+            )
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+        elapsed = int(time.time() - start_time)
+        self._log(f"agent {self.name} ({backend}) runs {elapsed}s")
+        return process
+
+    async def run_async(
+        self,
+        input_file: str | Path,
+        output_file: str | Path,
+    ) -> subprocess.CompletedProcess:
+        """Asynchronous run(): uses async_runner, run_acw_async for the default
+        runner, or a worker thread for a custom synchronous runner.
+        """
+        if not self._validated:
+            await asyncio.to_thread(self._validate_provider)
         backend = f"{self.provider}:{self.model}"
+        limiter = self._limiter()
+        if limiter is not None:
+            self.wait_seconds = await limiter.acquire_async()
+            self._log_wait(backend)
+
+        start_time = time.time()
         self._log(f"agent {self.name} ({backend}) is running...")
 
-        process = self._runner(
-            self.provider,
-            self.model,
-            input_file,
-            output_file,
-            tools=self.tools,
-            permission_mode=self.permission_mode,
-            extra_flags=self.extra_flags,
-            timeout=self.timeout,
-        )
+        args = (self.provider, self.model, input_file, output_file)
+        try:
+            if self._async_runner is not None:
+                process = await self._async_runner(*args, **self._runner_kwargs())
+            elif self._runner is run_acw:
+                process = await run_acw_async(*args, **self._runner_kwargs())
+            else:
+                process = await asyncio.to_thread(self._runner, *args, **self._runner_kwargs())
+        finally:
+            if limiter is not None:
+                limiter.release()
 
         elapsed = int(time.time() - start_time)
         self._log(f"agent {self.name} ({backend}) runs {elapsed}s")
@@ -246,8 +470,9 @@ def run(
         extra_flags=extra_flags,
         log_writer=log_writer,
         runner=_runner,
+        limit=True,
     )
     return runner.run(input_file, output_file)
 
 
-__all__ = ["ACW", "list_acw_providers", "run", "run_acw"]
+__all__ = ["ACW", "list_acw_providers", "run", "run_acw", "run_acw_async"]
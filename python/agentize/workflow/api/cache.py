@@ -0,0 +1,127 @@
+"""Content-addressed cache of stage outputs for the Session DSL."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+DEFAULT_MAX_AGE_DAYS = 7.0
+DEFAULT_MAX_SIZE_MB = 256.0
+
+
+class StageCache:
+    """On-disk stage output cache keyed by everything that determines the output.
+
+    The key hashes the rendered input, provider, model, tools, permission
+    mode, extra flags and (when given) the repository commit, so a hit is a
+    byte-identical request. Entries live in `<cache_dir>/<key[:2]>/<key>.out`;
+    after every store, entries older than max_age_days are removed, then the
+    least recently used ones until the cache fits in max_size_mb. A limit of
+    0 disables it.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        *,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+        max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+        commit: str | None = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_age_days = max_age_days
+        self.max_size_mb = max_size_mb
+        self.commit = commit
+
+    def key(
+        self,
+        input_text: str,
+        backend: tuple[str, str],
+        *,
+        tools: str | None = None,
+        permission_mode: str | None = None,
+        extra_flags: list[str] | None = None,
+    ) -> str:
+        provider, model = backend
+        material = {
+            "input": hashlib.sha256(input_text.encode()).hexdigest(),
+            "provider": provider,
+            "model": model,
+            "tools": tools,
+            "permission_mode": permission_mode,
+            "extra_flags": list(extra_flags or []),
+            "commit": self.commit,
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.out"
+
+    def get(self, key: str) -> Path | None:
+        """Path of the cached output for key, or None. A hit refreshes its LRU time."""
+        entry = self._entry(key)
+        try:
+            if self._expired(entry.stat().st_mtime, time.time()):
+                return None
+            os.utime(entry)
+        except OSError:
+            return None
+        return entry
+
+    def put(self, key: str, output_path: str | Path, *, stage: str = "") -> None:
+        """Store a validated stage output under key, then evict."""
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.with_suffix(f".tmp{os.getpid()}")
+        shutil.copyfile(output_path, tmp_path)
+        tmp_path.replace(entry)
+        entry.with_suffix(".json").write_text(json.dumps({"stage": stage, "stored_at": time.time()}))
+        self.evict()
+
+    def evict(self, now: float | None = None) -> int:
+        """Apply the age and size limits. Returns the number of entries removed."""
+        now = time.time() if now is None else now
+        entries = []
+        for entry in self.cache_dir.glob("*/*.out"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        removed = 0
+        kept = []
+        for mtime, size, entry in entries:
+            if self._expired(mtime, now):
+                removed += self._remove(entry)
+            else:
+                kept.append((mtime, size, entry))
+
+        if self.max_size_mb:
+            budget = self.max_size_mb * 1024 * 1024
+            total = sum(size for _, size, _ in kept)
+            for _, size, entry in sorted(kept, key=lambda item: item[0]):
+                if total <= budget:
+                    break
+                removed += self._remove(entry)
+                total -= size
+        return removed
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return bool(self.max_age_days) and now - mtime > self.max_age_days * 86400
+
+    @staticmethod
+    def _remove(entry: Path) -> int:
+        try:
+            entry.unlink()
+            entry.with_suffix(".json").unlink(missing_ok=True)
+        except OSError:
+            return 0
+        return 1
+
+
+__all__ = ["StageCache", "DEFAULT_MAX_AGE_DAYS", "DEFAULT_MAX_SIZE_MB"]
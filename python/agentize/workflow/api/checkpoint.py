@@ -0,0 +1,122 @@
+"""Checkpoint manifest of completed stages for resumable Session runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+MANIFEST_VERSION = 1
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class StageManifest:
+    """JSON record of the stages a Session has completed under one prefix.
+
+    Each entry stores the SHA-256 of the stage input and output, the output
+    path, the backend and the completion time. A checkpoint is valid while the
+    rendered input and backend are unchanged and the output file still has the
+    recorded content. The `meta` section holds caller data needed to resume a
+    run, such as the planner's feature description.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_prefix(cls, output_dir: str | Path, prefix: str) -> "StageManifest":
+        return cls(Path(output_dir) / f"{prefix}-manifest.json")
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    def load(self) -> dict[str, Any]:
+        """The manifest contents; empty sections when missing or unreadable."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            data = {}
+        stages = data.get("stages")
+        meta = data.get("meta")
+        return {
+            "version": MANIFEST_VERSION,
+            "stages": stages if isinstance(stages, dict) else {},
+            "meta": meta if isinstance(meta, dict) else {},
+        }
+
+    def meta(self) -> dict[str, Any]:
+        return self.load()["meta"]
+
+    def update_meta(self, **values: Any) -> None:
+        with self._lock:
+            data = self.load()
+            data["meta"].update(values)
+            self._write(data)
+
+    def record(
+        self,
+        stage: str,
+        *,
+        input_path: Path,
+        output_path: Path,
+        backend: tuple[str, str],
+    ) -> None:
+        """Record a completed stage whose output has been validated."""
+        provider, model = backend
+        entry = {
+            "input_sha256": _file_sha256(input_path),
+            "output_path": str(output_path),
+            "output_sha256": _file_sha256(output_path),
+            "backend": f"{provider}:{model}",
+            "completed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            data = self.load()
+            data["stages"][stage] = entry
+            self._write(data)
+
+    def is_valid(
+        self,
+        stage: str,
+        *,
+        input_path: Path,
+        output_path: Path,
+        backend: tuple[str, str],
+    ) -> bool:
+        """True when the stage's checkpoint still matches its input, backend and output."""
+        entry = self.load()["stages"].get(stage)
+        if not isinstance(entry, dict):
+            return False
+        provider, model = backend
+        if entry.get("backend") != f"{provider}:{model}":
+            return False
+        if entry.get("output_path") != str(output_path):
+            return False
+        try:
+            if output_path.stat().st_size == 0:
+                return False
+            return (
+                entry.get("input_sha256") == _file_sha256(input_path)
+                and entry.get("output_sha256") == _file_sha256(output_path)
+            )
+        except OSError:
+            return False
+
+    def _write(self, data: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".tmp{os.getpid()}")
+        tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+        tmp_path.replace(self.path)
+
+
+__all__ = ["StageManifest", "MANIFEST_VERSION"]
@@ -0,0 +1,247 @@
+"""Prompt context assembly: shared blocks referenced by path, size accounting and budgets."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+# How a block ended up in the prompt
+INLINE = "inline"
+REFERENCE = "reference"
+TRUNCATED = "truncated"
+OUTLINED = "outlined"
+
+STRATEGIES = ("truncate", "outline")
+
+# Separator between the sections of a stage prompt
+SECTION_SEPARATOR = "\n\n---\n\n"
+
+# Rough provider-neutral estimate used for token budgets
+BYTES_PER_TOKEN = 4
+
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text.encode()) // BYTES_PER_TOKEN)
+
+
+def format_size(n: int) -> str:
+    if n < 1024:
+        return f"{n}B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f}KB"
+    return f"{n / (1024 * 1024):.1f}MB"
+
+
+def can_read_files(backend: tuple[str, str], tools: str | None) -> bool:
+    """Whether a stage on backend can open a referenced file itself (Claude with the Read tool)."""
+    provider, _ = backend
+    return provider == "claude" and "Read" in (tools or "").split(",")
+
+
+@dataclass(frozen=True)
+class ContextBlock:
+    """One section of a stage prompt.
+
+    `shared` blocks are stable across stages and may be referenced by path
+    instead of inlined; `path` names a file that already holds `content`
+    (otherwise one is written to the session directory). `reducible` blocks
+    may be truncated or outlined to meet a budget.
+    """
+
+    name: str
+    content: str
+    title: str | None = None
+    shared: bool = False
+    reducible: bool = False
+    path: Path | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.content.encode())
+
+
+@dataclass(frozen=True)
+class ContextPolicy:
+    """How stage prompts are assembled.
+
+    With `reference`, shared blocks of at least `reference_min_bytes` are
+    referenced by path for stages that can read files. When the inline
+    prompt exceeds `max_bytes` or `max_tokens`, reducible blocks are cut
+    down, largest first, with `strategy`: `truncate` keeps the head and tail
+    of a block, `outline` keeps its markdown headings and their first lines.
+    """
+
+    reference: bool = False
+    reference_min_bytes: int = 1024
+    max_bytes: int | None = None
+    max_tokens: int | None = None
+    strategy: str = "truncate"
+
+    def __post_init__(self) -> None:
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown context strategy '{self.strategy}' (expected one of: {', '.join(STRATEGIES)})")
+
+    def budget(self) -> int | None:
+        """The byte budget of a prompt, or None when unlimited."""
+        limits = [limit for limit in (self.max_bytes, self.max_tokens and self.max_tokens * BYTES_PER_TOKEN) if limit]
+        return min(limits) if limits else None
+
+
+@dataclass(frozen=True)
+class BlockUsage:
+    name: str
+    size: int
+    prompt_size: int
+    mode: str
+
+
+@dataclass(frozen=True)
+class AssembledPrompt:
+    text: str
+    blocks: tuple[BlockUsage, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.text.encode())
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def changed(self) -> bool:
+        """Whether any block was referenced or reduced."""
+        return any(block.mode != INLINE for block in self.blocks)
+
+    def summary(self) -> str:
+        """`prompt <size> (~<tokens> tokens): <block> <size>[ -> <mode> <size>], ...`."""
+        parts = []
+        for block in self.blocks:
+            part = f"{block.name} {format_size(block.size)}"
+            if block.mode != INLINE:
+                part += f" -> {block.mode} {format_size(block.prompt_size)}"
+            parts.append(part)
+        return f"prompt {format_size(self.size)} (~{self.tokens} tokens): {', '.join(parts)}"
+
+
+def _cut(text: str, max_bytes: int, note: str) -> str:
+    """Keep the head and tail of text within max_bytes, with a note where the middle was dropped."""
+    data = text.encode()
+    if len(data) <= max_bytes:
+        return text
+    marker = f"\n\n[... {note}: {format_size(len(data))} reduced to fit the prompt budget ...]\n\n"
+    room = max(max_bytes - len(marker.encode()), 0)
+    head = data[: room * 2 // 3].decode(errors="ignore")
+    tail = data[len(data) - (room - room * 2 // 3):].decode(errors="ignore") if room else ""
+    return f"{head}{marker}{tail}"
+
+
+def _outline(text: str, max_bytes: int, note: str) -> str:
+    """Markdown headings with the first non-empty line after each, cut to max_bytes."""
+    kept = []
+    want_line = False
+    for line in text.splitlines():
+        if _HEADING_RE.match(line):
+            kept.append(line)
+            want_line = True
+        elif want_line and line.strip():
+            kept.append(line)
+            want_line = False
+    outline = "\n".join(kept) + f"\n\n[... {note}: outline of {format_size(len(text.encode()))} ...]"
+    return _cut(outline, max_bytes, note)
+
+
+class ContextAssembler:
+    """Builds stage prompts from context blocks under a ContextPolicy.
+
+    Shared blocks without a `path` are written once to
+    `<shared_dir>/<prefix>-context-<name>.md` and rewritten only when their
+    content changes.
+    """
+
+    def __init__(self, shared_dir: str | Path, prefix: str, policy: ContextPolicy | None = None) -> None:
+        self.shared_dir = Path(shared_dir)
+        self.prefix = prefix
+        self.policy = policy or ContextPolicy()
+        self._written: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _shared_file(self, block: ContextBlock, digest: str) -> Path:
+        if block.path is not None:
+            return block.path
+        path = self.shared_dir / f"{self.prefix}-context-{block.name}.md"
+        with self._lock:
+            if self._written.get(block.name) != digest:
+                path.write_text(block.content)
+                self._written[block.name] = digest
+        return path
+
+    def _render(self, block: ContextBlock, content: str) -> str:
+        return content if block.title is None else f"{block.title}\n\n{content}"
+
+    def _reference(self, block: ContextBlock) -> str:
+        digest = hashlib.sha256(block.content.encode()).hexdigest()
+        path = self._shared_file(block, digest)
+        # The digest changes the prompt whenever the file does, which keeps stage caches and checkpoints exact
+        return (
+            f"Read `{path}` ({format_size(block.size)}, sha256 {digest[:12]}) before answering; "
+            "its content is not repeated here."
+        )
+
+    def assemble(
+        self,
+        blocks: Iterable[ContextBlock],
+        *,
+        can_read: bool = False,
+        separator: str = SECTION_SEPARATOR,
+    ) -> AssembledPrompt:
+        """Join blocks into a prompt, referencing and reducing them as the policy allows."""
+        blocks = list(blocks)
+        policy = self.policy
+        contents = []
+        modes = []
+        for block in blocks:
+            if can_read and policy.reference and block.shared and block.size >= policy.reference_min_bytes:
+                contents.append(self._reference(block))
+                modes.append(REFERENCE)
+            else:
+                contents.append(block.content)
+                modes.append(INLINE)
+
+        def _text() -> str:
+            return separator.join(self._render(block, content) for block, content in zip(blocks, contents))
+
+        budget = policy.budget()
+        if budget is not None:
+            reduce = _outline if policy.strategy == "outline" else _cut
+            reducible = [i for i, block in enumerate(blocks) if block.reducible and modes[i] == INLINE]
+            for i in sorted(reducible, key=lambda i: blocks[i].size, reverse=True):
+                excess = len(_text().encode()) - budget
+                if excess <= 0:
+                    break
+                keep = max(len(contents[i].encode()) - excess, 0)
+                contents[i] = reduce(contents[i], keep, blocks[i].name)
+                modes[i] = OUTLINED if policy.strategy == "outline" else TRUNCATED
+
+        usage = tuple(
+            BlockUsage(block.name, block.size, len(content.encode()), mode)
+            for block, content, mode in zip(blocks, contents, modes)
+        )
+        return AssembledPrompt(_text(), usage)
+
+
+__all__ = [
+    "AssembledPrompt",
+    "BlockUsage",
+    "ContextAssembler",
+    "ContextBlock",
+    "ContextPolicy",
+    "can_read_files",
+    "estimate_tokens",
+    "STRATEGIES",
+]
@@ -8,9 +8,24 @@ import shlex
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Iterable
 
+# How long a known gh auth state is trusted before the next command re-learns it
+GH_AUTH_TTL = 300.0
+
+# Stderr of a gh command that failed for lack of authentication
+_AUTH_FAILURE_RE = re.compile(
+    r"gh auth login|not logged in|authentication required|bad credentials|HTTP 401",
+    re.IGNORECASE,
+)
+
+# (overrides path, authenticated, monotonic time learned); None until a command has run
+_GH_AUTH: tuple[str, bool, float] | None = None
+_GH_AUTH_LOCK = threading.Lock()
+
 
 def _resolve_overrides() -> Path | None:
     overrides_path = os.environ.get("AGENTIZE_SHELL_OVERRIDES")
@@ -36,24 +51,29 @@ def _body_args(body: str) -> tuple[list[str], str | None]:
 
 
 def _gh_available() -> bool:
+    """Whether gh can be invoked, and was not recently seen failing authentication.
+
+    Authentication is learned from the exit status of real commands
+    (`_run_gh`) and trusted for GH_AUTH_TTL seconds, so no separate
+    `gh auth status` round trip is made.
+    """
     overrides = _resolve_overrides()
     if overrides is None and shutil.which("gh") is None:
         return False
-    if overrides is not None:
-        cmd = _shell_command(["gh", "auth", "status"])
-        result = subprocess.run(
-            ["bash", "-c", f"source {shlex.quote(str(overrides))} && {cmd}"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        return result.returncode == 0
+    with _GH_AUTH_LOCK:
+        known = _GH_AUTH
+    if known is None:
+        return True
+    scope, authenticated, learned_at = known
+    if scope != str(overrides) or time.monotonic() - learned_at > GH_AUTH_TTL:
+        return True
+    return authenticated
 
-    result = subprocess.run(
-        ["gh", "auth", "status"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-    return result.returncode == 0
+
+def _record_gh_auth(authenticated: bool) -> None:
+    global _GH_AUTH
+    with _GH_AUTH_LOCK:
+        _GH_AUTH = (str(_resolve_overrides()), authenticated, time.monotonic())
 
 
 def _run_gh(
@@ -82,7 +102,11 @@ def _run_gh(
     if result.returncode != 0:
         detail = result.stderr.strip() or result.stdout.strip()
         hint = detail if detail else f"exit code {result.returncode}"
+        if _AUTH_FAILURE_RE.search(detail):
+            _record_gh_auth(False)
+            raise RuntimeError(f"gh CLI not authenticated: gh {' '.join(args)} failed ({hint})")
         raise RuntimeError(f"gh {' '.join(args)} failed ({hint})")
+    _record_gh_auth(True)
     return result
 
 
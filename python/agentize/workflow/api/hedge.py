@@ -0,0 +1,107 @@
+"""Stage latency history and hedged (speculative) stage execution policies."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+# Fewest recorded runs a hedge threshold is based on, and how many recent ones count
+MIN_SAMPLES = 5
+SAMPLE_WINDOW = 50
+
+
+def _history_key(stage: str, backend: tuple[str, str]) -> str:
+    provider, model = backend
+    return f"{stage}|{provider}:{model}"
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of samples for q in (0, 1]."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(q * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyHistory:
+    """Recent run times of each stage on each backend, stored as JSON.
+
+    Only stages that actually ran are recorded (not cache hits or resumed
+    checkpoints), and the time spent waiting for a provider permit is left
+    out, so the history reflects provider latency.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, list[float]]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def samples(self, stage: str, backend: tuple[str, str]) -> list[float]:
+        values = self._load().get(_history_key(stage, backend))
+        if not isinstance(values, list):
+            return []
+        return [float(value) for value in values if isinstance(value, (int, float))]
+
+    def record(self, stage: str, backend: tuple[str, str], seconds: float) -> None:
+        """Append a run time, keeping the most recent SAMPLE_WINDOW per stage and backend."""
+        key = _history_key(stage, backend)
+        with self._lock:
+            data = self._load()
+            values = data.get(key) if isinstance(data.get(key), list) else []
+            data[key] = (values + [round(seconds, 3)])[-SAMPLE_WINDOW:]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".tmp{os.getpid()}")
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+            tmp_path.replace(self.path)
+
+    def percentile(self, stage: str, backend: tuple[str, str], q: float) -> float | None:
+        """The q-th percentile run time, or None with fewer than MIN_SAMPLES runs."""
+        samples = self.samples(stage, backend)
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return _percentile(samples, q)
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Start a second copy of a slow stage on another backend.
+
+    When the stage has not produced valid output after the `percentile`-th
+    recorded run time of its backend (never less than `min_delay`), the same
+    prompt is started on `backend` and the first valid output wins. Without
+    enough history the stage hedges after `default_delay`, or not at all
+    when that is None.
+    """
+
+    backend: tuple[str, str]
+    percentile: float = 0.9
+    min_delay: float = 30.0
+    default_delay: float | None = None
+
+    def delay(self, history: LatencyHistory | None, stage: str, backend: tuple[str, str]) -> float | None:
+        """Seconds to wait before hedging stage on backend, or None to not hedge."""
+        if backend == self.backend:
+            return None
+        threshold = history.percentile(stage, backend, self.percentile) if history is not None else None
+        if threshold is None:
+            threshold = self.default_delay
+        if threshold is None:
+            return None
+        return max(threshold, self.min_delay)
+
+
+def hedge_output_path(output_path: Path) -> Path:
+    """Where the hedged copy of a stage writes its output: `<output>.hedge`."""
+    return output_path.with_name(f"{output_path.name}.hedge")
+
+
+__all__ = ["HedgePolicy", "LatencyHistory", "hedge_output_path", "MIN_SAMPLES", "SAMPLE_WINDOW"]
@@ -0,0 +1,285 @@
+"""Cross-process concurrency and rate limits for acw provider calls.
+
+Every process that runs acw (planner and impl stages, the server's workflows,
+the handsoff supervisor) takes a slot from the same lock files before calling
+a provider, so together they never exceed `acw.limits` in
+.agentize.local.yaml:
+
+    acw:
+      limits:
+        claude:
+          concurrency: 3      # calls in flight per model
+          rpm: 20             # calls started per minute per model
+          models:
+            opus:
+              concurrency: 2  # per-model override
+
+A slot is an `flock` on `<limits_dir>/<provider>-<model>.slot<N>`, so a crashed
+caller frees its slot with its last descriptor. The request rate is a token
+bucket stored in `<provider>-<model>.bucket`. Waiting callers line up on a
+queue lock and only its holder polls, so callers are served roughly in
+arrival order instead of whoever polls first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fcntl
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_POLL_INTERVAL = 0.2
+
+
+@dataclass(frozen=True)
+class ProviderLimit:
+    """Limits for one provider:model. 0 disables a limit."""
+
+    concurrency: int = 0
+    rpm: float = 0
+    burst: int = 1
+
+    @property
+    def enabled(self) -> bool:
+        return self.concurrency > 0 or self.rpm > 0
+
+
+def _parse_limit(section: dict, base: ProviderLimit, where: str) -> ProviderLimit:
+    values = {}
+    for key, cast in (("concurrency", int), ("rpm", float), ("burst", int)):
+        if key not in section:
+            continue
+        try:
+            values[key] = max(cast(section[key]), 0)
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}.{key} must be a number") from None
+    return ProviderLimit(
+        concurrency=values.get("concurrency", base.concurrency),
+        rpm=values.get("rpm", base.rpm),
+        burst=max(values.get("burst", base.burst), 1),
+    )
+
+
+def load_provider_limits(config: Optional[dict] = None) -> dict[tuple[str, str | None], ProviderLimit]:
+    """Parse `acw.limits` into {(provider, model or None): limit}.
+
+    Args:
+        config: Parsed runtime config (loaded via load_runtime_config() if None)
+    """
+    if config is None:
+        from agentize.server.runtime_config import load_runtime_config
+
+        config, _ = load_runtime_config()
+    acw = config.get("acw")
+    limits_config = acw.get("limits") if isinstance(acw, dict) else None
+    if not isinstance(limits_config, dict):
+        return {}
+
+    limits: dict[tuple[str, str | None], ProviderLimit] = {}
+    for provider, section in limits_config.items():
+        if not isinstance(section, dict):
+            raise ValueError(f"acw.limits.{provider} must be a mapping")
+        provider_limit = _parse_limit(section, ProviderLimit(), f"acw.limits.{provider}")
+        limits[(provider, None)] = provider_limit
+        models = section.get("models")
+        if isinstance(models, dict):
+            for model, model_section in models.items():
+                if isinstance(model_section, dict):
+                    where = f"acw.limits.{provider}.models.{model}"
+                    limits[(provider, model)] = _parse_limit(model_section, provider_limit, where)
+    return limits
+
+
+def resolve_limits_dir() -> Path:
+    """`AGENTIZE_ACW_LIMITS_DIR`, else `$AGENTIZE_HOME/.tmp/acw-limits` (shared by every clone)."""
+    override = os.getenv("AGENTIZE_ACW_LIMITS_DIR")
+    if override:
+        return Path(override)
+    return Path(os.getenv("AGENTIZE_HOME", ".")) / ".tmp" / "acw-limits"
+
+
+class ProviderLimiter:
+    """A held-until-release permit to call one provider:model.
+
+    acquire() blocks until a concurrency slot and a rate token are both
+    available and returns the seconds spent waiting; release() frees the slot.
+    Use as a context manager for the same effect.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        limit: ProviderLimit,
+        *,
+        limits_dir: Optional[Path] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.provider = provider
+        self.model = model
+        self.limit = limit
+        self.limits_dir = Path(limits_dir) if limits_dir is not None else resolve_limits_dir()
+        self.poll_interval = poll_interval
+        self.waited = 0.0
+        self._key = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{provider}-{model}")
+        self._slot_fd: Optional[int] = None
+
+    def _open(self, suffix: str) -> int:
+        self.limits_dir.mkdir(parents=True, exist_ok=True)
+        return os.open(self.limits_dir / f"{self._key}.{suffix}", os.O_RDWR | os.O_CREAT, 0o644)
+
+    @staticmethod
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _take_slot(self) -> bool:
+        if self.limit.concurrency <= 0:
+            return True
+        for index in range(self.limit.concurrency):
+            fd = self._open(f"slot{index}")
+            if self._try_lock(fd):
+                self._slot_fd = fd
+                return True
+            os.close(fd)
+        return False
+
+    def _release_slot(self) -> None:
+        if self._slot_fd is not None:
+            os.close(self._slot_fd)
+            self._slot_fd = None
+
+    def _take_token(self, now: float) -> float:
+        """Take a rate token; returns 0 on success, else the seconds until one is due."""
+        if self.limit.rpm <= 0:
+            return 0.0
+        rate = self.limit.rpm / 60.0
+        fd = self._open("bucket")
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                state = json.loads(os.pread(fd, 4096, 0) or b"{}")
+            except ValueError:
+                state = {}
+            elapsed = max(now - float(state.get("updated", now)), 0.0)
+            tokens = min(float(state.get("tokens", self.limit.burst)) + elapsed * rate, self.limit.burst)
+            if tokens < 1:
+                return (1 - tokens) / rate
+            data = json.dumps({"tokens": tokens - 1, "updated": now}).encode()
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, data, 0)
+            return 0.0
+        finally:
+            os.close(fd)
+
+    def _try_acquire(self) -> float:
+        """One attempt at a slot plus a token. Returns 0 on success, else a suggested delay."""
+        if not self._take_slot():
+            return self.poll_interval
+        delay = self._take_token(time.time())
+        if delay > 0:
+            self._release_slot()
+            return min(max(delay, self.poll_interval / 4), 5.0)
+        return 0.0
+
+    def acquire(self) -> float:
+        started = time.monotonic()
+        queue_fd = self._open("queue")
+        try:
+            fcntl.flock(queue_fd, fcntl.LOCK_EX)
+            while (delay := self._try_acquire()) > 0:
+                time.sleep(delay)
+        finally:
+            os.close(queue_fd)
+        self.waited = time.monotonic() - started
+        return self.waited
+
+    async def acquire_async(self) -> float:
+        """acquire() without blocking the event loop."""
+        started = time.monotonic()
+        queue_fd = self._open("queue")
+        try:
+            while not self._try_lock(queue_fd):
+                await asyncio.sleep(self.poll_interval)
+            while (delay := self._try_acquire()) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            os.close(queue_fd)
+        self.waited = time.monotonic() - started
+        return self.waited
+
+    def release(self) -> None:
+        self._release_slot()
+
+    def __enter__(self) -> "ProviderLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def provider_limiter(provider: str, model: str, config: Optional[dict] = None) -> Optional[ProviderLimiter]:
+    """The limiter for provider:model, or None when no limit applies.
+
+    Limits that cannot be loaded are reported on stderr and ignored, so a bad
+    config never blocks a stage.
+    """
+    try:
+        limits = load_provider_limits(config)
+    except (OSError, ValueError) as exc:
+        print(f"Warning: Ignoring acw.limits ({exc})", file=sys.stderr)
+        return None
+    limit = limits.get((provider, model)) or limits.get((provider, None))
+    if limit is None or not limit.enabled:
+        return None
+    return ProviderLimiter(provider, model, limit)
+
+
+def main(argv: list[str]) -> int:
+    """`python -m agentize.workflow.api.limiter run PROVIDER MODEL -- CMD...`
+
+    Runs CMD while holding a permit for PROVIDER:MODEL, for callers that
+    cannot import agentize (the handsoff supervisor). Exits with CMD's status.
+    """
+    parser = argparse.ArgumentParser(prog="python -m agentize.workflow.api.limiter")
+    sub = parser.add_subparsers(dest="action", required=True)
+    run = sub.add_parser("run", help="Run a command under the provider limit")
+    run.add_argument("provider")
+    run.add_argument("model")
+    run.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("run requires a command after --")
+
+    limiter = provider_limiter(args.provider, args.model)
+    if limiter is None:
+        return subprocess.call(command)
+    with limiter:
+        return subprocess.call(command)
+
+
+__all__ = [
+    "ProviderLimit",
+    "ProviderLimiter",
+    "load_provider_limits",
+    "provider_limiter",
+    "resolve_limits_dir",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
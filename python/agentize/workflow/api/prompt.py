@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 _FRONTMATTER_RE = re.compile(r"^---\s*\n.*?\n---\s*\n", re.DOTALL)
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}\s]+)\}\}|\{#([^{}#\s]+)#\}")
+
+# Compiled templates keyed by (resolved path, strip_frontmatter); reloaded when mtime or size changes
+_TEMPLATE_CACHE: dict[tuple[str, bool], tuple[int, int, "PromptTemplate"]] = {}
+_TEMPLATE_LOCK = threading.Lock()
 
 
 def _strip_yaml_frontmatter(content: str) -> str:
@@ -14,24 +21,78 @@ def _strip_yaml_frontmatter(content: str) -> str:
     return _FRONTMATTER_RE.sub("", content, count=1)
 
 
-def read_prompt(path: str | Path, *, strip_frontmatter: bool = False) -> str:
-    """Read a prompt file, optionally stripping YAML frontmatter."""
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A template parsed once into literal text and placeholders.
+
+    `literals` has one more entry than `keys`; `tokens` keeps each
+    placeholder as written, for keys missing from the render values.
+    """
+
+    source: str
+    literals: tuple[str, ...]
+    keys: tuple[str, ...]
+    tokens: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, source: str) -> "PromptTemplate":
+        literals = []
+        keys = []
+        tokens = []
+        position = 0
+        for match in _PLACEHOLDER_RE.finditer(source):
+            literals.append(source[position:match.start()])
+            keys.append(match.group(1) or match.group(2))
+            tokens.append(match.group(0))
+            position = match.end()
+        literals.append(source[position:])
+        return cls(source, tuple(literals), tuple(keys), tuple(tokens))
+
+    @property
+    def placeholders(self) -> frozenset[str]:
+        return frozenset(self.keys)
+
+    def missing(self, required: Iterable[str]) -> list[str]:
+        """Required placeholder names that the template does not contain, sorted."""
+        return sorted(set(required) - self.placeholders)
+
+    def render(self, values: dict[str, Any]) -> str:
+        """Substitute values in one pass; placeholders without a value are kept as written."""
+        parts = [self.literals[0]]
+        for key, token, literal in zip(self.keys, self.tokens, self.literals[1:]):
+            if key in values:
+                value = values[key]
+                parts.append("" if value is None else str(value))
+            else:
+                parts.append(token)
+            parts.append(literal)
+        return "".join(parts)
+
+
+def load_template(path: str | Path, *, strip_frontmatter: bool = False) -> PromptTemplate:
+    """Read and compile a prompt file, reusing the compiled template while the file is unchanged."""
     path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"Prompt file not found: {path}")
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt file not found: {path}") from None
+    key = (str(path.resolve()), strip_frontmatter)
+    with _TEMPLATE_LOCK:
+        cached = _TEMPLATE_CACHE.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
     content = path.read_text()
     if strip_frontmatter:
-        return _strip_yaml_frontmatter(content)
-    return content
+        content = _strip_yaml_frontmatter(content)
+    template = PromptTemplate.compile(content)
+    with _TEMPLATE_LOCK:
+        _TEMPLATE_CACHE[key] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
 
 
-def _replace_tokens(content: str, values: dict[str, Any]) -> str:
-    rendered = content
-    for key, value in values.items():
-        token_value = "" if value is None else str(value)
-        rendered = rendered.replace(f"{{{{{key}}}}}", token_value)
-        rendered = rendered.replace(f"{{#{key}#}}", token_value)
-    return rendered
+def read_prompt(path: str | Path, *, strip_frontmatter: bool = False) -> str:
+    """Read a prompt file, optionally stripping YAML frontmatter."""
+    return load_template(path, strip_frontmatter=strip_frontmatter).source
 
 
 def render(
@@ -42,11 +103,11 @@ def render(
     strip_frontmatter: bool = False,
 ) -> str:
     """Render a template with replacements and write it to dest_path."""
-    template = read_prompt(template_path, strip_frontmatter=strip_frontmatter)
-    rendered = _replace_tokens(template, values)
+    template = load_template(template_path, strip_frontmatter=strip_frontmatter)
+    rendered = template.render(values)
     dest_path = Path(dest_path)
     dest_path.write_text(rendered)
     return rendered
 
 
-__all__ = ["read_prompt", "render"]
+__all__ = ["PromptTemplate", "load_template", "read_prompt", "render"]
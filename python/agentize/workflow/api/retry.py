@@ -0,0 +1,214 @@
+"""Retry policies for Session stages: failure classes, backoff and fallback backends."""
+
+from __future__ import annotations
+
+import random
+import re
+import subprocess
+from dataclasses import dataclass, field
+from typing import Callable, Mapping
+
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+TIMEOUT = "timeout"
+DETERMINISTIC = "deterministic"
+FAILURE_CLASSES = (RATE_LIMIT, TRANSIENT, TIMEOUT, DETERMINISTIC)
+
+# acw argument and setup errors (unknown provider, missing input file, provider
+# CLI not installed, bad chat session) and shell "cannot execute / not found"
+_DETERMINISTIC_EXIT_CODES = {2, 3, 4, 5, 126, 127}
+# coreutils timeout(1)
+_TIMEOUT_EXIT_CODES = {124}
+# acw: the provider CLI is not installed
+_BACKEND_SPECIFIC_EXIT_CODES = {4}
+
+_RATE_LIMIT_RE = re.compile(
+    r"rate[ _-]?limit|too many requests|\b429\b|overloaded|quota|usage limit|resource[ _]exhausted",
+    re.IGNORECASE,
+)
+_TIMEOUT_RE = re.compile(r"timed? ?out|deadline exceeded|\b504\b", re.IGNORECASE)
+_TRANSIENT_RE = re.compile(
+    r"connection (?:reset|refused|aborted|error)|network|temporar(?:y|ily)|unavailable|"
+    r"\b50[023]\b|internal server error|bad gateway|econnreset|broken pipe",
+    re.IGNORECASE,
+)
+_DETERMINISTIC_RE = re.compile(
+    r"invalid (?:model|api key|request|argument)|unknown (?:model|provider|option)|"
+    r"unauthori[sz]ed|authentication|permission denied|not logged in|\b40[013]\b|"
+    r"context (?:length|window)|prompt is too long",
+    re.IGNORECASE,
+)
+# Deterministic causes that another provider or model may not share
+_BACKEND_SPECIFIC_RE = re.compile(
+    r"(?:invalid|unknown) (?:model|provider|api key)|model \S* ?not found|not found in PATH|"
+    r"unauthori[sz]ed|authentication|not logged in|\b401\b|context (?:length|window)|prompt is too long",
+    re.IGNORECASE,
+)
+
+
+class StageFailure(RuntimeError):
+    """A stage that ran but did not produce valid output.
+
+    Carries the finished process and the provider's stderr (the acw
+    `.stderr` sidecar plus the process stderr) for classify_failure().
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        process: subprocess.CompletedProcess | None = None,
+        stderr: str = "",
+    ) -> None:
+        super().__init__(message)
+        self.process = process
+        self.stderr = stderr
+
+
+def classify_failure(error: BaseException) -> str:
+    """Classify a failed attempt as one of FAILURE_CLASSES.
+
+    Timeouts and stderr patterns are checked first, then acw's exit codes.
+    A stage that exits non-zero without a recognised cause, or writes no
+    output, is transient. Exceptions other than StageFailure, timeouts and
+    OSError come from prompt writers or callbacks and are deterministic.
+    """
+    if isinstance(error, (subprocess.TimeoutExpired, TimeoutError)):
+        return TIMEOUT
+    if isinstance(error, StageFailure):
+        stderr = error.stderr
+        if _RATE_LIMIT_RE.search(stderr):
+            return RATE_LIMIT
+        if _DETERMINISTIC_RE.search(stderr):
+            return DETERMINISTIC
+        returncode = error.process.returncode if error.process is not None else 0
+        if returncode in _TIMEOUT_EXIT_CODES or _TIMEOUT_RE.search(stderr):
+            return TIMEOUT
+        if _TRANSIENT_RE.search(stderr):
+            return TRANSIENT
+        if returncode in _DETERMINISTIC_EXIT_CODES:
+            return DETERMINISTIC
+        return TRANSIENT
+    if isinstance(error, OSError):
+        return TRANSIENT
+    return DETERMINISTIC
+
+
+def is_backend_specific(error: BaseException) -> bool:
+    """True when a failure points at the backend (model, provider, credentials or
+    context size) rather than at the stage, so another backend may succeed.
+    """
+    if not isinstance(error, StageFailure):
+        return False
+    if error.process is not None and error.process.returncode in _BACKEND_SPECIFIC_EXIT_CODES:
+        return True
+    return bool(_BACKEND_SPECIFIC_RE.search(error.stderr))
+
+
+def _default_budgets() -> dict[str, int]:
+    return {RATE_LIMIT: 5, TRANSIENT: 2, TIMEOUT: 1, DETERMINISTIC: 0}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How many times to retry each failure class, and how long to wait.
+
+    `budgets` maps a failure class to the retries it may use; a class that
+    is missing gets none. The n-th retry waits up to
+    min(max_delay, base_delay * multiplier ** (n - 1)) seconds, drawn
+    uniformly from [0, that] when `jitter` is set ("full jitter").
+
+    With `fallback`, the stage switches to that backend once `fallback_after`
+    attempts have failed, or earlier when a failure's class has no retries
+    left. Counts restart on the fallback backend. Deterministic failures
+    only fall back when `backend_specific` accepts them; a missing prompt
+    file fails the same way on every backend.
+    """
+
+    budgets: Mapping[str, int] = field(default_factory=_default_budgets)
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    fallback: tuple[str, str] | None = None
+    fallback_after: int = 2
+    classify: Callable[[BaseException], str] = classify_failure
+    backend_specific: Callable[[BaseException], bool] = is_backend_specific
+
+    @classmethod
+    def fixed(cls, retry: int, retry_delay: float = 0) -> "RetryPolicy":
+        """`retry` retries for every failure class, `retry_delay` seconds apart (the legacy behaviour)."""
+        return cls(
+            budgets={name: retry for name in FAILURE_CLASSES},
+            base_delay=retry_delay,
+            max_delay=retry_delay,
+            multiplier=1.0,
+            jitter=False,
+        )
+
+    def delay(self, retry_number: int, rng: random.Random | None = None) -> float:
+        """Seconds to wait before the retry_number-th retry (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** max(retry_number - 1, 0))
+        if ceiling <= 0:
+            return 0.0
+        if not self.jitter:
+            return ceiling
+        return (rng or random).uniform(0, ceiling)
+
+
+class RetryState:
+    """Per-stage bookkeeping for a RetryPolicy across attempts."""
+
+    def __init__(self, policy: RetryPolicy, backend: tuple[str, str]) -> None:
+        self.policy = policy
+        self.backend = backend
+        self.failure_class: str | None = None
+        self._counts: dict[str, int] = {}
+        self._failures = 0
+        self._on_fallback = False
+
+    def _switch_to_fallback(self) -> bool:
+        fallback = self.policy.fallback
+        if self._on_fallback or fallback is None or fallback == self.backend:
+            return False
+        self.backend = fallback
+        self._on_fallback = True
+        self._counts = {}
+        self._failures = 0
+        return True
+
+    def next_delay(self, error: BaseException) -> float | None:
+        """Record a failed attempt; the seconds to wait before retrying, or None to give up.
+
+        After a switch to the fallback backend, `backend` holds the new backend.
+        """
+        failure_class = self.policy.classify(error)
+        self.failure_class = failure_class
+        self._failures += 1
+        can_fall_back = failure_class != DETERMINISTIC or self.policy.backend_specific(error)
+        used = self._counts.get(failure_class, 0)
+        if used >= self.policy.budgets.get(failure_class, 0):
+            return 0.0 if can_fall_back and self._switch_to_fallback() else None
+        if can_fall_back and self.policy.fallback is not None and self._failures >= self.policy.fallback_after:
+            if self._switch_to_fallback():
+                return 0.0
+        self._counts[failure_class] = used + 1
+        return self.policy.delay(sum(self._counts.values()))
+
+
+NO_RETRY = RetryPolicy.fixed(0)
+
+
+__all__ = [
+    "RetryPolicy",
+    "RetryState",
+    "StageFailure",
+    "classify_failure",
+    "is_backend_specific",
+    "FAILURE_CLASSES",
+    "RATE_LIMIT",
+    "TRANSIENT",
+    "TIMEOUT",
+    "DETERMINISTIC",
+    "NO_RETRY",
+]
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import shutil
 import subprocess
 import sys
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Iterable
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Mapping
 
 from agentize.workflow.api.acw import ACW, run_acw
+from agentize.workflow.api.cache import StageCache
+from agentize.workflow.api.checkpoint import StageManifest
+from agentize.workflow.api.hedge import HedgePolicy, LatencyHistory, hedge_output_path
+from agentize.workflow.api.retry import NO_RETRY, RetryPolicy, RetryState, StageFailure
+from agentize.workflow.api.stream import OutputCallback, OutputFollower, follow, stderr_path
+from agentize.workflow.api.telemetry import StageTelemetry, TraceWriter, collect_telemetry
 
 PromptWriter = Callable[[Path], str]
 PromptInput = str | PromptWriter
@@ -24,6 +33,15 @@ class StageResult:
     input_path: Path
     output_path: Path
     process: subprocess.CompletedProcess
+    cached: bool = False
+    resumed: bool = False
+    hedged: bool = False
+    telemetry: StageTelemetry = field(default_factory=StageTelemetry)
+
+    @property
+    def wait_seconds(self) -> float:
+        """Time the last attempt waited for a provider permit (telemetry.wait_seconds)."""
+        return self.telemetry.wait_seconds
 
     def text(self) -> str:
         return self.output_path.read_text()
@@ -39,17 +57,93 @@ class StageCall:
     options: dict[str, Any]
 
 
+NodePrompt = str | Callable[[Mapping[str, "StageResult"]], PromptInput]
+
+
+@dataclass(frozen=True)
+class StageNode:
+    """A stage in a graph executed by run_graph.
+
+    `prompt` is a string, or a function of the upstream results (keyed by
+    the stage names in `after`) returning a string or a prompt writer.
+    """
+
+    stage: str
+    prompt: NodePrompt
+    backend: tuple[str, str]
+    after: tuple[str, ...] = ()
+    options: dict[str, Any] = field(default_factory=dict)
+
+
 class PipelineError(RuntimeError):
-    """Raised when a stage exhausts its retry budget."""
+    """Raised when a stage exhausts its retry budget.
+
+    `failure_class` is the retry.classify_failure() class of the last error.
+    """
 
-    def __init__(self, stage: str, attempts: int, last_error: Exception | str) -> None:
+    def __init__(
+        self,
+        stage: str,
+        attempts: int,
+        last_error: Exception | str,
+        failure_class: str | None = None,
+    ) -> None:
         self.stage = stage
         self.attempts = attempts
         self.last_error = last_error
+        self.failure_class = failure_class
         detail = last_error if isinstance(last_error, str) else str(last_error)
         super().__init__(f"Stage '{stage}' failed after {attempts} attempts: {detail}")
 
 
+class GraphError(PipelineError):
+    """Raised by run_graph when stages failed; carries every stage outcome.
+
+    The PipelineError fields describe the first failed stage (in node order).
+    """
+
+    def __init__(
+        self,
+        results: dict[str, StageResult],
+        errors: dict[str, Exception],
+        skipped: list[str],
+    ) -> None:
+        self.results = results
+        self.errors = errors
+        self.skipped = skipped
+        stage, error = next(iter(errors.items()))
+        attempts = error.attempts if isinstance(error, PipelineError) else 1
+        last_error = error.last_error if isinstance(error, PipelineError) else error
+        failure_class = error.failure_class if isinstance(error, PipelineError) else None
+        super().__init__(stage, attempts, last_error, failure_class)
+        if skipped:
+            self.args = (f"{self.args[0]} (skipped dependents: {', '.join(skipped)})",)
+
+
+class ParallelError(PipelineError):
+    """Raised by run_parallel(fail_fast=True); carries every stage outcome.
+
+    The PipelineError fields describe the first failed stage (in call order).
+    """
+
+    def __init__(
+        self,
+        results: dict[str, StageResult],
+        errors: dict[str, Exception],
+        cancelled: list[str],
+    ) -> None:
+        self.results = results
+        self.errors = errors
+        self.cancelled = cancelled
+        stage, error = next(iter(errors.items()))
+        attempts = error.attempts if isinstance(error, PipelineError) else 1
+        last_error = error.last_error if isinstance(error, PipelineError) else error
+        failure_class = error.failure_class if isinstance(error, PipelineError) else None
+        super().__init__(stage, attempts, last_error, failure_class)
+        if cancelled:
+            self.args = (f"{self.args[0]} (cancelled: {', '.join(cancelled)})",)
+
+
 class Session:
     """Imperative workflow session with shared artifact settings."""
 
@@ -59,15 +153,28 @@ class Session:
         prefix: str,
         *,
         runner: Callable[..., subprocess.CompletedProcess] = run_acw,
+        async_runner: Callable[..., Awaitable[subprocess.CompletedProcess]] | None = None,
         input_suffix: str = "-input.md",
         output_suffix: str = "-output.md",
+        cache: StageCache | None = None,
+        resume: bool = False,
+        retry_policy: RetryPolicy | None = None,
+        latency: LatencyHistory | None = None,
+        trace: bool = True,
     ) -> None:
         self._output_dir = Path(output_dir)
         self._output_dir.mkdir(parents=True, exist_ok=True)
         self._prefix = prefix
         self._runner = runner
+        self._async_runner = async_runner
         self._input_suffix = input_suffix
         self._output_suffix = output_suffix
+        self._cache = cache
+        self._resume = resume
+        self._retry_policy = retry_policy
+        self._latency = latency
+        self.manifest = StageManifest.for_prefix(self._output_dir, prefix)
+        self.trace = TraceWriter.for_prefix(self._output_dir, prefix) if trace else None
         self._log_lock = threading.Lock()
 
     def _log(self, message: str) -> None:
@@ -112,20 +219,18 @@ class Session:
             raise TypeError("prompt must be a string or a callable writer")
         input_path.write_text(prompt)
 
-    def _run_stage(
+    def _acw(
         self,
         name: str,
         backend: tuple[str, str],
-        input_path: Path,
-        output_path: Path,
         *,
         tools: str | None,
         permission_mode: str | None,
         timeout: int,
         extra_flags: list[str] | None,
-    ) -> subprocess.CompletedProcess:
+    ) -> ACW:
         provider, model = backend
-        acw_runner = ACW(
+        return ACW(
             name=name,
             provider=provider,
             model=model,
@@ -135,16 +240,453 @@ class Session:
             extra_flags=extra_flags,
             log_writer=self._log,
             runner=self._runner,
+            async_runner=self._async_runner,
         )
-        return acw_runner.run(input_path, output_path)
+
+    def _run_stage(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        input_path: Path,
+        output_path: Path,
+        **acw_opts: Any,
+    ) -> tuple[subprocess.CompletedProcess, float]:
+        """Run the stage; returns the process and the seconds spent waiting on acw.limits."""
+        acw = self._acw(name, backend, **acw_opts)
+        return acw.run(input_path, output_path), acw.wait_seconds
+
+    async def _run_stage_async(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        input_path: Path,
+        output_path: Path,
+        **acw_opts: Any,
+    ) -> tuple[subprocess.CompletedProcess, float]:
+        acw = self._acw(name, backend, **acw_opts)
+        return await acw.run_async(input_path, output_path), acw.wait_seconds
+
+    def _cache_lookup(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        input_path: Path,
+        output_path: Path,
+        **acw_opts: Any,
+    ) -> tuple[str | None, StageResult | None]:
+        """Cache key for the rendered input, and a cache-hit result when one exists."""
+        key = self._cache_key(name, backend, input_path, **acw_opts)
+        if key is None:
+            return None, None
+        try:
+            cached = self._cache.get(key)
+            if cached is None:
+                return key, None
+            shutil.copyfile(cached, output_path)
+        except OSError as exc:
+            self._log(f"agent {name}: stage cache unavailable ({exc})")
+            return None, None
+        provider, model = backend
+        self._log(f"agent {name} ({provider}:{model}) reused cached output")
+        return key, StageResult(
+            stage=name,
+            input_path=input_path,
+            output_path=output_path,
+            process=subprocess.CompletedProcess(args=["stage-cache", key], returncode=0, stdout="", stderr=""),
+            cached=True,
+            telemetry=collect_telemetry(
+                provider, input_path, output_path, started=0, wall_seconds=0, wait_seconds=0, usage=False
+            ),
+        )
+
+    def _cache_key(self, name: str, backend: tuple[str, str], input_path: Path, **acw_opts: Any) -> str | None:
+        """Cache key of the rendered input on backend, or None without a usable cache."""
+        if self._cache is None:
+            return None
+        try:
+            return self._cache.key(input_path.read_text(), backend, **acw_opts)
+        except OSError as exc:
+            self._log(f"agent {name}: stage cache unavailable ({exc})")
+            return None
+
+    def _cache_store(self, name: str, key: str | None, output_path: Path) -> None:
+        if self._cache is None or key is None:
+            return
+        try:
+            self._cache.put(key, output_path, stage=name)
+        except OSError as exc:
+            self._log(f"agent {name}: failed to cache output ({exc})")
+
+    def _checkpoint_lookup(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        input_path: Path,
+        output_path: Path,
+    ) -> StageResult | None:
+        """A resumed result when resuming and the stage's checkpoint is still valid."""
+        if not self._resume:
+            return None
+        if not self.manifest.is_valid(name, input_path=input_path, output_path=output_path, backend=backend):
+            return None
+        provider, model = backend
+        self._log(f"agent {name} ({provider}:{model}) resumed from checkpoint")
+        return StageResult(
+            stage=name,
+            input_path=input_path,
+            output_path=output_path,
+            process=subprocess.CompletedProcess(args=["checkpoint", name], returncode=0, stdout="", stderr=""),
+            resumed=True,
+            telemetry=collect_telemetry(
+                provider, input_path, output_path, started=0, wall_seconds=0, wait_seconds=0, usage=False
+            ),
+        )
+
+    def _checkpoint_record(self, result: StageResult, backend: tuple[str, str]) -> StageResult:
+        try:
+            self.manifest.record(
+                result.stage,
+                input_path=result.input_path,
+                output_path=result.output_path,
+                backend=backend,
+            )
+        except OSError as exc:
+            self._log(f"agent {result.stage}: failed to write checkpoint ({exc})")
+        return result
+
+    def _telemetry(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        input_path: Path,
+        output_path: Path,
+        process: subprocess.CompletedProcess,
+        *,
+        since: float,
+        wall_seconds: float,
+        wait_seconds: float,
+    ) -> StageTelemetry:
+        """Telemetry of a stage that ran; provider usage is only looked up for real acw runs.
+
+        Usage lookup is best effort: the stage has already succeeded, so an
+        error here only drops the usage fields and never triggers a retry.
+        """
+        provider, _ = backend
+        usage = self._runner is run_acw and self._async_runner is None
+        if usage:
+            try:
+                return collect_telemetry(
+                    provider,
+                    input_path,
+                    output_path,
+                    started=since,
+                    wall_seconds=wall_seconds,
+                    wait_seconds=wait_seconds,
+                    stderr=self._read_stderr(output_path, process),
+                )
+            except Exception as exc:
+                self._log(f"agent {name}: failed to collect usage ({exc})")
+        return collect_telemetry(
+            provider,
+            input_path,
+            output_path,
+            started=since,
+            wall_seconds=wall_seconds,
+            wait_seconds=wait_seconds,
+            usage=False,
+        )
+
+    def _trace_write(self, name: str, backend: tuple[str, str], status: str, **fields: Any) -> None:
+        if self.trace is None:
+            return
+        try:
+            self.trace.write(name, backend, status, **fields)
+        except OSError as exc:
+            self._log(f"agent {name}: failed to write trace ({exc})")
+
+    def _trace_failure(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        attempts: int,
+        state: RetryState,
+        exc: Exception,
+    ) -> None:
+        self._trace_write(
+            name,
+            backend,
+            "failed",
+            attempts=attempts,
+            failure_class=state.failure_class,
+            error=str(exc),
+        )
+
+    def _finish(self, result: StageResult, backend: tuple[str, str], attempts: int) -> StageResult:
+        """Append the trace record of a finished stage and return its result."""
+        self._trace_write(
+            result.stage,
+            backend,
+            "ok",
+            attempts=attempts,
+            cached=result.cached,
+            resumed=result.resumed,
+            hedged=result.hedged,
+            **result.telemetry.as_dict(),
+        )
+        return result
+
+    async def _run_followed(
+        self,
+        stage: Awaitable[tuple[subprocess.CompletedProcess, float]],
+        output_path: Path,
+        *,
+        on_output: OutputCallback | None,
+        on_stderr: OutputCallback | None,
+    ) -> tuple[subprocess.CompletedProcess, float]:
+        """Await a stage while following its output files; a callback error cancels it."""
+        followers = [
+            OutputFollower(path, callback)
+            for path, callback in ((output_path, on_output), (stderr_path(output_path), on_stderr))
+            if callback is not None
+        ]
+        if not followers:
+            return await stage
+        for follower in followers:
+            # Stale output from an earlier run would be replayed as new
+            follower.path.unlink(missing_ok=True)
+
+        stage_task = asyncio.ensure_future(stage)
+        watcher = asyncio.ensure_future(follow(followers))
+        try:
+            await asyncio.wait({stage_task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if watcher.done():
+                await _cancel_pending([stage_task])
+                watcher.result()
+            outcome = stage_task.result()
+            await _cancel_pending([watcher])
+            for follower in followers:
+                follower.poll(final=True)
+            return outcome
+        finally:
+            await _cancel_pending([stage_task, watcher])
+
+    def _record_latency(self, name: str, backend: tuple[str, str], seconds: float) -> None:
+        if self._latency is None:
+            return
+        try:
+            self._latency.record(name, backend, seconds)
+        except OSError as exc:
+            self._log(f"agent {name}: failed to record stage latency ({exc})")
+
+    async def _run_hedged(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        hedge: HedgePolicy | None,
+        input_path: Path,
+        output_path: Path,
+        *,
+        on_output: OutputCallback | None,
+        on_stderr: OutputCallback | None,
+        **acw_opts: Any,
+    ) -> tuple[subprocess.CompletedProcess, float, bool]:
+        """Run and validate a stage, racing a copy on the hedge backend once it is slow.
+
+        Returns the winning process, its provider-permit wait and whether the
+        hedge won. The loser is cancelled. If both fail, the primary's error is raised.
+        """
+
+        async def _attempt(run_backend: tuple[str, str], path: Path, followed: bool):
+            started = time.monotonic()
+            stage = self._run_stage_async(name, run_backend, input_path, path, **acw_opts)
+            if followed:
+                stage = self._run_followed(stage, path, on_output=on_output, on_stderr=on_stderr)
+            process, wait_seconds = await stage
+            self._check_run(name, run_backend, path, process, time.monotonic() - started - wait_seconds)
+            return process, wait_seconds
+
+        delay = hedge.delay(self._latency, name, backend) if hedge is not None else None
+        if delay is None:
+            process, wait_seconds = await _attempt(backend, output_path, True)
+            return process, wait_seconds, False
+
+        hedge_path = hedge_output_path(output_path)
+        started = time.monotonic()
+        primary = asyncio.ensure_future(_attempt(backend, output_path, True))
+        tasks = [primary]
+        try:
+            await asyncio.wait(tasks, timeout=delay)
+            if not primary.done():
+                provider, model = hedge.backend
+                self._log(f"agent {name}: no output after {delay:.0f}s; hedging on {provider}:{model}")
+                hedge_path.unlink(missing_ok=True)
+                tasks.append(asyncio.ensure_future(_attempt(hedge.backend, hedge_path, False)))
+
+            winner = None
+            pending = set(tasks)
+            while pending and winner is None:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in tasks if task.done() and task.exception() is None), None)
+            if winner is None:
+                raise primary.exception()
+        finally:
+            await _cancel_pending(tasks)
+
+        process, wait_seconds = winner.result()
+        if winner is primary:
+            hedge_path.unlink(missing_ok=True)
+            return process, wait_seconds, False
+        # The cancelled primary's run time is a lower bound; recording it keeps slow runs in the history
+        self._record_latency(name, backend, time.monotonic() - started)
+        hedge_path.replace(output_path)
+        provider, model = hedge.backend
+        self._log(f"agent {name}: hedge on {provider}:{model} finished first")
+        if on_output is not None:
+            on_output(output_path.read_text())
+        return process, wait_seconds, True
+
+    @staticmethod
+    def _replay_output(result: StageResult, on_output: OutputCallback | None) -> StageResult:
+        """Pass a reused output to on_output in one piece, as if it had streamed."""
+        if on_output is not None:
+            on_output(result.text())
+        return result
+
+    @staticmethod
+    def _read_stderr(output_path: Path, process: subprocess.CompletedProcess) -> str:
+        """Provider stderr (acw's `.stderr` sidecar) followed by the process stderr, for classification."""
+        try:
+            with stderr_path(output_path).open("rb") as handle:
+                handle.seek(0, 2)
+                handle.seek(max(handle.tell() - 65536, 0))
+                sidecar = handle.read().decode(errors="replace")
+        except OSError:
+            sidecar = ""
+        return f"{sidecar}\n{process.stderr or ''}"
 
     def _validate_output(self, stage: str, output_path: Path, process: subprocess.CompletedProcess) -> None:
         if process.returncode != 0:
-            raise RuntimeError(
-                f"Stage '{stage}' failed with exit code {process.returncode}"
+            raise StageFailure(
+                f"Stage '{stage}' failed with exit code {process.returncode}",
+                process=process,
+                stderr=self._read_stderr(output_path, process),
             )
         if not output_path.exists() or output_path.stat().st_size == 0:
-            raise RuntimeError(f"Stage '{stage}' produced no output")
+            raise StageFailure(
+                f"Stage '{stage}' produced no output",
+                process=process,
+                stderr=self._read_stderr(output_path, process),
+            )
+
+    def _retry_state(
+        self,
+        backend: tuple[str, str],
+        retry: int,
+        retry_delay: float,
+        retry_policy: RetryPolicy | None,
+    ) -> RetryState:
+        """retry_policy, else a fixed policy from retry/retry_delay, else the session's policy."""
+        if retry_policy is None:
+            if retry or retry_delay:
+                retry_policy = RetryPolicy.fixed(retry, retry_delay)
+            else:
+                retry_policy = self._retry_policy or NO_RETRY
+        return RetryState(retry_policy, backend)
+
+    def _retry_delay(self, name: str, attempt: int, state: RetryState, exc: Exception) -> float:
+        """Seconds to wait before retrying after a failed attempt.
+
+        Raises PipelineError (after tracing the failure) once the policy gives up.
+        """
+        backend = state.backend
+        delay = state.next_delay(exc)
+        if delay is None:
+            self._trace_failure(name, backend, attempt, state, exc)
+            raise PipelineError(name, attempt, exc, state.failure_class)
+        if state.backend != backend:
+            provider, model = state.backend
+            self._log(
+                f"agent {name}: attempt {attempt} failed ({state.failure_class}); "
+                f"falling back to {provider}:{model}"
+            )
+        elif delay > 0:
+            self._log(f"agent {name}: attempt {attempt} failed ({state.failure_class}); retrying in {delay:.1f}s")
+        return delay
+
+    def _reuse(
+        self,
+        name: str,
+        prompt: PromptInput,
+        backend: tuple[str, str],
+        input_path: Path,
+        output_path: Path,
+        on_output: OutputCallback | None,
+        cache_opts: dict[str, Any],
+    ) -> tuple[str | None, StageResult | None]:
+        """Render the prompt, then reuse a valid checkpoint or cached output.
+
+        Returns the cache key for storing a fresh output, and the reused
+        result, or None when the stage has to run.
+        """
+        self._write_prompt(prompt, input_path)
+        resumed = self._checkpoint_lookup(name, backend, input_path, output_path)
+        if resumed is not None:
+            return None, self._replay_output(resumed, on_output)
+        cache_key, cached = self._cache_lookup(name, backend, input_path, output_path, **cache_opts)
+        if cached is not None:
+            return cache_key, self._checkpoint_record(self._replay_output(cached, on_output), backend)
+        return cache_key, None
+
+    def _check_run(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        output_path: Path,
+        process: subprocess.CompletedProcess,
+        run_seconds: float,
+    ) -> None:
+        """Validate a finished run, then record its run time (excluding the permit wait)."""
+        self._validate_output(name, output_path, process)
+        self._record_latency(name, backend, run_seconds)
+
+    def _record_run(
+        self,
+        name: str,
+        backend: tuple[str, str],
+        cache_key: str | None,
+        input_path: Path,
+        output_path: Path,
+        process: subprocess.CompletedProcess,
+        *,
+        hedged: bool = False,
+        since: float,
+        wall_seconds: float,
+        wait_seconds: float,
+        cache_opts: dict[str, Any],
+    ) -> StageResult:
+        """Cache and checkpoint the validated output of a stage that ran on backend."""
+        if hedged:
+            # The output is the hedge backend's; keying it on the primary would serve it as that model's
+            cache_key = self._cache_key(name, backend, input_path, **cache_opts)
+        self._cache_store(name, cache_key, output_path)
+        result = StageResult(
+            stage=name,
+            input_path=input_path,
+            output_path=output_path,
+            process=process,
+            hedged=hedged,
+            telemetry=self._telemetry(
+                name,
+                backend,
+                input_path,
+                output_path,
+                process,
+                since=since,
+                wall_seconds=wall_seconds,
+                wait_seconds=wait_seconds,
+            ),
+        )
+        return self._checkpoint_record(result, backend)
 
     def run_prompt(
         self,
@@ -158,43 +700,254 @@ class Session:
         extra_flags: list[str] | None = None,
         retry: int = 0,
         retry_delay: float = 0,
+        retry_policy: RetryPolicy | None = None,
+        hedge: HedgePolicy | None = None,
         input_path: str | Path | None = None,
         output_path: str | Path | None = None,
+        on_output: OutputCallback | None = None,
+        on_stderr: OutputCallback | None = None,
     ) -> StageResult:
+        if on_output is not None or on_stderr is not None or hedge is not None:
+            # Followed and hedged stages run on an event loop so that a stage can be aborted
+            return asyncio.run(
+                self.run_prompt_async(
+                    name,
+                    prompt,
+                    backend,
+                    tools=tools,
+                    permission_mode=permission_mode,
+                    timeout=timeout,
+                    extra_flags=extra_flags,
+                    retry=retry,
+                    retry_delay=retry_delay,
+                    retry_policy=retry_policy,
+                    hedge=hedge,
+                    input_path=input_path,
+                    output_path=output_path,
+                    on_output=on_output,
+                    on_stderr=on_stderr,
+                )
+            )
         input_path_resolved, output_path_resolved = self._resolve_paths(
             name, input_path, output_path
         )
 
-        attempts = 0
-        last_error: Exception | str = ""
+        state = self._retry_state(backend, retry, retry_delay, retry_policy)
+        cache_opts = {"tools": tools, "permission_mode": permission_mode, "extra_flags": extra_flags}
+        attempt = 0
 
-        for attempt in range(1, retry + 2):
-            attempts = attempt
+        while True:
+            attempt += 1
+            backend = state.backend
             try:
-                self._write_prompt(prompt, input_path_resolved)
-                process = self._run_stage(
+                cache_key, reused = self._reuse(
+                    name, prompt, backend, input_path_resolved, output_path_resolved, None, cache_opts
+                )
+                if reused is not None:
+                    return self._finish(reused, backend, attempt)
+                since = time.time()
+                started = time.monotonic()
+                process, wait_seconds = self._run_stage(
                     name,
                     backend,
                     input_path_resolved,
                     output_path_resolved,
-                    tools=tools,
-                    permission_mode=permission_mode,
                     timeout=timeout,
-                    extra_flags=extra_flags,
+                    **cache_opts,
+                )
+                wall_seconds = time.monotonic() - started
+                self._check_run(name, backend, output_path_resolved, process, wall_seconds - wait_seconds)
+                result = self._record_run(
+                    name,
+                    backend,
+                    cache_key,
+                    input_path_resolved,
+                    output_path_resolved,
+                    process,
+                    since=since,
+                    wall_seconds=wall_seconds,
+                    wait_seconds=wait_seconds,
+                    cache_opts=cache_opts,
+                )
+                return self._finish(result, backend, attempt)
+            except Exception as exc:
+                delay = self._retry_delay(name, attempt, state, exc)
+                if delay > 0:
+                    time.sleep(delay)
+
+    async def run_prompt_async(
+        self,
+        name: str,
+        prompt: PromptInput,
+        backend: tuple[str, str],
+        *,
+        tools: str | None = None,
+        permission_mode: str | None = None,
+        timeout: int = 3600,
+        extra_flags: list[str] | None = None,
+        retry: int = 0,
+        retry_delay: float = 0,
+        retry_policy: RetryPolicy | None = None,
+        hedge: HedgePolicy | None = None,
+        input_path: str | Path | None = None,
+        output_path: str | Path | None = None,
+        on_output: OutputCallback | None = None,
+        on_stderr: OutputCallback | None = None,
+    ) -> StageResult:
+        """Asynchronous run_prompt(). Cancelling the task terminates the stage's acw process.
+
+        on_output and on_stderr receive the stage's output and stderr lines as
+        they are written. An exception raised by either aborts the attempt.
+        With hedge, a stage still running at the hedge threshold is started
+        again on the hedge backend and the first valid output wins.
+        """
+        input_path_resolved, output_path_resolved = self._resolve_paths(
+            name, input_path, output_path
+        )
+
+        state = self._retry_state(backend, retry, retry_delay, retry_policy)
+        cache_opts = {"tools": tools, "permission_mode": permission_mode, "extra_flags": extra_flags}
+        attempt = 0
+
+        while True:
+            attempt += 1
+            backend = state.backend
+            try:
+                cache_key, reused = self._reuse(
+                    name, prompt, backend, input_path_resolved, output_path_resolved, on_output, cache_opts
                 )
-                self._validate_output(name, output_path_resolved, process)
-                return StageResult(
-                    stage=name,
-                    input_path=input_path_resolved,
-                    output_path=output_path_resolved,
-                    process=process,
+                if reused is not None:
+                    return self._finish(reused, backend, attempt)
+                since = time.time()
+                started = time.monotonic()
+                process, wait_seconds, hedged = await self._run_hedged(
+                    name,
+                    backend,
+                    hedge,
+                    input_path_resolved,
+                    output_path_resolved,
+                    on_output=on_output,
+                    on_stderr=on_stderr,
+                    timeout=timeout,
+                    **cache_opts,
+                )
+                run_backend = hedge.backend if hedged else backend
+                result = self._record_run(
+                    name,
+                    run_backend,
+                    cache_key,
+                    input_path_resolved,
+                    output_path_resolved,
+                    process,
+                    hedged=hedged,
+                    since=since,
+                    wall_seconds=time.monotonic() - started,
+                    wait_seconds=wait_seconds,
+                    cache_opts=cache_opts,
                 )
+                return self._finish(result, run_backend, attempt)
             except Exception as exc:
-                last_error = exc
-                if attempt <= retry and retry_delay > 0:
-                    time.sleep(retry_delay)
+                delay = self._retry_delay(name, attempt, state, exc)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+    def _start_calls(
+        self,
+        calls: Iterable[StageCall],
+        *,
+        max_concurrency: int | None,
+        retry: int,
+        retry_delay: float,
+        retry_policy: RetryPolicy | None,
+    ) -> dict[asyncio.Task, str]:
+        """Schedule one task per call, at most max_concurrency running at once."""
+        calls = list(calls)
+        stage_names: set[str] = set()
+        for call in calls:
+            if call.stage in stage_names:
+                raise ValueError(f"Duplicate stage name '{call.stage}'")
+            stage_names.add(call.stage)
+
+        limit = asyncio.Semaphore(max_concurrency) if max_concurrency else contextlib.nullcontext()
+
+        async def _run(call: StageCall) -> StageResult:
+            async with limit:
+                return await self.run_prompt_async(
+                    call.stage, call.prompt, call.backend,
+                    retry=retry, retry_delay=retry_delay, retry_policy=retry_policy, **call.options,
+                )
 
-        raise PipelineError(name, attempts, last_error)
+        return {asyncio.ensure_future(_run(call)): call.stage for call in calls}
+
+    async def gather(
+        self,
+        calls: Iterable[StageCall],
+        *,
+        max_concurrency: int | None = None,
+        retry: int = 0,
+        retry_delay: float = 0,
+        retry_policy: RetryPolicy | None = None,
+        return_exceptions: bool = False,
+    ) -> dict[str, StageResult | BaseException]:
+        """Run stages concurrently and return results keyed by stage name.
+
+        The first failure cancels the stages still running and is raised,
+        unless return_exceptions is set, in which case every stage runs to
+        the end and failed stages map to their exception.
+        """
+        tasks = self._start_calls(
+            calls,
+            max_concurrency=max_concurrency,
+            retry=retry,
+            retry_delay=retry_delay,
+            retry_policy=retry_policy,
+        )
+        if not tasks:
+            return {}
+        try:
+            await asyncio.wait(
+                tasks,
+                return_when=asyncio.ALL_COMPLETED if return_exceptions else asyncio.FIRST_EXCEPTION,
+            )
+        finally:
+            await _cancel_pending(tasks)
+
+        results: dict[str, StageResult | BaseException] = {}
+        for task, stage in tasks.items():
+            if task.cancelled():
+                continue
+            exc = task.exception()
+            if exc is not None and not return_exceptions:
+                raise exc
+            results[stage] = exc if exc is not None else task.result()
+        return results
+
+    async def as_completed(
+        self,
+        calls: Iterable[StageCall],
+        *,
+        max_concurrency: int | None = None,
+        retry: int = 0,
+        retry_delay: float = 0,
+        retry_policy: RetryPolicy | None = None,
+    ) -> AsyncIterator[StageResult]:
+        """Yield stage results in completion order.
+
+        A failed stage raises its PipelineError from the iterator. Leaving the
+        loop early (break or error) cancels the stages still running.
+        """
+        tasks = self._start_calls(
+            calls,
+            max_concurrency=max_concurrency,
+            retry=retry,
+            retry_delay=retry_delay,
+            retry_policy=retry_policy,
+        )
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            await _cancel_pending(tasks)
 
     def stage(
         self,
@@ -203,10 +956,99 @@ class Session:
         backend: tuple[str, str],
         **opts: Any,
     ) -> StageCall:
-        if "retry" in opts or "retry_delay" in opts:
-            raise ValueError("retry and retry_delay are configured on run_parallel")
+        if opts.keys() & {"retry", "retry_delay", "retry_policy"}:
+            raise ValueError("retry, retry_delay and retry_policy are configured on run_parallel")
         return StageCall(stage=name, prompt=prompt, backend=backend, options=opts)
 
+    def node(
+        self,
+        name: str,
+        prompt: NodePrompt,
+        backend: tuple[str, str],
+        *,
+        after: Iterable[str] = (),
+        **opts: Any,
+    ) -> StageNode:
+        if opts.keys() & {"retry", "retry_delay", "retry_policy"}:
+            raise ValueError("retry, retry_delay and retry_policy are configured on run_graph")
+        return StageNode(stage=name, prompt=prompt, backend=backend, after=tuple(after), options=opts)
+
+    def run_graph(
+        self,
+        nodes: Iterable[StageNode],
+        *,
+        max_concurrency: int | None = None,
+        retry: int = 0,
+        retry_delay: float = 0,
+        retry_policy: RetryPolicy | None = None,
+        on_start: Callable[[StageNode], None] | None = None,
+    ) -> dict[str, StageResult]:
+        """Synchronous run_graph_async() (must not be called from a running event loop)."""
+        return asyncio.run(self.run_graph_async(
+            nodes,
+            max_concurrency=max_concurrency,
+            retry=retry,
+            retry_delay=retry_delay,
+            retry_policy=retry_policy,
+            on_start=on_start,
+        ))
+
+    async def run_graph_async(
+        self,
+        nodes: Iterable[StageNode],
+        *,
+        max_concurrency: int | None = None,
+        retry: int = 0,
+        retry_delay: float = 0,
+        retry_policy: RetryPolicy | None = None,
+        on_start: Callable[[StageNode], None] | None = None,
+    ) -> dict[str, StageResult]:
+        """Run a stage graph with maximal parallelism under max_concurrency.
+
+        Each stage starts as soon as every stage in its `after` has succeeded;
+        its prompt is built from their results. A failure skips its
+        dependents only: independent branches run to completion, then a
+        GraphError listing the completed, failed and skipped stages is raised.
+        """
+        graph = _validate_graph(nodes)
+        limit = asyncio.Semaphore(max_concurrency) if max_concurrency else contextlib.nullcontext()
+        results: dict[str, StageResult] = {}
+        errors: dict[str, Exception] = {}
+        skipped: list[str] = []
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def _run(node: StageNode) -> None:
+            if node.after:
+                await asyncio.wait([tasks[dep] for dep in node.after])
+            if any(dep not in results for dep in node.after):
+                skipped.append(node.stage)
+                return
+            try:
+                upstream = {dep: results[dep] for dep in node.after}
+                prompt = node.prompt(upstream) if callable(node.prompt) else node.prompt
+                async with limit:
+                    if on_start is not None:
+                        on_start(node)
+                    results[node.stage] = await self.run_prompt_async(
+                        node.stage, prompt, node.backend,
+                        retry=retry, retry_delay=retry_delay, retry_policy=retry_policy, **node.options,
+                    )
+            except Exception as exc:
+                errors[node.stage] = exc
+
+        for node in graph.values():
+            tasks[node.stage] = asyncio.ensure_future(_run(node))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            await _cancel_pending(tasks.values())
+
+        if errors:
+            ordered_errors = {stage: errors[stage] for stage in graph if stage in errors}
+            ordered_skipped = [stage for stage in graph if stage in skipped]
+            raise GraphError(results, ordered_errors, ordered_skipped)
+        return {stage: results[stage] for stage in graph}
+
     def run_parallel(
         self,
         calls: Iterable[StageCall],
@@ -214,7 +1056,33 @@ class Session:
         max_workers: int = 2,
         retry: int = 0,
         retry_delay: float = 0,
+        retry_policy: RetryPolicy | None = None,
+        fail_fast: bool = False,
     ) -> dict[str, StageResult]:
+        """Run stages on max_workers threads and return results keyed by stage name.
+
+        By default every stage runs to the end and the first failure in call
+        order is raised. With fail_fast, the first failure cancels the other
+        stages (terminating their acw process groups) and a ParallelError
+        with every stage outcome is raised. fail_fast runs its own event loop,
+        so it cannot be used from a coroutine; await gather() there instead.
+        """
+        if fail_fast:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                raise RuntimeError(
+                    "run_parallel(fail_fast=True) cannot run inside an event loop; await Session.gather() instead"
+                )
+            return asyncio.run(self._run_parallel_fail_fast(
+                calls,
+                max_workers=max_workers,
+                retry=retry,
+                retry_delay=retry_delay,
+                retry_policy=retry_policy,
+            ))
         results: dict[str, StageResult] = {}
         futures = {}
         stage_names: set[str] = set()
@@ -233,6 +1101,7 @@ class Session:
                     call.backend,
                     retry=retry,
                     retry_delay=retry_delay,
+                    retry_policy=retry_policy,
                     **call.options,
                 )] = call.stage
 
@@ -242,5 +1111,84 @@ class Session:
 
         return results
 
+    async def _run_parallel_fail_fast(
+        self,
+        calls: Iterable[StageCall],
+        *,
+        max_workers: int,
+        retry: int,
+        retry_delay: float,
+        retry_policy: RetryPolicy | None,
+    ) -> dict[str, StageResult]:
+        tasks = self._start_calls(
+            calls,
+            max_concurrency=max_workers,
+            retry=retry,
+            retry_delay=retry_delay,
+            retry_policy=retry_policy,
+        )
+        try:
+            if tasks:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            await _cancel_pending(tasks)
+
+        results: dict[str, StageResult] = {}
+        errors: dict[str, Exception] = {}
+        cancelled: list[str] = []
+        for task, stage in tasks.items():
+            if task.cancelled():
+                cancelled.append(stage)
+            elif task.exception() is not None:
+                errors[stage] = task.exception()
+            else:
+                results[stage] = task.result()
+        if errors:
+            if cancelled:
+                self._log(f"Stage '{next(iter(errors))}' failed; cancelled {', '.join(cancelled)}")
+            raise ParallelError(results, errors, cancelled)
+        return results
+
+
+def _validate_graph(nodes: Iterable[StageNode]) -> dict[str, StageNode]:
+    """Index nodes by stage, rejecting duplicates, unknown dependencies and cycles."""
+    graph: dict[str, StageNode] = {}
+    for node in nodes:
+        if node.stage in graph:
+            raise ValueError(f"Duplicate stage name '{node.stage}'")
+        graph[node.stage] = node
+    for node in graph.values():
+        for dep in node.after:
+            if dep not in graph:
+                raise ValueError(f"Stage '{node.stage}' depends on unknown stage '{dep}'")
+
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    def _visit(stage: str, path: list[str]) -> None:
+        if stage in visited:
+            return
+        if stage in visiting:
+            cycle = path[path.index(stage):] + [stage]
+            raise ValueError(f"Stage graph has a cycle: {' -> '.join(cycle)}")
+        visiting.add(stage)
+        for dep in graph[stage].after:
+            _visit(dep, path + [stage])
+        visiting.discard(stage)
+        visited.add(stage)
+
+    for stage in graph:
+        _visit(stage, [])
+    return graph
+
+
+async def _cancel_pending(tasks: Iterable[asyncio.Task]) -> None:
+    """Cancel unfinished tasks and wait until their acw processes are gone."""
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
 
-__all__ = ["Session", "StageCall", "StageResult", "PipelineError"]
+__all__ = ["Session", "StageCall", "StageNode", "StageResult", "PipelineError", "GraphError", "ParallelError"]
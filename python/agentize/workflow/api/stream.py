@@ -0,0 +1,70 @@
+"""Follow stage output files while the stage is still running."""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import os
+from pathlib import Path
+from typing import Callable, Iterable
+
+DEFAULT_POLL_INTERVAL = 0.25
+
+OutputCallback = Callable[[str], object]
+
+
+def stderr_path(output_path: str | Path) -> Path:
+    """The sidecar acw redirects provider stderr to: `<output>.stderr`."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.name}.stderr")
+
+
+class OutputFollower:
+    """Deliver text appended to a file to a callback, one or more whole lines at a time.
+
+    A partial last line is held back until its newline arrives or poll() is
+    called with final=True. If the file shrinks (the writer truncated it),
+    following restarts from the beginning.
+    """
+
+    def __init__(self, path: str | Path, callback: OutputCallback) -> None:
+        self.path = Path(path)
+        self._callback = callback
+        self._reset()
+
+    def _reset(self) -> None:
+        self._offset = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+
+    def _read_new(self) -> bytes:
+        try:
+            with self.path.open("rb") as handle:
+                if os.fstat(handle.fileno()).st_size < self._offset:
+                    self._reset()
+                handle.seek(self._offset)
+                data = handle.read()
+        except FileNotFoundError:
+            return b""
+        self._offset += len(data)
+        return data
+
+    def poll(self, *, final: bool = False) -> None:
+        """Read what was appended since the last poll and pass complete lines on."""
+        text = self._partial + self._decoder.decode(self._read_new(), final=final)
+        cut = len(text) if final else text.rfind("\n") + 1
+        lines, self._partial = text[:cut], text[cut:]
+        if lines:
+            self._callback(lines)
+
+
+async def follow(followers: Iterable[OutputFollower], interval: float = DEFAULT_POLL_INTERVAL) -> None:
+    """Poll followers until cancelled. A callback exception ends the loop and propagates."""
+    followers = list(followers)
+    while True:
+        for follower in followers:
+            follower.poll()
+        await asyncio.sleep(interval)
+
+
+__all__ = ["OutputFollower", "OutputCallback", "follow", "stderr_path", "DEFAULT_POLL_INTERVAL"]
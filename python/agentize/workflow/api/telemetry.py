@@ -0,0 +1,198 @@
+"""Per-stage telemetry and the JSONL run trace written by Session."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from agentize.usage import usage_cost
+
+# Codex and similar CLIs print a total such as "tokens used: 12,345" on stderr
+_STDERR_TOKENS_RE = re.compile(r"tokens used[:\s]+([\d,]+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class StageTelemetry:
+    """What a stage cost: time, artifact sizes and provider usage.
+
+    `wall_seconds` covers the final attempt, including `wait_seconds` spent
+    waiting for a provider permit. Token counts and `cost_usd` are filled in
+    when the provider's usage could be found (`usage_source`); `cost_usd`
+    stays None for models without pricing.
+    """
+
+    wait_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    tokens: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: Optional[float] = None
+    model: Optional[str] = None
+    usage_source: Optional[str] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def claude_projects_dir() -> Path:
+    """Where Claude Code stores session transcripts (`$CLAUDE_CONFIG_DIR/projects`, else `~/.claude/projects`)."""
+    config_dir = os.getenv("CLAUDE_CONFIG_DIR")
+    return Path(config_dir) / "projects" if config_dir else Path.home() / ".claude" / "projects"
+
+
+def claude_transcript_usage(
+    input_path: Path,
+    since: float,
+    *,
+    projects_dir: Optional[Path] = None,
+) -> Optional[dict[str, Any]]:
+    """Usage of the `claude -p @<input_path>` session written since `since`.
+
+    acw passes the prompt as `@<input_path>`, so the stage's transcript is
+    the recent one that mentions that path. Returns token counts, cost and
+    model, or None when no transcript matches.
+    """
+    projects_dir = projects_dir or claude_projects_dir()
+    needle = str(input_path)
+    candidates: list[tuple[float, Path]] = []
+    try:
+        for path in projects_dir.glob("*/*.jsonl"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                # Removed or rotated since the glob listed it
+                continue
+            if mtime >= since:
+                candidates.append((mtime, path))
+    except OSError:
+        return None
+    for _, path in sorted(candidates, reverse=True):
+        try:
+            text = path.read_text(errors="replace")
+        except OSError:
+            continue
+        if needle not in text:
+            continue
+        totals = {"input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0}
+        cost: Optional[float] = None
+        model: Optional[str] = None
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict) or entry.get("type") != "assistant":
+                continue
+            message = entry.get("message") or {}
+            usage = message.get("usage") or {}
+            if not usage:
+                continue
+            totals["input_tokens"] += usage.get("input_tokens", 0)
+            totals["output_tokens"] += usage.get("output_tokens", 0)
+            totals["cache_read_tokens"] += usage.get("cache_read_input_tokens", 0)
+            totals["cache_write_tokens"] += usage.get("cache_creation_input_tokens", 0)
+            model = message.get("model") or model
+            message_cost = usage_cost(usage, message.get("model", ""))
+            if message_cost is not None:
+                cost = (cost or 0.0) + message_cost
+        return {
+            **totals,
+            "tokens": sum(totals.values()),
+            "cost_usd": cost,
+            "model": model,
+            "usage_source": "claude-transcript",
+        }
+    return None
+
+
+def stderr_usage(stderr: str) -> Optional[dict[str, Any]]:
+    """A token total reported on stderr (codex style), or None."""
+    matches = _STDERR_TOKENS_RE.findall(stderr or "")
+    if not matches:
+        return None
+    return {"tokens": int(matches[-1].replace(",", "")), "usage_source": "stderr"}
+
+
+def collect_telemetry(
+    provider: str,
+    input_path: Path,
+    output_path: Path,
+    *,
+    started: float,
+    wall_seconds: float,
+    wait_seconds: float,
+    stderr: str = "",
+    usage: bool = True,
+) -> StageTelemetry:
+    """Telemetry of a finished stage; `started` is the wall-clock start time of the attempt."""
+    found: Optional[dict[str, Any]] = None
+    if usage:
+        if provider == "claude":
+            found = claude_transcript_usage(input_path, started)
+        if found is None:
+            found = stderr_usage(stderr)
+    return StageTelemetry(
+        wait_seconds=round(wait_seconds, 3),
+        wall_seconds=round(wall_seconds, 3),
+        input_bytes=_file_size(input_path),
+        output_bytes=_file_size(output_path),
+        **(found or {}),
+    )
+
+
+class TraceWriter:
+    """Appends one JSON line per finished or failed stage to `<prefix>-trace.jsonl`."""
+
+    def __init__(self, path: str | Path, run: str) -> None:
+        self.path = Path(path)
+        self.run = run
+        self.session = datetime.now().isoformat(timespec="seconds")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_prefix(cls, output_dir: str | Path, prefix: str) -> "TraceWriter":
+        return cls(Path(output_dir) / f"{prefix}-trace.jsonl", prefix)
+
+    def write(self, stage: str, backend: tuple[str, str], status: str, **fields: Any) -> None:
+        provider, model = backend
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "run": self.run,
+            "session": self.session,
+            "stage": stage,
+            "backend": f"{provider}:{model}",
+            "status": status,
+            **fields,
+        }
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a") as handle:
+                handle.write(line)
+
+
+__all__ = [
+    "StageTelemetry",
+    "TraceWriter",
+    "claude_projects_dir",
+    "claude_transcript_usage",
+    "collect_telemetry",
+    "stderr_usage",
+]
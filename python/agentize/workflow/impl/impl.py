@@ -8,6 +8,7 @@ import sys
 from pathlib import Path
 from typing import Iterable
 
+from agentize.claims import WorkClaim, format_holder, issue_claim_key
 from agentize.shell import run_shell_function
 from agentize.workflow.api import Session
 from agentize.workflow.api import gh as gh_utils
@@ -39,18 +40,14 @@ def _shell_cmd(parts: Iterable[str | Path]) -> str:
     return " ".join(shlex.quote(str(part)) for part in parts)
 
 
-def _read_template(template_path: Path) -> str:
+def _read_template(template_path: Path) -> prompt_utils.PromptTemplate:
     if not template_path.exists():
         raise ImplError(f"Error: Missing prompt template at {template_path}")
-    return prompt_utils.read_prompt(template_path)
+    return prompt_utils.load_template(template_path)
 
 
-def _validate_placeholders(template: str) -> None:
-    missing = sorted(
-        token
-        for token in _REQUIRED_TOKENS
-        if f"{{{{{token}}}}}" not in template and f"{{#{token}#}}" not in template
-    )
+def _validate_placeholders(template: prompt_utils.PromptTemplate) -> None:
+    missing = template.missing(_REQUIRED_TOKENS)
     if missing:
         missing_list = ", ".join(missing)
         raise ImplError(f"Error: Prompt template missing placeholders: {missing_list}")
@@ -310,11 +307,40 @@ def run_impl_workflow(
     max_iterations: int = 10,
     yolo: bool = False,
 ) -> None:
-    """Run the issue-to-implementation workflow loop."""
+    """Run the issue-to-implementation workflow loop.
+
+    Holds the local work claim on the issue for the whole run, so the server
+    or another `lol impl` cannot start a second agent on it meanwhile.
+    """
     issue_no = _coerce_issue_no(issue_no)
     provider, model = _parse_backend(backend)
     max_iterations = _parse_max_iterations(max_iterations)
 
+    claim = WorkClaim(issue_claim_key(issue_no), command=f"lol impl {issue_no}")
+    try:
+        claimed = claim.acquire()
+    except OSError as exc:
+        print(f"Warning: Cannot claim issue {issue_no} ({exc}); running unclaimed", file=sys.stderr)
+        claimed = True
+    if not claimed:
+        raise ImplError(
+            f"Error: Issue #{issue_no} is already being worked on by {format_holder(claim.holder())}"
+        )
+
+    try:
+        _run_impl_loop(issue_no, provider, model, max_iterations, yolo)
+    finally:
+        claim.release()
+
+
+def _run_impl_loop(
+    issue_no: int,
+    provider: str,
+    model: str,
+    max_iterations: int,
+    yolo: bool,
+) -> None:
+    """Create or reuse the issue worktree and iterate until the completion marker."""
     worktree_result = run_shell_function(
         _shell_cmd(["wt", "pathto", str(issue_no)]),
         capture_output=True,
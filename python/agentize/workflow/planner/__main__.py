@@ -19,7 +19,12 @@ from typing import Optional
 from agentize.shell import resolve_repo_root
 from agentize.workflow.api import run_acw
 from agentize.workflow.api import gh as gh_utils
-from agentize.workflow.planner.pipeline import run_consensus_stage, run_planner_pipeline
+from agentize.workflow.api.cache import StageCache
+from agentize.workflow.api.checkpoint import StageManifest
+from agentize.workflow.api.context import STRATEGIES, ContextPolicy
+from agentize.workflow.api.hedge import HedgePolicy, LatencyHistory
+from agentize.workflow.api.retry import FAILURE_CLASSES, RetryPolicy
+from agentize.workflow.planner.pipeline import STAGES, run_consensus_stage, run_planner_pipeline
 
 
 # ============================================================
@@ -96,8 +101,8 @@ def _strip_plan_footer(text: str) -> str:
     return result
 
 
-def _load_planner_backend_config(repo_root: Path, start_dir: Path) -> dict[str, str]:
-    """Load planner backend overrides from .agentize.local.yaml."""
+def _load_planner_section(repo_root: Path, start_dir: Path) -> tuple[dict, Optional[Path]]:
+    """Load the planner section of .agentize.local.yaml and the file it came from."""
     plugin_dir = repo_root / ".claude-plugin"
     if str(plugin_dir) not in sys.path:
         sys.path.insert(0, str(plugin_dir))
@@ -109,15 +114,19 @@ def _load_planner_backend_config(repo_root: Path, start_dir: Path) -> dict[str,
 
     config_path = find_local_config_file(start_dir)
     if config_path is None:
-        return {}
+        return {}, None
 
     config = parse_yaml_file(config_path)
     planner = config.get("planner")
     if planner is None:
-        return {}
+        return {}, config_path
     if not isinstance(planner, dict):
         raise ValueError(f"planner section in {config_path} must be a mapping")
+    return planner, config_path
 
+
+def _load_planner_backend_config(planner: dict, config_path: Optional[Path]) -> dict[str, str]:
+    """Load planner backend overrides from the planner section."""
     backend_config: dict[str, str] = {}
     for key in ("backend", "understander", "bold", "critique", "reducer"):
         if key not in planner:
@@ -135,6 +144,162 @@ def _load_planner_backend_config(repo_root: Path, start_dir: Path) -> dict[str,
     return backend_config
 
 
+def _parse_flag(value: object) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "1", "on")
+    return bool(value)
+
+
+def _planner_toggle(planner: dict, key: str) -> Optional[dict]:
+    """Options of an optional planner feature, or None when it is off.
+
+    A mapping is enabled unless its `enabled` key says otherwise (the key is
+    dropped from the options); a scalar is a plain on/off flag.
+    """
+    setting = planner.get(key)
+    if setting is None:
+        return None
+    if isinstance(setting, dict):
+        options = dict(setting)
+        enabled = _parse_flag(options.pop("enabled", True))
+    else:
+        options = {}
+        enabled = _parse_flag(setting)
+    return options if enabled else None
+
+
+def _load_planner_cache(
+    planner: dict,
+    config_path: Optional[Path],
+    repo_root: Path,
+    cache_dir: Path,
+) -> Optional[StageCache]:
+    """Build the stage cache from planner.cache (None when off).
+
+    `planner.cache: true` enables it with default limits; a mapping accepts
+    `enabled`, `max_age_days` and `max_size_mb`. Keys include the current
+    commit, since stages read the repository through their tools.
+    """
+    options = _planner_toggle(planner, "cache")
+    if options is None:
+        return None
+
+    limits = {}
+    for key in ("max_age_days", "max_size_mb"):
+        if key in options:
+            try:
+                limits[key] = float(options[key])
+            except (TypeError, ValueError):
+                raise ValueError(f"planner.cache.{key} in {config_path} must be a number") from None
+    return StageCache(cache_dir, commit=_resolve_commit_hash(repo_root), **limits)
+
+
+def _load_planner_retry(planner: dict, config_path: Optional[Path]) -> Optional[RetryPolicy]:
+    """Build the stage retry policy from planner.retry (None when off).
+
+    `planner.retry: true` enables the default classified policy; a mapping
+    accepts `enabled`, per-class retry budgets (`rate_limit`, `transient`,
+    `timeout`, `deterministic`), `base_delay`, `max_delay`, `fallback`
+    (provider:model) and `fallback_after`.
+    """
+    options = _planner_toggle(planner, "retry")
+    if options is None:
+        return None
+
+    policy = RetryPolicy()
+    values: dict = {}
+    budgets = dict(policy.budgets)
+    for key, cast in [(name, int) for name in FAILURE_CLASSES] + [
+        ("base_delay", float),
+        ("max_delay", float),
+        ("fallback_after", int),
+    ]:
+        if key not in options:
+            continue
+        try:
+            value = cast(options[key])
+        except (TypeError, ValueError):
+            raise ValueError(f"planner.retry.{key} in {config_path} must be a number") from None
+        if key in FAILURE_CLASSES:
+            budgets[key] = value
+        else:
+            values[key] = value
+    fallback = options.get("fallback")
+    if fallback:
+        fallback = str(fallback).strip()
+        _validate_backend_spec(fallback, "planner.retry.fallback")
+        values["fallback"] = _split_backend_spec(fallback)
+    return RetryPolicy(budgets=budgets, **values)
+
+
+def _load_planner_hedge(planner: dict, config_path: Optional[Path]) -> dict[str, HedgePolicy]:
+    """Build per-stage hedge policies from planner.hedge.
+
+    The mapping needs `backend` (provider:model) and accepts `percentile`,
+    `min_delay`, `default_delay` and `stages` (all stages when unset).
+    Returns an empty mapping when hedging is off.
+    """
+    setting = planner.get("hedge")
+    if setting is not None and not isinstance(setting, dict):
+        raise ValueError(f"planner.hedge in {config_path} must be a mapping")
+    options = _planner_toggle(planner, "hedge")
+    if options is None:
+        return {}
+
+    backend = str(options.get("backend") or "").strip()
+    if not backend:
+        raise ValueError(f"planner.hedge.backend in {config_path} is required")
+    _validate_backend_spec(backend, "planner.hedge")
+    values: dict = {"backend": _split_backend_spec(backend)}
+    for key in ("percentile", "min_delay", "default_delay"):
+        if options.get(key) is None:
+            continue
+        try:
+            values[key] = float(options[key])
+        except (TypeError, ValueError):
+            raise ValueError(f"planner.hedge.{key} in {config_path} must be a number") from None
+    if not 0 < values.get("percentile", 0.5) <= 1:
+        raise ValueError(f"planner.hedge.percentile in {config_path} must be in (0, 1]")
+
+    stages = options.get("stages") or list(STAGES)
+    if isinstance(stages, str):
+        stages = [stage.strip() for stage in stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise ValueError(f"planner.hedge.stages in {config_path} has unknown stages: {', '.join(unknown)}")
+    policy = HedgePolicy(**values)
+    return {stage: policy for stage in stages}
+
+
+def _load_planner_context(planner: dict, config_path: Optional[Path]) -> Optional[ContextPolicy]:
+    """Build the prompt context policy from planner.context (None when off).
+
+    `planner.context: true` references shared blocks by path; a mapping
+    accepts `enabled`, `reference` (default true), `reference_min_bytes`,
+    `max_bytes`, `max_tokens` and `strategy` (truncate or outline).
+    """
+    options = _planner_toggle(planner, "context")
+    if options is None:
+        return None
+
+    values: dict = {"reference": _parse_flag(options.get("reference", True))}
+    for key in ("reference_min_bytes", "max_bytes", "max_tokens"):
+        if options.get(key) is None:
+            continue
+        try:
+            values[key] = int(options[key])
+        except (TypeError, ValueError):
+            raise ValueError(f"planner.context.{key} in {config_path} must be an integer") from None
+        if values[key] <= 0 and key != "reference_min_bytes":
+            raise ValueError(f"planner.context.{key} in {config_path} must be positive")
+    strategy = str(options.get("strategy") or "truncate").strip()
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"planner.context.strategy in {config_path} must be one of: {', '.join(STRATEGIES)}"
+        )
+    return ContextPolicy(strategy=strategy, **values)
+
+
 def _validate_backend_spec(spec: str, label: str) -> None:
     """Validate backend spec format (provider:model)."""
     if not spec:
@@ -218,11 +383,13 @@ def main(argv: list[str]) -> int:
     parser.add_argument("--issue-mode", default="true", choices=["true", "false"])
     parser.add_argument("--verbose", default="false", choices=["true", "false"])
     parser.add_argument("--refine-issue-number", default="")
+    parser.add_argument("--resume", default="", help="Resume the run with this artifact prefix")
     args = parser.parse_args(argv)
 
     issue_mode = args.issue_mode == "true"
     verbose = args.verbose == "true"
     refine_issue_number = args.refine_issue_number.strip()
+    resume_prefix = args.resume.strip()
     feature_desc = args.feature_desc
 
     try:
@@ -242,18 +409,51 @@ def main(argv: list[str]) -> int:
         if verbose:
             _log(message)
 
+    def _log_stage_output(stage: str, text: str) -> None:
+        for line in text.splitlines():
+            _log(f"  [{stage}] {line}")
+
+    stage_output = _log_stage_output if verbose else None
+
     try:
-        backend_config = _load_planner_backend_config(repo_root, Path.cwd())
+        planner, config_path = _load_planner_section(repo_root, Path.cwd())
+        backend_config = _load_planner_backend_config(planner, config_path)
         stage_backends = _resolve_stage_backends(backend_config)
+        stage_cache = _load_planner_cache(planner, config_path, repo_root, output_dir / "stage-cache")
+        retry_policy = _load_planner_retry(planner, config_path)
+        hedges = _load_planner_hedge(planner, config_path)
+        context_policy = _load_planner_context(planner, config_path)
     except (RuntimeError, ValueError) as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
+    latency = LatencyHistory(output_dir / "stage-latency.json")
 
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     issue_number: Optional[str] = None
     issue_url: Optional[str] = None
 
-    if refine_issue_number:
+    if resume_prefix:
+        manifest = StageManifest.for_prefix(output_dir, resume_prefix)
+        if not manifest.exists():
+            print(
+                f"Error: No checkpoint manifest for prefix '{resume_prefix}' "
+                f"(expected {manifest.path})",
+                file=sys.stderr,
+            )
+            return 1
+        meta = manifest.meta()
+        feature_desc = feature_desc or meta.get("feature_desc", "")
+        if not feature_desc:
+            print(
+                f"Error: Checkpoint '{resume_prefix}' does not record a feature description",
+                file=sys.stderr,
+            )
+            return 1
+        issue_number = meta.get("issue_number") or None
+        issue_url = meta.get("issue_url") or None
+        prefix_name = resume_prefix
+        _log(f"Resuming pipeline from {manifest.path.name}")
+    elif refine_issue_number:
         refine_instructions = feature_desc
         issue_body = gh_utils.issue_body(refine_issue_number, cwd=repo_root)
         issue_url = gh_utils.issue_url(refine_issue_number, cwd=repo_root)
@@ -294,6 +494,15 @@ def main(argv: list[str]) -> int:
     else:
         prefix_name = timestamp
 
+    try:
+        StageManifest.for_prefix(output_dir, prefix_name).update_meta(
+            feature_desc=feature_desc,
+            issue_number=issue_number or "",
+            issue_url=issue_url or "",
+        )
+    except OSError as exc:
+        print(f"Warning: Could not write checkpoint manifest ({exc})", file=sys.stderr)
+
     _log("Starting multi-agent debate pipeline...")
     _log(f"Feature: {feature_desc}")
     _log_verbose(f"Artifacts prefix: {prefix_name}")
@@ -308,6 +517,13 @@ def main(argv: list[str]) -> int:
             prefix=prefix_name,
             output_suffix=".txt",
             skip_consensus=True,
+            cache=stage_cache,
+            resume=bool(resume_prefix),
+            retry_policy=retry_policy,
+            hedges=hedges,
+            latency=latency,
+            context=context_policy,
+            on_output=stage_output,
         )
     except (FileNotFoundError, RuntimeError, subprocess.TimeoutExpired) as exc:
         print(f"Error: {exc}", file=sys.stderr)
@@ -326,6 +542,13 @@ def main(argv: list[str]) -> int:
             prefix=prefix_name,
             stage_backends=stage_backends,
             runner=run_acw,
+            cache=stage_cache,
+            resume=bool(resume_prefix),
+            retry_policy=retry_policy,
+            hedges=hedges,
+            latency=latency,
+            context=context_policy,
+            on_output=stage_output,
         )
     except (FileNotFoundError, RuntimeError, subprocess.TimeoutExpired) as exc:
         print(f"Error: {exc}", file=sys.stderr)
@@ -2,15 +2,26 @@
 
 from __future__ import annotations
 
+import functools
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Mapping
 
 from agentize.shell import get_agentize_home
 from agentize.workflow.api import run_acw
 from agentize.workflow.api import prompt as prompt_utils
-from agentize.workflow.api.session import Session, StageResult
+from agentize.workflow.api.cache import StageCache
+from agentize.workflow.api.context import (
+    AssembledPrompt,
+    ContextAssembler,
+    ContextBlock,
+    ContextPolicy,
+    can_read_files,
+)
+from agentize.workflow.api.hedge import HedgePolicy, LatencyHistory
+from agentize.workflow.api.retry import RetryPolicy
+from agentize.workflow.api.session import NodePrompt, Session, StageNode, StageResult
 
 
 # ============================================================
@@ -20,6 +31,11 @@ from agentize.workflow.api.session import Session, StageResult
 # Stage names in execution order
 STAGES = ["understander", "bold", "critique", "reducer", "consensus"]
 
+# Stage names shown in progress logs
+STAGE_LABELS = {
+    "bold": "bold-proposer",
+}
+
 # Agent prompt paths (relative to AGENTIZE_HOME)
 AGENT_PROMPTS = {
     "understander": ".claude-plugin/agents/understander.md",
@@ -60,58 +76,85 @@ STAGE_PERMISSION_MODE = {
 # ============================================================
 
 
-def _render_stage_prompt(
+def _stage_blocks(
     stage: str,
     feature_desc: str,
     agentize_home: Path,
     previous_output: str | None = None,
-) -> str:
-    """Render the input prompt for a stage."""
-    parts = []
+    previous_path: Path | None = None,
+) -> list[ContextBlock]:
+    """Context blocks of a stage prompt: agent prompt, guidelines, feature and previous output."""
+    blocks = []
 
     if stage in AGENT_PROMPTS:
         agent_path = agentize_home / AGENT_PROMPTS[stage]
-        parts.append(prompt_utils.read_prompt(agent_path, strip_frontmatter=True))
+        blocks.append(ContextBlock("agent", prompt_utils.read_prompt(agent_path, strip_frontmatter=True)))
 
     if stage in STAGES_WITH_PLAN_GUIDELINE:
         plan_guideline_path = (
             agentize_home / ".claude-plugin/skills/plan-guideline/SKILL.md"
         )
         if plan_guideline_path.exists():
-            parts.append("\n---\n")
-            parts.append("# Planning Guidelines\n")
-            parts.append(prompt_utils.read_prompt(plan_guideline_path, strip_frontmatter=True))
-
-    parts.append("\n---\n")
-    parts.append("# Feature Request\n")
-    parts.append(feature_desc)
+            blocks.append(
+                ContextBlock(
+                    "plan-guideline",
+                    prompt_utils.read_prompt(plan_guideline_path, strip_frontmatter=True),
+                    title="# Planning Guidelines",
+                    shared=True,
+                    reducible=True,
+                )
+            )
+
+    blocks.append(ContextBlock("feature", feature_desc, title="# Feature Request", shared=True))
 
     if previous_output:
-        parts.append("\n---\n")
-        parts.append("# Previous Stage Output\n")
-        parts.append(previous_output)
+        blocks.append(
+            ContextBlock(
+                "previous-output",
+                previous_output,
+                title="# Previous Stage Output",
+                shared=True,
+                reducible=True,
+                path=previous_path,
+            )
+        )
+
+    return blocks
 
-    return "\n".join(parts)
+
+def _render_stage_prompt(
+    stage: str,
+    feature_desc: str,
+    agentize_home: Path,
+    previous_output: str | None = None,
+    *,
+    assembler: ContextAssembler,
+    can_read: bool = False,
+    previous_path: Path | None = None,
+) -> AssembledPrompt:
+    """Render the input prompt for a stage."""
+    blocks = _stage_blocks(stage, feature_desc, agentize_home, previous_output, previous_path)
+    return assembler.assemble(blocks, can_read=can_read)
 
 
 def _build_combined_report(
     bold_output: str,
     critique_output: str,
     reducer_output: str,
-) -> str:
+    *,
+    assembler: ContextAssembler,
+    can_read: bool = False,
+    paths: tuple[Path, Path, Path] | None = None,
+) -> AssembledPrompt:
     """Build the combined report for the consensus template."""
-    return f"""## Bold Proposer Output
-
-{bold_output}
-
-## Critique Output
-
-{critique_output}
-
-## Reducer Output
-
-{reducer_output}
-"""
+    bold_path, critique_path, reducer_path = paths or (None, None, None)
+    blocks = [
+        ContextBlock("bold-output", bold_output, "## Bold Proposer Output", True, True, bold_path),
+        ContextBlock("critique-output", critique_output, "## Critique Output", True, True, critique_path),
+        ContextBlock("reducer-output", reducer_output, "## Reducer Output", True, True, reducer_path),
+    ]
+    report = assembler.assemble(blocks, can_read=can_read, separator="\n\n")
+    return AssembledPrompt(report.text + "\n", report.blocks)
 
 
 def _render_consensus_prompt(
@@ -147,8 +190,27 @@ def run_planner_pipeline(
     prefix: str | None = None,
     output_suffix: str = "-output.md",
     skip_consensus: bool = False,
+    cache: StageCache | None = None,
+    resume: bool = False,
+    retry_policy: RetryPolicy | None = None,
+    hedges: dict[str, HedgePolicy] | None = None,
+    latency: LatencyHistory | None = None,
+    context: ContextPolicy | None = None,
+    on_output: Callable[[str, str], None] | None = None,
 ) -> dict[str, StageResult]:
-    """Execute the 5-stage planner pipeline."""
+    """Execute the 5-stage planner pipeline as a stage graph.
+
+    understander -> bold -> (critique | reducer) -> consensus; critique and
+    reducer run concurrently once bold has finished. With a cache, stages
+    whose rendered input and settings are unchanged reuse their stored output.
+    With resume, stages with a valid checkpoint under prefix are not re-run.
+    retry_policy (api/retry.py) decides which failed stage attempts are retried.
+    hedges maps stages to a HedgePolicy (api/hedge.py), whose threshold comes
+    from the run times recorded in latency.
+    context (api/context.py) lets stages that can read files reference shared
+    blocks by path, and caps prompt size.
+    on_output(stage, text) receives each stage's output as it is written.
+    """
     agentize_home = Path(get_agentize_home())
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -165,103 +227,88 @@ def run_planner_pipeline(
         prefix=prefix,
         runner=runner,
         output_suffix=output_suffix,
+        cache=cache,
+        resume=resume,
+        retry_policy=retry_policy,
+        latency=latency,
     )
 
-    def _log_stage(message: str) -> None:
-        session._log(message)
-
-    def _backend_label(stage: str) -> str:
-        provider, model = stage_backends[stage]
-        return f"{provider}:{model}"
-
-    results: dict[str, StageResult] = {}
-
-    understander_prompt = _render_stage_prompt(
-        "understander", feature_desc, agentize_home
-    )
-    _log_stage(f"Stage 1/5: Running understander ({_backend_label('understander')})")
-    results["understander"] = session.run_prompt(
-        "understander",
-        understander_prompt,
-        stage_backends["understander"],
-        tools=STAGE_TOOLS.get("understander"),
-        permission_mode=STAGE_PERMISSION_MODE.get("understander"),
-    )
-    understander_output = results["understander"].text()
-
-    bold_prompt = _render_stage_prompt(
-        "bold", feature_desc, agentize_home, understander_output
-    )
-    _log_stage(f"Stage 2/5: Running bold-proposer ({_backend_label('bold')})")
-    results["bold"] = session.run_prompt(
-        "bold",
-        bold_prompt,
-        stage_backends["bold"],
-        tools=STAGE_TOOLS.get("bold"),
-        permission_mode=STAGE_PERMISSION_MODE.get("bold"),
-    )
-    bold_output = results["bold"].text()
-
-    critique_prompt = _render_stage_prompt(
-        "critique", feature_desc, agentize_home, bold_output
-    )
-    reducer_prompt = _render_stage_prompt(
-        "reducer", feature_desc, agentize_home, bold_output
-    )
-
-    _log_stage(
-        "Stage 3-4/5: Running critique and reducer in parallel "
-        f"({_backend_label('critique')}, {_backend_label('reducer')})"
-    )
-
-    parallel_results = session.run_parallel(
-        [
-            session.stage(
-                "critique",
-                critique_prompt,
-                stage_backends["critique"],
-                tools=STAGE_TOOLS.get("critique"),
-                permission_mode=STAGE_PERMISSION_MODE.get("critique"),
-            ),
-            session.stage(
-                "reducer",
-                reducer_prompt,
-                stage_backends["reducer"],
-                tools=STAGE_TOOLS.get("reducer"),
-                permission_mode=STAGE_PERMISSION_MODE.get("reducer"),
-            ),
-        ]
-    )
-    results.update(parallel_results)
-
-    critique_output = results["critique"].text()
-    reducer_output = results["reducer"].text()
-
-    if skip_consensus:
-        return results
-
-    combined_report = _build_combined_report(
-        bold_output, critique_output, reducer_output
-    )
-
-    def _write_consensus_prompt(path: Path) -> str:
-        return _render_consensus_prompt(
-            feature_desc,
-            combined_report,
-            agentize_home,
-            path,
+    assembler = ContextAssembler(output_path, prefix, context)
+
+    def _can_read(stage: str) -> bool:
+        return can_read_files(stage_backends[stage], STAGE_TOOLS.get(stage))
+
+    def _log_context(stage: str, assembled: AssembledPrompt) -> None:
+        if assembled.changed():
+            session._log(f"agent {stage}: {assembled.summary()}")
+
+    def _stage_prompt(stage: str, upstream: str | None = None) -> Callable[[Mapping[str, StageResult]], str]:
+        def _render(results: Mapping[str, StageResult]) -> str:
+            previous_output = results[upstream].text() if upstream else None
+            assembled = _render_stage_prompt(
+                stage,
+                feature_desc,
+                agentize_home,
+                previous_output,
+                assembler=assembler,
+                can_read=_can_read(stage),
+                previous_path=results[upstream].output_path if upstream else None,
+            )
+            _log_context(stage, assembled)
+            return assembled.text
+
+        return _render
+
+    def _consensus_prompt(results: Mapping[str, StageResult]) -> Callable[[Path], str]:
+        combined_report = _build_combined_report(
+            results["bold"].text(),
+            results["critique"].text(),
+            results["reducer"].text(),
+            assembler=assembler,
+            can_read=_can_read("consensus"),
+            paths=(results["bold"].output_path, results["critique"].output_path, results["reducer"].output_path),
+        )
+        _log_context("consensus", combined_report)
+
+        def _write_consensus_prompt(path: Path) -> str:
+            return _render_consensus_prompt(
+                feature_desc,
+                combined_report.text,
+                agentize_home,
+                path,
+            )
+
+        return _write_consensus_prompt
+
+    def _node(stage: str, prompt: NodePrompt, after: tuple[str, ...] = ()) -> StageNode:
+        return session.node(
+            stage,
+            prompt,
+            stage_backends[stage],
+            after=after,
+            tools=STAGE_TOOLS.get(stage),
+            permission_mode=STAGE_PERMISSION_MODE.get(stage),
+            hedge=(hedges or {}).get(stage),
+            on_output=functools.partial(on_output, stage) if on_output else None,
         )
 
-    _log_stage(f"Stage 5/5: Running consensus ({_backend_label('consensus')})")
-    results["consensus"] = session.run_prompt(
-        "consensus",
-        _write_consensus_prompt,
-        stage_backends["consensus"],
-        tools=STAGE_TOOLS.get("consensus"),
-        permission_mode=STAGE_PERMISSION_MODE.get("consensus"),
-    )
+    # Critique and reducer both depend only on bold, so they overlap
+    nodes = [
+        _node("understander", _stage_prompt("understander")),
+        _node("bold", _stage_prompt("bold", "understander"), after=("understander",)),
+        _node("critique", _stage_prompt("critique", "bold"), after=("bold",)),
+        _node("reducer", _stage_prompt("reducer", "bold"), after=("bold",)),
+    ]
+    if not skip_consensus:
+        nodes.append(_node("consensus", _consensus_prompt, after=("bold", "critique", "reducer")))
 
-    return results
+    def _log_stage(node: StageNode) -> None:
+        provider, model = node.backend
+        position = STAGES.index(node.stage) + 1
+        label = STAGE_LABELS.get(node.stage, node.stage)
+        session._log(f"Stage {position}/{len(STAGES)}: Running {label} ({provider}:{model})")
+
+    return session.run_graph(nodes, max_concurrency=2, on_start=_log_stage)
 
 
 def run_consensus_stage(
@@ -274,6 +321,13 @@ def run_consensus_stage(
     prefix: str,
     stage_backends: dict[str, tuple[str, str]],
     runner: Callable[..., subprocess.CompletedProcess] = run_acw,
+    cache: StageCache | None = None,
+    resume: bool = False,
+    retry_policy: RetryPolicy | None = None,
+    hedges: dict[str, HedgePolicy] | None = None,
+    latency: LatencyHistory | None = None,
+    context: ContextPolicy | None = None,
+    on_output: Callable[[str, str], None] | None = None,
 ) -> StageResult:
     """Run the consensus stage independently."""
     bold_output = bold_path.read_text()
@@ -285,6 +339,9 @@ def run_consensus_stage(
         bold_output,
         critique_output,
         reducer_output,
+        assembler=ContextAssembler(output_dir, prefix, context),
+        can_read=can_read_files(stage_backends["consensus"], STAGE_TOOLS.get("consensus")),
+        paths=(bold_path, critique_path, reducer_path),
     )
 
     input_path = output_dir / f"{prefix}-consensus-input.md"
@@ -293,20 +350,32 @@ def run_consensus_stage(
     def _write_consensus_prompt(path: Path) -> str:
         return _render_consensus_prompt(
             feature_desc,
-            combined_report,
+            combined_report.text,
             agentize_home,
             path,
         )
 
-    session = Session(output_dir=output_dir, prefix=prefix, runner=runner)
+    session = Session(
+        output_dir=output_dir,
+        prefix=prefix,
+        runner=runner,
+        cache=cache,
+        resume=resume,
+        retry_policy=retry_policy,
+        latency=latency,
+    )
+    if combined_report.changed():
+        session._log(f"agent consensus: {combined_report.summary()}")
     return session.run_prompt(
         "consensus",
         _write_consensus_prompt,
         stage_backends["consensus"],
         tools=STAGE_TOOLS.get("consensus"),
         permission_mode=STAGE_PERMISSION_MODE.get("consensus"),
+        hedge=(hedges or {}).get("consensus"),
         input_path=input_path,
         output_path=output_path,
+        on_output=functools.partial(on_output, "consensus") if on_output else None,
     )
 
 
@@ -34,6 +34,13 @@ def project_root() -> Path:
     return PROJECT_ROOT
 
 
+@pytest.fixture
+def subprocess_env() -> dict[str, str]:
+    """Environment for child Python processes, with python/ on PYTHONPATH."""
+    paths = [str(PYTHON_PATH), os.environ.get("PYTHONPATH", "")]
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in paths if path)}
+
+
 @pytest.fixture
 def set_agentize_home(tmp_path, monkeypatch):
     """Set AGENTIZE_HOME to a temporary directory."""
@@ -48,3 +55,11 @@ def clear_local_config_cache():
     clear_cache()
     yield
     clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_claims_dir(tmp_path_factory, monkeypatch):
+    """Keep work claims (agentize.claims) out of the repository's git directory."""
+    claims_dir = tmp_path_factory.mktemp("claims")
+    monkeypatch.setenv("AGENTIZE_CLAIMS_DIR", str(claims_dir))
+    return claims_dir
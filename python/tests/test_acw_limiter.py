@@ -0,0 +1,125 @@
+"""Tests for cross-process acw provider limits."""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from agentize.workflow.api import limiter as limiter_module
+from agentize.workflow.api.acw import ACW
+from agentize.workflow.api.limiter import ProviderLimit, ProviderLimiter, load_provider_limits
+
+
+class TestLoadProviderLimits:
+    """Tests for parsing acw.limits."""
+
+    def test_model_overrides_inherit_provider_limits(self):
+        """Test that a model section overrides only the keys it sets."""
+        config = {"acw": {"limits": {"claude": {"concurrency": 3, "rpm": 20, "models": {"opus": {"concurrency": 1}}}}}}
+
+        limits = load_provider_limits(config)
+
+        assert limits[("claude", None)] == ProviderLimit(concurrency=3, rpm=20)
+        assert limits[("claude", "opus")] == ProviderLimit(concurrency=1, rpm=20)
+        assert load_provider_limits({}) == {}
+
+    def test_invalid_values_raise(self):
+        """Test that non-numeric limits are rejected with their YAML path."""
+        with pytest.raises(ValueError, match="acw.limits.claude.rpm"):
+            load_provider_limits({"acw": {"limits": {"claude": {"rpm": "fast"}}}})
+
+
+class TestProviderLimiter:
+    """Tests for concurrency slots and the rate bucket."""
+
+    def test_concurrency_slot_waits_for_release(self, tmp_path):
+        """Test that a caller waits while every slot is held, then takes the freed one."""
+        limit = ProviderLimit(concurrency=1)
+        holder = ProviderLimiter("claude", "opus", limit, limits_dir=tmp_path, poll_interval=0.05)
+        other_model = ProviderLimiter("claude", "sonnet", limit, limits_dir=tmp_path)
+        holder.acquire()
+        assert other_model.acquire() < 0.1
+        other_model.release()
+
+        timer = threading.Timer(0.3, holder.release)
+        timer.start()
+        waiter = ProviderLimiter("claude", "opus", limit, limits_dir=tmp_path, poll_interval=0.05)
+        with waiter:
+            assert waiter.waited >= 0.25
+        timer.join()
+
+    def test_slot_is_shared_across_processes(self, tmp_path, subprocess_env):
+        """Test that a slot held by another process blocks until that process exits."""
+        script = (
+            "import sys, time\n"
+            "from pathlib import Path\n"
+            "from agentize.workflow.api.limiter import ProviderLimit, ProviderLimiter\n"
+            "limiter = ProviderLimiter('codex', 'gpt', ProviderLimit(concurrency=1), limits_dir=Path(sys.argv[1]))\n"
+            "limiter.acquire()\n"
+            "print('held', flush=True)\n"
+            "time.sleep(0.4)\n"
+        )
+        holder = subprocess.Popen(
+            [sys.executable, "-c", script, str(tmp_path)], stdout=subprocess.PIPE, text=True, env=subprocess_env
+        )
+        assert holder.stdout.readline().strip() == "held"
+
+        waiter = ProviderLimiter("codex", "gpt", ProviderLimit(concurrency=1), limits_dir=tmp_path, poll_interval=0.05)
+        assert waiter.acquire() >= 0.2
+        waiter.release()
+        holder.wait()
+
+    def test_rate_bucket_spaces_calls(self, tmp_path):
+        """Test that rpm spaces call starts once the burst is spent."""
+        limit = ProviderLimit(rpm=600, burst=2)
+        waits = []
+        for _ in range(3):
+            with ProviderLimiter("claude", "opus", limit, limits_dir=tmp_path) as limiter:
+                waits.append(limiter.waited)
+
+        assert waits[0] < 0.05 and waits[1] < 0.05
+        assert waits[2] >= 0.05
+
+
+class TestLimitedCallers:
+    """Tests for ACW and the command wrapper honouring the limits."""
+
+    def test_acw_records_wait_and_releases(self, tmp_path, monkeypatch):
+        """Test that ACW waits for a slot, logs the wait and frees the slot afterwards."""
+        limit = ProviderLimit(concurrency=1)
+        monkeypatch.setattr(
+            "agentize.workflow.api.acw.provider_limiter",
+            lambda provider, model: ProviderLimiter(provider, model, limit, limits_dir=tmp_path, poll_interval=0.05),
+        )
+        holder = ProviderLimiter("claude", "opus", limit, limits_dir=tmp_path)
+        holder.acquire()
+        timer = threading.Timer(1.1, holder.release)
+        timer.start()
+
+        def _runner(provider, model, input_file, output_file, **_kwargs):
+            Path(output_file).write_text("ok")
+            return subprocess.CompletedProcess(args=["stub"], returncode=0)
+
+        logs = []
+        acw = ACW("bold", "claude", "opus", runner=_runner, limit=True, log_writer=logs.append)
+        acw.run(tmp_path / "in.md", tmp_path / "out.md")
+        timer.join()
+
+        assert acw.wait_seconds >= 1
+        assert any("waited 1s for a provider slot" in line for line in logs)
+        assert ProviderLimiter("claude", "opus", limit, limits_dir=tmp_path).acquire() < 0.1
+
+    def test_run_command_passes_exit_status(self, tmp_path, monkeypatch):
+        """Test that the supervisor wrapper runs its command under the limit and keeps its status."""
+        monkeypatch.setattr(
+            limiter_module,
+            "load_provider_limits",
+            lambda config=None: {("claude", None): ProviderLimit(concurrency=1)},
+        )
+        monkeypatch.setenv("AGENTIZE_ACW_LIMITS_DIR", str(tmp_path))
+
+        assert limiter_module.main(["run", "claude", "opus", "--", "sh", "-c", "exit 3"]) == 3
+        assert (tmp_path / "claude-opus.slot0").exists()
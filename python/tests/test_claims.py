@@ -0,0 +1,93 @@
+"""Tests for local advisory work claims."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from agentize.claims import (
+    EXIT_HELD,
+    ClaimHeldError,
+    WorkClaim,
+    claimed_by,
+    format_holder,
+    issue_claim_key,
+)
+from agentize.workflow.impl.impl import ImplError, run_impl_workflow
+
+
+class TestWorkClaim:
+    """Tests for taking, probing and handing off claims."""
+
+    def test_second_claim_is_rejected(self, tmp_path):
+        """Test that a held claim rejects another claimant and frees on release."""
+        first = WorkClaim('issue-42', command='lol impl 42', claims_dir=tmp_path)
+        second = WorkClaim('issue-42', claims_dir=tmp_path)
+
+        assert first.acquire()
+        assert not second.acquire()
+        assert claimed_by('issue-42', tmp_path)['command'] == 'lol impl 42'
+        with pytest.raises(ClaimHeldError, match='lol impl 42'):
+            with second:
+                pass
+
+        first.release()
+        assert claimed_by('issue-42', tmp_path) is None
+        assert second.acquire()
+        second.release()
+
+    def test_hand_off_keeps_claim_with_child(self, tmp_path):
+        """Test that a child inheriting the descriptor holds the claim until it exits."""
+        claim = WorkClaim('issue-7', command='server refine', claims_dir=tmp_path)
+        assert claim.acquire()
+        child = subprocess.Popen(
+            [sys.executable, '-c', 'import sys; sys.stdin.read()'],
+            stdin=subprocess.PIPE,
+            pass_fds=(claim.fileno(),),
+        )
+        claim.record_holder(child.pid)
+        claim.hand_off()
+
+        try:
+            holder = claimed_by('issue-7', tmp_path)
+            assert holder['pid'] == child.pid and holder['command'] == 'server refine'
+        finally:
+            child.communicate(b'')
+        assert claimed_by('issue-7', tmp_path) is None
+
+    def test_format_holder(self):
+        """Test the holder description used in rejection messages."""
+        assert format_holder({'pid': 4242, 'command': 'lol impl 42'}) == 'PID 4242 (lol impl 42)'
+        assert format_holder(None) == 'another process'
+        assert issue_claim_key(42) == 'issue-42'
+
+
+def test_cli_acquire_exits_when_held(tmp_path, subprocess_env):
+    """Test that the wt helper entrypoint exits with EXIT_HELD on a held claim."""
+    holder = WorkClaim('issue-9', command='lol impl 9', claims_dir=tmp_path)
+    assert holder.acquire()
+    fd = os.open(tmp_path / 'issue-9.lock', os.O_RDWR)
+    try:
+        result = subprocess.run(
+            [sys.executable, '-m', 'agentize.claims', 'acquire', 'issue-9', '--fd', str(fd),
+             '--command', 'wt spawn 9'],
+            pass_fds=(fd,), capture_output=True, text=True, env=subprocess_env,
+        )
+    finally:
+        os.close(fd)
+        holder.release()
+
+    assert result.returncode == EXIT_HELD
+    assert 'issue-9 is claimed by' in result.stderr and 'lol impl 9' in result.stderr
+
+
+def test_impl_workflow_rejects_claimed_issue(isolated_claims_dir):
+    """Test that lol impl fails fast when another process works on the issue."""
+    holder = WorkClaim(issue_claim_key(42), command='server review-resolution', claims_dir=isolated_claims_dir)
+    assert holder.acquire()
+    try:
+        with pytest.raises(ImplError, match='already being worked on by .*server review-resolution'):
+            run_impl_workflow(42, backend='claude:sonnet')
+    finally:
+        holder.release()
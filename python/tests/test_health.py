@@ -0,0 +1,104 @@
+"""Tests for stuck-worker detection and preemption."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import agentize.server.health as health_module
+from agentize.server.__main__ import (
+    HealthPolicy,
+    WorkerHealthMonitor,
+    record_spawn_log,
+    write_worker_status,
+)
+from agentize.server.spawn_logs import _load_index, _save_index
+from agentize.server.workers import is_preempted
+
+
+@pytest.fixture
+def worker(tmp_path):
+    """A live sleeping worker in slot 0 with an indexed spawn log."""
+    workers_dir = tmp_path / 'workers'
+    logs_dir = tmp_path / 'logs'
+    logs_dir.mkdir()
+    proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'], start_new_session=True)
+    log_file = logs_dir / 'refine-7-1.log'
+    log_file.write_text('working\n')
+    record_spawn_log(log_file, task='refine', issue_no=7, pid=proc.pid, logs_dir=logs_dir)
+    write_worker_status(0, 'BUSY', 7, proc.pid, str(workers_dir))
+    yield proc, log_file, logs_dir, workers_dir
+    proc.kill()
+    proc.wait()
+
+
+def _backdate_start(logs_dir, seconds):
+    index = _load_index(logs_dir)
+    for entry in index.values():
+        entry['start'] -= seconds
+    _save_index(logs_dir, index)
+
+
+class TestWorkerHealthMonitor:
+    """Tests for inactivity flags and budget preemption."""
+
+    def test_healthy_worker_is_left_alone(self, worker):
+        """Test that a fresh, active worker is neither flagged nor preempted."""
+        proc, _, logs_dir, workers_dir = worker
+        monitor = WorkerHealthMonitor(HealthPolicy(), workers_dir=str(workers_dir), logs_dir=logs_dir)
+
+        assert monitor.check(1) == []
+        health = monitor.assess(0)
+        assert health.task == 'refine' and not health.stalled and not health.over_budget
+        assert proc.poll() is None
+
+    def test_idle_worker_is_flagged_once(self, worker):
+        """Test that a worker with no output growth is reported once per stall."""
+        _, log_file, logs_dir, workers_dir = worker
+        _backdate_start(logs_dir, 3600)
+        old = time.time() - 3600
+        os.utime(log_file, (old, old))
+        messages = []
+        monitor = WorkerHealthMonitor(
+            HealthPolicy(inactivity_sec=600), messages.append, workers_dir=str(workers_dir), logs_dir=logs_dir
+        )
+        monitor.policy.budgets['refine'] = 0
+
+        assert [h.stalled for h in monitor.check(1)] == [True]
+        assert monitor.check(1) == []
+        assert len(messages) == 1 and 'no output for 60m' in messages[0]
+
+    def test_over_budget_worker_is_terminated_and_requeued(self, worker, monkeypatch):
+        """Test that a worker past its task budget is killed and its Status reset."""
+        proc, _, logs_dir, workers_dir = worker
+        _backdate_start(logs_dir, 2 * 3600)
+        resets = []
+        monkeypatch.setattr(health_module, 'reset_issue_status', lambda issue_no, status: resets.append((issue_no, status)))
+        monitor = WorkerHealthMonitor(HealthPolicy(), workers_dir=str(workers_dir), logs_dir=logs_dir)
+
+        acted = monitor.check(1)
+
+        assert [h.over_budget for h in acted] == [True]
+        assert proc.wait(timeout=10) != 0
+        assert resets == [(7, 'Proposed')]
+        # A second check does not preempt again before the worker is cleaned up
+        assert monitor.check(1) == []
+
+    def test_preempted_impl_task_is_marked_for_resume(self, worker, monkeypatch):
+        """Test that a preempted impl task is re-queued and marked so its worktree is resumed."""
+        proc, _, logs_dir, workers_dir = worker
+        index = _load_index(logs_dir)
+        for entry in index.values():
+            entry['task'] = 'issue'
+        _save_index(logs_dir, index)
+        _backdate_start(logs_dir, 5 * 3600)
+        resets = []
+        monkeypatch.setattr(health_module, 'reset_issue_status', lambda issue_no, status: resets.append((issue_no, status)))
+        monitor = WorkerHealthMonitor(HealthPolicy(), workers_dir=str(workers_dir), logs_dir=logs_dir)
+
+        assert [h.task for h in monitor.check(1)] == ['issue']
+        assert proc.wait(timeout=10) != 0
+        assert resets == [(7, 'Plan Accepted')]
+        assert is_preempted(7, str(workers_dir))
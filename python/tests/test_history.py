@@ -0,0 +1,105 @@
+"""Tests for the task duration history and estimator."""
+
+import json
+
+from agentize.server.__main__ import (
+    TaskHistory,
+    transcript_usage,
+    write_worker_status,
+    cleanup_dead_workers,
+    _format_eta,
+    _format_worker_assignment_message,
+    _shortest_first,
+)
+
+
+def _finish(history, task, duration, *, pid, labels=(), model=None, exit_code=0, start=1000.0):
+    history.record_start(task, issue_no=pid, pid=pid, labels=labels, model=model, started_at=start)
+    history.record_end(pid, exit_code, ended_at=start + duration)
+
+
+class TestTaskHistory:
+    """Tests for recording tasks and estimating durations."""
+
+    def test_record_start_and_end(self, tmp_path):
+        """Test that a reaped worker's open task is closed with its exit code."""
+        history = TaskHistory(str(tmp_path / 'history.sqlite'))
+        history.record_start('issue', issue_no=42, pid=4242, labels=['bug', 'agentize:plan'], started_at=100.0)
+
+        assert history.open_task(4242).labels == ('agentize:plan', 'bug')
+        record = history.record_end(4242, 0, ended_at=400.0)
+
+        assert record.duration == 300.0 and record.exit_code == 0
+        assert history.open_task(4242) is None
+        assert history.record_end(4242, 0) is None
+
+    def test_estimate_falls_back_from_label_to_task(self, tmp_path):
+        """Test the label > model > task fallback and that failed runs are ignored."""
+        history = TaskHistory(str(tmp_path / 'history.sqlite'))
+        for pid, duration in enumerate((100, 200, 300), start=1):
+            _finish(history, 'review-resolution', duration, pid=pid, labels=['docs'], model='claude-sonnet-4-5')
+        for pid, duration in enumerate((1000, 1100, 1200), start=10):
+            _finish(history, 'review-resolution', duration, pid=pid, labels=['core'], model='claude-opus-4-5')
+        _finish(history, 'review-resolution', 5, pid=99, labels=['docs'], exit_code=1)
+
+        assert history.estimate('review-resolution', labels=['docs']) == 200
+        assert history.estimate('review-resolution', labels=['agentize:plan']) == 650  # Workflow label ignored
+        assert history.estimate('review-resolution', model='claude-opus-4-5') == 1100
+        assert history.estimate('rebase') is None
+
+    def test_shortest_first_ordering(self, tmp_path):
+        """Test that review PRs are ordered by expected duration and stay put without history."""
+        history = TaskHistory(str(tmp_path / 'history.sqlite'))
+        for pid in range(3):
+            _finish(history, 'review-resolution', 3000, pid=pid, labels=['core'])
+        for pid in range(3, 6):
+            _finish(history, 'review-resolution', 60, pid=pid, labels=['docs'])
+        labels = {1: ['core'], 2: ['docs'], 3: ['other']}
+        prs = [(10, 1), (20, 2), (30, 3)]
+
+        ordered = _shortest_first(history, 'review-resolution', prs, lambda pr: labels[pr[1]])
+        assert ordered == [(20, 2), (30, 3), (10, 1)]
+        assert _shortest_first(None, 'review-resolution', prs, lambda pr: labels[pr[1]]) == prs
+
+
+def test_transcript_usage_counts_entries_after_start(tmp_path):
+    """Test that only assistant messages after the task started are priced."""
+    transcript = tmp_path / 'transcript.jsonl'
+    usage = {'input_tokens': 1_000_000, 'output_tokens': 0}
+    transcript.write_text('\n'.join(json.dumps(entry) for entry in (
+        {'type': 'assistant', 'timestamp': '2026-01-01T00:00:00Z',
+         'message': {'model': 'claude-opus-4-5', 'usage': usage}},
+        {'type': 'assistant', 'timestamp': '2026-01-02T00:00:00Z',
+         'message': {'model': 'claude-sonnet-4-5-20250929', 'usage': usage}},
+        {'type': 'user', 'message': {'content': 'hi'}},
+    )) + '\n')
+
+    model, cost = transcript_usage(str(transcript), since=1767225600 + 3600)  # 2026-01-01T01:00Z
+
+    assert model == 'claude-sonnet-4-5-20250929'
+    assert cost == 3.0
+    assert transcript_usage(str(tmp_path / 'missing.jsonl')) == (None, None)
+
+
+def test_cleanup_dead_workers_closes_task(tmp_path):
+    """Test that freeing a dead worker's slot records the end of its task."""
+    workers_dir = str(tmp_path / 'workers')
+    history = TaskHistory(str(tmp_path / 'history.sqlite'))
+    write_worker_status(0, 'BUSY', 42, 999999999, workers_dir)
+    history.record_start('issue', issue_no=42, pid=999999999, started_at=100.0)
+
+    cleanup_dead_workers(1, workers_dir, history=history)
+
+    record = history.records('issue')[0]
+    assert record.ended_at is not None
+
+
+def test_eta_formatting():
+    """Test the rough ETA rendering and the assignment message ETA line."""
+    assert _format_eta(45 * 60) == '~45m'
+    assert _format_eta(125 * 60) == '~2h05m'
+    assert _format_eta(10) == '~1m'
+
+    msg = _format_worker_assignment_message(42, 'Title', 1, None, 45 * 60)
+    assert msg.endswith('ETA: ~45m')
+    assert 'ETA' not in _format_worker_assignment_message(42, 'Title', 1, None)
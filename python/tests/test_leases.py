@@ -0,0 +1,159 @@
+"""Tests for agentize.server multi-host lease claims."""
+
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from agentize.server.__main__ import (
+    SQLiteLeaseStore,
+    HTTPLeaseStore,
+    LeaseError,
+    LeaseKeeper,
+    LeaseStore,
+    create_lease_keeper,
+    make_lease_server,
+)
+
+
+class TestSQLiteLeaseStore:
+    """Tests for the shared SQLite lease store."""
+
+    def test_acquire_is_exclusive_until_expiry(self, tmp_path):
+        """Test that a second owner cannot acquire an unexpired lease."""
+        store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+
+        assert store.acquire("issue:42", "host-a", 60) is True
+        assert store.acquire("issue:42", "host-b", 60) is False
+        # Re-acquire by the same owner (e.g., after restart) succeeds
+        assert store.acquire("issue:42", "host-a", 60) is True
+        assert store.get("issue:42").owner == "host-a"
+
+    def test_incomplete_store_fails_at_construction(self):
+        """Test that a store missing interface methods cannot be instantiated."""
+        class PartialStore(LeaseStore):
+            def acquire(self, key, owner, ttl):
+                return True
+
+        with pytest.raises(TypeError):
+            PartialStore()
+
+    def test_expired_lease_can_be_taken_over(self, tmp_path):
+        """Test that an expired lease is acquirable and the old owner cannot renew it."""
+        store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+        store.acquire("issue:42", "host-a", -1)
+
+        assert store.get("issue:42") is None
+        assert store.acquire("issue:42", "host-b", 60) is True
+        assert store.renew("issue:42", "host-a", 60) is False
+        assert store.renew("issue:42", "host-b", 60) is True
+
+    def test_release_only_by_owner(self, tmp_path):
+        """Test that release by a non-owner leaves the lease in place."""
+        store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+        store.acquire("issue:7", "host-a", 60)
+
+        store.release("issue:7", "host-b")
+        assert store.get("issue:7") is not None
+
+        store.release("issue:7", "host-a")
+        assert store.get("issue:7") is None
+
+
+class TestLeaseService:
+    """Tests for the HTTP lease service and client."""
+
+    def test_client_round_trip(self, tmp_path):
+        """Test acquire/get/release through the HTTP service."""
+        server = make_lease_server(SQLiteLeaseStore(str(tmp_path / "leases.db")), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            client = HTTPLeaseStore(f"http://127.0.0.1:{server.server_address[1]}")
+
+            assert client.acquire("pr:3", "host-a", 60) is True
+            assert client.acquire("pr:3", "host-b", 60) is False
+            assert client.get("pr:3").owner == "host-a"
+            client.release("pr:3", "host-a")
+            assert client.get("pr:3") is None
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_unreachable_service_raises_lease_error(self):
+        """Test that transport failures surface as LeaseError."""
+        client = HTTPLeaseStore("http://127.0.0.1:9", timeout=1)
+
+        with pytest.raises(LeaseError):
+            client.acquire("issue:1", "host-a", 60)
+
+
+class TestLeaseKeeper:
+    """Tests for heartbeat renewal and release."""
+
+    def test_heartbeat_releases_exited_worker(self, tmp_path):
+        """Test that a lease bound to a dead PID is released on heartbeat."""
+        store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+        keeper = LeaseKeeper(store, ttl=60, owner="host-a")
+        proc = subprocess.Popen([sys.executable, "-c", "pass"])
+        proc.wait()
+
+        assert keeper.claim("issue:42") is True
+        keeper.bind("issue:42", proc.pid)
+        keeper.heartbeat()
+
+        assert keeper.held() == []
+        assert store.get("issue:42") is None
+
+    def test_lease_without_pid_renewed_until_worker_idle(self, tmp_path):
+        """Test that a spawn without a PID keeps its lease until its slot is no longer busy."""
+        store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+        keeper = LeaseKeeper(store, ttl=60, owner="host-a")
+        keeper.claim("issue:42")
+        keeper.bind("issue:42", None)
+
+        keeper.heartbeat()
+        keeper.release_unbound({"issue:42"})
+        assert keeper.held() == ["issue:42"]
+        assert store.get("issue:42").owner == "host-a"
+
+        keeper.release_unbound(set())
+        assert keeper.held() == []
+        assert store.get("issue:42") is None
+
+    def test_heartbeat_drops_lost_lease(self, tmp_path):
+        """Test that a lease taken over by another owner stops being tracked."""
+        store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+        keeper = LeaseKeeper(store, ttl=-1, owner="host-a")
+        keeper.claim("issue:42")
+        store.acquire("issue:42", "host-b", 60)
+
+        keeper.heartbeat()
+
+        assert keeper.held() == []
+        assert store.get("issue:42").owner == "host-b"
+
+    def test_create_lease_keeper_from_config(self, tmp_path):
+        """Test config parsing for the sqlite backend and disabled leasing."""
+        assert create_lease_keeper({}, 300) is None
+
+        keeper = create_lease_keeper(
+            {"backend": "sqlite", "path": str(tmp_path / "l.db"), "owner": "node-1"}, 300
+        )
+        assert keeper.owner == "node-1"
+        assert keeper.ttl == 900
+
+        with pytest.raises(ValueError):
+            create_lease_keeper({"backend": "etcd"}, 300)
+
+    def test_issue_keys_are_scoped_by_repo(self, tmp_path):
+        """Test that servers for different repos can lease the same issue number."""
+        store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+        first = LeaseKeeper(store, ttl=60, owner="host-a", namespace="org/one")
+        second = LeaseKeeper(store, ttl=60, owner="host-b", namespace="org/two")
+
+        assert first.issue_key(42) == "org/one#issue:42"
+        assert first.claim(first.issue_key(42)) is True
+        assert second.claim(second.issue_key(42)) is True
+        assert LeaseKeeper(store, ttl=60).issue_key(42) == "issue:42"
@@ -0,0 +1,106 @@
+"""Tests for agentize.server lifecycle modes and the server registry."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from agentize.server.__main__ import (
+    ServerLifecycle,
+    MODE_DRAINING,
+    MODE_STOPPING,
+    MODE_RESTARTING,
+    claim_server_registry,
+    read_server_registry,
+    registry_slots,
+    write_worker_status,
+    check_worker_liveness,
+)
+from agentize.server.workers import _reap_exit_code
+
+
+class TestServerLifecycle:
+    """Tests for signal-driven mode transitions."""
+
+    def test_drain_then_stop(self):
+        """Test that drain stops accepting work and a later stop exits."""
+        lifecycle = ServerLifecycle()
+        lifecycle.request(MODE_DRAINING)
+
+        assert not lifecycle.accepting_work
+        assert not lifecycle.should_exit
+
+        lifecycle.request(MODE_STOPPING)
+        assert lifecycle.should_exit
+
+    def test_restart_is_final_and_wait_returns_early(self):
+        """Test that restart cannot be downgraded and wakes the inter-cycle wait."""
+        lifecycle = ServerLifecycle()
+        lifecycle.request(MODE_RESTARTING)
+        lifecycle.request(MODE_DRAINING)
+
+        started = time.monotonic()
+        lifecycle.wait(30)
+
+        assert lifecycle.mode == MODE_RESTARTING
+        assert time.monotonic() - started < 5
+
+    def test_reload_is_taken_once(self):
+        """Test that a SIGHUP reload request is consumed by one cycle."""
+        lifecycle = ServerLifecycle()
+        lifecycle.request_reload()
+
+        assert lifecycle.take_reload() is True
+        assert lifecycle.take_reload() is False
+        assert lifecycle.accepting_work
+
+
+class TestServerRegistry:
+    """Tests for worker registry ownership."""
+
+    def test_live_owner_blocks_second_server(self, tmp_path):
+        """Test that a live server on this host keeps ownership."""
+        owner = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            (tmp_path / "server.json").write_text(json.dumps({"pid": owner.pid, "host": os.uname().nodename}))
+            assert claim_server_registry(str(tmp_path)) == owner.pid
+        finally:
+            owner.kill()
+            owner.wait()
+
+    def test_stale_and_own_entries_are_adopted(self, tmp_path):
+        """Test that a dead owner's entry and this process's own entry are taken over."""
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        (tmp_path / "server.json").write_text(json.dumps({"pid": dead.pid, "host": os.uname().nodename}))
+
+        assert claim_server_registry(str(tmp_path)) is None
+        assert read_server_registry(str(tmp_path))["pid"] == os.getpid()
+        # Re-exec'd server (same PID) adopts its own entry
+        assert claim_server_registry(str(tmp_path)) is None
+
+    def test_registry_slots_cover_shrunk_worker_count(self, tmp_path):
+        """Test that slots above a reduced num_workers stay tracked."""
+        write_worker_status(4, "BUSY", 42, 123, str(tmp_path))
+
+        assert registry_slots(2, str(tmp_path)) == 5
+        assert registry_slots(8, str(tmp_path)) == 8
+
+
+class TestInheritedChildren:
+    """Tests for workers inherited across a restart exec."""
+
+    def test_exited_child_without_handle_is_reaped(self, tmp_path):
+        """Test that a zombie child is reported dead and its exit code kept."""
+        proc = subprocess.Popen([sys.executable, "-c", "raise SystemExit(3)"])
+        pid = proc.pid
+        proc.returncode = 0  # Popen must not reap it; simulate a handle lost to exec
+        write_worker_status(0, "BUSY", 42, pid, str(tmp_path))
+
+        deadline = time.monotonic() + 10
+        while check_worker_liveness(0, str(tmp_path)) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert not check_worker_liveness(0, str(tmp_path))
+        assert _reap_exit_code(pid) == 3
@@ -13,6 +13,14 @@ class TestSubmoduleImports:
         from agentize.server import session
         from agentize.server import github
         from agentize.server import workers
+        from agentize.server import spawn_logs
+        from agentize.server import leases
+        from agentize.server import simulate
+        from agentize.server import lifecycle
+        from agentize.server import recheck
+        from agentize.server import progress
+        from agentize.server import health
+        from agentize.server import history
 
 
 class TestMainReExports:
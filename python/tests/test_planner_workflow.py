@@ -169,34 +169,36 @@ class TestPlannerPipelineExecutionOrder:
 
     @pytest.mark.skipif(run_planner_pipeline is None, reason="Implementation not yet available")
     def test_critique_reducer_run_parallel(self, tmp_output_dir: Path, stub_runner: Callable, monkeypatch):
-        """Critique and reducer are dispatched through the parallel runner."""
+        """Critique and reducer depend only on bold, so the graph runs them concurrently."""
         from agentize.workflow.planner import pipeline as planner_pipeline
 
         recorded = {}
+        original_run_graph = planner_pipeline.Session.run_graph
 
-        def _run_parallel(self, calls, *, max_workers: int = 2, retry: int = 0, retry_delay: float = 0):
-            call_list = list(calls)
-            recorded["stages"] = [call.stage for call in call_list]
-            results = {}
-            for call in call_list:
-                results[call.stage] = self.run_prompt(
-                    call.stage,
-                    call.prompt,
-                    call.backend,
-                    **call.options,
-                )
-            return results
-
-        monkeypatch.setattr(planner_pipeline.Session, "run_parallel", _run_parallel)
+        def _run_graph(self, nodes, **kwargs):
+            nodes = list(nodes)
+            recorded["after"] = {node.stage: node.after for node in nodes}
+            recorded["max_concurrency"] = kwargs.get("max_concurrency")
+            return original_run_graph(self, nodes, **kwargs)
 
-        run_planner_pipeline(
+        monkeypatch.setattr(planner_pipeline.Session, "run_graph", _run_graph)
+
+        results = run_planner_pipeline(
             "Add feature X",
             output_dir=tmp_output_dir,
             runner=stub_runner,
             prefix="test",
         )
 
-        assert recorded.get("stages") == ["critique", "reducer"]
+        assert recorded["after"] == {
+            "understander": (),
+            "bold": ("understander",),
+            "critique": ("bold",),
+            "reducer": ("bold",),
+            "consensus": ("bold", "critique", "reducer"),
+        }
+        assert recorded["max_concurrency"] == 2
+        assert list(results) == ["understander", "bold", "critique", "reducer", "consensus"]
 
     @pytest.mark.skipif(run_planner_pipeline is None, reason="Implementation not yet available")
     def test_understander_runs_before_bold(self, tmp_output_dir: Path, stub_runner: Callable):
@@ -351,6 +353,70 @@ class TestPlannerPipelineOptions:
         output_files = [Path(inv["output_file"]).name for inv in stub_runner.invocations]
         assert not any("consensus" in output_file for output_file in output_files)
 
+    @pytest.mark.skipif(run_planner_pipeline is None, reason="Implementation not yet available")
+    def test_rerun_with_cache_reuses_every_stage(self, tmp_output_dir: Path, stub_runner: Callable):
+        """A re-run with unchanged prompts is served entirely from the stage cache."""
+        from agentize.workflow.api import StageCache
+
+        cache = StageCache(tmp_output_dir / "stage-cache", commit="abc123")
+        run_planner_pipeline("Cache me", output_dir=tmp_output_dir, runner=stub_runner, prefix="one", cache=cache)
+        first_run_calls = len(stub_runner.invocations)
+
+        results = run_planner_pipeline(
+            "Cache me", output_dir=tmp_output_dir, runner=stub_runner, prefix="two", cache=cache
+        )
+
+        assert first_run_calls == 5
+        assert len(stub_runner.invocations) == first_run_calls
+        assert all(result.cached for result in results.values())
+        assert results["consensus"].output_path.name == "two-consensus-output.md"
+
+    @pytest.mark.skipif(run_planner_pipeline is None, reason="Implementation not yet available")
+    def test_context_policy_references_shared_blocks(self, tmp_output_dir: Path, stub_runner: Callable):
+        """With a context policy, shared blocks are referenced by path instead of inlined."""
+        from agentize.workflow.api import ContextPolicy
+
+        inline = run_planner_pipeline("Share me", output_dir=tmp_output_dir, runner=stub_runner, prefix="inline")
+        results = run_planner_pipeline(
+            "Share me",
+            output_dir=tmp_output_dir,
+            runner=stub_runner,
+            prefix="ref",
+            context=ContextPolicy(reference=True, reference_min_bytes=0),
+        )
+
+        guideline = tmp_output_dir / "ref-context-plan-guideline.md"
+        critique_input = results["critique"].input_path.read_text()
+        consensus_input = results["consensus"].input_path.read_text()
+        assert guideline.read_text() in inline["critique"].input_path.read_text()
+        assert guideline.read_text() not in critique_input
+        assert f"Read `{guideline}`" in critique_input
+        assert f"Read `{results['bold'].output_path}`" in critique_input
+        assert f"Read `{results['reducer'].output_path}`" in consensus_input
+        assert "Simplified approach." not in consensus_input
+
+    @pytest.mark.skipif(run_planner_pipeline is None, reason="Implementation not yet available")
+    def test_resume_reruns_only_invalid_stages(self, tmp_output_dir: Path, stub_runner: Callable):
+        """Resume reuses valid checkpoints; a tampered output re-runs that stage and its dependents."""
+        run_planner_pipeline("Resume me", output_dir=tmp_output_dir, runner=stub_runner, prefix="run")
+        assert len(stub_runner.invocations) == 5
+
+        resumed = run_planner_pipeline(
+            "Resume me", output_dir=tmp_output_dir, runner=stub_runner, prefix="run", resume=True
+        )
+        assert len(stub_runner.invocations) == 5
+        assert all(result.resumed for result in resumed.values())
+
+        (tmp_output_dir / "run-reducer-output.md").write_text("# Truncated")
+        (tmp_output_dir / "run-consensus-output.md").unlink()
+        resumed = run_planner_pipeline(
+            "Resume me", output_dir=tmp_output_dir, runner=stub_runner, prefix="run", resume=True
+        )
+
+        rerun = [Path(inv["output_file"]).name for inv in stub_runner.invocations[5:]]
+        assert sorted(rerun) == ["run-consensus-output.md", "run-reducer-output.md"]
+        assert {stage for stage, result in resumed.items() if result.resumed} == {"understander", "bold", "critique"}
+
 
 # ============================================================
 # Test ACW runner
@@ -360,14 +426,22 @@ class TestACWRunner:
     """Tests for ACW provider validation and logging."""
 
     @pytest.mark.skipif(ACW is None, reason="Implementation not yet available")
-    def test_invalid_provider_raises(self, monkeypatch):
-        """ACW raises ValueError when provider is not in completion list."""
+    def test_invalid_provider_raises(self, monkeypatch, tmp_path: Path):
+        """ACW raises ValueError on first run when provider is not in completion list."""
         from agentize.workflow.api import ACW as api_ACW
 
-        monkeypatch.setattr("agentize.workflow.api.acw.list_acw_providers", lambda: ["claude"])
+        lookups = []
+
+        def _providers():
+            lookups.append(1)
+            return ["claude"]
+
+        monkeypatch.setattr("agentize.workflow.api.acw.list_acw_providers", _providers)
 
+        runner = api_ACW(name="test", provider="codex", model="gpt")
+        assert lookups == []
         with pytest.raises(ValueError, match="provider"):
-            api_ACW(name="test", provider="codex", model="gpt")
+            runner.run(tmp_path / "input.md", tmp_path / "output.md")
 
     @pytest.mark.skipif(ACW is None, reason="Implementation not yet available")
     def test_custom_runner_invoked(self, monkeypatch, tmp_path: Path):
@@ -472,6 +546,91 @@ class TestACWRunner:
         assert logs[0] == "agent understander (claude:sonnet) is running..."
         assert logs[1] == "agent understander (claude:sonnet) runs 12s"
 
+    def test_provider_list_persisted_until_acw_scripts_change(self, monkeypatch, tmp_path: Path):
+        """list_acw_providers reuses the on-disk list until an acw script changes."""
+        import os
+
+        from agentize.workflow.api import acw as acw_module
+
+        script = tmp_path / "src" / "cli" / "acw.sh"
+        (script.parent / "acw").mkdir(parents=True)
+        script.write_text('acw() { echo claude; echo codex; }\n')
+        module = script.parent / "acw" / "completion.sh"
+        module.write_text("# completion\n")
+        monkeypatch.setenv("AGENTIZE_HOME", str(tmp_path))
+        monkeypatch.delenv("PLANNER_ACW_SCRIPT", raising=False)
+        monkeypatch.delenv("AGENTIZE_SHELL_OVERRIDES", raising=False)
+
+        real_run = subprocess.run
+        calls = []
+
+        def _counting_run(*args, **kwargs):
+            calls.append(args)
+            return real_run(*args, **kwargs)
+
+        monkeypatch.setattr(acw_module.subprocess, "run", _counting_run)
+
+        def _fresh_process_list():
+            monkeypatch.setattr(acw_module, "_ACW_PROVIDERS_CACHE", None)
+            return acw_module.list_acw_providers()
+
+        assert _fresh_process_list() == ["claude", "codex"]
+        assert _fresh_process_list() == ["claude", "codex"]
+        assert len(calls) == 1
+        assert (tmp_path / ".tmp" / "acw-providers.json").exists()
+
+        module.write_text("# completion, changed\n")
+        os.utime(module, ns=(0, 0))
+        assert _fresh_process_list() == ["claude", "codex"]
+        assert len(calls) == 2
+
+
+# ============================================================
+# Test planner config loaders
+# ============================================================
+
+class TestPlannerConfig:
+    """Tests for the planner section loaders in planner/__main__.py."""
+
+    def test_planner_toggle(self):
+        """Test that mappings, scalars and `enabled` all resolve through one helper."""
+        from agentize.workflow.planner.__main__ import _planner_toggle
+
+        planner = {
+            "cache": True,
+            "retry": {"transient": 3},
+            "hedge": {"enabled": "no", "backend": "claude:sonnet"},
+            "context": "off",
+        }
+        assert _planner_toggle(planner, "cache") == {}
+        assert _planner_toggle(planner, "retry") == {"transient": 3}
+        assert _planner_toggle(planner, "hedge") is None
+        assert _planner_toggle(planner, "context") is None
+        assert _planner_toggle(planner, "missing") is None
+
+    def test_loaders_share_one_section(self, tmp_path: Path):
+        """Test that the loaders build their policies from an already parsed section."""
+        from agentize.workflow.planner.__main__ import (
+            _load_planner_context,
+            _load_planner_hedge,
+            _load_planner_retry,
+        )
+
+        config_path = tmp_path / ".agentize.local.yaml"
+        planner = {
+            "retry": {"rate_limit": 1, "fallback": "claude:sonnet"},
+            "hedge": {"backend": "claude:haiku", "stages": "bold"},
+            "context": True,
+        }
+        retry = _load_planner_retry(planner, config_path)
+        assert retry.budgets["rate_limit"] == 1
+        assert retry.fallback == ("claude", "sonnet")
+        assert set(_load_planner_hedge(planner, config_path)) == {"bold"}
+        assert _load_planner_context(planner, config_path).reference
+
+        with pytest.raises(ValueError, match="must be a mapping"):
+            _load_planner_hedge({"hedge": True}, config_path)
+
 
 # ============================================================
 # Test StageResult dataclass
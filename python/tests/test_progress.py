@@ -0,0 +1,129 @@
+"""Tests for worker progress streaming from spawn logs and transcripts."""
+
+import json
+
+import pytest
+
+from agentize.server.__main__ import (
+    ProgressTracker,
+    extract_log_milestones,
+    extract_transcript_milestones,
+    read_worker_progress,
+    record_spawn_log,
+    write_worker_status,
+    _format_worker_progress_message,
+)
+
+
+class TestMilestoneExtraction:
+    """Tests for milestone patterns in plain output and transcripts."""
+
+    def test_log_line_milestones(self):
+        """Test that git commit summaries, PR URLs and errors are recognized."""
+        assert extract_log_milestones('[issue-42-fix a1b2c3d4e] Fix parser') == [('commit', 'a1b2c3d Fix parser')]
+        assert extract_log_milestones('https://github.com/o/r/pull/17') == [('pr', '#17')]
+        assert extract_log_milestones('fatal: not a git repository')[0][0] == 'error'
+        assert extract_log_milestones('Reading files...') == []
+
+    def test_transcript_tool_results_and_api_errors(self):
+        """Test that tool results are scanned and API error entries become errors."""
+        tool_result = {'message': {'role': 'user', 'content': [
+            {'type': 'tool_result', 'content': 'Created PR https://github.com/o/r/pull/9\n'},
+        ]}}
+        api_error = {'isApiErrorMessage': True, 'message': {'content': [{'type': 'text', 'text': 'Overloaded'}]}}
+
+        assert extract_transcript_milestones(json.dumps(tool_result)) == [('pr', '#9')]
+        assert extract_transcript_milestones(json.dumps(api_error)) == [('error', 'Overloaded')]
+        assert extract_transcript_milestones('not json') == []
+
+
+@pytest.fixture
+def busy_worker(tmp_path):
+    """One BUSY worker on issue 42 with an indexed spawn log and a session transcript."""
+    workers_dir = tmp_path / 'workers'
+    logs_dir = tmp_path / 'logs'
+    session_dir = tmp_path / 'sessions'
+    logs_dir.mkdir()
+    (session_dir / 'by-issue').mkdir(parents=True)
+
+    log_file = logs_dir / 'issue-42-1.log'
+    log_file.write_text('starting\n')
+    record_spawn_log(log_file, task='issue', issue_no=42, pid=4242, logs_dir=logs_dir)
+    transcript = tmp_path / 'transcript.jsonl'
+    transcript.write_text('')
+    (session_dir / 's1.json').write_text(json.dumps({
+        'workflow': 'issue-to-impl', 'state': 'initial', 'issue_no': 42,
+        'continuation_count': 0, 'transcript_path': str(transcript),
+    }))
+    (session_dir / 'by-issue' / '42.json').write_text(json.dumps({'session_id': 's1'}))
+    write_worker_status(0, 'BUSY', 42, 4242, str(workers_dir))
+
+    events = []
+    tracker = ProgressTracker(
+        events.append, throttle_sec=60, workers_dir=str(workers_dir),
+        logs_dir=logs_dir, session_dir=session_dir,
+    )
+    return tracker, events, log_file, transcript, session_dir, workers_dir
+
+
+class TestProgressTracker:
+    """Tests for tailing, throttling and the progress file."""
+
+    def test_milestones_are_throttled_per_worker(self, busy_worker):
+        """Test that the first milestone is sent at once and later ones wait for the window."""
+        tracker, events, log_file, _, _, workers_dir = busy_worker
+        tracker.poll(now=1000)
+        assert events == []
+
+        with open(log_file, 'a') as f:
+            f.write('[issue-42 abcdef1] First commit\n')
+        tracker.poll(now=1010)
+        assert [(e.kind, e.detail) for e in events] == [('commit', 'abcdef1 First commit')]
+
+        with open(log_file, 'a') as f:
+            f.write('[issue-42 1234567] Second commit\nhttps://github.com/o/r/pull/5\n')
+        tracker.poll(now=1020)
+        assert len(events) == 1  # Inside the throttle window
+
+        tracker.poll(now=1075)
+        assert [(e.kind, e.detail) for e in events][-1] == ('pr', '#5')
+
+        progress = read_worker_progress(str(workers_dir))[0]
+        assert progress['issue_no'] == 42
+        assert progress['milestone'] == 'pr'
+        assert progress['last_activity'] == 1020
+
+    def test_transcript_and_iterations(self, busy_worker):
+        """Test that transcript growth and continuation_count bumps are tracked."""
+        tracker, events, _, transcript, session_dir, _ = busy_worker
+        tracker.poll(now=1000)
+
+        entry = {'message': {'content': [{'type': 'tool_result', 'content': '[main 7654321] Add test'}]}}
+        transcript.write_text(json.dumps(entry) + '\n')
+        state = json.loads((session_dir / 's1.json').read_text())
+        state['continuation_count'] = 2
+        (session_dir / 's1.json').write_text(json.dumps(state))
+        tracker.poll(now=1010)
+
+        progress = tracker.snapshot()[0]
+        assert progress.continuation_count == 2
+        assert progress.transcript_bytes > 0
+        assert events[-1].kind == 'commit'  # Outranks the iteration milestone
+
+    def test_freed_worker_is_dropped(self, busy_worker):
+        """Test that a worker leaves the progress file once its slot is FREE."""
+        tracker, _, _, _, _, workers_dir = busy_worker
+        tracker.poll(now=1000)
+        write_worker_status(0, 'FREE', None, None, str(workers_dir))
+        tracker.poll(now=1010)
+
+        assert read_worker_progress(str(workers_dir)) == {}
+
+
+def test_format_worker_progress_message():
+    """Test that the progress message escapes the milestone detail."""
+    msg = _format_worker_progress_message(42, 1, 'commit', 'abc1234 Use <b>', 'https://github.com/o/r/issues/42')
+
+    assert '<a href="https://github.com/o/r/issues/42">#42</a>' in msg
+    assert '&lt;b&gt;' in msg
+    assert 'Worker: 1' in msg
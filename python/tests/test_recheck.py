@@ -0,0 +1,118 @@
+"""Tests for the mergeable == UNKNOWN short-delay re-check queue."""
+
+import agentize.server.__main__ as server_main
+from agentize.server import github
+from agentize.server.__main__ import (
+    MergeableRecheckQueue,
+    ServerLifecycle,
+    MODE_DRAINING,
+    _recheck_unknown_prs,
+    _wait_for_next_poll,
+)
+
+
+def _pr(number, mergeable):
+    return {'number': number, 'headRefName': f'issue-{number}', 'mergeable': mergeable}
+
+
+class TestMergeableRecheckQueue:
+    """Tests for the backoff schedule."""
+
+    def test_sync_tracks_only_unknown_prs(self):
+        """Test that a full poll queues UNKNOWN PRs and drops resolved ones."""
+        queue = MergeableRecheckQueue((10, 30, 90))
+        queue.sync([_pr(1, 'UNKNOWN'), _pr(2, 'CONFLICTING'), _pr(3, 'UNKNOWN')], now=0)
+
+        assert len(queue) == 2
+        assert queue.seconds_until_due(0) == 10
+        assert queue.due(9) == []
+        assert sorted(queue.due(10)) == [1, 3]
+
+        queue.sync([_pr(1, 'MERGEABLE'), _pr(3, 'UNKNOWN')], now=5)
+        assert 1 not in queue and 3 in queue
+
+    def test_still_unknown_backs_off_then_leaves(self):
+        """Test that repeated UNKNOWN results follow the delays and then give up."""
+        queue = MergeableRecheckQueue((10, 30, 90))
+        queue.sync([_pr(7, 'UNKNOWN')], now=0)
+
+        queue.record(7, 'UNKNOWN', now=10)
+        assert queue.seconds_until_due(10) == 30
+        queue.record(7, 'UNKNOWN', now=40)
+        assert queue.seconds_until_due(40) == 90
+        queue.record(7, 'UNKNOWN', now=130)
+        assert 7 not in queue and queue.seconds_until_due(130) is None
+
+    def test_resync_keeps_backoff_position(self):
+        """Test that a full poll does not reset a PR already being re-checked."""
+        queue = MergeableRecheckQueue((10, 30))
+        queue.sync([_pr(7, 'UNKNOWN')], now=0)
+        queue.record(7, 'UNKNOWN', now=10)
+        queue.sync([_pr(7, 'UNKNOWN')], now=20)
+
+        assert queue.seconds_until_due(20) == 20
+
+    def test_empty_delays_disable_rechecks(self):
+        """Test that server.recheck_delays: [] leaves UNKNOWN PRs to the next poll."""
+        queue = MergeableRecheckQueue(())
+        queue.sync([_pr(1, 'UNKNOWN')], now=0)
+
+        assert len(queue) == 0
+
+
+class TestRecheckUnknownPrs:
+    """Tests for re-querying due PRs between polls."""
+
+    def test_resolved_conflict_is_rebased(self, monkeypatch):
+        """Test that a PR that settles to CONFLICTING is assigned without a full poll."""
+        views = {1: _pr(1, 'CONFLICTING'), 2: _pr(2, 'UNKNOWN'), 3: None}
+        monkeypatch.setattr(server_main, 'get_repo_owner_name', lambda: ('o', 'r'))
+        monkeypatch.setattr(server_main, 'lookup_project_graphql_id', lambda org, number: 'PVT')
+        monkeypatch.setattr(server_main, 'query_pr', lambda owner, repo, pr_no: views[pr_no])
+        monkeypatch.setattr(github, 'query_issue_project_status', lambda *args: 'Done')
+
+        queue = MergeableRecheckQueue((10, 30))
+        queue.sync([_pr(1, 'UNKNOWN'), _pr(2, 'UNKNOWN'), _pr(3, 'UNKNOWN')], now=90.0)
+        assigned = []
+        _recheck_unknown_prs(queue, 'org', 1, lambda numbers, prs: assigned.append((numbers, prs)), lambda: 100.0)
+
+        assert assigned == [([1], [views[1]])]
+        assert 2 in queue and 1 not in queue and 3 not in queue
+
+
+class TestWaitForNextPoll:
+    """Tests for the inter-poll wait with re-check wake-ups."""
+
+    def test_wakes_for_due_rechecks_within_period(self):
+        """Test that the wait is split at re-check due times and still ends at the period."""
+        clock = {'now': 0.0}
+
+        class _ClockLifecycle(ServerLifecycle):
+            def wait(self, seconds):
+                clock['now'] += seconds
+
+        queue = MergeableRecheckQueue((10, 30, 90))
+        queue.sync([_pr(1, 'UNKNOWN')], now=0.0)
+        wakeups = []
+
+        def on_due():
+            wakeups.append(clock['now'])
+            for pr_no in queue.due(clock['now']):
+                queue.record(pr_no, 'UNKNOWN', clock['now'])
+
+        _wait_for_next_poll(_ClockLifecycle(), 300, queue, on_due, lambda: clock['now'])
+
+        assert wakeups[:3] == [10.0, 40.0, 130.0]
+        assert clock['now'] == 300.0
+
+    def test_signal_ends_wait(self):
+        """Test that a drain request returns from the wait without running re-checks."""
+        lifecycle = ServerLifecycle()
+        lifecycle.request(MODE_DRAINING)
+        queue = MergeableRecheckQueue((10,))
+        queue.sync([_pr(1, 'UNKNOWN')], now=0.0)
+        calls = []
+
+        _wait_for_next_poll(lifecycle, 300, queue, lambda: calls.append(1))
+
+        assert calls == []
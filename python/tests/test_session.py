@@ -11,7 +11,10 @@ from agentize.server.__main__ import (
     _get_session_state_for_issue,
     _remove_issue_index,
     set_pr_number_for_issue,
+    SessionIndex,
+    get_session_index,
 )
+from lib.session_utils import update_session_state, write_issue_index, write_session_state
 
 
 class TestResolveSessionDir:
@@ -90,11 +93,26 @@ class TestGetSessionStateForIssue:
         (session_dir / "abc123.json").write_text(json.dumps(state_data))
 
         session_dir_path = _resolve_session_dir()
+        get_session_index(session_dir_path).refresh()
         state = _get_session_state_for_issue(42, session_dir_path)
 
         assert state is not None
         assert state["state"] == "done"
 
+    def test_get_session_state_for_issue_does_not_rescan(self, set_agentize_home):
+        """Test that lookups are served from memory until the index is refreshed."""
+        session_dir = set_agentize_home / ".tmp" / "hooked-sessions"
+        (session_dir / "by-issue").mkdir(parents=True)
+        index = get_session_index(session_dir)
+        index.refresh()
+
+        (session_dir / "by-issue" / "42.json").write_text(json.dumps({"session_id": "abc123"}))
+        (session_dir / "abc123.json").write_text(json.dumps({"state": "done"}))
+
+        assert _get_session_state_for_issue(42, session_dir) is None
+        index.refresh()
+        assert _get_session_state_for_issue(42, session_dir)["state"] == "done"
+
     def test_get_session_state_for_issue_returns_none_for_missing(
         self, set_agentize_home
     ):
@@ -229,3 +247,78 @@ class TestSetPrNumberForIssue:
             assert state.get("continuation_count") == 3
             assert state.get("state") == "in_progress"
             assert state.get("workflow") == "issue-to-impl"
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "scan"])
+def session_index(request, tmp_path):
+    """SessionIndex over a fresh session dir, in both watcher modes."""
+    session_dir = tmp_path / "hooked-sessions"
+    session_dir.mkdir()
+    return SessionIndex(session_dir, use_inotify=request.param), session_dir
+
+
+class TestSessionIndex:
+    """Tests for the in-memory session state index."""
+
+    def test_queries_by_issue_workflow_and_state(self, session_index):
+        """Test lookups by issue index and filters on workflow/state."""
+        index, session_dir = session_index
+        write_session_state("s1", {"workflow": "issue-to-impl", "state": "done", "issue_no": 42}, str(session_dir))
+        write_session_state("s2", {"workflow": "ultra-planner", "state": "initial", "issue_no": 7}, str(session_dir))
+        write_issue_index("s1", 42, "issue-to-impl", sess_dir=str(session_dir))
+
+        index.refresh()
+
+        assert index.for_issue(42)["state"] == "done"
+        assert index.for_issue(7) is None  # no by-issue entry
+        assert [sid for sid, _ in index.query(workflow="ultra-planner")] == ["s2"]
+        assert [sid for sid, _ in index.query(state="done", issue_no=42)] == ["s1"]
+
+    def test_picks_up_rewrites_and_deletions(self, session_index):
+        """Test that refresh reflects in-place rewrites and removed files."""
+        index, session_dir = session_index
+        write_session_state("s1", {"state": "initial"}, str(session_dir))
+        index.refresh()
+
+        (session_dir / "s1.json").write_text(json.dumps({"state": "done!"}))
+        index.refresh()
+        assert index.get("s1")["state"] == "done!"
+
+        (session_dir / "s1.json").unlink()
+        index.refresh()
+        assert index.get("s1") is None
+
+    def test_torn_file_keeps_last_good_state(self, session_index):
+        """Test that an unparsable rewrite does not replace the indexed state."""
+        index, session_dir = session_index
+        write_session_state("s1", {"state": "initial"}, str(session_dir))
+        index.refresh()
+
+        (session_dir / "s1.json").write_text('{"state": "do')
+        index.refresh()
+        assert index.get("s1") == {"state": "initial"}
+
+        (session_dir / "s1.json").write_text(json.dumps({"state": "done"}))
+        index.refresh()
+        assert index.get("s1") == {"state": "done"}
+
+
+class TestSessionStateWrites:
+    """Tests for the locked, atomic hook writers in lib.session_utils."""
+
+    def test_update_merges_into_current_file(self, tmp_path):
+        """Test that update_session_state re-reads the file instead of clobbering it."""
+        write_session_state("s1", {"state": "initial", "continuation_count": 1}, str(tmp_path))
+        # Another writer marks the session done after the hook read it
+        (tmp_path / "s1.json").write_text(json.dumps({"state": "done", "continuation_count": 1}))
+
+        state = update_session_state("s1", {"continuation_count": 2}, str(tmp_path))
+
+        assert state == {"state": "done", "continuation_count": 2}
+        assert json.loads((tmp_path / "s1.json").read_text()) == state
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".lock", "s1.json"]
+
+    def test_update_missing_session_returns_none(self, tmp_path):
+        """Test that updating a missing session does not create it."""
+        assert update_session_state("nope", {"issue_no": 1}, str(tmp_path)) is None
+        assert not (tmp_path / "nope.json").exists()
@@ -0,0 +1,74 @@
+"""Tests for agentize.server.simulate throughput harness."""
+
+import dataclasses
+import os
+
+from agentize.server import github
+from agentize.server.__main__ import ServerDeps
+from agentize.server.simulate import (
+    DEFAULT_DURATIONS,
+    FakeGitHub,
+    SimulationResult,
+    _Simulator,
+    generate_board,
+    run_simulation,
+)
+
+
+class TestFakeGitHub:
+    """Tests for the synthetic GitHub backend."""
+
+    def test_discovery_functions_read_fake_board(self, monkeypatch):
+        """Test that github.py discovery parses the fake backend's responses."""
+        fake = FakeGitHub()
+        fake.issues = {
+            1: {'status': 'Plan Accepted', 'labels': {'agentize:plan'}},
+            2: {'status': 'Proposed', 'labels': {'agentize:dev-req'}},
+        }
+        monkeypatch.setattr(github.subprocess, 'run', fake.run)
+
+        assert github.discover_candidate_issues('o', 'r') == [1]
+        assert github.query_issue_project_status('o', 'r', 1, 'PVT_sim') == 'Plan Accepted'
+        assert github._query_issue_labels('o', 'r', 2) == ['agentize:dev-req']
+        assert fake.calls == {'issue_list': 1, 'issue_status': 1, 'issue_view': 1}
+
+    def test_generate_board_links_prs_to_issues(self):
+        """Test that every generated PR links an issue with a worktree."""
+        fake = FakeGitHub()
+        generate_board(fake, 100)
+
+        assert len(fake.prs) == 20
+        assert all(fake.issues[pr['issue']].get('worktree') for pr in fake.prs.values())
+
+
+class TestRunSimulation:
+    """Tests for end-to-end simulated polling."""
+
+    def test_small_board_reports_metrics(self, tmp_path, monkeypatch):
+        """Test that a simulated run assigns work and reports per-cycle metrics."""
+        monkeypatch.chdir(tmp_path)
+        result = run_simulation(50, num_workers=3, period=60, cycles=10)
+
+        assert result.cycles == 10
+        assert len(result.poll_latency) == 10
+        assert min(result.gh_calls) > 50  # at least one status query per candidate
+        assert sum(result.assigned.values()) == len(result.time_to_assignment)
+        assert 0 < result.utilization <= 1
+        # Worker status files live in a scratch directory, never the caller's .tmp
+        assert not os.path.exists(tmp_path / '.tmp')
+
+    def test_unlimited_workers_drain_board(self, tmp_path, monkeypatch):
+        """Test that unlimited mode assigns every ready candidate in the first cycle."""
+        monkeypatch.chdir(tmp_path)
+        result = run_simulation(20, num_workers=0, period=60, cycles=500)
+
+        assert result.time_to_assignment and max(result.time_to_assignment) <= 60 * 3
+        assert result.completed == sum(result.assigned.values())
+
+    def test_every_server_dependency_is_simulated(self):
+        """Test that the simulator replaces every ServerDeps field, so none hits real state."""
+        result = SimulationResult(n=0, num_workers=1, period=60)
+        deps = _Simulator(FakeGitHub(), result, 1, DEFAULT_DURATIONS, 0.5, 0).deps()
+
+        real = [f.name for f in dataclasses.fields(ServerDeps) if getattr(deps, f.name) is f.default]
+        assert real == []
@@ -0,0 +1,151 @@
+"""Tests for agentize.server spawn log index, compression, and retention."""
+
+import gzip
+import os
+import sys
+import threading
+
+from agentize.server.__main__ import (
+    new_spawn_log,
+    record_spawn_log,
+    finish_spawn_logs_for_pid,
+    find_spawn_logs,
+    enforce_log_retention,
+    tail_log,
+    follow_log,
+    init_worker_status_files,
+    write_worker_status,
+    read_worker_status,
+    cleanup_dead_workers,
+)
+
+
+class TestSpawnLogIndex:
+    """Tests for recording and querying spawn logs."""
+
+    def test_record_and_find_by_issue(self, tmp_path):
+        """Test that recorded logs are queryable by issue and task."""
+        log_file = new_spawn_log("refine", 42, tmp_path)
+        log_file.write_text("hello\n")
+        record_spawn_log(log_file, task="refine", issue_no=42)
+        record_spawn_log(log_file, pid=12345)
+
+        entries = find_spawn_logs(issue_no=42, logs_dir=tmp_path)
+
+        assert len(entries) == 1
+        assert entries[0]["task"] == "refine"
+        assert entries[0]["pid"] == 12345
+        assert entries[0]["path"] == log_file
+        assert find_spawn_logs(task="rebase", logs_dir=tmp_path) == []
+
+    def test_concurrent_writers_keep_every_entry(self, tmp_path):
+        """Test that concurrent index updates do not lose each other's entries."""
+        def _record(worker):
+            for i in range(10):
+                record_spawn_log(tmp_path / f"refine-{worker}-{i}.log", task="refine", issue_no=worker)
+
+        threads = [threading.Thread(target=_record, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(find_spawn_logs(logs_dir=tmp_path)) == 80
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_finish_compresses_and_records_exit_code(self, tmp_path):
+        """Test that finishing a log gzips it and records the exit code."""
+        log_file = tmp_path / "review-resolution-7-1.log"
+        log_file.write_text("line1\nline2\n")
+        record_spawn_log(log_file, task="review-resolution", issue_no=3, pr_no=7, pid=999999999)
+
+        finished = finish_spawn_logs_for_pid(999999999, 1, logs_dir=tmp_path)
+
+        assert finished == [tmp_path / "review-resolution-7-1.log.gz"]
+        assert not log_file.exists()
+        entry = find_spawn_logs(pr_no=7, logs_dir=tmp_path)[0]
+        assert entry["exit_code"] == 1
+        assert entry["end"] is not None
+        assert tail_log(log_file, 1) == ["line2"]
+
+
+class TestLogRetention:
+    """Tests for retention enforcement."""
+
+    def test_age_limit_removes_finished_logs_only(self, tmp_path):
+        """Test that old finished logs are deleted while live logs are kept."""
+        old = tmp_path / "refine-1-1.log"
+        old.write_text("x" * 100)
+        live = tmp_path / "refine-2-1.log"
+        live.write_text("y" * 100)
+        record_spawn_log(live, task="refine", issue_no=2, pid=os.getpid())
+        for path in (old, live):
+            os.utime(path, (0, 0))
+
+        reclaimed = enforce_log_retention(max_age_sec=60, logs_dir=tmp_path)
+
+        assert reclaimed == 100
+        assert not old.exists()
+        assert live.exists()
+
+    def test_size_limit_removes_oldest_first(self, tmp_path):
+        """Test that the size budget evicts the oldest finished logs first."""
+        for i in range(3):
+            path = tmp_path / f"issue-{i}-1.log"
+            path.write_text("z" * 100)
+            os.utime(path, (i * 10, i * 10))
+
+        enforce_log_retention(max_total_bytes=150, logs_dir=tmp_path)
+
+        assert not (tmp_path / "issue-0-1.log").exists()
+        assert not (tmp_path / "issue-1-1.log").exists()
+        assert (tmp_path / "issue-2-1.log").exists()
+
+
+class TestFollowLog:
+    """Tests for live log following."""
+
+    def test_follow_stops_when_log_is_compressed(self, tmp_path):
+        """Test that follow_log yields existing lines and ends once finished."""
+        log_file = tmp_path / "feat-request-5-1.log"
+        log_file.write_text("a\nb\n")
+        record_spawn_log(log_file, pid=424242)
+
+        lines = []
+        for line in follow_log(log_file, poll_interval=0, from_start=True):
+            lines.append(line)
+            if len(lines) == 2:
+                finish_spawn_logs_for_pid(424242, 0, logs_dir=tmp_path)
+
+        assert lines == ["a", "b"]
+        with gzip.open(tmp_path / "feat-request-5-1.log.gz", "rt") as f:
+            assert f.read() == "a\nb\n"
+
+
+class TestWorkerLogIntegration:
+    """Tests for spawn log handling in cleanup_dead_workers."""
+
+    def test_cleanup_records_child_exit_code(self, tmp_path, monkeypatch):
+        """Test that cleanup reaps a direct child and records its exit code."""
+        from agentize.server import workers
+
+        monkeypatch.setenv("AGENTIZE_HOME", str(tmp_path))
+        workers_dir = tmp_path / "workers"
+        init_worker_status_files(1, str(workers_dir))
+
+        proc, log_file = workers._spawn_claude_with_log(
+            [sys.executable, "-c", "import sys; print('done'); sys.exit(3)"],
+            str(tmp_path),
+            "refine",
+            issue_no=11,
+        )
+        proc.wait()
+        write_worker_status(0, "BUSY", 11, proc.pid, str(workers_dir))
+
+        cleanup_dead_workers(1, str(workers_dir))
+
+        assert read_worker_status(0, str(workers_dir))["state"] == "FREE"
+        entry = find_spawn_logs(issue_no=11)[0]
+        assert entry["exit_code"] == 3
+        assert entry["compressed"] is True
+        assert tail_log(log_file) == ["done"]
@@ -0,0 +1,114 @@
+"""Tests for agentize.tmp_gc .tmp artifact garbage collection."""
+
+import json
+import os
+
+from agentize.tmp_gc import ArtifactPolicy, load_gc_policies, run_gc
+from agentize.server.__main__ import init_worker_status_files, write_worker_status
+
+NOW = 1_800_000_000
+DAY = 86400
+
+
+def _write(path, content="x", age_days=30):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    ts = NOW - age_days * DAY
+    os.utime(path, (ts, ts))
+    return path
+
+
+class TestRunGc:
+    """Tests for policy enforcement and live-state protection."""
+
+    def test_age_policy_removes_old_files_and_reports_bytes(self, tmp_path):
+        """Test that files past max_age_days are removed and counted."""
+        old = _write(tmp_path / "debug-stop" / "s1-cont-1-1.log", "abc", age_days=10)
+        new = _write(tmp_path / "debug-stop" / "s2-cont-1-1.log", "abc", age_days=1)
+        policy = ArtifactPolicy("debug-stop", ("debug-stop/*.log",), max_age_days=7)
+
+        report = run_gc([tmp_path], [policy], now=NOW)
+
+        assert report == {"debug-stop": {"files": 1, "bytes": 3}}
+        assert not old.exists()
+        assert new.exists()
+
+    def test_lru_count_keeps_most_recently_used(self, tmp_path):
+        """Test that max_count keeps the N most recently used files."""
+        for i in range(4):
+            _write(tmp_path / "acw-sessions" / f"s{i}.md", age_days=i + 1)
+        policy = ArtifactPolicy("acw-sessions", ("acw-sessions/*.md",), max_count=2)
+
+        run_gc([tmp_path], [policy], now=NOW)
+
+        remaining = sorted(p.name for p in (tmp_path / "acw-sessions").iterdir())
+        assert remaining == ["s0.md", "s1.md"]
+
+    def test_dry_run_keeps_files(self, tmp_path):
+        """Test that dry_run reports without deleting."""
+        path = _write(tmp_path / "issue-42-bold.txt", age_days=30)
+        policy = ArtifactPolicy("planner", ("issue-*-*.txt",), max_age_days=7)
+
+        report = run_gc([tmp_path], [policy], dry_run=True, now=NOW)
+
+        assert report["planner"]["files"] == 1
+        assert path.exists()
+
+    def test_busy_worker_session_is_protected(self, tmp_path):
+        """Test that a busy worker's session, debug log and issue index survive."""
+        workers_dir = tmp_path / "workers"
+        init_worker_status_files(1, str(workers_dir))
+        write_worker_status(0, "BUSY", 42, os.getpid(), str(workers_dir))
+
+        sess_dir = tmp_path / "hooked-sessions"
+        live = _write(sess_dir / "live.json", json.dumps({"state": "initial"}))
+        index = _write(sess_dir / "by-issue" / "42.json", json.dumps({"session_id": "live"}))
+        live_log = _write(tmp_path / "debug-stop" / "live-cont-3-1.log")
+        stale = _write(sess_dir / "stale.json", json.dumps({"state": "done"}))
+        stale_index = _write(sess_dir / "by-issue" / "7.json", json.dumps({"session_id": "stale"}))
+
+        report = run_gc([tmp_path], load_gc_policies({}), now=NOW)
+
+        assert live.exists() and index.exists() and live_log.exists()
+        assert not stale.exists()
+        assert not stale_index.exists()
+        assert report["sessions"]["files"] == 2
+
+    def test_grace_period_protects_recent_files(self, tmp_path):
+        """Test that files used within grace_sec are never removed."""
+        path = _write(tmp_path / "impl-input-1.txt", age_days=0)
+        policy = ArtifactPolicy("impl", ("impl-input-*.txt",), max_count=0)
+
+        run_gc([tmp_path], [policy], now=NOW)
+
+        assert path.exists()
+
+    def test_run_records_share_one_policy_for_any_prefix(self, tmp_path):
+        """Test that traces and manifests age out under `traces`, never as planner artifacts."""
+        stamped = "20260101-120000"
+        for prefix in ("issue-42", stamped):
+            _write(tmp_path / f"{prefix}-bold-output.md", age_days=10)
+            _write(tmp_path / f"{prefix}-trace.jsonl", age_days=10)
+            _write(tmp_path / f"{prefix}-manifest.json", age_days=40)
+
+        report = run_gc([tmp_path], load_gc_policies({}), now=NOW)
+
+        assert report["planner"]["files"] == 2
+        assert report["traces"]["files"] == 2
+        remaining = sorted(p.name for p in tmp_path.iterdir())
+        assert remaining == ["20260101-120000-trace.jsonl", "issue-42-trace.jsonl"]
+
+
+class TestLoadGcPolicies:
+    """Tests for gc.<class> config overrides."""
+
+    def test_overrides_apply_and_zero_disables(self):
+        """Test that overrides replace defaults and 0 disables a limit."""
+        policies = {
+            p.name: p
+            for p in load_gc_policies({"gc": {"interval": "30m", "debug-stop": {"max_age_days": 0, "max_size_mb": 8}}})
+        }
+
+        assert policies["debug-stop"].max_age_days is None
+        assert policies["debug-stop"].max_size_mb == 8
+        assert policies["sessions"].max_age_days == 14
@@ -0,0 +1,48 @@
+"""Tests for agentize.trace stage trace summaries."""
+
+import json
+
+from agentize.trace import format_summary, load_trace, select_runs, summarize
+
+
+def _records():
+    return [
+        {"run": "issue-1", "session": "2026-01-01T10:00:00", "stage": "bold", "status": "ok",
+         "wall_seconds": 30.0, "wait_seconds": 5.0, "tokens": 1000, "cost_usd": 0.5},
+        {"run": "issue-1", "session": "2026-01-01T10:00:00", "stage": "critique", "status": "failed"},
+        {"run": "issue-2", "session": "2026-01-02T10:00:00", "stage": "bold", "status": "ok",
+         "cached": True, "wall_seconds": 0.0, "tokens": 0, "cost_usd": None},
+    ]
+
+
+def test_load_trace_skips_malformed_lines(tmp_path):
+    """Test that bad lines and missing files are ignored."""
+    path = tmp_path / "issue-1-trace.jsonl"
+    path.write_text(json.dumps(_records()[0]) + "\nnot json\n[]\n")
+
+    assert load_trace([path, tmp_path / "missing-trace.jsonl"]) == [_records()[0]]
+
+
+def test_summarize_by_stage_and_run():
+    """Test that stages and runs aggregate wall time, failures, reuse, tokens and cost."""
+    summary = summarize(_records())
+
+    bold = summary["stages"]["bold"]
+    assert (bold["count"], bold["reused"], bold["wall"], bold["wait"], bold["tokens"]) == (2, 1, 30.0, 5.0, 1000)
+    assert bold["cost"] == 0.5
+    assert summary["stages"]["critique"]["failed"] == 1
+    assert set(summary["runs"]) == {"issue-1 @ 2026-01-01T10:00:00", "issue-2 @ 2026-01-02T10:00:00"}
+
+    text = format_summary(summary)
+    assert "Total: 3 stages in 2 runs" in text
+    assert "$0.50" in text
+    assert format_summary(summarize([])) == "No stage traces found"
+
+
+def test_select_runs_filters_prefix_and_recent_runs():
+    """Test --run and --last selection."""
+    records = _records()
+
+    assert {r["run"] for r in select_runs(records, run="issue-2")} == {"issue-2"}
+    assert {r["run"] for r in select_runs(records, last=1)} == {"issue-2"}
+    assert len(select_runs(records, last=5)) == 3
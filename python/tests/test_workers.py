@@ -83,6 +83,26 @@ class TestWorkerStatusFiles:
         status = read_worker_status(2, str(workers_dir))
         assert status["state"] == "FREE"
 
+    def test_cleanup_dead_workers_refreshes_session_index_once(self, tmp_path, monkeypatch):
+        """Test that the session index is refreshed once per cycle, not per dead worker."""
+        from agentize.server.session import SessionIndex
+
+        workers_dir = tmp_path / "workers"
+        init_worker_status_files(3, str(workers_dir))
+        refreshes = []
+        monkeypatch.setattr(SessionIndex, "refresh", lambda self: refreshes.append(self.session_dir))
+        history = MagicMock()
+
+        cleanup_dead_workers(3, str(workers_dir), session_dir=tmp_path / "sessions", history=history)
+        assert refreshes == []
+
+        for worker_id in range(3):
+            write_worker_status(worker_id, "BUSY", 40 + worker_id, 999999990 + worker_id, str(workers_dir))
+        cleanup_dead_workers(3, str(workers_dir), session_dir=tmp_path / "sessions", history=history)
+
+        assert len(refreshes) == 1
+        assert history.record_end.call_count == 3
+
 
 class TestRefinementSpawnAndCleanup:
     """Tests for refinement spawn and cleanup functions."""
@@ -208,11 +228,36 @@ class TestRefinementSpawnAndCleanup:
             with patch.object(workers_module.subprocess, "Popen", return_value=mock_popen):
                 with patch.object(Path, "mkdir"):
                     with patch("builtins.open", MagicMock()):
-                        success, pid = workers_module.spawn_refinement(42)
+                        with patch.object(workers_module, "record_spawn_log"):
+                            success, pid = workers_module.spawn_refinement(42)
 
         # wt spawn should NOT be called because worktree already exists
         assert len(spawn_called) == 0
 
+    def test_spawn_review_resolution_skips_claimed_issue(self, isolated_claims_dir):
+        """Test that a spawn is skipped, status untouched, while another process claims the issue."""
+        import agentize.server.workers as workers_module
+        from agentize.claims import WorkClaim
+
+        shell_calls = []
+
+        def mock_shell_run(cmd, **kwargs):
+            shell_calls.append(cmd)
+            return MagicMock(returncode=0, stdout="/tmp/test-worktree")
+
+        holder = WorkClaim("issue-42", command="lol impl 42", claims_dir=isolated_claims_dir)
+        assert holder.acquire()
+        try:
+            with patch.object(workers_module, "run_shell_function", side_effect=mock_shell_run):
+                with patch.object(workers_module.subprocess, "Popen") as mock_popen:
+                    success, pid = workers_module.spawn_review_resolution(7, 42)
+        finally:
+            holder.release()
+
+        assert (success, pid) == (False, None)
+        mock_popen.assert_not_called()
+        assert not any("wt_claim_issue_status" in cmd for cmd in shell_calls)
+
     def test_cleanup_refinement_sets_proposed_status(self, capsys):
         """Test _cleanup_refinement calls wt_claim_issue_status with Proposed."""
         import agentize.server.workers as workers_module
@@ -237,6 +282,65 @@ class TestRefinementSpawnAndCleanup:
         assert status_called
 
 
+class TestPreemptedImplResume:
+    """Tests for resuming a preempted impl run in its existing worktree."""
+
+    def test_resume_worktree_spawns_agent_in_existing_worktree(self, tmp_path, monkeypatch, isolated_claims_dir):
+        """Test that resume_worktree runs /issue-to-impl in the worktree without wt spawn."""
+        import agentize.server.workers as workers_module
+
+        monkeypatch.setenv("AGENTIZE_HOME", str(tmp_path))
+        shell_calls = []
+
+        def mock_shell_run(cmd, **kwargs):
+            shell_calls.append(cmd)
+            return MagicMock(returncode=0, stdout="/trees/issue-42\n")
+
+        mock_popen = MagicMock()
+        mock_popen.pid = 12345
+
+        with patch.object(workers_module, "run_shell_function", side_effect=mock_shell_run):
+            with patch.object(workers_module.subprocess, "Popen", return_value=mock_popen) as popen:
+                success, pid = workers_module.resume_worktree(42, model="sonnet")
+        workers_module._spawned_procs.pop(12345, None)
+
+        assert (success, pid) == (True, 12345)
+        assert popen.call_args.args[0] == ["claude", "--model", "sonnet", "--print", "/issue-to-impl 42"]
+        assert popen.call_args.kwargs["cwd"] == "/trees/issue-42"
+        assert not any("wt spawn" in cmd for cmd in shell_calls)
+        assert 'wt_claim_issue_status 42 "/trees/issue-42"' in shell_calls
+
+    def test_preempted_mark_roundtrip(self, tmp_path):
+        """Test that a preempted mark is set, seen and cleared per issue."""
+        from agentize.server.workers import clear_preempted, is_preempted, mark_preempted
+
+        workers_dir = str(tmp_path / "workers")
+        mark_preempted(42, workers_dir)
+
+        assert is_preempted(42, workers_dir)
+        assert not is_preempted(43, workers_dir)
+        clear_preempted(42, workers_dir)
+        assert not is_preempted(42, workers_dir)
+
+    def test_spawn_impl_resumes_and_clears_the_mark(self, tmp_path, monkeypatch):
+        """Test that the server resumes a marked issue and clears the mark once spawned."""
+        import agentize.server.__main__ as server_main
+        from agentize.server.workers import is_preempted, mark_preempted
+
+        monkeypatch.chdir(tmp_path)
+        calls = []
+        deps = server_main.ServerDeps(
+            resume_worktree=lambda issue_no: calls.append(("resume", issue_no)) or (True, 1),
+            spawn_worktree=lambda issue_no: calls.append(("spawn", issue_no)) or (True, 2),
+        )
+        mark_preempted(42)
+
+        assert server_main._spawn_impl(deps, 42, resume=True) == (True, 1)
+        assert server_main._spawn_impl(deps, 43, resume=False) == (True, 2)
+        assert calls == [("resume", 42), ("spawn", 43)]
+        assert not is_preempted(42)
+
+
 class TestFeatRequestSpawnAndCleanup:
     """Tests for feat-request spawn and cleanup functions."""
 
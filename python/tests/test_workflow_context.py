@@ -0,0 +1,61 @@
+"""Tests for agentize.workflow.api.context prompt assembly."""
+
+import pytest
+
+from agentize.workflow.api.context import ContextAssembler, ContextBlock, ContextPolicy
+
+
+def _blocks(guideline: str = "# Guide\n\n" + "Rule.\n" * 400):
+    return [
+        ContextBlock("agent", "You are the critic."),
+        ContextBlock("plan-guideline", guideline, title="# Planning Guidelines", shared=True, reducible=True),
+        ContextBlock("feature", "Add caching", title="# Feature Request", shared=True),
+    ]
+
+
+def test_default_policy_inlines_blocks(tmp_path):
+    """Test that the default policy joins blocks unchanged and writes nothing."""
+    prompt = ContextAssembler(tmp_path, "run").assemble(_blocks(), can_read=True)
+
+    assert prompt.text == "\n\n---\n\n".join(
+        ["You are the critic.", "# Planning Guidelines\n\n" + _blocks()[1].content, "# Feature Request\n\nAdd caching"]
+    )
+    assert not prompt.changed()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reference_writes_shared_block_once(tmp_path, monkeypatch):
+    """Test that large shared blocks are written once and referenced with their digest."""
+    assembler = ContextAssembler(tmp_path, "run", ContextPolicy(reference=True))
+    shared = tmp_path / "run-context-plan-guideline.md"
+
+    first = assembler.assemble(_blocks(), can_read=True)
+    monkeypatch.setattr(type(shared), "write_text", lambda *args, **kwargs: pytest.fail("rewritten"))
+    second = assembler.assemble(_blocks(), can_read=True)
+
+    assert first.text == second.text
+    assert shared.read_text() == _blocks()[1].content
+    assert f"Read `{shared}`" in first.text and "Rule." not in first.text
+    assert "Add caching" in first.text  # below reference_min_bytes
+    assert [block.mode for block in first.blocks] == ["inline", "reference", "inline"]
+    assert "plan-guideline 2.4KB -> reference" in first.summary()
+    assert assembler.assemble(_blocks(), can_read=False).text != first.text
+
+
+@pytest.mark.parametrize("strategy, mode", [("truncate", "truncated"), ("outline", "outlined")])
+def test_budget_reduces_reducible_blocks(tmp_path, strategy, mode):
+    """Test that a budget cuts reducible blocks down and keeps the others."""
+    policy = ContextPolicy(max_bytes=600, strategy=strategy)
+    prompt = ContextAssembler(tmp_path, "run", policy).assemble(_blocks())
+
+    assert prompt.size <= 600
+    assert prompt.text.startswith("You are the critic.")
+    assert prompt.text.endswith("# Feature Request\n\nAdd caching")
+    assert "plan-guideline" in prompt.text and "# Guide" in prompt.text
+    assert [block.mode for block in prompt.blocks] == ["inline", mode, "inline"]
+
+
+def test_unknown_strategy_rejected():
+    """Test that an unknown reduction strategy is rejected."""
+    with pytest.raises(ValueError, match="Unknown context strategy"):
+        ContextPolicy(strategy="summarize")
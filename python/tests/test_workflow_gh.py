@@ -0,0 +1,40 @@
+"""Tests for agentize.workflow.api.gh authentication handling."""
+
+import pytest
+
+from agentize.workflow.api import gh
+
+
+def _stub_gh(tmp_path, monkeypatch, body):
+    overrides = tmp_path / "overrides.sh"
+    calls = tmp_path / "calls.log"
+    overrides.write_text(f'gh() {{\n  echo "$*" >> "{calls}"\n{body}\n}}\n')
+    monkeypatch.setenv("AGENTIZE_SHELL_OVERRIDES", str(overrides))
+    monkeypatch.setattr(gh, "_GH_AUTH", None)
+    return calls
+
+
+def test_run_gh_makes_no_auth_status_call(tmp_path, monkeypatch):
+    """Test that a command runs without a separate gh auth status round trip."""
+    calls = _stub_gh(tmp_path, monkeypatch, '  echo "https://github.com/o/r/issues/7"')
+
+    gh.issue_create("Title", "Body")
+    gh.issue_create("Title", "Body")
+
+    assert [line.split()[:2] for line in calls.read_text().splitlines()] == [["issue", "create"]] * 2
+
+
+def test_auth_failure_is_cached(tmp_path, monkeypatch):
+    """Test that an auth failure is reported and later commands fail fast until the TTL expires."""
+    calls = _stub_gh(tmp_path, monkeypatch, '  echo "To get started with GitHub CLI, please run: gh auth login" >&2\n  return 4')
+
+    with pytest.raises(RuntimeError, match="not authenticated"):
+        gh.issue_create("Title", "Body")
+    with pytest.raises(RuntimeError, match="not available or not authenticated"):
+        gh.issue_create("Title", "Body")
+    assert len(calls.read_text().splitlines()) == 1
+
+    monkeypatch.setattr(gh, "GH_AUTH_TTL", 0.0)
+    with pytest.raises(RuntimeError, match="not authenticated"):
+        gh.issue_create("Title", "Body")
+    assert len(calls.read_text().splitlines()) == 2
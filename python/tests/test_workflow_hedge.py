@@ -0,0 +1,122 @@
+"""Tests for hedged stage execution in agentize.workflow.api.hedge."""
+
+import asyncio
+import subprocess
+from pathlib import Path
+
+from agentize.workflow.api import HedgePolicy, LatencyHistory, Session, StageCache
+
+
+def test_latency_history_percentile(tmp_path: Path):
+    """Test that thresholds need MIN_SAMPLES runs and honour min_delay and default_delay."""
+    history = LatencyHistory(tmp_path / "latency.json")
+    backend = ("claude", "opus")
+    for seconds in (10, 20, 30, 40):
+        history.record("bold", backend, seconds)
+    assert history.percentile("bold", backend, 0.9) is None
+
+    history.record("bold", backend, 100)
+    assert history.percentile("bold", backend, 0.9) == 100
+    assert history.percentile("bold", backend, 0.5) == 30
+    assert history.samples("bold", ("claude", "sonnet")) == []
+
+    policy = HedgePolicy(("claude", "sonnet"), percentile=0.5, min_delay=45)
+    assert policy.delay(history, "bold", backend) == 45
+    assert policy.delay(history, "critique", backend) is None
+    assert HedgePolicy(("claude", "sonnet"), default_delay=60).delay(None, "bold", backend) == 60
+    assert policy.delay(history, "bold", ("claude", "sonnet")) is None
+
+
+def _racing_runner(durations: dict[str, float], calls: list[str], cancelled: list[str], failing: set[str] = frozenset()):
+    async def _runner(provider, model, input_file, output_file, **_kwargs):
+        calls.append(model)
+        try:
+            await asyncio.sleep(durations[model])
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        if model in failing:
+            return subprocess.CompletedProcess(args=["stub"], returncode=1)
+        Path(output_file).write_text(f"from {model}")
+        return subprocess.CompletedProcess(args=["stub"], returncode=0)
+
+    return _runner
+
+
+def test_hedge_wins_and_cancels_slow_primary(tmp_path: Path):
+    """Test that a slow stage is hedged, the hedge's output wins and the primary is cancelled."""
+    calls: list[str] = []
+    cancelled: list[str] = []
+    history = LatencyHistory(tmp_path / "latency.json")
+    session = Session(
+        tmp_path,
+        "hedge",
+        async_runner=_racing_runner({"opus": 5, "sonnet": 0.05}, calls, cancelled),
+        latency=history,
+    )
+    policy = HedgePolicy(("claude", "sonnet"), min_delay=0, default_delay=0.1)
+
+    result = session.run_prompt("bold", "hello", ("claude", "opus"), hedge=policy)
+
+    assert result.hedged
+    assert result.text() == "from sonnet"
+    assert calls == ["opus", "sonnet"]
+    assert cancelled == ["opus"]
+    assert not (tmp_path / "hedge-bold-output.md.hedge").exists()
+    assert len(history.samples("bold", ("claude", "opus"))) == 1
+    assert len(history.samples("bold", ("claude", "sonnet"))) == 1
+
+
+def test_fast_primary_is_not_hedged(tmp_path: Path):
+    """Test that a stage finishing before the threshold never starts the hedge."""
+    calls: list[str] = []
+    cancelled: list[str] = []
+    session = Session(tmp_path, "hedge", async_runner=_racing_runner({"opus": 0.01, "sonnet": 0.01}, calls, cancelled))
+    policy = HedgePolicy(("claude", "sonnet"), min_delay=0, default_delay=1)
+
+    result = session.run_prompt("bold", "hello", ("claude", "opus"), hedge=policy)
+
+    assert not result.hedged
+    assert result.text() == "from opus"
+    assert calls == ["opus"]
+
+
+def test_invalid_primary_output_waits_for_hedge(tmp_path: Path):
+    """Test that a primary failing after the hedge started does not win over the hedge."""
+    calls: list[str] = []
+    cancelled: list[str] = []
+    runner = _racing_runner({"opus": 0.2, "sonnet": 0.4}, calls, cancelled, failing={"opus"})
+    session = Session(tmp_path, "hedge", async_runner=runner)
+    policy = HedgePolicy(("claude", "sonnet"), min_delay=0, default_delay=0.05)
+
+    result = session.run_prompt("bold", "hello", ("claude", "opus"), hedge=policy)
+
+    assert result.hedged
+    assert result.text() == "from sonnet"
+    assert cancelled == []
+
+
+def test_hedge_output_is_cached_under_the_hedge_backend(tmp_path: Path):
+    """Test that a winning hedge's output is never served as a cache hit for the primary backend."""
+    calls: list[str] = []
+    cancelled: list[str] = []
+    cache = StageCache(tmp_path / "cache")
+    runner = _racing_runner({"opus": 5, "sonnet": 0.05}, calls, cancelled)
+    policy = HedgePolicy(("claude", "sonnet"), min_delay=0, default_delay=0.1)
+
+    hedged = Session(tmp_path, "hedge", async_runner=runner, cache=cache).run_prompt(
+        "bold", "hello", ("claude", "opus"), hedge=policy
+    )
+    assert hedged.hedged
+    assert cache.get(cache.key("hello", ("claude", "sonnet"))) is not None
+    assert cache.get(cache.key("hello", ("claude", "opus"))) is None
+
+    calls.clear()
+    fast = _racing_runner({"opus": 0.01, "sonnet": 0.01}, calls, cancelled)
+    session = Session(tmp_path, "hedge", async_runner=fast, cache=cache, resume=True)
+    rerun = session.run_prompt("bold", "hello", ("claude", "opus"), hedge=policy)
+
+    assert not rerun.cached and not rerun.resumed
+    assert rerun.text() == "from opus"
+    assert calls == ["opus"]
+    assert session.run_prompt("bold", "hello", ("claude", "sonnet"), hedge=policy).cached
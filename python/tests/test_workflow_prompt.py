@@ -0,0 +1,43 @@
+"""Tests for compiled prompt templates in agentize.workflow.api.prompt."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from agentize.workflow.api import prompt as prompt_utils
+from agentize.workflow.api.prompt import PromptTemplate
+
+
+def test_render_substitutes_both_placeholder_forms_in_one_pass():
+    """Test that values are inserted verbatim and unknown placeholders are kept."""
+    template = PromptTemplate.compile("Issue {{issue_no}} ({#title#}) {{unknown}} {{empty}}")
+
+    rendered = template.render({"issue_no": 42, "title": "uses {{issue_no}}", "empty": None})
+
+    assert rendered == "Issue 42 (uses {{issue_no}}) {{unknown}} "
+    assert template.placeholders == {"issue_no", "title", "unknown", "empty"}
+    assert template.missing(["issue_no", "finalize_file"]) == ["finalize_file"]
+
+
+def test_load_template_caches_until_file_changes(tmp_path: Path, monkeypatch):
+    """Test that a template is compiled once and reloaded when its file changes."""
+    path = tmp_path / "prompt.md"
+    path.write_text("---\nname: x\n---\nHello {{name}}\n")
+
+    first = prompt_utils.load_template(path, strip_frontmatter=True)
+    reads = []
+    original_read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or original_read_text(self, *a, **k))
+
+    assert prompt_utils.load_template(path, strip_frontmatter=True) is first
+    assert prompt_utils.read_prompt(path, strip_frontmatter=True) == "Hello {{name}}\n"
+    assert reads == []
+
+    path.write_text("Bye {{name}}\n")
+    os.utime(path, ns=(0, 0))
+    assert prompt_utils.render(path, {"name": "x"}, tmp_path / "out.md") == "Bye x\n"
+    assert (tmp_path / "out.md").read_text() == "Bye x\n"
+
+    with pytest.raises(FileNotFoundError):
+        prompt_utils.load_template(tmp_path / "missing.md")
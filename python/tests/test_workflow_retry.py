@@ -0,0 +1,128 @@
+"""Tests for Session retry policies in agentize.workflow.api.retry."""
+
+import random
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agentize.workflow.api import PipelineError, RetryPolicy, Session, StageFailure, classify_failure
+from agentize.workflow.api.retry import DETERMINISTIC, RATE_LIMIT, TIMEOUT, TRANSIENT, is_backend_specific
+
+
+def _failure(returncode: int, stderr: str = "") -> StageFailure:
+    process = subprocess.CompletedProcess(args=["stub"], returncode=returncode)
+    return StageFailure("failed", process=process, stderr=stderr)
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (_failure(1, "Error: 429 Too Many Requests"), RATE_LIMIT),
+        (_failure(1, "API Error: Overloaded"), RATE_LIMIT),
+        (_failure(1, "Error: invalid model 'opux'"), DETERMINISTIC),
+        (_failure(4), DETERMINISTIC),
+        (_failure(124), TIMEOUT),
+        (_failure(1, "connection reset by peer"), TRANSIENT),
+        (_failure(1), TRANSIENT),
+        (_failure(0), TRANSIENT),
+        (subprocess.TimeoutExpired(["acw"], 5), TIMEOUT),
+        (ValueError("Prompt writer did not write input file"), DETERMINISTIC),
+    ],
+)
+def test_classify_failure(error, expected):
+    """Test that failures are classified from timeouts, stderr patterns and exit codes."""
+    assert classify_failure(error) == expected
+
+
+def test_delay_backs_off_with_full_jitter():
+    """Test that delays grow exponentially, cap at max_delay and jitter below the bound."""
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+    assert [policy.delay(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+
+    jittered = RetryPolicy(base_delay=1, max_delay=5)
+    rng = random.Random(7)
+    delays = [jittered.delay(3, rng) for _ in range(50)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def _scripted_runner(outcomes: list[tuple[int, str]], calls: list[tuple[str, str]]):
+    """A runner that fails with the queued (exit code, stderr) pairs, then succeeds."""
+
+    def _runner(provider, model, input_file, output_file, **_kwargs):
+        calls.append((provider, model))
+        if outcomes:
+            returncode, stderr = outcomes.pop(0)
+            Path(f"{output_file}.stderr").write_text(stderr)
+            return subprocess.CompletedProcess(args=["stub"], returncode=returncode)
+        Path(output_file).write_text("ok")
+        return subprocess.CompletedProcess(args=["stub"], returncode=0)
+
+    return _runner
+
+
+def test_policy_retries_rate_limits_but_not_deterministic_failures(tmp_path: Path):
+    """Test that each class uses its own budget and deterministic failures fail at once."""
+    policy = RetryPolicy(budgets={RATE_LIMIT: 3}, base_delay=0)
+    calls: list[tuple[str, str]] = []
+    runner = _scripted_runner([(1, "rate limit exceeded")] * 2, calls)
+    session = Session(tmp_path, "retry", runner=runner, retry_policy=policy)
+
+    assert session.run_prompt("bold", "hello", ("claude", "opus")).text() == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+    runner = _scripted_runner([(2, "Error: Unknown provider 'x'")] * 3, calls)
+    session = Session(tmp_path, "retry", runner=runner, retry_policy=policy)
+    with pytest.raises(PipelineError) as excinfo:
+        session.run_prompt("bold", "hello", ("claude", "opus"))
+    assert excinfo.value.attempts == 1
+    assert excinfo.value.failure_class == DETERMINISTIC
+    assert len(calls) == 1
+
+
+def test_policy_falls_back_to_another_backend(tmp_path: Path, capsys):
+    """Test that a stage moves to the fallback backend after fallback_after failures."""
+    policy = RetryPolicy(
+        budgets={TRANSIENT: 5},
+        base_delay=0,
+        fallback=("claude", "sonnet"),
+        fallback_after=2,
+    )
+    calls: list[tuple[str, str]] = []
+    runner = _scripted_runner([(1, "503 Service Unavailable")] * 2, calls)
+    session = Session(tmp_path, "retry", runner=runner)
+
+    result = session.run_prompt("bold", "hello", ("claude", "opus"), retry_policy=policy)
+
+    assert calls == [("claude", "opus"), ("claude", "opus"), ("claude", "sonnet")]
+    assert result.text() == "ok"
+    assert session.manifest.load()["stages"]["bold"]["backend"] == "claude:sonnet"
+    assert "falling back to claude:sonnet" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    ("outcome", "falls_back"),
+    [
+        ((3, "Error: input file not found"), False),
+        ((127, "bash: acw: command not found"), False),
+        ((1, "Error: unknown model 'opux'"), True),
+        ((4, ""), True),
+    ],
+)
+def test_deterministic_failures_fall_back_only_when_backend_specific(tmp_path: Path, outcome, falls_back):
+    """Test that only backend-specific deterministic failures move to the fallback backend."""
+    assert is_backend_specific(_failure(*outcome)) == falls_back
+    policy = RetryPolicy(base_delay=0, fallback=("claude", "sonnet"))
+    calls: list[tuple[str, str]] = []
+    session = Session(tmp_path, "retry", runner=_scripted_runner([outcome], calls), retry_policy=policy)
+
+    if falls_back:
+        assert session.run_prompt("bold", "hello", ("claude", "opus")).text() == "ok"
+        assert calls == [("claude", "opus"), ("claude", "sonnet")]
+    else:
+        with pytest.raises(PipelineError) as excinfo:
+            session.run_prompt("bold", "hello", ("claude", "opus"))
+        assert excinfo.value.failure_class == DETERMINISTIC
+        assert calls == [("claude", "opus")]
@@ -1,7 +1,10 @@
 """Tests for the Session DSL in agentize.workflow.api."""
 
+import asyncio
+import os
 import subprocess
 import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -13,6 +16,8 @@ except ImportError:
     Session = None
     StageResult = None
 
+from agentize.workflow.api import GraphError, ParallelError
+
 
 @pytest.mark.skipif(Session is None, reason="Implementation not yet available")
 def test_run_prompt_retries_on_missing_output(tmp_path: Path):
@@ -127,3 +132,342 @@ def test_run_parallel_returns_mapping(tmp_path: Path):
     assert results["critique"].text().startswith("done:")
     assert results["reducer"].text().startswith("done:")
     assert len(seen) == 2
+
+
+def _async_runner(behaviour: dict[str, tuple[float, int]], log: list[str]):
+    """Async runner stub: per-output-stem (delay, exit code); writes output on success."""
+    async def _runner(provider, model, input_file, output_file, **_kwargs):
+        stage = Path(output_file).name.split("-")[1]
+        delay, code = behaviour[stage]
+        log.append(f"start:{stage}")
+        await asyncio.sleep(delay)
+        if code == 0:
+            Path(output_file).write_text(stage)
+        log.append(f"end:{stage}")
+        return subprocess.CompletedProcess(args=["stub"], returncode=code)
+
+    return _runner
+
+
+def test_gather_limits_concurrency_and_maps_results(tmp_path: Path):
+    """gather runs stages on the event loop, at most max_concurrency at once."""
+    log: list[str] = []
+    runner = _async_runner({"a": (0.02, 0), "b": (0.02, 0), "c": (0.0, 0)}, log)
+    session = Session(output_dir=tmp_path, prefix="g", async_runner=runner)
+    calls = [session.stage(name, f"prompt {name}", ("claude", "sonnet")) for name in ("a", "b", "c")]
+
+    results = asyncio.run(session.gather(calls, max_concurrency=2))
+
+    assert {stage: result.text() for stage, result in results.items()} == {"a": "a", "b": "b", "c": "c"}
+    assert log.index("start:c") > min(log.index("end:a"), log.index("end:b"))
+
+
+def test_gather_failure_cancels_running_stages(tmp_path: Path):
+    """The first failed stage is raised and siblings are cancelled instead of awaited."""
+    log: list[str] = []
+    runner = _async_runner({"critique": (0.0, 1), "reducer": (30.0, 0)}, log)
+    session = Session(output_dir=tmp_path, prefix="g", async_runner=runner)
+    calls = [session.stage(name, "p", ("claude", "opus")) for name in ("critique", "reducer")]
+
+    with pytest.raises(PipelineError, match="critique"):
+        asyncio.run(asyncio.wait_for(session.gather(calls), 5))
+    assert "end:reducer" not in log
+
+    results = asyncio.run(session.gather(
+        [session.stage("critique", "p", ("claude", "opus"))], return_exceptions=True
+    ))
+    assert isinstance(results["critique"], PipelineError)
+
+
+def test_run_parallel_fail_fast_cancels_siblings_and_reports_outcomes(tmp_path: Path):
+    """With fail_fast, the first failure cancels running siblings and lists every outcome."""
+    log: list[str] = []
+    runner = _async_runner({"understander": (0.0, 0), "critique": (0.05, 1), "reducer": (30.0, 0)}, log)
+    session = Session(output_dir=tmp_path, prefix="p", async_runner=runner)
+    calls = [session.stage(name, "p", ("claude", "opus")) for name in ("understander", "critique", "reducer")]
+
+    started = time.monotonic()
+    with pytest.raises(ParallelError) as excinfo:
+        session.run_parallel(calls, max_workers=3, fail_fast=True)
+
+    assert time.monotonic() - started < 5
+    error = excinfo.value
+    assert error.stage == "critique"
+    assert list(error.results) == ["understander"]
+    assert list(error.errors) == ["critique"]
+    assert error.cancelled == ["reducer"]
+    assert "cancelled: reducer" in str(error)
+    assert "end:reducer" not in log
+
+
+def test_run_parallel_fail_fast_inside_event_loop_points_to_gather(tmp_path: Path):
+    """fail_fast cannot start its own loop from a coroutine and says to use gather."""
+    session = Session(output_dir=tmp_path, prefix="p", async_runner=_async_runner({}, []))
+
+    async def _inside_loop():
+        session.run_parallel([session.stage("bold", "p", ("claude", "opus"))], fail_fast=True)
+
+    with pytest.raises(RuntimeError, match="gather"):
+        asyncio.run(_inside_loop())
+
+
+def test_as_completed_yields_in_completion_order(tmp_path: Path):
+    """as_completed yields the fastest stage first; a sync runner runs in a thread."""
+    log: list[str] = []
+    runner = _async_runner({"slow": (0.05, 0), "fast": (0.0, 0)}, log)
+    session = Session(output_dir=tmp_path, prefix="g", async_runner=runner)
+
+    async def _collect():
+        calls = [session.stage(name, "p", ("claude", "opus")) for name in ("slow", "fast")]
+        return [result.stage async for result in session.as_completed(calls)]
+
+    assert asyncio.run(_collect()) == ["fast", "slow"]
+
+    def _sync_runner(provider, model, input_file, output_file, **_kwargs):
+        Path(output_file).write_text("sync")
+        return subprocess.CompletedProcess(args=["stub"], returncode=0)
+
+    sync_session = Session(output_dir=tmp_path, prefix="s", runner=_sync_runner)
+    result = asyncio.run(sync_session.run_prompt_async("stage", "p", ("claude", "opus")))
+    assert result.text() == "sync"
+
+
+def test_run_acw_async_cancellation_kills_process_group(tmp_path: Path, monkeypatch):
+    """run_acw_async runs acw via bash and cancelling it terminates the provider process."""
+    from agentize.workflow.api.acw import run_acw_async
+
+    script = tmp_path / "acw.sh"
+    script.write_text(
+        'acw() {\n'
+        '  if [ "$1" = "slow" ]; then sleep 30 & echo $! > "$4.pid"; wait; fi\n'
+        '  echo "$1:$2" > "$4"\n'
+        '}\n'
+    )
+    monkeypatch.setenv("PLANNER_ACW_SCRIPT", str(script))
+    monkeypatch.setenv("AGENTIZE_HOME", str(tmp_path))
+
+    output = tmp_path / "out.md"
+    process = asyncio.run(run_acw_async("claude", "sonnet", tmp_path / "in.md", output))
+    assert process.returncode == 0
+    assert output.read_text().strip() == "claude:sonnet"
+
+    slow_output = tmp_path / "slow.md"
+    pid_file = Path(f"{slow_output}.pid")
+
+    async def _cancel():
+        task = asyncio.ensure_future(run_acw_async("slow", "m", tmp_path / "in.md", slow_output))
+        for _ in range(100):
+            if pid_file.exists() and pid_file.read_text().strip():
+                break
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_cancel())
+    sleeper = int(pid_file.read_text())
+    for _ in range(50):
+        try:
+            os.kill(sleeper, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("provider process survived cancellation")
+
+
+def test_run_graph_builds_prompts_from_upstream_and_overlaps(tmp_path: Path):
+    """Stages start once their dependencies finish; siblings overlap; prompts see upstream output."""
+    log: list[str] = []
+    runner = _async_runner({"a": (0.0, 0), "b": (0.03, 0), "c": (0.03, 0), "d": (0.0, 0)}, log)
+    session = Session(output_dir=tmp_path, prefix="dag", async_runner=runner)
+    started: list[str] = []
+
+    nodes = [
+        session.node("d", lambda up: f"after {up['b'].text()}+{up['c'].text()}", ("claude", "opus"), after=("b", "c")),
+        session.node("b", lambda up: up["a"].text(), ("claude", "opus"), after=("a",)),
+        session.node("c", lambda up: up["a"].text(), ("claude", "opus"), after=("a",)),
+        session.node("a", "root prompt", ("claude", "sonnet")),
+    ]
+    results = session.run_graph(nodes, max_concurrency=2, on_start=lambda node: started.append(node.stage))
+
+    assert list(results) == ["d", "b", "c", "a"]
+    assert (tmp_path / "dag-d-input.md").read_text() == "after b+c"
+    assert log.index("start:c") < log.index("end:b")  # b and c overlap
+    assert started[0] == "a" and started[-1] == "d"
+
+
+def test_run_graph_failure_skips_dependents_only(tmp_path: Path):
+    """A failed stage skips its dependents while independent branches still finish."""
+    log: list[str] = []
+    runner = _async_runner({"a": (0.0, 0), "bad": (0.0, 1), "child": (0.0, 0), "other": (0.05, 0)}, log)
+    session = Session(output_dir=tmp_path, prefix="dag", async_runner=runner)
+    nodes = [
+        session.node("a", "p", ("claude", "opus")),
+        session.node("bad", "p", ("claude", "opus"), after=("a",)),
+        session.node("child", "p", ("claude", "opus"), after=("bad",)),
+        session.node("other", "p", ("claude", "opus"), after=("a",)),
+    ]
+
+    with pytest.raises(GraphError) as excinfo:
+        session.run_graph(nodes)
+
+    error = excinfo.value
+    assert isinstance(error, PipelineError) and error.stage == "bad"
+    assert set(error.results) == {"a", "other"}
+    assert list(error.errors) == ["bad"]
+    assert error.skipped == ["child"]
+    assert "start:child" not in log
+
+
+def test_run_graph_rejects_invalid_graphs(tmp_path: Path):
+    """Unknown dependencies and cycles are rejected before anything runs."""
+    session = Session(output_dir=tmp_path, prefix="dag", runner=lambda *a, **k: None)
+
+    with pytest.raises(ValueError, match="unknown stage 'missing'"):
+        session.run_graph([session.node("a", "p", ("claude", "opus"), after=("missing",))])
+    with pytest.raises(ValueError, match="cycle: a -> b -> a"):
+        session.run_graph([
+            session.node("a", "p", ("claude", "opus"), after=("b",)),
+            session.node("b", "p", ("claude", "opus"), after=("a",)),
+        ])
+
+
+def _counting_runner(calls: list[str], *, fail: bool = False):
+    def _runner(provider, model, input_file, output_file, **_kwargs):
+        calls.append(Path(output_file).name)
+        if not fail:
+            Path(output_file).write_text(f"out:{Path(input_file).read_text()}")
+        return subprocess.CompletedProcess(args=["stub"], returncode=0)
+
+    return _runner
+
+
+def test_stage_cache_reuses_identical_requests(tmp_path: Path):
+    """A byte-identical stage is served from the cache; any setting change misses."""
+    from agentize.workflow.api import StageCache
+
+    calls: list[str] = []
+    cache = StageCache(tmp_path / "cache", commit="abc123")
+    session = Session(output_dir=tmp_path / "run1", prefix="p", runner=_counting_runner(calls), cache=cache)
+
+    first = session.run_prompt("bold", "same prompt", ("claude", "opus"), tools="Read")
+    rerun = Session(output_dir=tmp_path / "run2", prefix="q", runner=_counting_runner(calls), cache=cache)
+    second = rerun.run_prompt("bold", "same prompt", ("claude", "opus"), tools="Read")
+
+    assert (first.cached, second.cached) == (False, True)
+    assert second.text() == "out:same prompt"
+    assert second.output_path == tmp_path / "run2" / "q-bold-output.md"
+    assert len(calls) == 1
+
+    rerun.run_prompt("bold", "same prompt", ("claude", "opus"), tools="Read,Grep")
+    rerun.run_prompt("bold", "same prompt", ("claude", "sonnet"), tools="Read")
+    other_commit = Session(output_dir=tmp_path / "run3", prefix="p", runner=_counting_runner(calls),
+                           cache=StageCache(tmp_path / "cache", commit="def456"))
+    other_commit.run_prompt("bold", "same prompt", ("claude", "opus"), tools="Read")
+    assert len(calls) == 4
+
+
+def test_stage_cache_skips_failures_and_evicts(tmp_path: Path):
+    """Failed outputs are never cached; expired and over-budget entries are evicted."""
+    from agentize.workflow.api import StageCache
+
+    calls: list[str] = []
+    cache = StageCache(tmp_path / "cache")
+    failing = Session(output_dir=tmp_path, prefix="f", runner=_counting_runner(calls, fail=True), cache=cache)
+    with pytest.raises(PipelineError):
+        failing.run_prompt("stage", "p", ("claude", "opus"))
+    assert not list((tmp_path / "cache").glob("*/*.out"))
+
+    unlimited = StageCache(tmp_path / "cache", max_age_days=0, max_size_mb=0)
+    for index in range(3):
+        key = unlimited.key(f"input {index}", ("claude", "opus"))
+        source = tmp_path / f"source-{index}.md"
+        source.write_text("x" * 1024)
+        unlimited.put(key, source, stage="s")
+        os.utime(unlimited.get(key), (1000 + index, 1000 + index))
+
+    now = 1000 + 86400 * 10
+    assert StageCache(tmp_path / "cache", max_age_days=30, max_size_mb=2048 / 1024 / 1024).evict(now) == 1
+    assert len(list((tmp_path / "cache").glob("*/*.out"))) == 2
+    assert StageCache(tmp_path / "cache", max_age_days=7).evict(now) == 2
+
+
+def test_manifest_records_stages_and_resume_validates_them(tmp_path: Path):
+    """Completed stages are checkpointed; resume reuses only checkpoints that still match."""
+    calls: list[str] = []
+    session = Session(output_dir=tmp_path, prefix="p", runner=_counting_runner(calls))
+    session.run_prompt("bold", "prompt", ("claude", "opus"))
+    session.run_prompt("critique", "prompt", ("claude", "opus"))
+
+    entry = session.manifest.load()["stages"]["bold"]
+    assert entry["backend"] == "claude:opus"
+    assert entry["output_path"] == str(tmp_path / "p-bold-output.md")
+    assert {"input_sha256", "output_sha256", "completed_at"} <= entry.keys()
+
+    resumed = Session(output_dir=tmp_path, prefix="p", runner=_counting_runner(calls), resume=True)
+    assert resumed.run_prompt("bold", "prompt", ("claude", "opus")).resumed
+    assert not resumed.run_prompt("bold", "changed prompt", ("claude", "opus")).resumed
+    assert not resumed.run_prompt("critique", "prompt", ("claude", "sonnet")).resumed
+    assert calls == ["p-bold-output.md", "p-critique-output.md", "p-bold-output.md", "p-critique-output.md"]
+
+    (tmp_path / "p-critique-output.md").write_text("edited")
+    assert not resumed.run_prompt("critique", "prompt", ("claude", "sonnet")).resumed
+    assert len(calls) == 5
+
+
+def _writing_runner(lines: list[str], log: list[str], *, stderr: str = ""):
+    """Async runner that appends output lines over time, like a provider redirected by acw."""
+
+    async def _runner(provider, model, input_file, output_file, **_kwargs):
+        if stderr:
+            Path(f"{output_file}.stderr").write_text(stderr)
+        with open(output_file, "a") as handle:
+            for line in lines:
+                handle.write(line)
+                handle.flush()
+                await asyncio.sleep(0.3)
+        log.append("finished")
+        return subprocess.CompletedProcess(args=["stub"], returncode=0)
+
+    return _runner
+
+
+def test_on_output_streams_lines_while_the_stage_runs(tmp_path: Path):
+    """on_output sees whole lines before the stage ends; stale output is not replayed."""
+    (tmp_path / "s-bold-output.md").write_text("stale from last run\n")
+    log: list[str] = []
+    seen: list[tuple[str, int]] = []
+    session = Session(output_dir=tmp_path, prefix="s",
+                      async_runner=_writing_runner(["# Plan\nstep", " one\n", "tail"], log))
+
+    result = session.run_prompt("bold", "p", ("claude", "opus"),
+                                on_output=lambda text: seen.append((text, len(log))))
+
+    chunks = [text for text, _ in seen]
+    assert "".join(chunks) == "# Plan\nstep one\ntail"
+    assert all(chunk.endswith("\n") for chunk in chunks[:-1]) and chunks[-1] == "tail"
+    assert seen[0] == ("# Plan\n", 0)
+    assert result.text() == "# Plan\nstep one\ntail"
+
+    replayed: list[str] = []
+    resumed = Session(output_dir=tmp_path, prefix="s", async_runner=_writing_runner([], log), resume=True)
+    assert resumed.run_prompt("bold", "p", ("claude", "opus"), on_output=replayed.append).resumed
+    assert replayed == ["# Plan\nstep one\ntail"]
+
+
+def test_on_stderr_callback_error_aborts_the_stage(tmp_path: Path):
+    """An exception from a follower callback cancels the running stage and fails the attempt."""
+    log: list[str] = []
+    session = Session(output_dir=tmp_path, prefix="s",
+                      async_runner=_writing_runner(["a\n"] * 20, log, stderr="Error: quota exceeded\n"))
+
+    def _fail_on_banner(text: str) -> None:
+        if "Error:" in text:
+            raise RuntimeError(f"provider failed: {text.strip()}")
+
+    started = time.monotonic()
+    with pytest.raises(PipelineError, match="quota exceeded"):
+        session.run_prompt("bold", "p", ("claude", "opus"), on_stderr=_fail_on_banner)
+    assert time.monotonic() - started < 3
+    assert log == []
@@ -0,0 +1,149 @@
+"""Tests for stage telemetry and run traces in agentize.workflow.api.telemetry."""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from agentize.workflow.api import PipelineError, Session, StageCache
+from agentize.workflow.api.telemetry import claude_transcript_usage, collect_telemetry, stderr_usage
+
+
+def _transcript(path: Path, input_path: Path, usages: list[dict], model: str = "claude-sonnet-4-5-20250929") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [{"type": "user", "message": {"content": f"@{input_path}"}}]
+    lines += [{"type": "assistant", "message": {"model": model, "usage": usage}} for usage in usages]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+
+def test_claude_transcript_usage_matches_input_path(tmp_path: Path):
+    """Test that the transcript mentioning the stage input is summed and priced."""
+    projects = tmp_path / "projects"
+    input_path = tmp_path / "run-bold-input.md"
+    since = time.time() - 1
+    _transcript(projects / "-repo" / "a.jsonl", tmp_path / "other-input.md", [{"input_tokens": 999}])
+    _transcript(
+        projects / "-repo" / "b.jsonl",
+        input_path,
+        [
+            {"input_tokens": 1_000_000, "output_tokens": 0},
+            {"input_tokens": 0, "output_tokens": 100_000, "cache_read_input_tokens": 50},
+        ],
+    )
+
+    usage = claude_transcript_usage(input_path, since, projects_dir=projects)
+
+    assert usage["input_tokens"] == 1_000_000
+    assert usage["output_tokens"] == 100_000
+    assert usage["cache_read_tokens"] == 50
+    assert usage["tokens"] == 1_100_050
+    assert usage["cost_usd"] == pytest.approx(3.0 + 1.5, abs=0.01)
+    assert usage["model"] == "claude-sonnet-4-5-20250929"
+    assert claude_transcript_usage(input_path, time.time() + 60, projects_dir=projects) is None
+
+    # A transcript removed after the directory was listed is skipped
+    (projects / "-repo" / "gone.jsonl").symlink_to(tmp_path / "missing.jsonl")
+    assert claude_transcript_usage(input_path, since, projects_dir=projects)["input_tokens"] == 1_000_000
+
+
+def test_stderr_usage_and_artifact_sizes(tmp_path: Path):
+    """Test that non-Claude providers fall back to a stderr token total, with byte sizes recorded."""
+    assert stderr_usage("done\ntokens used: 12,345\n") == {"tokens": 12345, "usage_source": "stderr"}
+    assert stderr_usage("no usage here") is None
+
+    input_path = tmp_path / "in.md"
+    output_path = tmp_path / "out.md"
+    input_path.write_text("abcd")
+    output_path.write_text("ab")
+    telemetry = collect_telemetry(
+        "codex", input_path, output_path, started=0, wall_seconds=2.5, wait_seconds=0.5, stderr="tokens used 42"
+    )
+    assert (telemetry.input_bytes, telemetry.output_bytes) == (4, 2)
+    assert (telemetry.wall_seconds, telemetry.wait_seconds) == (2.5, 0.5)
+    assert telemetry.tokens == 42
+    assert telemetry.cost_usd is None
+
+
+def _runner(returncode: int = 0):
+    def _run(provider, model, input_file, output_file, **_kwargs):
+        if returncode == 0:
+            Path(output_file).write_text("output")
+        return subprocess.CompletedProcess(args=["stub"], returncode=returncode)
+
+    return _run
+
+
+def _trace(tmp_path: Path, prefix: str) -> list[dict]:
+    return [json.loads(line) for line in (tmp_path / f"{prefix}-trace.jsonl").read_text().splitlines()]
+
+
+def test_session_records_telemetry_and_appends_trace(tmp_path: Path):
+    """Test that run, cached and failed stages each append one trace record."""
+    session = Session(tmp_path, "run", runner=_runner(), cache=StageCache(tmp_path / "cache"))
+
+    result = session.run_prompt("bold", "hello", ("claude", "opus"))
+    cached = session.run_prompt("bold", "hello", ("claude", "opus"))
+
+    assert result.telemetry.input_bytes == 5
+    assert result.telemetry.output_bytes == 6
+    assert result.telemetry.wall_seconds >= 0
+    assert result.telemetry.usage_source is None
+    assert result.wait_seconds == result.telemetry.wait_seconds
+    assert cached.cached and cached.telemetry.output_bytes == 6
+
+    failing = Session(tmp_path, "run", runner=_runner(returncode=1))
+    with pytest.raises(PipelineError):
+        failing.run_prompt("critique", "hello", ("codex", "gpt-5"))
+
+    records = _trace(tmp_path, "run")
+    assert [(r["stage"], r["status"], r["cached"] if "cached" in r else None) for r in records] == [
+        ("bold", "ok", False),
+        ("bold", "ok", True),
+        ("critique", "failed", None),
+    ]
+    assert records[0]["backend"] == "claude:opus"
+    assert records[0]["output_bytes"] == 6
+    assert records[2]["failure_class"] == "transient"
+    assert records[0]["session"] != "" and records[0]["run"] == "run"
+
+
+def test_trace_can_be_disabled(tmp_path: Path):
+    """Test that trace=False writes no trace file."""
+    session = Session(tmp_path, "quiet", runner=_runner(), trace=False)
+    session.run_prompt("bold", "hello", ("claude", "opus"))
+
+    assert session.trace is None
+    assert not (tmp_path / "quiet-trace.jsonl").exists()
+
+
+def test_usage_errors_do_not_fail_a_finished_stage(tmp_path: Path, monkeypatch, capsys):
+    """Test that a usage lookup error keeps the stage result, with time and sizes only."""
+    import agentize.workflow.api.session as session_module
+
+    calls = []
+    runner = _runner()
+
+    def _counting_runner(*args, **kwargs):
+        calls.append(args)
+        return runner(*args, **kwargs)
+
+    real_collect = session_module.collect_telemetry
+
+    def _failing_collect(*args, usage=True, **kwargs):
+        if usage:
+            raise FileNotFoundError("transcript vanished")
+        return real_collect(*args, usage=usage, **kwargs)
+
+    # Usage is only looked up for the real acw runner
+    monkeypatch.setattr(session_module, "run_acw", _counting_runner)
+    monkeypatch.setattr(session_module, "collect_telemetry", _failing_collect)
+    session = Session(tmp_path, "usage", runner=_counting_runner)
+
+    result = session.run_prompt("bold", "hello", ("claude", "opus"), retry=2)
+
+    assert len(calls) == 1
+    assert result.telemetry.output_bytes == 6
+    assert result.telemetry.usage_source is None
+    assert "agent bold: failed to collect usage (transcript vanished)" in capsys.readouterr().err
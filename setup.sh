@@ -0,0 +1,23 @@
+#!/bin/bash
+
+# Auto-generated by make setup
+# This file is local-only and gitignored
+
+export AGENTIZE_HOME="/root/package"
+export PYTHONPATH="$AGENTIZE_HOME/python:$PYTHONPATH"
+source "$AGENTIZE_HOME/src/cli/wt.sh"
+source "$AGENTIZE_HOME/src/cli/lol.sh"
+source "$AGENTIZE_HOME/src/cli/acw.sh"
+
+# Enable zsh completion for wt command
+if [ -n "$ZSH_VERSION" ]; then  # zsh-only setup
+  fpath=($AGENTIZE_HOME/src/completion $fpath)
+  # Re-initialize completion system to pick up new fpath
+  if command -v compdef >/dev/null 2>&1; then
+    # Already initialized, re-run to pick up new fpath
+    autoload -Uz compinit && compinit
+  else
+    # Not initialized yet, initialize now
+    autoload -Uz compinit && compinit
+  fi
+fi
@@ -21,6 +21,8 @@ source "$_LOL_COMMANDS_DIR/commands/project.sh"
 source "$_LOL_COMMANDS_DIR/commands/serve.sh"
 source "$_LOL_COMMANDS_DIR/commands/claude-clean.sh"
 source "$_LOL_COMMANDS_DIR/commands/usage.sh"
+source "$_LOL_COMMANDS_DIR/commands/gc.sh"
+source "$_LOL_COMMANDS_DIR/commands/trace.sh"
 source "$_LOL_COMMANDS_DIR/commands/plan.sh"
 source "$_LOL_COMMANDS_DIR/commands/impl.sh"
 source "$_LOL_COMMANDS_DIR/commands/simp.sh"
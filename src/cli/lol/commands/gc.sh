@@ -0,0 +1,19 @@
+#!/usr/bin/env bash
+# lol gc command implementation
+# Shell wrapper that invokes Python .tmp garbage collector
+
+# Remove expired .tmp artifacts (sessions, debug logs, acw chats, stage outputs)
+# Usage: _lol_cmd_gc [dry_run]
+#   dry_run: "1" to report without deleting, "0" to delete (default)
+_lol_cmd_gc() {
+    local dry_run="${1:-0}"
+
+    # Build command arguments
+    local args=()
+    if [ "$dry_run" = "1" ]; then
+        args+=(--dry-run)
+    fi
+
+    # Invoke Python garbage collector module
+    python3 -m agentize.tmp_gc "${args[@]}"
+}
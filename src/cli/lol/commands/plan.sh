@@ -3,18 +3,19 @@
 # Delegates to planner pipeline for multi-agent debate
 
 # Run the multi-agent debate pipeline
-# Usage: _lol_cmd_plan <feature_desc_or_refine_instructions> <issue_mode> <verbose> <refine_issue_number>
+# Usage: _lol_cmd_plan <feature_desc_or_refine_instructions> <issue_mode> <verbose> <refine_issue_number> [resume_prefix]
 _lol_cmd_plan() {
     local feature_desc="$1"
     local issue_mode="$2"
     local verbose="$3"
     local refine_issue_number="$4"
+    local resume_prefix="${5:-}"
 
     # Validate feature description
-    if [ -z "$feature_desc" ] && [ -z "$refine_issue_number" ]; then
+    if [ -z "$feature_desc" ] && [ -z "$refine_issue_number" ] && [ -z "$resume_prefix" ]; then
         echo "Error: Feature description is required." >&2
         echo "" >&2
-        echo "Usage: lol plan [--dry-run] [--verbose] [--editor] [--refine <issue-number> [refinement-instructions]] [<feature-description>]" >&2
+        echo "Usage: lol plan [--dry-run] [--verbose] [--editor] [--refine <issue-number> [refinement-instructions]] [--resume <prefix>] [<feature-description>]" >&2
         return 1
     fi
 
@@ -29,5 +30,5 @@ _lol_cmd_plan() {
     fi
 
     # Delegate to planner pipeline
-    _planner_run_pipeline "$feature_desc" "$issue_mode" "$verbose" "$refine_issue_number"
+    _planner_run_pipeline "$feature_desc" "$issue_mode" "$verbose" "$refine_issue_number" "$resume_prefix"
 }
@@ -0,0 +1,24 @@
+#!/usr/bin/env bash
+# lol trace command implementation
+# Shell wrapper that invokes Python stage trace summaries
+
+# Summarize workflow stage time, tokens and cost from .tmp/*-trace.jsonl
+# Usage: _lol_cmd_trace [run] [last]
+#   run: Session prefix to include (e.g. issue-42), empty for all runs
+#   last: Number of most recent runs to include, empty for all runs
+_lol_cmd_trace() {
+    local run="${1:-}"
+    local last="${2:-}"
+
+    # Build command arguments
+    local args=()
+    if [ -n "$run" ]; then
+        args+=(--run "$run")
+    fi
+    if [ -n "$last" ]; then
+        args+=(--last "$last")
+    fi
+
+    # Invoke Python trace module
+    python3 -m agentize.trace "${args[@]}"
+}
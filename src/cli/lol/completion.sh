@@ -14,6 +14,8 @@ _lol_complete() {
             echo "version"
             echo "project"
             echo "usage"
+            echo "gc"
+            echo "trace"
             echo "serve"
             echo "claude-clean"
             echo "plan"
@@ -41,6 +43,13 @@ _lol_complete() {
         claude-clean-flags)
             echo "--dry-run"
             ;;
+        gc-flags)
+            echo "--dry-run"
+            ;;
+        trace-flags)
+            echo "--run"
+            echo "--last"
+            ;;
         usage-flags)
             echo "--today"
             echo "--week"
@@ -52,6 +61,7 @@ _lol_complete() {
             echo "--verbose"
             echo "--editor"
             echo "--refine"
+            echo "--resume"
             ;;
         impl-flags)
             echo "--backend"
@@ -91,6 +91,12 @@ lol() {
         usage)
             _lol_parse_usage "$@"
             ;;
+        gc)
+            _lol_parse_gc "$@"
+            ;;
+        trace)
+            _lol_parse_trace "$@"
+            ;;
         version)
             _lol_log_version
             _lol_cmd_version
@@ -113,6 +119,8 @@ lol() {
             echo "  lol impl <issue-no> [--backend <provider:model>] [--max-iterations <N>] [--yolo]"
             echo "  lol usage [--today | --week] [--cache] [--cost]"
             echo "  lol claude-clean [--dry-run]"
+            echo "  lol gc [--dry-run]"
+            echo "  lol trace [--run <prefix>] [--last <N>]"
             echo ""
             echo "Flags:"
             echo "  --version           Display version information"
@@ -123,7 +131,7 @@ lol() {
             echo "  --write <path>      Write automation template to file (project)"
             echo "  --org <owner>       GitHub owner: organization or user (project --create)"
             echo "  --title <title>     Project title (project --create)"
-            echo "  --dry-run           Skip issue creation (plan) or preview changes (claude-clean)"
+            echo "  --dry-run           Skip issue creation (plan) or preview changes (claude-clean, gc)"
             echo "  --verbose           Print detailed stage logs (plan)"
             echo "  --editor            Open \$EDITOR to compose feature description (plan)"
             echo "  --refine            Refine an existing plan issue (plan)"
@@ -151,6 +159,8 @@ lol() {
             echo "  lol serve                       # Start server (config in .agentize.local.yaml)"
             echo "  lol claude-clean --dry-run      # Preview stale entries"
             echo "  lol claude-clean                # Remove stale entries"
+            echo "  lol gc --dry-run                # Preview expired .tmp artifacts"
+            echo "  lol trace --run issue-42        # Stage time and cost of a plan run"
             echo "  lol plan \"Add JWT auth\"        # Run planning pipeline"
             echo "  lol plan --dry-run \"Refactor\"  # Plan without creating issue"
             echo "  lol plan --refine 42 \"Tighten scope\""
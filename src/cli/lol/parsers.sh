@@ -228,6 +228,65 @@ _lol_parse_usage() {
     _lol_cmd_usage "$mode" "$cache" "$cost"
 }
 
+# Parse gc command arguments and call _lol_cmd_gc
+_lol_parse_gc() {
+    local dry_run="0"
+
+    # Parse arguments
+    while [ $# -gt 0 ]; do
+        case "$1" in
+            --dry-run)
+                dry_run="1"
+                shift
+                ;;
+            *)
+                echo "Error: Unknown option '$1'"
+                echo "Usage: lol gc [--dry-run]"
+                return 1
+                ;;
+        esac
+    done
+
+    _lol_cmd_gc "$dry_run"
+}
+
+# Parse trace command arguments and call _lol_cmd_trace
+_lol_parse_trace() {
+    local run=""
+    local last=""
+
+    # Parse arguments
+    while [ $# -gt 0 ]; do
+        case "$1" in
+            --run)
+                if [ -z "$2" ]; then
+                    echo "Error: --run requires a session prefix"
+                    echo "Usage: lol trace [--run <prefix>] [--last <N>]"
+                    return 1
+                fi
+                run="$2"
+                shift 2
+                ;;
+            --last)
+                if ! [[ "$2" =~ ^[0-9]+$ ]]; then
+                    echo "Error: --last requires a number"
+                    echo "Usage: lol trace [--run <prefix>] [--last <N>]"
+                    return 1
+                fi
+                last="$2"
+                shift 2
+                ;;
+            *)
+                echo "Error: Unknown option '$1'"
+                echo "Usage: lol trace [--run <prefix>] [--last <N>]"
+                return 1
+                ;;
+        esac
+    done
+
+    _lol_cmd_trace "$run" "$last"
+}
+
 # Parse plan command arguments and call _lol_cmd_plan
 _lol_parse_plan() {
     local dry_run="false"
@@ -236,6 +295,7 @@ _lol_parse_plan() {
     local feature_desc=""
     local refine_issue_number=""
     local refine_instructions=""
+    local resume_prefix=""
 
     # Handle --help
     if [ "$1" = "--help" ] || [ "$1" = "-h" ]; then
@@ -244,12 +304,14 @@ _lol_parse_plan() {
         echo "Usage: lol plan [options] \"<feature-description>\""
         echo "       lol plan --editor [options]"
         echo "       lol plan --refine <issue-number> [refinement-instructions]"
+        echo "       lol plan --resume <prefix> [options]"
         echo ""
         echo "Options:"
         echo "  --dry-run    Skip GitHub issue creation; use timestamp-based artifacts"
         echo "  --verbose    Print detailed stage logs (quiet by default)"
         echo "  --editor     Open \$EDITOR to compose feature description"
         echo "  --refine     Refine an existing plan issue by number"
+        echo "  --resume     Resume an interrupted run from its .tmp/<prefix> artifacts"
         echo "  --help       Show this help message"
         return 0
     fi
@@ -279,6 +341,16 @@ _lol_parse_plan() {
                 refine_issue_number="$1"
                 shift
                 ;;
+            --resume)
+                shift
+                if [ -z "$1" ]; then
+                    echo "Error: --resume requires an artifact prefix (e.g., issue-42)" >&2
+                    echo "Usage: lol plan --resume <prefix> [options]" >&2
+                    return 1
+                fi
+                resume_prefix="$1"
+                shift
+                ;;
             --backend|--understander|--bold|--critique|--reducer)
                 echo "Error: Backend flags are no longer supported for lol plan." >&2
                 echo "Configure planner backends in .agentize.local.yaml (planner.backend, planner.understander, planner.bold, planner.critique, planner.reducer)." >&2
@@ -311,6 +383,12 @@ _lol_parse_plan() {
         esac
     done
 
+    if [ -n "$resume_prefix" ] && { [ -n "$refine_issue_number" ] || [ "$use_editor" = "true" ]; }; then
+        echo "Error: --resume cannot be combined with --refine or --editor." >&2
+        echo "Usage: lol plan --resume <prefix> [options]" >&2
+        return 1
+    fi
+
     # Handle --editor flag
     if [ "$use_editor" = "true" ]; then
         # Check mutual exclusion with positional description
@@ -360,8 +438,8 @@ _lol_parse_plan() {
         feature_desc=$(echo "$feature_desc" | sed -e :a -e '/^\n*$/{$d;N;ba' -e '}')
     fi
 
-    # Validate feature description
-    if [ -z "$feature_desc" ] && [ -z "$refine_issue_number" ]; then
+    # Validate feature description (a resumed run reads it from its manifest)
+    if [ -z "$feature_desc" ] && [ -z "$refine_issue_number" ] && [ -z "$resume_prefix" ]; then
         echo "Error: Feature description is required." >&2
         echo "" >&2
         echo "Usage: lol plan [options] \"<feature-description>\"" >&2
@@ -382,7 +460,7 @@ _lol_parse_plan() {
         issue_mode="false"
     fi
 
-    _lol_cmd_plan "$feature_desc" "$issue_mode" "$verbose" "$refine_issue_number"
+    _lol_cmd_plan "$feature_desc" "$issue_mode" "$verbose" "$refine_issue_number" "$resume_prefix"
 }
 
 # Parse impl command arguments and call _lol_cmd_impl
@@ -237,10 +237,30 @@ cmd_spawn() {
         return 1
     fi
 
+    # Claim the issue before the agent starts so a second agent (server or lol impl) is rejected.
+    # Taken before the worktree is created, so a rejected claim leaves nothing behind.
+    local run_agent=false
+    if [ "$no_agent" = false ] && command -v claude >/dev/null 2>&1; then
+        run_agent=true
+        wt_claim_work "$issue_no" "wt spawn $issue_no" "$common_dir" || return 1
+    fi
+
+    # Resolve optional provisioning settings from the project's .agentize.yaml
+    local sparse_dirs reflink_mode
+    sparse_dirs=$(wt_read_worktree_setting sparse_checkout "$default_branch" "$common_dir")
+    reflink_mode=$(wt_read_worktree_setting reflink "$default_branch" "$common_dir" | head -1)
+
     # Create worktree from default branch
-    # In a bare repo, we create worktree directly from the branch ref
+    # In a bare repo, we create worktree directly from the branch ref.
+    # Sparse and reflink provisioning defer the checkout until after setup.
+    local checkout_flag=""
+    if [ -n "$sparse_dirs" ] || [ "$reflink_mode" = true ]; then
+        checkout_flag="--no-checkout"
+    fi
+
+    local provision_start=$SECONDS
     local spawn_error
-    spawn_error=$(git -C "$common_dir" worktree add -b "$branch_name" "$worktree_path" "$default_branch" 2>&1)
+    spawn_error=$(git -C "$common_dir" worktree add $checkout_flag -b "$branch_name" "$worktree_path" "$default_branch" 2>&1)
     local spawn_exit=$?
 
     if [ $spawn_exit -ne 0 ]; then
@@ -249,10 +269,32 @@ cmd_spawn() {
         echo "  Path: $worktree_path" >&2
         echo "  Base: $default_branch" >&2
         echo "  Git error: $spawn_error" >&2
+        wt_release_work_claim
         return 1
     fi
 
+    local checkout_mode="full"
+    if [ -n "$sparse_dirs" ]; then
+        if wt_apply_sparse_profile "$worktree_path" "$sparse_dirs" \
+            && git -C "$worktree_path" reset --hard -q >/dev/null 2>&1; then
+            checkout_mode="sparse"
+        else
+            echo "Warning: Sparse checkout failed, falling back to full checkout" >&2
+            git -C "$worktree_path" sparse-checkout disable >/dev/null 2>&1 || true
+            git -C "$worktree_path" reset --hard -q >/dev/null 2>&1
+        fi
+    elif [ "$reflink_mode" = true ]; then
+        if wt_reflink_populate "$trees_dir/main" "$worktree_path"; then
+            checkout_mode="reflink"
+        else
+            # Filesystem without copy-on-write support: materialize normally
+            git -C "$worktree_path" reset --hard -q >/dev/null 2>&1
+            git -C "$worktree_path" clean -fdxq >/dev/null 2>&1 || true
+        fi
+    fi
+
     echo "Created worktree: $worktree_path"
+    wt_report_provision "$worktree_path" "$checkout_mode" "$provision_start"
 
     # Add pre-trusted entry to ~/.claude.json to skip trust dialog
     local claude_config="$HOME/.claude.json"
@@ -271,8 +313,9 @@ cmd_spawn() {
     wt_claim_issue_status "$issue_no" "$worktree_path" || true
 
     # Invoke Claude if not disabled
-    if [ "$no_agent" = false ] && command -v claude >/dev/null 2>&1; then
+    if [ "$run_agent" = true ]; then
         wt_invoke_claude "/issue-to-impl $issue_no" "$worktree_path" "$yolo" "$headless" "issue-${issue_no}" "$model"
+        wt_release_work_claim
     fi
 
     return 0
@@ -527,15 +570,27 @@ cmd_rebase() {
         return 1
     fi
 
+    # Re-apply the sparse-checkout profile so profile changes reach existing worktrees
+    local sparse_dirs
+    sparse_dirs=$(wt_read_worktree_setting sparse_checkout "$(wt_get_default_branch)")
+    if [ -n "$sparse_dirs" ]; then
+        wt_apply_sparse_profile "$worktree_path" "$sparse_dirs" || return 1
+    fi
+
     # Check if Claude is available
     if ! command -v claude >/dev/null 2>&1; then
         echo "Error: claude CLI is required for rebase command" >&2
         return 1
     fi
 
+    # Claim the issue so the rebase never runs alongside another agent in the worktree
+    wt_claim_work "$issue_no" "wt rebase $pr_no" || return 1
+
     # Invoke Claude to perform the rebase
     wt_invoke_claude "/sync-master" "$worktree_path" "$yolo" "$headless" "rebase-${pr_no}" "$model"
-    return $?
+    local invoke_status=$?
+    wt_release_work_claim
+    return $invoke_status
 }
 
 # wt help: Show help message
@@ -139,6 +139,156 @@ wt_resolve_worktree() {
     return 1
 }
 
+# Read a worktree.* setting from the project's .agentize.yaml at a git ref
+# Scalars print as a single line; block lists (- item) and inline lists ([a, b])
+# print one item per line. Prints nothing when the file or key is absent.
+# Arguments:
+#   $1 - key under the worktree: section (e.g., "sparse_checkout", "reflink")
+#   $2 - git ref to read .agentize.yaml from (e.g., "main")
+#   $3 - repository directory (optional, defaults to wt_common)
+wt_read_worktree_setting() {
+    local key="$1"
+    local ref="$2"
+    local repo_dir="${3:-$(wt_common)}"
+
+    if [ -z "$key" ] || [ -z "$ref" ] || [ -z "$repo_dir" ]; then
+        return 0
+    fi
+
+    git -C "$repo_dir" show "$ref:.agentize.yaml" 2>/dev/null | awk -v key="$key" '
+        function trim(s) { gsub(/^[ \t]+|[ \t]+$/, "", s); return s }
+        function unquote(s) { s = trim(s); gsub(/^["'"'"']|["'"'"']$/, "", s); return s }
+        /^[ \t]*#/ || /^[ \t]*$/ { next }
+        /^[^ \t]/ { in_section = ($0 ~ /^worktree:[ \t]*$/); in_key = 0; next }
+        !in_section { next }
+        {
+            line = $0
+            sub(/[ \t]+#.*$/, "", line)
+            match(line, /^[ \t]*/)
+            indent = RLENGTH
+            content = substr(line, indent + 1)
+            if (in_key && indent > key_indent && content ~ /^- /) {
+                print unquote(substr(content, 3))
+                next
+            }
+            in_key = 0
+            if (content ~ ("^" key ":")) {
+                value = trim(substr(content, length(key) + 2))
+                if (value == "") {
+                    in_key = 1
+                    key_indent = indent
+                } else if (value ~ /^\[.*\]$/) {
+                    value = substr(value, 2, length(value) - 2)
+                    n = split(value, items, ",")
+                    for (i = 1; i <= n; i++) {
+                        item = unquote(items[i])
+                        if (item != "") print item
+                    }
+                } else {
+                    print unquote(value)
+                }
+            }
+        }
+    '
+}
+
+# Apply a sparse-checkout profile to a worktree (cone mode)
+# Re-applying the same profile is a no-op, so callers may invoke it on every run.
+# Arguments:
+#   $1 - worktree path
+#   $2 - sparse-checkout directories, one per line (as printed by wt_read_worktree_setting)
+# Returns:
+#   0 - Profile applied (or no directories given)
+#   1 - git sparse-checkout failed
+wt_apply_sparse_profile() {
+    local worktree_path="$1"
+    local sparse_dirs="$2"
+
+    if [ -z "$sparse_dirs" ]; then
+        return 0
+    fi
+
+    local -a sparse_args
+    local sparse_dir
+    while IFS= read -r sparse_dir; do
+        [ -n "$sparse_dir" ] && sparse_args+=("$sparse_dir")
+    done <<EOF_SPARSE
+$sparse_dirs
+EOF_SPARSE
+
+    if ! git -C "$worktree_path" sparse-checkout set --cone "${sparse_args[@]}" >/dev/null 2>&1; then
+        echo "Error: Failed to apply sparse-checkout profile to $worktree_path" >&2
+        return 1
+    fi
+    return 0
+}
+
+# Populate a --no-checkout worktree by reflink-copying files from a source worktree
+# Copy-on-write clones share data blocks with the source, so only files that differ
+# from the new HEAD are rewritten by the final `git reset --hard`.
+# Arguments:
+#   $1 - source worktree path (typically trees/main)
+#   $2 - target worktree path (created with git worktree add --no-checkout)
+# Returns:
+#   0 - Target populated via reflink
+#   1 - Reflink unsupported or copy failed (target left without a checkout)
+wt_reflink_populate() {
+    local source_path="$1"
+    local target_path="$2"
+
+    if [ ! -d "$source_path" ] || [ ! -d "$target_path" ]; then
+        return 1
+    fi
+
+    # Probe support on one file first so unsupported filesystems fail fast
+    local probe_src="$source_path/.git"
+    local probe_dst="$target_path/.wt-reflink-probe"
+    if ! cp --reflink=always "$probe_src" "$probe_dst" 2>/dev/null; then
+        rm -f "$probe_dst"
+        return 1
+    fi
+    rm -f "$probe_dst"
+
+    # Copy only top-level entries tracked at the source HEAD; nested untracked
+    # files that come along are removed by the clean step below
+    local name
+    while IFS= read -r name; do
+        [ -n "$name" ] || continue
+        [ -e "$source_path/$name" ] || continue
+        if ! cp -a --reflink=always "$source_path/$name" "$target_path/" 2>/dev/null; then
+            return 1
+        fi
+    done <<EOF_ENTRIES
+$(git -C "$source_path" ls-tree --name-only HEAD 2>/dev/null)
+EOF_ENTRIES
+
+    # Sync index and working tree with HEAD, rewriting only files that differ
+    git -C "$target_path" reset --hard -q >/dev/null 2>&1 || return 1
+    git -C "$target_path" clean -fdxq >/dev/null 2>&1 || true
+    return 0
+}
+
+# Print a one-line provisioning summary (elapsed seconds and disk usage)
+# Disk usage is only measured when WT_PROVISION_STATS=1 since du walks the tree.
+# Arguments:
+#   $1 - worktree path
+#   $2 - checkout mode label (full, sparse, reflink)
+#   $3 - start time in seconds (from $SECONDS)
+wt_report_provision() {
+    local worktree_path="$1"
+    local mode="$2"
+    local start_seconds="$3"
+    local elapsed=$((SECONDS - start_seconds))
+
+    if [ "$WT_PROVISION_STATS" = "1" ]; then
+        local disk_kb
+        disk_kb=$(du -sk "$worktree_path" 2>/dev/null | awk '{print $1}')
+        echo "Checkout: $mode (${elapsed}s, ${disk_kb:-?}K on disk)"
+    else
+        echo "Checkout: $mode (${elapsed}s)"
+    fi
+}
+
 # Attempt to set issue status on the associated GitHub Projects board
 # This is best-effort: failures are logged but do not block worktree creation
 # Arguments:
@@ -271,6 +421,61 @@ wt_claim_issue_status() {
     return 0
 }
 
+# Claim an issue for agent work (local advisory lock, see python/agentize/claims.py)
+# Opens the claim on a free descriptor of the current shell (bash/zsh {var}
+# redirection, number kept in _wt_work_claim_fd), so descriptors the user
+# already has open are left alone. Processes spawned afterwards
+# inherit the descriptor and keep the claim until they exit, so a headless
+# agent holds it for its whole run. Drop this shell's copy with wt_release_work_claim.
+# Arguments:
+#   $1 - issue_no: Issue number to claim
+#   $2 - command_label: Recorded as the holder (e.g., "wt spawn 42")
+#   $3 - common_dir: (optional) Git common directory; resolved via wt_common
+# Returns:
+#   0 - Claimed, or claims unavailable (agentize Python package not importable)
+#   1 - Another process holds the claim (holder printed to stderr)
+wt_claim_work() {
+    local issue_no="$1"
+    local command_label="$2"
+    local common_dir="${3:-$(wt_common)}"
+    if [ -z "$common_dir" ] && [ -z "${AGENTIZE_CLAIMS_DIR:-}" ]; then
+        return 0
+    fi
+    local claims_dir="${AGENTIZE_CLAIMS_DIR:-$common_dir/agentize-claims}"
+
+    if ! mkdir -p "$claims_dir" 2>/dev/null || [ ! -w "$claims_dir" ]; then
+        return 0
+    fi
+    exec {_wt_work_claim_fd}<>"$claims_dir/issue-$issue_no.lock" || return 0
+
+    local claim_error claim_status
+    claim_error=$(python3 -m agentize.claims acquire "issue-$issue_no" --fd "$_wt_work_claim_fd" \
+        --command "$command_label" 2>&1)
+    claim_status=$?
+    if [ $claim_status -eq 0 ]; then
+        _wt_work_claim="issue-$issue_no"
+        return 0
+    fi
+
+    exec {_wt_work_claim_fd}>&-
+    _wt_work_claim_fd=""
+    if [ $claim_status -eq 3 ]; then
+        echo "$claim_error" >&2
+        return 1
+    fi
+    return 0
+}
+
+# Close this shell's copy of the claim opened by wt_claim_work (no-op if none)
+# Agents spawned in the background keep the claim until they exit.
+wt_release_work_claim() {
+    if [ -n "${_wt_work_claim:-}" ]; then
+        exec {_wt_work_claim_fd}>&-
+        _wt_work_claim=""
+        _wt_work_claim_fd=""
+    fi
+}
+
 # Unified interface for invoking Claude CLI with consistent flag handling
 # Arguments:
 #   $1 - command: Claude CLI command string (e.g., "/issue-to-impl 42", "/sync-master")
@@ -323,6 +528,11 @@ wt_invoke_claude() {
         ) </dev/null >"$log_file" 2>&1 &
         local claude_pid=$!
 
+        # Record the agent as the holder of the issue claim (it inherited the claim descriptor)
+        if [ -n "${_wt_work_claim:-}" ]; then
+            python3 -m agentize.claims note "$_wt_work_claim" --fd "$_wt_work_claim_fd" --pid "$claude_pid" >/dev/null 2>&1
+        fi
+
         echo "PID: $claude_pid"
         echo "Log: $log_file"
         return 0
@@ -19,6 +19,8 @@ EXPECTED_FUNCTIONS=(
     "_lol_cmd_serve"
     "_lol_cmd_claude_clean"
     "_lol_cmd_usage"
+    "_lol_cmd_gc"
+    "_lol_cmd_trace"
     "_lol_cmd_plan"
     "_lol_cmd_impl"
     "_lol_cmd_simp"
@@ -42,6 +44,8 @@ DISALLOWED_FUNCTIONS=(
     "lol_cmd_serve"
     "lol_cmd_claude_clean"
     "lol_cmd_usage"
+    "lol_cmd_gc"
+    "lol_cmd_trace"
     "lol_cmd_plan"
     "lol_cmd_impl"
     "lol_cmd_simp"
@@ -20,6 +20,8 @@ echo "$output" | grep -q "^use-branch$" || test_fail "Missing command: use-branc
 echo "$output" | grep -q "^version$" || test_fail "Missing command: version"
 echo "$output" | grep -q "^project$" || test_fail "Missing command: project"
 echo "$output" | grep -q "^usage$" || test_fail "Missing command: usage"
+echo "$output" | grep -q "^gc$" || test_fail "Missing command: gc"
+echo "$output" | grep -q "^trace$" || test_fail "Missing command: trace"
 echo "$output" | grep -q "^claude-clean$" || test_fail "Missing command: claude-clean"
 echo "$output" | grep -q "^plan$" || test_fail "Missing command: plan"
 echo "$output" | grep -q "^impl$" || test_fail "Missing command: impl"
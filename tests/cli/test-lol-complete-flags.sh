@@ -33,6 +33,17 @@ claude_clean_output=$(lol --complete claude-clean-flags 2>/dev/null)
 
 echo "$claude_clean_output" | grep -q "^--dry-run$" || test_fail "claude-clean-flags missing: --dry-run"
 
+# Test gc-flags
+gc_output=$(lol --complete gc-flags 2>/dev/null)
+
+echo "$gc_output" | grep -q "^--dry-run$" || test_fail "gc-flags missing: --dry-run"
+
+# Test trace-flags
+trace_output=$(lol --complete trace-flags 2>/dev/null)
+
+echo "$trace_output" | grep -q "^--run$" || test_fail "trace-flags missing: --run"
+echo "$trace_output" | grep -q "^--last$" || test_fail "trace-flags missing: --last"
+
 # Test usage-flags
 usage_output=$(lol --complete usage-flags 2>/dev/null)
 
@@ -48,6 +59,7 @@ echo "$plan_output" | grep -q "^--dry-run$" || test_fail "plan-flags missing: --
 echo "$plan_output" | grep -q "^--verbose$" || test_fail "plan-flags missing: --verbose"
 echo "$plan_output" | grep -q "^--refine$" || test_fail "plan-flags missing: --refine"
 echo "$plan_output" | grep -q "^--editor$" || test_fail "plan-flags missing: --editor"
+echo "$plan_output" | grep -q "^--resume$" || test_fail "plan-flags missing: --resume"
 
 # Test impl-flags
 impl_output=$(lol --complete impl-flags 2>/dev/null)
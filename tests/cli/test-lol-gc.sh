@@ -0,0 +1,48 @@
+#!/usr/bin/env bash
+# Test: lol gc command
+# Tests .tmp artifact garbage collection via shell CLI
+
+source "$(dirname "$0")/../common.sh"
+
+LOL_CLI="$PROJECT_ROOT/src/cli/lol.sh"
+
+test_info "lol gc command tests"
+
+export PYTHONPATH="$PROJECT_ROOT/python"
+source "$LOL_CLI"
+
+# Isolated AGENTIZE_HOME with a Makefile so lol accepts it
+TEST_HOME=$(make_temp_dir "gc-home")
+touch "$TEST_HOME/Makefile"
+mkdir -p "$TEST_HOME/.tmp/debug-stop" "$TEST_HOME/.tmp/acw-sessions"
+
+# Stale artifacts (older than every default age limit) and one fresh file
+echo "old" > "$TEST_HOME/.tmp/debug-stop/sess-old-cont-1-1.log"
+echo "old" > "$TEST_HOME/.tmp/issue-42-bold.txt"
+echo "new" > "$TEST_HOME/.tmp/acw-sessions/fresh123.md"
+touch -d "2020-01-01" "$TEST_HOME/.tmp/debug-stop/sess-old-cont-1-1.log" "$TEST_HOME/.tmp/issue-42-bold.txt"
+# Unrelated files are never collected
+echo "keep" > "$TEST_HOME/.tmp/issue-42.md"
+touch -d "2020-01-01" "$TEST_HOME/.tmp/issue-42.md"
+
+# Test 1: --dry-run reports but keeps files
+output=$(AGENTIZE_HOME="$TEST_HOME" lol gc --dry-run 2>&1)
+echo "$output" | grep -q "Reclaimable:" || { cleanup_dir "$TEST_HOME"; test_fail "gc --dry-run missing summary: $output"; }
+[ -f "$TEST_HOME/.tmp/issue-42-bold.txt" ] || { cleanup_dir "$TEST_HOME"; test_fail "gc --dry-run deleted a file"; }
+
+# Test 2: gc removes stale artifacts and keeps fresh/unrelated ones
+output=$(AGENTIZE_HOME="$TEST_HOME" lol gc 2>&1)
+echo "$output" | grep -q "Reclaimed: .* in 2 files" || { cleanup_dir "$TEST_HOME"; test_fail "Unexpected gc summary: $output"; }
+[ ! -f "$TEST_HOME/.tmp/debug-stop/sess-old-cont-1-1.log" ] || { cleanup_dir "$TEST_HOME"; test_fail "Stale debug-stop log not removed"; }
+[ ! -f "$TEST_HOME/.tmp/issue-42-bold.txt" ] || { cleanup_dir "$TEST_HOME"; test_fail "Stale planner artifact not removed"; }
+[ -f "$TEST_HOME/.tmp/acw-sessions/fresh123.md" ] || { cleanup_dir "$TEST_HOME"; test_fail "Fresh acw session removed"; }
+[ -f "$TEST_HOME/.tmp/issue-42.md" ] || { cleanup_dir "$TEST_HOME"; test_fail "Unrelated issue file removed"; }
+
+# Test 3: unknown option is rejected
+if AGENTIZE_HOME="$TEST_HOME" lol gc --bogus >/dev/null 2>&1; then
+  cleanup_dir "$TEST_HOME"
+  test_fail "lol gc accepted unknown option"
+fi
+
+cleanup_dir "$TEST_HOME"
+test_pass "lol gc collects stale .tmp artifacts and honors --dry-run"
@@ -14,6 +14,7 @@ source "$LOL_CLI"
 
 # Create temp directory for test artifacts
 TMP_DIR=$(make_temp_dir "test-lol-impl-$$")
+export AGENTIZE_CLAIMS_DIR="$TMP_DIR/claims"
 trap 'cleanup_dir "$TMP_DIR"' EXIT
 
 # Create stub worktree path
@@ -0,0 +1,91 @@
+#!/usr/bin/env bash
+# Test: lol plan --resume re-runs only the stages without a valid checkpoint
+
+source "$(dirname "$0")/../common.sh"
+
+LOL_CLI="$PROJECT_ROOT/src/cli/lol.sh"
+PLANNER_CLI="$PROJECT_ROOT/src/cli/planner.sh"
+
+test_info "lol plan --resume re-runs only unfinished stages"
+
+export AGENTIZE_HOME="$PROJECT_ROOT"
+export PYTHONPATH="$PROJECT_ROOT/python"
+source "$PLANNER_CLI"
+source "$LOL_CLI"
+
+TMP_DIR=$(make_temp_dir "test-lol-plan-resume-$$")
+PREFIX=""
+trap 'cleanup_dir "$TMP_DIR"; [ -n "$PREFIX" ] && rm -f "$PROJECT_ROOT/.tmp/$PREFIX"-*' EXIT
+
+CALL_LOG="$TMP_DIR/acw-calls.log"
+FAIL_CONSENSUS="$TMP_DIR/fail-consensus"
+touch "$CALL_LOG" "$FAIL_CONSENSUS"
+
+# Stub acw: every stage succeeds, except consensus while $FAIL_CONSENSUS exists
+STUB_ACW="$TMP_DIR/acw-stub.sh"
+cat > "$STUB_ACW" <<'STUBEOF'
+#!/usr/bin/env bash
+acw() {
+    local provider="$1"
+    local model="$2"
+    local input_file="$3"
+    local output_file="$4"
+
+    if [ "$provider" = "--complete" ] && [ "$model" = "providers" ]; then
+        printf '%s\n' claude codex opencode cursor kimi
+        return 0
+    fi
+
+    echo "acw $provider $model $input_file $output_file" >> "${PLANNER_ACW_CALL_LOG:?}"
+    if echo "$output_file" | grep -q "consensus" && [ -f "${PLANNER_FAIL_CONSENSUS:?}" ]; then
+        return 1
+    fi
+    echo "# Stub Plan: $(basename "$output_file")" > "$output_file"
+    return 0
+}
+STUBEOF
+
+export PLANNER_ACW_CALL_LOG="$CALL_LOG"
+export PLANNER_ACW_SCRIPT="$STUB_ACW"
+export PLANNER_FAIL_CONSENSUS="$FAIL_CONSENSUS"
+export PLANNER_NO_ANIM=1
+
+# Test 1: A run that fails at consensus leaves a manifest of the debate stages
+test_info "Test 1: Failed consensus leaves checkpoints"
+status=0
+output=$(cd "$TMP_DIR" && lol plan --dry-run --verbose "Resume test feature" 2>&1) || status=$?
+[ $status -ne 0 ] || test_fail "Expected the first run to fail at consensus"
+PREFIX=$(echo "$output" | sed -n 's/^Artifacts prefix: //p')
+[ -n "$PREFIX" ] || test_fail "Verbose output should name the artifact prefix, got: $output"
+[ -s "$PROJECT_ROOT/.tmp/$PREFIX-manifest.json" ] || test_fail "Expected $PREFIX-manifest.json"
+
+# Test 2: Resume runs consensus only, with the recorded feature description
+test_info "Test 2: Resume re-runs consensus only"
+rm -f "$FAIL_CONSENSUS"
+: > "$CALL_LOG"
+output=$(cd "$TMP_DIR" && lol plan --dry-run --resume "$PREFIX" 2>&1) || {
+    echo "$output" >&2
+    test_fail "lol plan --resume should succeed"
+}
+[ "$(wc -l < "$CALL_LOG" | tr -d ' ')" = "1" ] || {
+    cat "$CALL_LOG" >&2
+    test_fail "Expected a single acw call on resume"
+}
+grep -q "consensus" "$CALL_LOG" || test_fail "The resumed call should be consensus"
+[ "$(echo "$output" | grep -c "resumed from checkpoint")" = "4" ] \
+    || test_fail "Expected 4 resumed stages, got: $output"
+echo "$output" | grep -q "Feature: Resume test feature" \
+    || test_fail "The feature description should come from the manifest"
+
+# Test 3: Unknown prefixes and conflicting flags are rejected
+test_info "Test 3: Invalid resume requests fail"
+status=0
+output=$(cd "$TMP_DIR" && lol plan --dry-run --resume "no-such-prefix-$$" 2>&1) || status=$?
+[ $status -eq 1 ] || test_fail "Expected exit 1 for a missing manifest, got $status"
+echo "$output" | grep -q "No checkpoint manifest" || test_fail "Missing manifest error, got: $output"
+
+status=0
+output=$(lol plan --resume "$PREFIX" --refine 42 2>&1) || status=$?
+[ $status -eq 1 ] || test_fail "--resume with --refine should be rejected"
+
+test_pass "lol plan --resume re-runs only unfinished stages"
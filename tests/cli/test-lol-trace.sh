@@ -0,0 +1,47 @@
+#!/usr/bin/env bash
+# Test: lol trace command
+# Tests workflow stage trace summaries via shell CLI
+
+source "$(dirname "$0")/../common.sh"
+
+LOL_CLI="$PROJECT_ROOT/src/cli/lol.sh"
+
+test_info "lol trace command tests"
+
+export PYTHONPATH="$PROJECT_ROOT/python"
+source "$LOL_CLI"
+
+# Isolated AGENTIZE_HOME with a Makefile so lol accepts it
+TEST_HOME=$(make_temp_dir "trace-home")
+touch "$TEST_HOME/Makefile"
+mkdir -p "$TEST_HOME/.tmp"
+
+cat > "$TEST_HOME/.tmp/issue-42-trace.jsonl" <<'JSON'
+{"run": "issue-42", "session": "2026-01-01T10:00:00", "stage": "bold", "backend": "claude:opus", "status": "ok", "wall_seconds": 40.0, "wait_seconds": 2.0, "tokens": 1500, "cost_usd": 0.75}
+{"run": "issue-42", "session": "2026-01-01T10:00:00", "stage": "critique", "backend": "claude:opus", "status": "failed", "attempts": 2}
+JSON
+cat > "$TEST_HOME/.tmp/issue-7-trace.jsonl" <<'JSON'
+{"run": "issue-7", "session": "2026-01-02T10:00:00", "stage": "bold", "backend": "claude:opus", "status": "ok", "wall_seconds": 10.0, "tokens": 100, "cost_usd": 0.25}
+JSON
+
+# Test 1: summary covers every run
+output=$(AGENTIZE_HOME="$TEST_HOME" lol trace 2>&1)
+echo "$output" | grep -q "Total: 3 stages in 2 runs" || { cleanup_dir "$TEST_HOME"; test_fail "Unexpected trace summary: $output"; }
+echo "$output" | grep -q '\$1.00' || { cleanup_dir "$TEST_HOME"; test_fail "trace summary missing total cost: $output"; }
+
+# Test 2: --run filters by session prefix
+output=$(AGENTIZE_HOME="$TEST_HOME" lol trace --run issue-7 2>&1)
+echo "$output" | grep -q "Total: 1 stages in 1 runs" || { cleanup_dir "$TEST_HOME"; test_fail "--run did not filter: $output"; }
+
+# Test 3: invalid options are rejected
+if AGENTIZE_HOME="$TEST_HOME" lol trace --last abc >/dev/null 2>&1; then
+  cleanup_dir "$TEST_HOME"
+  test_fail "lol trace accepted a non-numeric --last"
+fi
+if AGENTIZE_HOME="$TEST_HOME" lol trace --bogus >/dev/null 2>&1; then
+  cleanup_dir "$TEST_HOME"
+  test_fail "lol trace accepted unknown option"
+fi
+
+cleanup_dir "$TEST_HOME"
+test_pass "lol trace summarizes stage traces and honors --run"
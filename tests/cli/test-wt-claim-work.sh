@@ -0,0 +1,66 @@
+#!/usr/bin/env bash
+# Test: wt_claim_work rejects an issue claimed by another process and holds the claim on a free fd
+
+source "$(dirname "$0")/../common.sh"
+
+WT_CLI="$PROJECT_ROOT/src/cli/wt.sh"
+
+test_info "wt_claim_work rejects issues claimed by another process"
+
+export AGENTIZE_HOME="$PROJECT_ROOT"
+export PYTHONPATH="$PROJECT_ROOT/python"
+source "$WT_CLI"
+
+TMP_DIR=$(make_temp_dir "test-wt-claim-work-$$")
+export AGENTIZE_CLAIMS_DIR="$TMP_DIR/claims"
+HOLDER_PID=""
+trap '[ -n "$HOLDER_PID" ] && kill "$HOLDER_PID" 2>/dev/null; cleanup_dir "$TMP_DIR"' EXIT
+
+# Hold the claim on issue 42 from another process, as `lol impl 42` would
+python3 - "$TMP_DIR/ready" <<'EOF' &
+import sys, time
+from agentize.claims import WorkClaim
+claim = WorkClaim("issue-42", command="lol impl 42")
+assert claim.acquire()
+open(sys.argv[1], "w").close()
+time.sleep(60)
+EOF
+HOLDER_PID=$!
+
+for _ in $(seq 1 50); do
+    [ -f "$TMP_DIR/ready" ] && break
+    sleep 0.1
+done
+[ -f "$TMP_DIR/ready" ] || test_fail "Claim holder did not start"
+
+# Test 1: A held claim is rejected with the holder named
+test_info "Test 1: Held claim is rejected"
+status=0
+output=$(wt_claim_work 42 "wt spawn 42" 2>&1) || status=$?
+[ $status -eq 1 ] || test_fail "Expected exit 1 for a held claim, got $status"
+echo "$output" | grep -q "issue-42 is claimed by PID $HOLDER_PID (lol impl 42)" \
+    || test_fail "Rejection should name the holder, got: $output"
+
+# Test 2: Other issues are unaffected and the claim is held until released
+test_info "Test 2: Unclaimed issue is claimed and released"
+exec 9>"$TMP_DIR/user-fd"
+wt_claim_work 43 "wt spawn 43" || test_fail "Claiming a free issue should succeed"
+[ "$_wt_work_claim" = "issue-43" ] || test_fail "Claim key not recorded"
+[ "$_wt_work_claim_fd" != 9 ] || test_fail "Claim should not reuse the caller's fd 9"
+python3 -c 'from agentize.claims import claimed_by; import sys; sys.exit(0 if claimed_by("issue-43") is not None else 1)' \
+    || test_fail "issue-43 should be held while its fd is open"
+wt_release_work_claim
+echo "still open" >&9 || test_fail "The caller's fd 9 should be left open"
+exec 9>&-
+python3 -c 'from agentize.claims import claimed_by; import sys; sys.exit(0 if claimed_by("issue-43") is None else 1)' \
+    || test_fail "issue-43 should be free after release"
+
+# Test 3: The claim frees once the holder exits
+test_info "Test 3: Claim frees when the holder exits"
+kill "$HOLDER_PID"
+wait "$HOLDER_PID" 2>/dev/null || true
+HOLDER_PID=""
+wt_claim_work 42 "wt spawn 42" || test_fail "Claim should be free after the holder exits"
+wt_release_work_claim
+
+test_pass "wt_claim_work rejects held claims and holds its own on a free fd"
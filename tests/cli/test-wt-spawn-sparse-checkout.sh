@@ -0,0 +1,76 @@
+#!/usr/bin/env bash
+# Test: wt spawn applies the worktree.sparse_checkout profile from .agentize.yaml
+
+source "$(dirname "$0")/../common.sh"
+source "$(dirname "$0")/../helpers-worktree.sh"
+
+test_info "wt spawn applies sparse-checkout profile"
+
+# Custom setup: seed repo with two top-level directories and a sparse profile
+setup_test_repo_with_sparse_profile() {
+    clean_git_env
+
+    local SEED_DIR=$(mktemp -d)
+    cd "$SEED_DIR"
+    git init
+    git config user.email "test@example.com"
+    git config user.name "Test User"
+
+    echo "test" > README.md
+    mkdir -p src docs
+    echo "code" > src/main.c
+    echo "manual" > docs/manual.md
+    cat > .agentize.yaml <<'YAML'
+project:
+  name: sparse-test
+worktree:
+  sparse_checkout:
+    - src
+YAML
+    git add README.md src docs .agentize.yaml
+    git commit -m "Initial commit with sparse profile"
+
+    TEST_REPO_DIR=$(mktemp -d)
+    git clone --bare "$SEED_DIR" "$TEST_REPO_DIR"
+    cd "$TEST_REPO_DIR"
+    rm -rf "$SEED_DIR"
+
+    cp "$PROJECT_ROOT/src/cli/wt.sh" ./wt-cli.sh
+    cp -r "$PROJECT_ROOT/src/cli/wt" ./wt
+
+    create_gh_stub
+}
+
+setup_test_repo_with_sparse_profile
+source ./wt-cli.sh
+
+wt init >/dev/null 2>&1 || test_fail "wt init failed"
+
+output=$(wt spawn 42 --no-agent 2>&1) || {
+  cleanup_test_repo
+  test_fail "wt spawn 42 failed: $output"
+}
+
+worktree_path="$TEST_REPO_DIR/trees/issue-42"
+
+echo "$output" | grep -q "Checkout: sparse" || {
+  cleanup_test_repo
+  test_fail "Expected sparse checkout summary, got: $output"
+}
+
+# Cone mode keeps top-level files and the listed directories only
+[ -f "$worktree_path/README.md" ] || { cleanup_test_repo; test_fail "README.md should be checked out"; }
+[ -f "$worktree_path/src/main.c" ] || { cleanup_test_repo; test_fail "src/main.c should be checked out"; }
+if [ -e "$worktree_path/docs/manual.md" ]; then
+  cleanup_test_repo
+  test_fail "docs/ should be excluded by the sparse profile"
+fi
+
+# Excluded paths must not show up as deletions
+if [ -n "$(git -C "$worktree_path" status --porcelain)" ]; then
+  cleanup_test_repo
+  test_fail "Sparse worktree should have a clean status"
+fi
+
+cleanup_test_repo
+test_pass "wt spawn applies sparse-checkout profile"